@@ -0,0 +1,17 @@
+import pytest
+
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import db
+from tests.factory import create_test_app
+
+
+@pytest.fixture
+def app():
+    """App de prueba con el esquema creado en SQLite en memoria; se descarta al terminar."""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    lookups.clear()
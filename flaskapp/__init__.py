@@ -1,6 +1,5 @@
 from flask import Flask, render_template
 from flask_login import LoginManager
-from sqlalchemy import text
 from flaskapp.database.models import db
 import os
 
@@ -44,21 +43,23 @@ def register_blueprints(app):
     @app.context_processor
     def inject_notifications():
         def has_unread_notifications(c_id: int) -> dict:
-            from flaskapp.database.models import Notification
-            unread_count = Notification.query.filter_by(
-                user_id=str(c_id),
-                is_read=False
-            ).count()
-            print(f"Unread notifications for user {c_id}: {unread_count}", flush=True)
+            from flaskapp.modules.notifications.service import NotificationService
+            # Contador desnormalizado, memorizado por request: sin COUNT por render
+            unread_count = NotificationService.get_unread_count(int(c_id))
             return {
                 'has_unread': unread_count > 0,
                 'count': unread_count
             }
         return {'has_unread_notifications': has_unread_notifications}
 
-def create_app():
+def create_app(bootstrap_only: bool = False):
 
-    """Create a Flask application."""
+    """
+    Create a Flask application. Startup only checks the schema version row
+    (see flaskapp/database/bootstrap.py); `bootstrap_only` builds the app for
+    maintenance commands (the bootstrap step, the rollups job), without that
+    check or background threads.
+    """
     app = Flask(__name__)    
     
     # Configuration
@@ -80,33 +81,35 @@ def create_app():
     
     # Import authentication loaders
     from flaskapp.database import auth_loaders
+    from flaskapp.database.principals import principals
+    principals.configure(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+    from flaskapp.modules.authentication.hasher import password_hasher
+    password_hasher.configure(
+        app.config['PASSWORD_HASH_ITERATIONS'], app.config['PASSWORD_HASH_WORKERS'],
+        app.config['PASSWORD_HASH_QUEUE'], app.config['PASSWORD_HASH_TIMEOUT']
+    )
     
     # Register blueprints
     register_blueprints(app)
-    
-    # Create database tables and seed data
-    with app.app_context():
-        db.create_all()   # Creates tables for ALL modules' models   
-        seed_functions_and_triggers(app)  # Insert base data required for system operation
-        # Seed the database with test data
-        seed_db_command(app)
 
-    return app
+    # Per-request SQL profiling, only when SQL_PROFILING is set
+    from flaskapp.database.profiling import sql_profiler
+    sql_profiler.init_app(app)
+    
+    if bootstrap_only:
+        return app
 
-def seed_functions_and_triggers(app):
-    print("Seeding functions and triggers...")
+    # Schema, triggers and seed data are applied by the bootstrap step, not per worker
+    from flaskapp.database.bootstrap import check_schema, ensure_bootstrapped
     with app.app_context():
-        with open('flaskapp/database/seed_base_data.sql', 'r') as f:
-            sql = f.read()
-        with db.engine.connect() as connection:
-            connection.execute(text(sql))
-            connection.commit()
+        if app.config['DB_AUTO_BOOTSTRAP']:
+            ensure_bootstrapped(app)
+        else:
+            check_schema()
 
-def seed_db_command(app):
-    """
-    Puebla la base de datos con datos de prueba.
-    Crea usuarios, organizaciones, torneos, equipos, etc.
-    """
-    from .database.seeder import seed_database
-    
-    seed_database(app)
\ No newline at end of file
+    # Dashboard stats are served from a snapshot; the first dashboard read starts its refresh thread
+    from flaskapp.modules.home.service import dashboard_snapshot
+    dashboard_snapshot.ttl = app.config['DASHBOARD_STATS_TTL']
+    dashboard_snapshot.refresh_interval = app.config['DASHBOARD_REFRESH_INTERVAL']
+
+    return app
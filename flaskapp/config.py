@@ -8,6 +8,28 @@ class BaseConfig:
     """Base configuration (shared across environments)"""
     SECRET_KEY = os.getenv('SECRET_KEY', os.urandom(32))
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # Disables warning
+    # Dashboard stats snapshot: max age (seconds) and refresh period of the thread that the first dashboard
+    # read starts in each process and that stops after one TTL without reads (0 disables the thread)
+    DASHBOARD_STATS_TTL = int(os.getenv('DASHBOARD_STATS_TTL', 300))
+    DASHBOARD_REFRESH_INTERVAL = int(os.getenv('DASHBOARD_REFRESH_INTERVAL', 60))
+    # Run the schema/seed bootstrap at startup when the schema version row is outdated;
+    # otherwise startup only checks it (run `python -m flaskapp.database.bootstrap` once per deploy)
+    DB_AUTO_BOOTSTRAP = os.getenv('DB_AUTO_BOOTSTRAP', '0') == '1'
+    # Cached Flask-Login principals: entries per process and max age (seconds, 0 disables the cache).
+    # Other processes may show a stale name/picture for up to the TTL; access checks re-read is_admin
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 10000))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))
+    # Password hashing: PBKDF2 iterations (changing it rehashes on next login), pool threads (0 = one per CPU),
+    # requests allowed to queue, and seconds to wait for a slot before answering 503
+    PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 100000))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 64))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+    # Opt-in SQL profiling (X-SQL-Profile header, /admin/sql-profile): repeats of one SELECT that flag
+    # an N+1 loop, and how many finished requests the in-memory report keeps
+    SQL_PROFILING = os.getenv('SQL_PROFILING', '0') == '1'
+    SQL_PROFILING_N_PLUS_ONE = int(os.getenv('SQL_PROFILING_N_PLUS_ONE', 5))
+    SQL_PROFILING_REPORT_SIZE = int(os.getenv('SQL_PROFILING_REPORT_SIZE', 500))
 
 class DevelopmentConfig(BaseConfig):
     """Configuration for local development (SQLite)"""
@@ -18,6 +40,7 @@ class DevelopmentConfig(BaseConfig):
     # Creates `dev.db` in flaskapp directory
     SQLALCHEMY_DATABASE_URI = f"sqlite:///{BASE_DIR / 'database' / 'dev.db'}" 
     DEBUG = True  # Enable debug mode for development
+    DB_AUTO_BOOTSTRAP = os.getenv('DB_AUTO_BOOTSTRAP', '1') == '1'
 
 class ProductionConfig(BaseConfig):
     """Configuration for production (PostgreSQL)"""
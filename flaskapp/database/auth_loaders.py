@@ -4,12 +4,13 @@ Authentication loaders for Flask-Login
 
 from flaskapp import login_manager
 from flaskapp.database.models import User
+from flaskapp.database.principals import principals
 
 
 @login_manager.user_loader
 def user_loader(id):
-    """Load user by ID for Flask-Login."""
-    return User.query.filter_by(id=id).first()
+    """Load the user's principal for Flask-Login (cached, see principals.py)."""
+    return principals.get(int(id))
 
 
 @login_manager.request_loader
@@ -0,0 +1,120 @@
+"""
+Versioned schema and base-data bootstrap.
+
+Creating tables, (re)installing the PostgreSQL functions and triggers of
+seed_base_data.sql, seeding and building the derived tables is done once per
+deploy, not by every worker at startup:
+
+    python -m flaskapp.database.bootstrap            # schema, triggers, seed data
+    python -m flaskapp.database.bootstrap --no-seed  # only the status/type tables
+    python -m flaskapp.database.bootstrap --force    # re-run even if already at SCHEMA_VERSION
+
+Without --force the command is a no-op (one version query) when the database
+is already at SCHEMA_VERSION, so it is safe to run on every container start.
+
+The step ends by writing SCHEMA_VERSION to the single schema_version row.
+create_app() then only reads that row: it raises SchemaOutOfDate when the
+version differs, or, with DB_AUTO_BOOTSTRAP (development), runs the bootstrap
+itself. Bump SCHEMA_VERSION whenever models.py or seed_base_data.sql change
+in a way an existing database has to pick up.
+"""
+
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from flaskapp.database.models import MatchStatus, SchemaVersion, db
+
+SCHEMA_VERSION = 2
+
+BASE_SQL = Path(__file__).parent / 'seed_base_data.sql'
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database was not bootstrapped for this version of the code."""
+
+
+def current_version(session=None) -> Optional[int]:
+    """Version recorded by the last bootstrap; None if there is none (or no table yet)."""
+    session = session or db.session
+    try:
+        return session.execute(select(SchemaVersion.version).where(SchemaVersion.id == 1)).scalar()
+    except (OperationalError, ProgrammingError):
+        session.rollback()
+        return None
+
+
+def check_schema() -> None:
+    version = current_version()
+    if version != SCHEMA_VERSION:
+        raise SchemaOutOfDate(
+            f"Database schema version is {version}, this code expects {SCHEMA_VERSION}: "
+            "run `python -m flaskapp.database.bootstrap` first"
+        )
+
+
+def run_base_sql() -> None:
+    """Functions, triggers and column migrations (PostgreSQL only: the script is PL/pgSQL)."""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    with db.engine.connect() as connection:
+        connection.execute(text(BASE_SQL.read_text()))
+        connection.commit()
+
+
+def bootstrap(app, seed: bool = True) -> None:
+    """Bring the database up to SCHEMA_VERSION. Idempotent; call inside an app context."""
+    from flaskapp.database.lookups import lookups
+    from flaskapp.database.seeder import seed_database, seed_master_data
+    from flaskapp.modules.home import rollups
+    from flaskapp.modules.matches import performance, ratings
+
+    db.create_all()
+    run_base_sql()
+    if seed:
+        seed_database(app)
+    elif db.session.query(MatchStatus.id).first() is None:
+        seed_master_data()
+        db.session.commit()
+    lookups.load()
+    # Existing databases: user_performance and user_ratings are built the first time
+    performance.ensure_built()
+    ratings.ensure_built()
+    rollups.run()  # Counts the seeded history; the rollups job advances it from here
+
+    db.session.merge(SchemaVersion(id=1, version=SCHEMA_VERSION))
+    db.session.commit()
+
+
+def ensure_bootstrapped(app, seed: bool = True) -> bool:
+    """Bootstrap only when the recorded version differs (one query otherwise)."""
+    if current_version() == SCHEMA_VERSION:
+        return False
+    bootstrap(app, seed)
+    return True
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Create or upgrade the database schema and base data.')
+    parser.add_argument('--no-seed', action='store_true',
+                        help='only seed the status/type tables, not the development data')
+    parser.add_argument('--force', action='store_true',
+                        help='bootstrap even if the database is already at the current version')
+    args = parser.parse_args(argv)
+
+    from flaskapp import create_app
+    app = create_app(bootstrap_only=True)
+    with app.app_context():
+        if args.force:
+            bootstrap(app, seed=not args.no_seed)
+            ran = True
+        else:
+            ran = ensure_bootstrapped(app, seed=not args.no_seed)
+    print(f"Database {'bootstrapped to' if ran else 'already at'} schema version {SCHEMA_VERSION}")
+
+
+if __name__ == '__main__':
+    main()
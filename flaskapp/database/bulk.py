@@ -0,0 +1,156 @@
+"""
+Bulk insert helpers.
+
+Writes many rows in as few round-trips as possible using the connection of
+the current session, so the rows are part of the caller's transaction:
+- PostgreSQL: COPY ... FROM STDIN (one round-trip for the whole batch).
+- Other dialects: a single Core insert() executed with executemany.
+
+bulk_upsert writes rows that may already exist with a single
+INSERT ... ON CONFLICT DO UPDATE (PostgreSQL and SQLite).
+"""
+
+import csv
+import io
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+from flaskapp.database.models import db
+
+COPY = 'copy'
+EXECUTEMANY = 'executemany'
+
+COPY_NULL = r'\N'  # Explicit NULL marker so empty strings stay empty strings
+
+
+def default_method(session=None) -> str:
+    """Best bulk method for the dialect bound to the session."""
+    session = session or db.session
+    return COPY if session.get_bind().dialect.name == 'postgresql' else EXECUTEMANY
+
+
+def bulk_insert(
+    model,
+    rows: Sequence[Dict[str, Any]],
+    columns: Optional[List[str]] = None,
+    method: Optional[str] = None,
+    session=None
+) -> int:
+    """
+    Insert `rows` (dicts keyed by column name) into the model's table.
+
+    Rows are written on the session's connection and are NOT committed;
+    the caller decides when the transaction ends. Returns the row count.
+    """
+    if not rows:
+        return 0
+
+    session = session or db.session
+    method = method or default_method(session)
+    table = model.__table__
+    columns = columns or list(rows[0].keys())
+
+    if method == COPY:
+        _copy_rows(session, table, columns, rows)
+    elif method == EXECUTEMANY:
+        session.execute(insert(table), [{c: row.get(c) for c in columns} for row in rows])
+    else:
+        raise ValueError(f"Unknown bulk insert method: {method}")
+
+    return len(rows)
+
+
+def bulk_insert_chunked(
+    model,
+    rows: Iterable[Dict[str, Any]],
+    chunk_size: int = 5000,
+    columns: Optional[List[str]] = None,
+    method: Optional[str] = None,
+    session=None
+) -> int:
+    """
+    Same as bulk_insert, but consumes `rows` lazily (e.g. a generator) and
+    writes them in chunks so memory stays bounded by `chunk_size`.
+    """
+    total = 0
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            total += bulk_insert(model, chunk, columns, method, session)
+            chunk = []
+    total += bulk_insert(model, chunk, columns, method, session)
+    return total
+
+
+def bulk_upsert(
+    model,
+    rows: Sequence[Dict[str, Any]],
+    key_columns: Sequence[str],
+    increment: Sequence[str] = (),
+    session=None
+) -> int:
+    """
+    Insert `rows` or update the ones that already exist, matched by
+    `key_columns` (primary key or unique constraint). Columns in `increment`
+    are added to the stored value; every other column is replaced.
+
+    One statement on PostgreSQL and SQLite; other dialects fall back to the
+    ORM, row by row. Not committed. Returns the row count.
+    """
+    if not rows:
+        return 0
+
+    session = session or db.session
+    dialect = session.get_bind().dialect.name
+    columns = [c for c in rows[0].keys() if c not in key_columns]
+
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        statement = dialect_insert(model.__table__).values(list(rows))
+        statement = statement.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={
+                c: model.__table__.c[c] + statement.excluded[c] if c in increment else statement.excluded[c]
+                for c in columns
+            }
+        )
+        session.execute(statement)
+        return len(rows)
+
+    for row in rows:
+        key = tuple(row[c] for c in key_columns)
+        instance = session.get(model, key if len(key) > 1 else key[0])
+        if instance is None:
+            session.add(model(**row))
+            continue
+        for c in columns:
+            setattr(instance, c, getattr(instance, c) + row[c] if c in increment else row[c])
+    return len(rows)
+
+
+def _copy_rows(session, table, columns: List[str], rows: Sequence[Dict[str, Any]]) -> None:
+    """COPY rows through the session's psycopg2 connection (same transaction)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row.get(c)) for c in columns])
+    buffer.seek(0)
+
+    raw_connection = session.connection().connection.driver_connection
+    column_list = ', '.join(columns)
+    with raw_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+
+
+def _copy_value(value: Any) -> Any:
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return value
@@ -0,0 +1,151 @@
+"""
+Process-wide registry for lookup tables (code <-> id).
+
+Status and type tables are tiny and only change through the seeder or a
+migration, so services resolve codes here instead of querying every time:
+
+    lookups.id_of(MatchStatus, 'COMPLETED')
+    lookups.code_of(TournamentStatus, tournament.status_id)
+    lookups.description_of(MatchStatus, match.status_id)
+
+All tables are read with a single UNION ALL query. The registry is loaded
+on first use (and by the bootstrap step) and must be refreshed explicitly with
+`lookups.refresh()` after a lookup table changes. It remembers the engine it
+was loaded from, so a different engine (e.g. a new test app) reloads it on
+first use. An unknown code triggers a refresh before failing, which covers
+rows added after startup; those refreshes are throttled to one per
+MISS_REFRESH_INTERVAL seconds, so a caller repeating a bad code fails from
+memory instead of re-reading every table.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import literal, select, union_all
+
+from flaskapp.database.models import (
+    EventStatus, MatchStatus, NotificationType, RelatedEntityType, TeamInvitationStatus,
+    TournamentFormat, TournamentStatus, db
+)
+
+LOOKUP_MODELS = (
+    EventStatus, TournamentStatus, TournamentFormat, MatchStatus,
+    TeamInvitationStatus, NotificationType, RelatedEntityType,
+)
+
+MISS_REFRESH_INTERVAL = 5.0  # Seconds between refreshes triggered by unknown codes
+
+
+class UnknownLookupCode(LookupError):
+    """The code (or id) does not exist in the lookup table, as of the latest refresh."""
+
+
+def _key_column(model):
+    """Most lookup tables are keyed by `code`; RelatedEntityType uses `name`."""
+    columns = model.__table__.c
+    return columns.code if 'code' in columns else columns.name
+
+
+def _description_column(model):
+    columns = model.__table__.c
+    return columns.description if 'description' in columns else literal(None)
+
+
+class LookupRegistry:
+    def __init__(self, models=LOOKUP_MODELS, miss_refresh_interval: float = MISS_REFRESH_INTERVAL):
+        self._models = {model.__tablename__: model for model in models}
+        self.miss_refresh_interval = miss_refresh_interval
+        self._lock = threading.Lock()
+        self._engine = None
+        self._miss_refreshed_at: Optional[float] = None
+        self._ids: Dict[type, Dict[str, int]] = {}
+        self._codes: Dict[type, Dict[int, str]] = {}
+        self._descriptions: Dict[type, Dict[int, Optional[str]]] = {}
+
+    def load(self, session=None) -> None:
+        """Read every lookup table in one round-trip and swap the maps in."""
+        session = session or db.session
+        query = union_all(*(
+            select(literal(name).label('table_name'), model.__table__.c.id, _key_column(model).label('code'),
+                   _description_column(model).label('description'))
+            for name, model in self._models.items()
+        ))
+
+        ids: Dict[type, Dict[str, int]] = {model: {} for model in self._models.values()}
+        descriptions: Dict[type, Dict[int, Optional[str]]] = {model: {} for model in self._models.values()}
+        for table_name, row_id, code, description in session.execute(query):
+            ids[self._models[table_name]][code] = row_id
+            descriptions[self._models[table_name]][row_id] = description
+        codes = {model: {row_id: code for code, row_id in table.items()} for model, table in ids.items()}
+
+        with self._lock:
+            self._ids, self._codes, self._descriptions = ids, codes, descriptions
+            if self._engine is not session.get_bind().engine:
+                self._miss_refreshed_at = None
+            self._engine = session.get_bind().engine
+
+    def refresh(self, session=None) -> None:
+        """Reload after a lookup table changed (seeder, migration, admin)."""
+        self.load(session)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._engine = None
+            self._miss_refreshed_at = None
+            self._ids, self._codes, self._descriptions = {}, {}, {}
+
+    def _ensure_loaded(self) -> None:
+        if self._engine is not db.engine:
+            self.load()
+
+    def _refresh_on_miss(self) -> bool:
+        """Refresh for an unknown code, unless another miss already did within the interval."""
+        now = time.monotonic()
+        with self._lock:
+            if self._miss_refreshed_at is not None and now - self._miss_refreshed_at < self.miss_refresh_interval:
+                return False
+            self._miss_refreshed_at = now
+        self.refresh()
+        return True
+
+    def id_of(self, model, code: str) -> int:
+        self._ensure_loaded()
+        table = self._ids.get(model, {})
+        if code not in table:
+            if self._refresh_on_miss():
+                table = self._ids.get(model, {})
+            if code not in table:
+                raise UnknownLookupCode(f"{model.__tablename__}: unknown code {code!r}")
+        return table[code]
+
+    def code_of(self, model, row_id: Optional[int]) -> Optional[str]:
+        if row_id is None:
+            return None
+        self._ensure_loaded()
+        table = self._codes.get(model, {})
+        if row_id not in table:
+            if self._refresh_on_miss():
+                table = self._codes.get(model, {})
+            if row_id not in table:
+                raise UnknownLookupCode(f"{model.__tablename__}: unknown id {row_id!r}")
+        return table[row_id]
+
+    def description_of(self, model, row_id: Optional[int]) -> Optional[str]:
+        """Description of a row (None for tables without one); same refresh rule as code_of."""
+        if self.code_of(model, row_id) is None:
+            return None
+        return self._descriptions.get(model, {}).get(row_id)
+
+    def ids(self, model) -> Dict[str, int]:
+        """Copy of the code -> id map of one table."""
+        self._ensure_loaded()
+        return dict(self._ids.get(model, {}))
+
+    def codes(self, model) -> Dict[int, str]:
+        """Copy of the id -> code map of one table."""
+        self._ensure_loaded()
+        return dict(self._codes.get(model, {}))
+
+
+lookups = LookupRegistry()
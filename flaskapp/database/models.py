@@ -5,7 +5,7 @@ SQLAlchemy models for the tournament management system.
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from sqlalchemy import CheckConstraint, UniqueConstraint, ForeignKeyConstraint
+from sqlalchemy import CheckConstraint, UniqueConstraint, ForeignKeyConstraint, event
 from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -36,6 +36,16 @@ class TournamentStatus(db.Model):
     # Relationships
     tournaments = db.relationship('Tournament', backref='status', lazy=True)
 
+class TournamentFormat(db.Model):
+    __tablename__ = 'tournament_formats'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    code = db.Column(db.String(50), unique=True, nullable=False)
+    description = db.Column(db.Text)
+    
+    # Relationships
+    tournaments = db.relationship('Tournament', backref='format', lazy=True)
+
 class MatchStatus(db.Model):
     __tablename__ = 'match_statuses'
     
@@ -98,7 +108,9 @@ class User(UserMixin, db.Model):
     password = db.Column(db.LargeBinary)  # Compatible with existing auth system
     profile_picture = db.Column(db.String(255))
     is_admin = db.Column(db.Boolean, default=False, index=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Contador desnormalizado de notificaciones sin leer (lo mantienen las rutas de escritura)
+    unread_notification_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
     
     def __init__(self, **kwargs):
@@ -137,7 +149,9 @@ class Organization(db.Model):
     name = db.Column(db.String(100), unique=True, nullable=False, index=True)
     description = db.Column(db.Text)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Contador desnormalizado de organization_members (ver SECCIÓN 5)
+    member_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
     
     # Relationships
@@ -255,8 +269,11 @@ class Tournament(db.Model):
     end_date = db.Column(db.DateTime)
     prizes = db.Column(db.Text)
     status_id = db.Column(db.Integer, db.ForeignKey('tournament_statuses.id'), nullable=False, index=True)
+    format_id = db.Column(db.Integer, db.ForeignKey('tournament_formats.id'))  # NULL = eliminación simple
+    # Contador desnormalizado de teams (ver SECCIÓN 5)
+    team_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_by = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
     
     # Constraints
@@ -283,6 +300,11 @@ class Tournament(db.Model):
         back_populates='tournaments'
     )
     
+    @property
+    def format_code(self):
+        """Código del formato; los torneos sin formato son de eliminación simple."""
+        return self.format.code if self.format else 'SINGLE_ELIMINATION'
+    
     def __repr__(self):
         return f'<Tournament {self.name}>'
 
@@ -314,7 +336,7 @@ class Team(db.Model):
     tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id', ondelete='CASCADE'), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     seed_score = db.Column(db.Integer, default=0)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
     
     # Constraints
@@ -361,6 +383,7 @@ class Match(db.Model):
     tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id', ondelete='CASCADE'), nullable=False)
     level = db.Column(db.Integer, nullable=False)  # 0=final, higher=earlier rounds
     match_number = db.Column(db.Integer, nullable=False)  # Unique position in bracket tree
+    bracket = db.Column(db.String(20), nullable=False, default='MAIN', server_default='MAIN')  # MAIN, WINNERS, LOSERS, GRAND_FINAL
     team_a_id = db.Column(db.Integer, db.ForeignKey('teams.id', ondelete='SET NULL'))
     team_b_id = db.Column(db.Integer, db.ForeignKey('teams.id', ondelete='SET NULL'))
     score_team_a = db.Column(db.Integer)
@@ -369,9 +392,14 @@ class Match(db.Model):
     best_player_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'))
     is_bye = db.Column(db.Boolean, default=False)
     status_id = db.Column(db.Integer, db.ForeignKey('match_statuses.id'), nullable=False, index=True)
-    completed_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime, index=True)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
     recorded_by_referee_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    # Precomputed routing (NULL = single elimination, next match is match_number // 2)
+    next_match_number = db.Column(db.Integer)
+    next_match_slot = db.Column(db.String(1))  # 'A' -> team_a, 'B' -> team_b
+    loser_match_number = db.Column(db.Integer)
+    loser_match_slot = db.Column(db.String(1))
     
     # Constraints
     __table_args__ = (
@@ -393,6 +421,8 @@ class Match(db.Model):
             '(score_team_a IS NOT NULL AND score_team_b IS NOT NULL AND score_team_a <> score_team_b)',
             name='check_scores_consistency'
         ),
+        CheckConstraint("next_match_slot IS NULL OR next_match_slot IN ('A', 'B')", name='check_next_match_slot'),
+        CheckConstraint("loser_match_slot IS NULL OR loser_match_slot IN ('A', 'B')", name='check_loser_match_slot'),
         db.Index('idx_matches_tournament_level', 'tournament_id', 'level'),
         db.Index('idx_matches_level_number', 'level', 'match_number'),
         db.Index('idx_matches_bye', 'tournament_id', 'is_bye'),
@@ -451,4 +481,157 @@ class Notification(db.Model):
     user = db.relationship('User', backref='notifications')
     
     def __repr__(self):
-        return f'<Notification {self.title}>'
\ No newline at end of file
+        return f'<Notification {self.title}>'
+
+
+class UserPerformance(db.Model):
+    """
+    Agregado materializado del historial de cada usuario (partidas, victorias
+    y finales ganadas). Lo mantiene flaskapp.modules.matches.performance al
+    completar partidas y alimenta las estadísticas del perfil; el seed de los
+    equipos sale de user_ratings.
+    """
+    __tablename__ = 'user_performance'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    matches_played = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    wins = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    finals_won = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<UserPerformance user:{self.user_id} wins:{self.wins}>'
+
+class UserRating(db.Model):
+    """
+    Rating Elo de cada usuario por actividad. Lo mantiene
+    flaskapp.modules.matches.ratings; el seed de un equipo es el promedio de
+    los ratings de sus miembros en la actividad del torneo.
+    """
+    __tablename__ = 'user_ratings'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    activity_id = db.Column(db.Integer, db.ForeignKey('activities.id', ondelete='CASCADE'), primary_key=True)
+    rating = db.Column(db.Float, nullable=False)
+    matches_rated = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Constraints
+    __table_args__ = (
+        # Ranking por actividad: top-K y rango de ratings sin ordenar la tabla
+        db.Index('idx_user_ratings_leaderboard', 'activity_id', rating.desc(), 'user_id'),
+    )
+    
+    def __repr__(self):
+        return f'<UserRating user:{self.user_id} activity:{self.activity_id} rating:{self.rating:.0f}>'
+
+
+class UserRatingBucket(db.Model):
+    """
+    Usuarios con rating por tramo (bucket = floor(rating / ratings.BUCKET_WIDTH))
+    en cada actividad. La posición de un usuario en el ranking es la suma de
+    los tramos superiores más los que lo superan dentro de su tramo.
+    """
+    __tablename__ = 'user_rating_buckets'
+    
+    activity_id = db.Column(db.Integer, db.ForeignKey('activities.id', ondelete='CASCADE'), primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True)
+    players = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    def __repr__(self):
+        return f'<UserRatingBucket activity:{self.activity_id} bucket:{self.bucket} players:{self.players}>'
+
+
+class RatingRecompute(db.Model):
+    """
+    Actividades con una corrección de resultado pendiente de recalcular. Las
+    encola flaskapp.modules.matches.ratings.record_results y las procesa el job
+    de ratings (python -m flaskapp.modules.matches.ratings).
+    """
+    __tablename__ = 'rating_recomputes'
+    
+    activity_id = db.Column(db.Integer, db.ForeignKey('activities.id', ondelete='CASCADE'), primary_key=True)
+    requested_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<RatingRecompute activity:{self.activity_id} at:{self.requested_at}>'
+
+
+class DailyRollup(db.Model):
+    """
+    Conteo diario de eventos por métrica (usuarios, organizaciones, torneos y
+    equipos creados; partidas completadas) y organización. organization_id = 0
+    agrupa lo que no pertenece a una organización (usuarios). Lo llena de forma
+    incremental flaskapp.modules.home.rollups.
+    """
+    __tablename__ = 'daily_rollups'
+    
+    metric = db.Column(db.String(30), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    organization_id = db.Column(db.Integer, primary_key=True, default=0, server_default='0')
+    count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    def __repr__(self):
+        return f'<DailyRollup {self.metric} {self.day} org:{self.organization_id} count:{self.count}>'
+
+
+class RollupWatermark(db.Model):
+    """Hasta dónde (inclusive) está contada cada métrica de daily_rollups."""
+    __tablename__ = 'rollup_watermarks'
+    
+    metric = db.Column(db.String(30), primary_key=True)
+    processed_until = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<RollupWatermark {self.metric} until:{self.processed_until}>'
+
+
+class SchemaVersion(db.Model):
+    """Versión del esquema aplicada por flaskapp.database.bootstrap (una sola fila, id = 1)."""
+    __tablename__ = 'schema_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SchemaVersion {self.version} at:{self.applied_at}>'
+
+
+# ##############################
+# SECCIÓN 5: Contadores desnormalizados
+# ##############################
+# Organization.member_count y Tournament.team_count se ajustan en la misma
+# transacción que cada INSERT/DELETE del ORM de la fila hija, con un UPDATE
+# atómico (col = col + delta) que conserva updated_at. Las inserciones masivas
+# (bulk_insert) y los borrados en cascada de la BD no pasan por aquí:
+# seed_base_data.sql reconcilia ambos contadores en cada bootstrap.
+
+def _adjust_counter(connection, model, column: str, row_id: int, delta: int) -> None:
+    table = model.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == row_id)
+        .values({column: table.c[column] + delta, 'updated_at': table.c.updated_at})
+    )
+
+
+@event.listens_for(OrganizationMember, 'after_insert')
+def _member_added(mapper, connection, member):
+    _adjust_counter(connection, Organization, 'member_count', member.organization_id, 1)
+
+
+@event.listens_for(OrganizationMember, 'after_delete')
+def _member_removed(mapper, connection, member):
+    _adjust_counter(connection, Organization, 'member_count', member.organization_id, -1)
+
+
+@event.listens_for(Team, 'after_insert')
+def _team_added(mapper, connection, team):
+    _adjust_counter(connection, Tournament, 'team_count', team.tournament_id, 1)
+
+
+@event.listens_for(Team, 'after_delete')
+def _team_removed(mapper, connection, team):
+    _adjust_counter(connection, Tournament, 'team_count', team.tournament_id, -1)
@@ -0,0 +1,146 @@
+"""
+In-process cache of the user principals Flask-Login loads on every request.
+
+user_loader used to fetch the full users row for each authenticated request.
+The templates and decorators only read a handful of columns (id, name, email,
+profile picture and admin flag), so those are kept as an immutable
+UserPrincipal in a bounded LRU with a TTL:
+
+    principal = principals.get(user_id)   # no query while cached
+
+Entries are evicted when the row changes: ORM updates/deletes of a User
+(profile edits, admin flag) register the id on the session, and the id is
+dropped once that session commits, so the next request reloads it. Other
+processes only see the change when their own entry expires, which bounds
+staleness to the TTL. Hence nothing that must be current is read from here:
+the unread notification counter (kept by database triggers) is read by
+NotificationService, and access checks read the admin flag from the
+authorization context, not from the cached is_admin.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from flask_login import UserMixin
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from flaskapp.database.models import User, db
+
+DEFAULT_MAX_SIZE = 10_000
+DEFAULT_TTL = 60.0
+
+_PENDING_KEY = 'principals_evict'
+
+
+@dataclass(frozen=True, eq=False)
+class UserPrincipal(UserMixin):
+    """Read-only subset of a User, shared between requests."""
+    id: int
+    name: str
+    email: str
+    profile_picture: Optional[str]
+    is_admin: bool
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl: float = DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: 'OrderedDict[int, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._engine = None
+
+    def configure(self, max_size: int, ttl: float) -> None:
+        with self._lock:
+            self.max_size = max_size
+            self.ttl = ttl
+            self._entries.clear()
+
+    def get(self, user_id: int) -> Optional[UserPrincipal]:
+        """Cached principal, or one narrow query on a miss; None if the user does not exist."""
+        self._check_engine()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                principal, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(user_id)
+                    return principal
+                del self._entries[user_id]
+
+        principal = self._load(user_id)
+        if principal is not None and self.max_size > 0 and self.ttl > 0:
+            with self._lock:
+                self._entries[user_id] = (principal, now + self.ttl)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return principal
+
+    def evict(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def evict_on_commit(self, session: Session, user_id: int) -> None:
+        """Drop the entry once `session` commits (and right away, for this process)."""
+        session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+        self.evict(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_engine(self) -> None:
+        # Tests and scripts create several apps/databases in one process
+        if self._engine is not db.engine:
+            with self._lock:
+                self._entries.clear()
+                self._engine = db.engine
+
+    @staticmethod
+    def _load(user_id: int) -> Optional[UserPrincipal]:
+        row = db.session.execute(
+            select(
+                User.id, User.name, User.email, User.profile_picture, User.is_admin
+            ).where(User.id == user_id)
+        ).first()
+        if row is None:
+            return None
+        return UserPrincipal(
+            id=row.id,
+            name=row.name,
+            email=row.email,
+            profile_picture=row.profile_picture,
+            is_admin=bool(row.is_admin)
+        )
+
+
+principals = PrincipalCache()
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    session = inspect(target).session
+    if session is not None:
+        principals.evict_on_commit(session, target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _evict_committed(session):
+    # A request may have cached the old row between the flush and the commit
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        principals.evict(user_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
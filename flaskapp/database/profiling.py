@@ -0,0 +1,235 @@
+"""
+Opt-in SQL profiling per request (SQL_PROFILING=1).
+
+Engine events time every statement executed inside a request; Flask hooks
+open the profile in before_request and close it in after_request:
+
+    X-SQL-Profile: queries=14; db_ms=8.31; n_plus_one=1
+    Server-Timing: db;dur=8.31;desc="14 queries"
+
+Statements are grouped by fingerprint (literals, bind parameters and IN
+lists collapsed), so the same query with different ids counts as a repeat.
+A SELECT fingerprint that runs at least `n_plus_one_threshold` times in one
+request is flagged as a likely N+1 loop, together with the first frame outside
+the libraries (the application code) that issued it when it crossed the
+threshold.
+
+Finished requests go to a bounded in-memory window; report() summarizes it
+(recent requests, per-endpoint averages, top repeated statements) for the
+admin endpoint /admin/sql-profile. When profiling is off nothing is hooked.
+"""
+
+import os
+import re
+import sys
+import sysconfig
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+DEFAULT_REPORT_SIZE = 500
+HEADER = 'X-SQL-Profile'
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Standard library and site-packages: SQLAlchemy, Flask and friends are never the "caller"
+_LIBRARY_DIRS = tuple({os.path.abspath(path) for key, path in sysconfig.get_paths().items()
+                       if key in ('stdlib', 'platstdlib', 'purelib', 'platlib')})
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'%\(\w+\)s|(?<!:):\w+|\$\d+'), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?...)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def fingerprint(statement: str) -> str:
+    """Statement text with literals and parameters replaced, to group repeats."""
+    for pattern, replacement in _LITERALS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def _caller() -> Optional[str]:
+    """First frame outside this module and the installed libraries, as 'path:line in function'."""
+    this_file = os.path.abspath(__file__)
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.startswith('<'):
+            filename = os.path.abspath(filename)
+            if filename != this_file and not filename.startswith(_LIBRARY_DIRS):
+                if filename.startswith(_PROJECT_DIR + os.sep):
+                    filename = os.path.relpath(filename, _PROJECT_DIR)
+                return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+@dataclass
+class StatementStats:
+    fingerprint: str
+    count: int = 0
+    total_ms: float = 0.0
+    location: Optional[str] = None  # Set when the statement crosses the N+1 threshold
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    endpoint: Optional[str]
+    started_at: datetime
+    status: Optional[int] = None
+    queries: int = 0
+    db_ms: float = 0.0
+    statements: Dict[str, StatementStats] = field(default_factory=dict)
+    n_plus_one: List[StatementStats] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            'method': self.method,
+            'path': self.path,
+            'endpoint': self.endpoint,
+            'status': self.status,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'queries': self.queries,
+            'db_ms': round(self.db_ms, 2),
+            'n_plus_one': [asdict(stats) for stats in self.n_plus_one],
+        }
+
+
+class SQLProfiler:
+    def __init__(self, n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+                 report_size: int = DEFAULT_REPORT_SIZE):
+        self.enabled = False
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._window: deque = deque(maxlen=report_size)
+        self._lock = threading.Lock()
+        self._listening = False
+
+    def init_app(self, app) -> None:
+        """Hooks the app when SQL_PROFILING is on; otherwise leaves it untouched."""
+        if not app.config.get('SQL_PROFILING'):
+            return
+        self.enabled = True
+        self.n_plus_one_threshold = app.config.get('SQL_PROFILING_N_PLUS_ONE', DEFAULT_N_PLUS_ONE_THRESHOLD)
+        with self._lock:
+            self._window = deque(self._window, maxlen=app.config.get('SQL_PROFILING_REPORT_SIZE', DEFAULT_REPORT_SIZE))
+            if not self._listening:
+                event.listen(Engine, 'before_cursor_execute', self._before_execute)
+                event.listen(Engine, 'after_cursor_execute', self._after_execute)
+                self._listening = True
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._window.clear()
+
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _start() -> None:
+        g._sql_profile = RequestProfile(
+            method=request.method, path=request.path, endpoint=request.endpoint, started_at=datetime.utcnow()
+        )
+
+    def _finish(self, response):
+        profile = g.pop('_sql_profile', None)
+        if profile is None:
+            return response
+        profile.status = response.status_code
+        response.headers[HEADER] = (
+            f"queries={profile.queries}; db_ms={profile.db_ms:.2f}; n_plus_one={len(profile.n_plus_one)}"
+        )
+        response.headers.add('Server-Timing', f'db;dur={profile.db_ms:.2f};desc="{profile.queries} queries"')
+        profile.statements = {}  # The window keeps only the summary and the flagged statements
+        with self._lock:
+            self._window.append(profile)
+        return response
+
+    @staticmethod
+    def _current() -> Optional[RequestProfile]:
+        return g.get('_sql_profile') if has_request_context() else None
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current() is not None:
+            conn.info.setdefault('_sql_profile_started', []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = self._current()
+        started = conn.info.get('_sql_profile_started')
+        if profile is None or not started:
+            return
+        elapsed = (time.perf_counter() - started.pop()) * 1000
+        profile.queries += 1
+        profile.db_ms += elapsed
+
+        key = fingerprint(statement)
+        stats = profile.statements.get(key)
+        if stats is None:
+            stats = profile.statements[key] = StatementStats(key)
+        stats.count += 1
+        stats.total_ms += elapsed
+        if stats.count == self.n_plus_one_threshold and key.upper().startswith('SELECT'):
+            stats.location = _caller()
+            profile.n_plus_one.append(stats)
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    def report(self, recent: int = 50) -> dict:
+        """Summary of the rolling window: last requests, endpoints by query count and top N+1 statements."""
+        with self._lock:
+            profiles = list(self._window)
+
+        endpoints: Dict[str, dict] = {}
+        repeated: Dict[str, dict] = {}
+        for profile in profiles:
+            key = f"{profile.method} {profile.endpoint or profile.path}"
+            stats = endpoints.setdefault(key, {'endpoint': key, 'requests': 0, 'queries': 0, 'max_queries': 0,
+                                               'db_ms': 0.0, 'n_plus_one_requests': 0})
+            stats['requests'] += 1
+            stats['queries'] += profile.queries
+            stats['max_queries'] = max(stats['max_queries'], profile.queries)
+            stats['db_ms'] += profile.db_ms
+            stats['n_plus_one_requests'] += bool(profile.n_plus_one)
+            for statement in profile.n_plus_one:
+                entry = repeated.setdefault(statement.fingerprint, {
+                    'fingerprint': statement.fingerprint, 'location': statement.location,
+                    'requests': 0, 'executions': 0, 'total_ms': 0.0
+                })
+                entry['requests'] += 1
+                entry['executions'] += statement.count
+                entry['total_ms'] += statement.total_ms
+
+        for stats in endpoints.values():
+            stats['avg_queries'] = round(stats.pop('queries') / stats['requests'], 1)
+            stats['avg_db_ms'] = round(stats.pop('db_ms') / stats['requests'], 2)
+        for entry in repeated.values():
+            entry['total_ms'] = round(entry['total_ms'], 2)
+
+        return {
+            'enabled': self.enabled,
+            'window': len(profiles),
+            'n_plus_one_threshold': self.n_plus_one_threshold,
+            'endpoints': sorted(endpoints.values(), key=lambda s: s['avg_queries'], reverse=True),
+            'n_plus_one': sorted(repeated.values(), key=lambda e: e['executions'], reverse=True),
+            'recent': [profile.summary() for profile in profiles[-recent:]][::-1],
+        }
+
+
+sql_profiler = SQLProfiler()
@@ -4,6 +4,102 @@
 -- FECHA: 2025-06-09
 -- =============================================
 
+-- ##############################
+-- SECCIÓN 0: Columnas nuevas en bases existentes
+-- (db.create_all() solo crea tablas faltantes, no agrega columnas)
+-- ##############################
+
+INSERT INTO tournament_formats (code, description) VALUES
+    ('SINGLE_ELIMINATION', 'Eliminación simple'),
+    ('DOUBLE_ELIMINATION', 'Doble eliminación (bracket de ganadores y de perdedores)'),
+    ('SWISS', 'Sistema suizo (rondas entre equipos con igual puntaje)'),
+    ('ROUND_ROBIN', 'Liga (todos contra todos)'),
+    ('GROUP_STAGE', 'Fase de grupos y eliminación directa')
+ON CONFLICT (code) DO NOTHING;
+
+ALTER TABLE tournaments ADD COLUMN IF NOT EXISTS format_id INTEGER REFERENCES tournament_formats(id);
+
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS bracket VARCHAR(20) NOT NULL DEFAULT 'MAIN';
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS next_match_number INTEGER;
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS next_match_slot VARCHAR(1);
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS loser_match_number INTEGER;
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS loser_match_slot VARCHAR(1);
+
+-- Contador desnormalizado de notificaciones sin leer. Se recalcula en el bootstrap
+-- para corregir cualquier desfase; solo se tocan las filas que difieren.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS unread_notification_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE users u
+SET unread_notification_count = c.unread
+FROM (
+    SELECT u2.id, COUNT(n.id) AS unread
+    FROM users u2
+    LEFT JOIN notifications n ON n.user_id = u2.id AND NOT n.is_read
+    GROUP BY u2.id
+) c
+WHERE u.id = c.id
+  AND u.unread_notification_count <> c.unread;
+
+-- Contadores desnormalizados de miembros y equipos (los mantiene el ORM, ver
+-- models.py SECCIÓN 5). Se reconcilian en el bootstrap, solo donde difieren, para
+-- cubrir inserciones masivas y borrados en cascada.
+ALTER TABLE organizations ADD COLUMN IF NOT EXISTS member_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE tournaments ADD COLUMN IF NOT EXISTS team_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE organizations o
+SET member_count = c.members
+FROM (
+    SELECT o2.id, COUNT(om.id) AS members
+    FROM organizations o2
+    LEFT JOIN organization_members om ON om.organization_id = o2.id
+    GROUP BY o2.id
+) c
+WHERE o.id = c.id
+  AND o.member_count <> c.members;
+
+UPDATE tournaments t
+SET team_count = c.teams
+FROM (
+    SELECT t2.id, COUNT(te.id) AS teams
+    FROM tournaments t2
+    LEFT JOIN teams te ON te.tournament_id = t2.id
+    GROUP BY t2.id
+) c
+WHERE t.id = c.id
+  AND t.team_count <> c.teams;
+
+-- Ranking por actividad: el índice compuesto reemplaza al de activity_id
+CREATE INDEX IF NOT EXISTS idx_user_ratings_leaderboard ON user_ratings(activity_id, rating DESC, user_id);
+DROP INDEX IF EXISTS idx_user_ratings_activity;
+
+-- Ventanas incrementales de daily_rollups: created_at / completed_at indexados
+CREATE INDEX IF NOT EXISTS ix_users_created_at ON users(created_at);
+CREATE INDEX IF NOT EXISTS ix_organizations_created_at ON organizations(created_at);
+CREATE INDEX IF NOT EXISTS ix_tournaments_created_at ON tournaments(created_at);
+CREATE INDEX IF NOT EXISTS ix_teams_created_at ON teams(created_at);
+CREATE INDEX IF NOT EXISTS ix_matches_completed_at ON matches(completed_at);
+
+-- Búsqueda de usuarios por subcadena (flaskapp/database/usersearch.py): índices
+-- GIN de trigramas para ILIKE '%q%' y orden por nombre para las páginas. Si el
+-- usuario de la base no puede crear la extensión, la búsqueda sigue funcionando
+-- sin los índices de trigramas.
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+EXCEPTION WHEN insufficient_privilege THEN
+    RAISE NOTICE 'pg_trgm no disponible: búsqueda de usuarios sin índices de trigramas';
+END $$;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        CREATE INDEX IF NOT EXISTS idx_users_name_trgm ON users USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_users_email_trgm ON users USING gin (email gin_trgm_ops);
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_users_name ON users(name, id);
+
 -- ##############################
 -- SECCIÓN 1: Funciones
 -- ##############################
@@ -52,9 +148,11 @@ DECLARE
     next_match_match_number INTEGER;
     next_match_level INTEGER;
 BEGIN
-    IF NEW.is_bye AND NEW.winner_id IS NOT NULL AND NEW.level > 0 THEN
-        -- Calcular siguiente match
-        SELECT CEILING(NEW.match_number / 2.0)::INTEGER INTO next_match_match_number;
+    -- Solo los brackets con numeración de heap propagan por match_number / 2
+    IF NEW.is_bye AND NEW.winner_id IS NOT NULL AND NEW.level > 0
+       AND NEW.bracket IN ('MAIN', 'WINNERS') THEN
+        -- Calcular siguiente match (división entera, igual que MatchService: match_number // 2)
+        next_match_match_number := NEW.match_number / 2;
         next_match_level := NEW.level - 1;
 
         -- Propagación inmediata
@@ -108,6 +206,9 @@ BEGIN
     -- Insertar la notificación
     INSERT INTO notifications (user_id, title, message, type_id, related_entity_type_id, related_entity_id, created_at)
     VALUES (user_id, title, message, type_id, related_entity_type_id, related_entity_id, NOW());
+
+    -- Mantener el contador de no leídas del usuario
+    UPDATE users SET unread_notification_count = unread_notification_count + 1 WHERE id = user_id;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -164,6 +265,18 @@ BEGIN
         JOIN tournaments t ON te.tournament_id = t.id
         JOIN team_members tm ON te.id = tm.team_id
         WHERE te.tournament_id = NEW.id;
+
+        -- Mantener el contador de no leídas de cada participante
+        UPDATE users u
+        SET unread_notification_count = u.unread_notification_count + n.added
+        FROM (
+            SELECT tm.user_id, COUNT(*) AS added
+            FROM teams te
+            JOIN team_members tm ON te.id = tm.team_id
+            WHERE te.tournament_id = NEW.id
+            GROUP BY tm.user_id
+        ) n
+        WHERE u.id = n.user_id;
     END IF;
 
     RETURN NEW;
@@ -186,12 +299,14 @@ DROP TRIGGER IF EXISTS set_timestamp_matches ON matches;
 DROP TRIGGER IF EXISTS set_timestamp_team_invitations ON team_invitations;
 
 -- Crear triggers para timestamps
+-- Solo cambios de perfil: el contador de notificaciones no cuenta como actualización
 CREATE TRIGGER set_timestamp_users
-    BEFORE UPDATE ON users
+    BEFORE UPDATE OF name, email, password, profile_picture, is_admin ON users
     FOR EACH ROW EXECUTE FUNCTION trigger_set_timestamp();
 
+-- Los contadores desnormalizados (member_count, team_count) tampoco cuentan
 CREATE TRIGGER set_timestamp_organizations
-    BEFORE UPDATE ON organizations
+    BEFORE UPDATE OF name, description, created_by ON organizations
     FOR EACH ROW EXECUTE FUNCTION trigger_set_timestamp();
 
 CREATE TRIGGER set_timestamp_activities
@@ -203,7 +318,8 @@ CREATE TRIGGER set_timestamp_events
     FOR EACH ROW EXECUTE FUNCTION trigger_set_timestamp();
 
 CREATE TRIGGER set_timestamp_tournaments
-    BEFORE UPDATE ON tournaments
+    BEFORE UPDATE OF organization_id, event_id, activity_id, name, description, max_teams,
+                     start_date, end_date, prizes, status_id, format_id, created_by ON tournaments
     FOR EACH ROW EXECUTE FUNCTION trigger_set_timestamp();
 
 CREATE TRIGGER set_timestamp_teams
@@ -10,7 +10,7 @@ from flaskapp import db
 from flaskapp.database.models import (
     User, Organization, OrganizationMember, Activity, ActivityCategory,
     Event, Tournament, Team, TeamMember, TournamentReferee, Match,
-    EventStatus, TournamentStatus, MatchStatus, TeamInvitationStatus,
+    EventStatus, TournamentStatus, TournamentFormat, MatchStatus, TeamInvitationStatus,
     NotificationType, RelatedEntityType
 )
 
@@ -62,6 +62,13 @@ def seed_database(app):
             print("Generando eventos y torneos...")
             create_events_and_tournaments(organizations, activities, all_memberships, specific_memberships)
 
+            # Las partidas del seeding se insertan directo: se calcula el rendimiento de una vez
+            print("Calculando el rendimiento histórico y los ratings de los usuarios...")
+            from flaskapp.modules.matches import performance, ratings
+            db.session.flush()
+            performance.rebuild()
+            ratings.recompute()
+
             # 4. Confirmar todos los cambios en la base de datos
             db.session.commit()
             print("\n¡Seeding completado exitosamente! ✅")
@@ -75,6 +82,14 @@ def seed_database(app):
             print(f"\nOcurrió un error inesperado durante el seeding: {e}")
             print("Se ha revertido la transacción.")
 
+TOURNAMENT_FORMATS = [
+    {'code': 'SINGLE_ELIMINATION', 'description': 'Eliminación simple'},
+    {'code': 'DOUBLE_ELIMINATION', 'description': 'Doble eliminación (bracket de ganadores y de perdedores)'},
+    {'code': 'SWISS', 'description': 'Sistema suizo (rondas entre equipos con igual puntaje)'},
+    {'code': 'ROUND_ROBIN', 'description': 'Liga (todos contra todos)'},
+    {'code': 'GROUP_STAGE', 'description': 'Fase de grupos y eliminación directa'},
+]
+
 def seed_master_data():
     """Crea los registros en las tablas de estado y tipo."""
     statuses_data = {
@@ -117,6 +132,12 @@ def seed_master_data():
         for data in data_list:
             instance = model(**data)
             db.session.add(instance)
+
+    # Los formatos también los inserta seed_base_data.sql (bases existentes)
+    existing_formats = {code for (code,) in db.session.query(TournamentFormat.code)}
+    for data in TOURNAMENT_FORMATS:
+        if data['code'] not in existing_formats:
+            db.session.add(TournamentFormat(**data))
     
     db.session.flush()
 
@@ -0,0 +1,333 @@
+"""
+Synthetic data generator for load testing.
+
+    python -m flaskapp.database.synthetic                  # 1M users, 10k organizations, 100k tournaments
+    python -m flaskapp.database.synthetic --users 100000 --organizations 1000 --tournaments 10000
+    python -m flaskapp.database.synthetic --stream --batch-rows 50000
+
+Rows are plain dicts written with bulk_insert (COPY on PostgreSQL,
+executemany elsewhere), table by table in foreign-key order (TABLE_ORDER).
+Ids of the parent tables (users, organizations, tournaments, teams) are
+assigned here, after the current maximum, so nothing is read back. Every user
+gets the same password hash of PASSWORD, computed once.
+
+Each organization owns a contiguous block of users (the first ones are its
+organizers) and its tournaments draw teams, players and a referee from that
+block. Every organization and tournament has its own Random seeded from
+(seed, kind, number), so a seed always produces the same rows in both modes:
+
+- default: all rows are kept in memory and inserted table by table at the end;
+- stream: buffered rows are written (still in table order) every
+  `batch_rows` rows, so memory is bounded by the batch, not the dataset.
+
+Tournaments are completed single-elimination brackets (Bracket, byes
+included) with scores, winners, best player and referee. user_performance,
+user_ratings and daily_rollups are rebuilt at the end unless derived=False.
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select, text
+
+from flaskapp.database.bulk import bulk_insert
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import (
+    Activity, Match, MatchStatus, Organization, OrganizationMember, Team, TeamMember, Tournament,
+    TournamentReferee, TournamentStatus, User, db
+)
+from flaskapp.modules.authentication.hasher import password_hasher
+from flaskapp.modules.tournaments.bracket import Bracket
+
+PASSWORD = 'password1'
+BASE_DATE = datetime(2024, 1, 1)  # Fixed so a seed always yields the same timestamps
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+ORGANIZERS_PER_ORGANIZATION = 2
+
+DEFAULT_ACTIVITIES = [('Ajedrez', 1), ('EA FC 25', 1), ('Valorant', 5), ('League of Legends', 5)]
+FIRST_NAMES = ['Ana', 'Martín', 'Lucía', 'Pedro', 'Sofía', 'Diego', 'Valentina', 'Joaquín', 'Camila', 'Tomás',
+               'Isidora', 'Benjamín', 'Florencia', 'Matías', 'Antonia', 'Vicente', 'Josefa', 'Agustín']
+LAST_NAMES = ['González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva', 'Martínez', 'Sepúlveda',
+              'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández', 'Torres', 'Araya', 'Flores']
+
+# Foreign-key order in which buffered rows are written
+TABLE_ORDER = (User, Organization, OrganizationMember, Tournament, TournamentReferee, Team, TeamMember, Match)
+# Tables whose ids are assigned by the generator
+ID_TABLES = (User, Organization, Tournament, Team)
+
+
+@dataclass
+class SyntheticConfig:
+    users: int = 1_000_000
+    organizations: int = 10_000
+    tournaments: int = 100_000
+    teams_per_tournament: int = 8
+    seed: int = 42
+    stream: bool = False
+    batch_rows: int = 50_000
+    derived: bool = True
+
+
+class TableWriter:
+    """Buffers rows per table; flush() writes them in TABLE_ORDER."""
+
+    def __init__(self, limit: Optional[int], session):
+        self.limit = limit
+        self.session = session
+        self.counts: Dict[str, int] = {model.__tablename__: 0 for model in TABLE_ORDER}
+        self._rows: Dict[type, List[dict]] = {model: [] for model in TABLE_ORDER}
+        self._buffered = 0
+
+    def add(self, model, row: dict) -> None:
+        self._rows[model].append(row)
+        self._buffered += 1
+        if self.limit is not None and self._buffered >= self.limit:
+            self.flush()
+
+    def flush(self) -> None:
+        for model in TABLE_ORDER:
+            rows = self._rows[model]
+            if rows:
+                self.counts[model.__tablename__] += bulk_insert(model, rows, session=self.session)
+                self._rows[model] = []
+        self._buffered = 0
+
+
+class _Ids:
+    """Next id of each generated parent table, continuing after the stored maximum."""
+
+    def __init__(self, session):
+        self._next = {
+            model: (session.execute(select(func.max(model.id))).scalar() or 0) + 1 for model in ID_TABLES
+        }
+
+    def take(self, model) -> int:
+        value = self._next[model]
+        self._next[model] = value + 1
+        return value
+
+
+def _moment(rng: random.Random) -> datetime:
+    return BASE_DATE + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+
+def _activities(session) -> List[Activity]:
+    activities = session.execute(select(Activity).order_by(Activity.id)).scalars().all()
+    if not activities:
+        activities = [Activity(name=name, min_players_per_team=players) for name, players in DEFAULT_ACTIVITIES]
+        session.add_all(activities)
+        session.flush()
+    return activities
+
+
+def _play_bracket(bracket, rng: random.Random) -> None:
+    """Picks every winner from the first round to the final, advancing it to the parent match."""
+    for level in range(bracket.depth - 1, -1, -1):
+        for match_number in range(1 << level, 2 << level):
+            if not bracket.is_bye[match_number]:
+                team_a, team_b = bracket.team_a[match_number], bracket.team_b[match_number]
+                bracket.winner[match_number] = team_a if rng.random() < 0.5 else team_b
+            if match_number > 1:
+                column = bracket.team_b if match_number & 1 else bracket.team_a
+                column[match_number >> 1] = bracket.winner[match_number]
+
+
+class _Generator:
+    def __init__(self, config: SyntheticConfig, writer: TableWriter, session):
+        self.config = config
+        self.writer = writer
+        self.ids = _Ids(session)
+        self.activities = [(a.id, a.min_players_per_team) for a in _activities(session)]
+        self.password = password_hasher.hash(PASSWORD)
+        self.tournament_completed = lookups.id_of(TournamentStatus, 'COMPLETED')
+        self.match_completed = lookups.id_of(MatchStatus, 'COMPLETED')
+
+    def run(self) -> None:
+        config = self.config
+        for number in range(config.organizations):
+            first_user = number * config.users // config.organizations
+            last_user = (number + 1) * config.users // config.organizations
+            first_tournament = number * config.tournaments // config.organizations
+            last_tournament = (number + 1) * config.tournaments // config.organizations
+            self.organization(number, last_user - first_user, range(first_tournament, last_tournament))
+
+    def organization(self, number: int, user_count: int, tournaments: range) -> None:
+        rng = random.Random(f'{self.config.seed}:organization:{number}')
+        add = self.writer.add
+
+        user_ids = []
+        for _ in range(user_count):
+            user_id = self.ids.take(User)
+            user_ids.append(user_id)
+            add(User, {
+                'id': user_id,
+                'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                'email': f'user{user_id}@synthetic.test',
+                'password': self.password,
+                'is_admin': False,
+                'unread_notification_count': 0,
+                'created_at': _moment(rng)
+            })
+        if not user_ids:
+            return
+
+        organizers = user_ids[:ORGANIZERS_PER_ORGANIZATION]
+        organization_id = self.ids.take(Organization)
+        created_at = _moment(rng)
+        add(Organization, {
+            'id': organization_id,
+            'name': f'Organización {organization_id}',
+            'created_by': organizers[0],
+            'member_count': len(user_ids),
+            'created_at': created_at
+        })
+        for user_id in user_ids:
+            add(OrganizationMember, {
+                'organization_id': organization_id,
+                'user_id': user_id,
+                'is_organizer': user_id in organizers,
+                'joined_at': created_at
+            })
+
+        players = user_ids[len(organizers):]
+        for tournament_number in tournaments:
+            self.tournament(tournament_number, organization_id, organizers, players)
+
+    def tournament(self, number: int, organization_id: int, organizers: List[int], players: List[int]) -> None:
+        rng = random.Random(f'{self.config.seed}:tournament:{number}')
+        add = self.writer.add
+        activity_id, team_size = rng.choice(self.activities)
+        team_count = min(self.config.teams_per_tournament, (len(players) - 1) // team_size)
+        if team_count < 2:
+            return
+
+        # Referee first, then disjoint teams from the remaining players
+        chosen = rng.sample(players, 1 + team_count * team_size)
+        referee_id = chosen[0]
+        organizer_id = rng.choice(organizers)
+        start = _moment(rng)
+        end = start + timedelta(days=rng.randint(1, 3))
+
+        tournament_id = self.ids.take(Tournament)
+        add(Tournament, {
+            'id': tournament_id,
+            'organization_id': organization_id,
+            'activity_id': activity_id,
+            'name': f'Torneo {tournament_id}',
+            'max_teams': team_count,
+            'start_date': start,
+            'end_date': end,
+            'status_id': self.tournament_completed,
+            'team_count': team_count,
+            'created_by': organizer_id,
+            'created_at': start - timedelta(days=14)
+        })
+        add(TournamentReferee, {
+            'tournament_id': tournament_id, 'user_id': referee_id, 'assigned_by': organizer_id,
+            'assigned_at': start - timedelta(days=7)
+        })
+
+        teams = []  # (id, seed_score, members)
+        for index in range(team_count):
+            team_id = self.ids.take(Team)
+            members = chosen[1 + index * team_size:1 + (index + 1) * team_size]
+            seed_score = rng.randrange(100)
+            teams.append((team_id, seed_score, members))
+            add(Team, {
+                'id': team_id, 'tournament_id': tournament_id, 'name': f'Equipo {index + 1}',
+                'seed_score': seed_score, 'created_at': start - timedelta(days=10)
+            })
+            for position, user_id in enumerate(members):
+                add(TeamMember, {
+                    'team_id': team_id, 'user_id': user_id, 'is_leader': position == 0,
+                    'joined_at': start - timedelta(days=10)
+                })
+
+        members_of = {team_id: members for team_id, _, members in teams}
+        seeded = sorted(teams, key=lambda team: team[1], reverse=True)
+        bracket = Bracket.from_seeded_ids([team_id for team_id, _, _ in seeded])
+        _play_bracket(bracket, rng)
+
+        for row in bracket.iter_rows(self.match_completed, self.match_completed, tournament_id):
+            completed_at = start + (end - start) * (bracket.depth - row['level']) / (bracket.depth + 1)
+            row.update(bracket='MAIN', score_team_a=None, score_team_b=None, best_player_id=None,
+                       recorded_by_referee_id=None, completed_at=completed_at)
+            if not row['is_bye']:
+                winner_score = rng.randint(1, 5)
+                loser_score = rng.randrange(winner_score)
+                a_won = row['winner_id'] == row['team_a_id']
+                row.update(
+                    score_team_a=winner_score if a_won else loser_score,
+                    score_team_b=loser_score if a_won else winner_score,
+                    best_player_id=rng.choice(members_of[row['winner_id']]),
+                    recorded_by_referee_id=referee_id
+                )
+            add(Match, row)
+
+
+def _reset_sequences(session) -> None:
+    """Explicit ids bypass the PostgreSQL sequences; move them past the new rows."""
+    if session.get_bind().dialect.name != 'postgresql':
+        return
+    for model in ID_TABLES:
+        table = model.__tablename__
+        session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def generate(config: SyntheticConfig, session=None) -> Dict[str, int]:
+    """Write the synthetic dataset and commit; returns the rows written per table."""
+    session = session or db.session
+    writer = TableWriter(config.batch_rows if config.stream else None, session)
+    _Generator(config, writer, session).run()
+    writer.flush()
+    _reset_sequences(session)
+    session.commit()
+
+    if config.derived:
+        from flaskapp.modules.home import rollups
+        from flaskapp.modules.matches import performance, ratings
+        performance.rebuild(session)
+        ratings.recompute(session=session)
+        rollups.rebuild(session=session)
+        session.commit()
+    return writer.counts
+
+
+def main(argv=None) -> None:
+    defaults = SyntheticConfig()
+    parser = argparse.ArgumentParser(description='Fill the database with synthetic data for load testing.')
+    parser.add_argument('--users', type=int, default=defaults.users)
+    parser.add_argument('--organizations', type=int, default=defaults.organizations)
+    parser.add_argument('--tournaments', type=int, default=defaults.tournaments)
+    parser.add_argument('--teams', type=int, default=defaults.teams_per_tournament, help='teams per tournament')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--stream', action='store_true', help='write every --batch-rows rows instead of at the end')
+    parser.add_argument('--batch-rows', type=int, default=defaults.batch_rows)
+    parser.add_argument('--no-derived', action='store_true', help='skip user_performance, ratings and rollups')
+    args = parser.parse_args(argv)
+    config = SyntheticConfig(
+        users=args.users, organizations=args.organizations, tournaments=args.tournaments,
+        teams_per_tournament=args.teams, seed=args.seed, stream=args.stream, batch_rows=args.batch_rows,
+        derived=not args.no_derived
+    )
+
+    from flaskapp import create_app
+    from flaskapp.database.bootstrap import ensure_bootstrapped
+    app = create_app(bootstrap_only=True)
+    with app.app_context():
+        ensure_bootstrapped(app, seed=False)
+        began = time.perf_counter()
+        counts = generate(config)
+        for table, count in counts.items():
+            print(f"{table:>22}: {count:>10,}")
+        print(f"Generated in {time.perf_counter() - began:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Portable `date_trunc` for time-bucketed aggregates.
+
+    month = date_trunc('month', User.created_at)
+    select(month, func.count()).group_by(month)
+
+PostgreSQL gets its native date_trunc (index- and planner-friendly). SQLite,
+used in development and tests, gets the equivalent strftime. Either way the
+result is typed as DateTime, so rows come back as datetime objects truncated
+to the start of the unit.
+"""
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+SQLITE_FORMATS = {
+    'day': '%Y-%m-%d 00:00:00',
+    'month': '%Y-%m-01 00:00:00',
+    'year': '%Y-01-01 00:00:00',
+}
+
+
+class date_trunc(FunctionElement):
+    type = DateTime()
+    inherit_cache = False  # The unit is not part of the cache key
+
+    def __init__(self, unit: str, column):
+        if unit not in SQLITE_FORMATS:
+            raise ValueError(f"Unsupported date_trunc unit: {unit!r}")
+        self.unit = unit
+        super().__init__(column)
+
+
+@compiles(date_trunc)
+def _date_trunc_default(element, compiler, **kw):
+    return f"date_trunc('{element.unit}', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(date_trunc, 'sqlite')
+def _date_trunc_sqlite(element, compiler, **kw):
+    return f"strftime('{SQLITE_FORMATS[element.unit]}', {compiler.process(element.clauses, **kw)})"
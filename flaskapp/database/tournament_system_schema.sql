@@ -21,6 +21,13 @@ CREATE TABLE tournament_statuses (
     description TEXT
 );
 
+-- Formatos de torneo
+CREATE TABLE tournament_formats (
+    id SERIAL PRIMARY KEY,
+    code VARCHAR(50) UNIQUE NOT NULL,
+    description TEXT
+);
+
 -- Estados de partidos
 CREATE TABLE match_statuses (
     id SERIAL PRIMARY KEY,
@@ -67,6 +74,7 @@ CREATE TABLE users (
     password_hash VARCHAR(255) NOT NULL,
     profile_picture VARCHAR(255),
     is_admin BOOLEAN DEFAULT FALSE,
+    unread_notification_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP
 );
@@ -81,6 +89,7 @@ CREATE TABLE organizations (
     name VARCHAR(100) UNIQUE NOT NULL,
     description TEXT,
     created_by INTEGER REFERENCES users(id) NOT NULL,
+    member_count INTEGER NOT NULL DEFAULT 0, -- Desnormalizado: filas en organization_members
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP
 );
@@ -145,6 +154,8 @@ CREATE TABLE tournaments (
     end_date TIMESTAMP,
     prizes TEXT,
     status_id INTEGER REFERENCES tournament_statuses(id) NOT NULL,
+    format_id INTEGER REFERENCES tournament_formats(id), -- NULL = eliminación simple
+    team_count INTEGER NOT NULL DEFAULT 0, -- Desnormalizado: filas en teams
     created_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP,
@@ -195,6 +206,7 @@ CREATE TABLE matches (
     tournament_id INTEGER REFERENCES tournaments(id) ON DELETE CASCADE NOT NULL,
     level INTEGER NOT NULL, -- Nivel/Ronda en el bracket (ej. 0=final)
     match_number INTEGER NOT NULL, -- Posición única en el árbol del bracket
+    bracket VARCHAR(20) NOT NULL DEFAULT 'MAIN', -- MAIN, WINNERS, LOSERS, GRAND_FINAL
     team_a_id INTEGER REFERENCES teams(id) ON DELETE SET NULL,
     team_b_id INTEGER REFERENCES teams(id) ON DELETE SET NULL,
     score_team_a INTEGER,
@@ -206,6 +218,10 @@ CREATE TABLE matches (
     completed_at TIMESTAMP,
     updated_at TIMESTAMP,
     recorded_by_referee_id INTEGER REFERENCES users(id),
+    next_match_number INTEGER, -- Ruta precalculada del ganador (NULL = match_number / 2)
+    next_match_slot CHAR(1) CHECK (next_match_slot IN ('A', 'B')),
+    loser_match_number INTEGER, -- Ruta precalculada del perdedor (doble eliminación)
+    loser_match_slot CHAR(1) CHECK (loser_match_slot IN ('A', 'B')),
     UNIQUE(tournament_id, match_number),
     CONSTRAINT check_winner_is_participant
         CHECK (winner_id IS NULL OR winner_id = team_a_id OR winner_id = team_b_id),
@@ -245,6 +261,60 @@ CREATE TABLE notifications (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Rendimiento histórico por usuario (agregado que se mantiene al completar partidas)
+CREATE TABLE user_performance (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    matches_played INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    finals_won INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Rating Elo por usuario y actividad (se usa como seed de los equipos)
+CREATE TABLE user_ratings (
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    activity_id INTEGER REFERENCES activities(id) ON DELETE CASCADE,
+    rating DOUBLE PRECISION NOT NULL,
+    matches_rated INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, activity_id)
+);
+
+CREATE TABLE user_rating_buckets (
+    activity_id INTEGER REFERENCES activities(id) ON DELETE CASCADE,
+    bucket INTEGER,
+    players INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (activity_id, bucket)
+);
+
+-- Actividades con correcciones pendientes de recalcular (job de ratings)
+CREATE TABLE rating_recomputes (
+    activity_id INTEGER PRIMARY KEY REFERENCES activities(id) ON DELETE CASCADE,
+    requested_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Conteos diarios para las gráficas de crecimiento (organization_id = 0: sin organización)
+CREATE TABLE daily_rollups (
+    metric VARCHAR(30),
+    day DATE,
+    organization_id INTEGER DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (metric, day, organization_id)
+);
+
+CREATE TABLE rollup_watermarks (
+    metric VARCHAR(30) PRIMARY KEY,
+    processed_until TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Versión del esquema aplicada por flaskapp/database/bootstrap.py (una fila)
+CREATE TABLE schema_version (
+    id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ##############################
 -- SECCIÓN 5: Funciones
 -- ##############################
@@ -470,6 +540,7 @@ CREATE TRIGGER lock_bye_matches
 
 -- Índices para tablas principales
 CREATE INDEX idx_users_email ON users(email);
+CREATE INDEX idx_users_name ON users(name, id);
 CREATE INDEX idx_users_is_admin ON users(is_admin) WHERE is_admin = TRUE;
 CREATE INDEX idx_organizations_name ON organizations(name);
 CREATE INDEX idx_activities_name ON activities(name);
@@ -484,6 +555,19 @@ CREATE INDEX idx_tournament_referees_tournament ON tournament_referees(tournamen
 CREATE INDEX idx_team_members_user ON team_members(user_id);
 CREATE INDEX idx_team_members_team ON team_members(team_id);
 CREATE INDEX idx_team_members_leader ON team_members(team_id, is_leader) WHERE is_leader = TRUE;
+CREATE INDEX idx_user_ratings_leaderboard ON user_ratings(activity_id, rating DESC, user_id);
+
+-- Ventanas incrementales de daily_rollups (flaskapp.modules.home.rollups)
+CREATE INDEX ix_users_created_at ON users(created_at);
+CREATE INDEX ix_organizations_created_at ON organizations(created_at);
+CREATE INDEX ix_tournaments_created_at ON tournaments(created_at);
+CREATE INDEX ix_teams_created_at ON teams(created_at);
+CREATE INDEX ix_matches_completed_at ON matches(completed_at);
+
+-- Búsqueda de usuarios por subcadena (flaskapp.database.usersearch)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_users_name_trgm ON users USING gin (name gin_trgm_ops);
+CREATE INDEX idx_users_email_trgm ON users USING gin (email gin_trgm_ops);
 
 -- Índices para búsquedas en torneos y eventos
 CREATE INDEX idx_tournaments_organization ON tournaments(organization_id);
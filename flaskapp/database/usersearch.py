@@ -0,0 +1,55 @@
+"""
+Substring search over user names and emails (member/referee pickers, typeahead).
+
+    query.filter(usersearch.matching(search))
+    users, has_more = usersearch.page(search, offset=0, limit=10, organization_id=org_id)
+
+Every engine runs the same escaped ILIKE '%q%' on users.name and users.email,
+so '%' and '_' typed by the user are literals, not wildcards. On PostgreSQL
+the pg_trgm GIN indexes on both columns (seed_base_data.sql) answer it
+without scanning the table, and the (name, id) btree serves the ordered page.
+SQLite (development and tests) scans, which is fine at those sizes.
+"""
+
+from typing import List, Optional, Tuple
+
+from sqlalchemy import or_, true
+
+from flaskapp.database.models import OrganizationMember, User, db
+
+
+def normalize(search: Optional[str]) -> str:
+    return (search or '').strip().lower()
+
+
+def escape_like(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def matching(search: Optional[str]):
+    """Condition on User for queries that already join users (pickers)."""
+    text = normalize(search)
+    if not text:
+        return true()
+    pattern = f'%{escape_like(text)}%'
+    return or_(User.name.ilike(pattern, escape='\\'), User.email.ilike(pattern, escape='\\'))
+
+
+def page(search: Optional[str], offset: int = 0, limit: int = 10,
+         organization_id: Optional[int] = None, session=None) -> Tuple[List[User], bool]:
+    """
+    One page of users matching `search`, in name order, optionally limited
+    to the members of an organization. Reads limit + 1 rows instead of
+    counting: the second value says whether there is a next page.
+    """
+    session = session or db.session
+    if not normalize(search):
+        return [], False
+
+    query = session.query(User).filter(matching(search))
+    if organization_id is not None:
+        query = query.join(OrganizationMember, OrganizationMember.user_id == User.id).filter(
+            OrganizationMember.organization_id == organization_id
+        )
+    users = query.order_by(User.name, User.id).offset(offset).limit(limit + 1).all()
+    return users[:limit], len(users) > limit
@@ -36,4 +36,20 @@ class ActivityStats:
     total_teams: int
     total_participants: int
     recent_tournaments: List[ActivityTournamentStats]
-    popular_organizations: List[dict]
\ No newline at end of file
+    popular_organizations: List[dict]
+
+@dataclass
+class LeaderboardEntry:
+    rank: int
+    user_id: int
+    name: str
+    rating: int
+    matches_rated: int
+
+@dataclass
+class ActivityLeaderboard:
+    entries: List[LeaderboardEntry]
+    total_players: int
+    offset: int
+    limit: int
+    current_user: Optional[LeaderboardEntry] = None
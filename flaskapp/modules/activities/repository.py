@@ -1,5 +1,6 @@
-from sqlalchemy import func, desc
-from flaskapp.database.models import db, Activity, Tournament, Team, TeamMember, Organization
+from sqlalchemy import and_, func, desc, or_, select
+from flaskapp.database.models import db, Activity, Tournament, Team, TeamMember, Organization, User, UserRating, UserRatingBucket
+from flaskapp.modules.matches import ratings
 
 class ActivityRepository:
     
@@ -78,4 +79,64 @@ class ActivityRepository:
             Organization.id,
             Organization.name,
             func.count(Tournament.id).label('tournament_count')
-        ).all()
\ No newline at end of file
+        ).all()
+
+    @staticmethod
+    def get_top_rated(activity_id: int, limit: int, offset: int = 0) -> list:
+        """Página del ranking: recorre idx_user_ratings_leaderboard en orden, sin ordenar la tabla."""
+        return db.session.query(
+            UserRating.user_id,
+            User.name,
+            UserRating.rating,
+            UserRating.matches_rated
+        ).join(
+            User, User.id == UserRating.user_id
+        ).filter(
+            UserRating.activity_id == activity_id
+        ).order_by(
+            UserRating.rating.desc(), UserRating.user_id
+        ).limit(limit).offset(offset).all()
+
+    @staticmethod
+    def count_rated_players(activity_id: int) -> int:
+        return db.session.query(
+            func.coalesce(func.sum(UserRatingBucket.players), 0)
+        ).filter(
+            UserRatingBucket.activity_id == activity_id
+        ).scalar()
+
+    @staticmethod
+    def get_player_rating(activity_id: int, user_id: int):
+        return db.session.query(
+            UserRating.user_id,
+            User.name,
+            UserRating.rating,
+            UserRating.matches_rated
+        ).join(
+            User, User.id == UserRating.user_id
+        ).filter(
+            UserRating.activity_id == activity_id,
+            UserRating.user_id == user_id
+        ).first()
+
+    @staticmethod
+    def get_player_rank(activity_id: int, user_id: int, rating: float) -> int:
+        """
+        Posición (desde 1) de un rating en el ranking: los usuarios de los tramos
+        superiores (user_rating_buckets) más los que lo superan dentro de su
+        tramo; ante empate va primero el user_id menor, como en get_top_rated.
+        """
+        bucket = ratings.bucket_of(rating)
+        above = select(func.coalesce(func.sum(UserRatingBucket.players), 0)).where(
+            UserRatingBucket.activity_id == activity_id,
+            UserRatingBucket.bucket > bucket
+        ).scalar_subquery()
+        within = select(func.count()).select_from(UserRating).where(
+            UserRating.activity_id == activity_id,
+            UserRating.rating < (bucket + 1) * ratings.BUCKET_WIDTH,
+            or_(
+                UserRating.rating > rating,
+                and_(UserRating.rating == rating, UserRating.user_id < user_id)
+            )
+        ).scalar_subquery()
+        return db.session.execute(select(above + within + 1)).scalar()
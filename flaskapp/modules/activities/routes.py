@@ -1,6 +1,8 @@
 
 
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+from dataclasses import asdict
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 from flaskapp.database.models import Activity, db
 from flaskapp.modules.activities.forms import ActivityForm
@@ -28,14 +30,28 @@ def index():
 def detail(activity_id):
     activity_data = ActivityService.get_complete_activity_details(
         activity_id,
-        current_user.is_admin
+        current_user.is_admin,
+        current_user.id
     )
     
     return render_template(
         'activities/detail.html',
         activity=activity_data['activity'],
-        stats=activity_data['stats']
+        stats=activity_data['stats'],
+        leaderboard=activity_data['leaderboard']
+    )
+
+@activities_blueprint.route('/<int:activity_id>/leaderboard')
+@login_required
+def leaderboard(activity_id):
+    """Página del ranking en JSON: ?offset=0&limit=10 (máximo 100 por página)."""
+    leaderboard = ActivityService.get_leaderboard(
+        activity_id,
+        limit=request.args.get('limit', 10, type=int),
+        offset=request.args.get('offset', 0, type=int),
+        user_id=current_user.id
     )
+    return jsonify(asdict(leaderboard))
 
 @activities_blueprint.route('/manage/', methods=['GET', 'POST'])
 @activities_blueprint.route('/manage/<int:activity_id>', methods=['GET', 'POST'])
@@ -1,15 +1,19 @@
-from typing import List
-from flaskapp.database.models import Activity 
-from flaskapp.modules.activities.dto import ActivityDTO, ActivityDetailDTO
+from typing import List, Optional
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import Activity, TournamentStatus
+from flaskapp.modules.activities.dto import ActivityDTO, ActivityDetailDTO, ActivityLeaderboard, LeaderboardEntry
 from ..activities.dto import ActivityStats, ActivityTournamentStats
 
 # Se importa el nuevo repositorio
 from .repository import ActivityRepository
 
+LEADERBOARD_SIZE = 10
+MAX_LEADERBOARD_PAGE = 100
+
 class ActivityService:
 
     @staticmethod
-    def get_complete_activity_details(activity_id, is_admin=False):    
+    def get_complete_activity_details(activity_id, is_admin=False, user_id=None):    
         activity_dto = ActivityService.get_activity_detail(activity_id, is_admin)
         
         # La lógica de negocio permanece aquí, las llamadas a la BD se van al repositorio
@@ -30,7 +34,7 @@ class ActivityService:
         stats.recent_tournaments = [
             ActivityTournamentStats(
                 id=t.id, name=t.name, organization_name=t.organization.name,
-                organization_id=t.organization_id, status=t.status.code if t.status else '',
+                organization_id=t.organization_id, status=lookups.code_of(TournamentStatus, t.status_id) or '',
                 start_date=t.start_date.strftime('%Y-%m-%d') if t.start_date else ''
             ) for t in recent_tournaments
         ]
@@ -41,9 +45,45 @@ class ActivityService:
         
         return {
             'activity': activity_dto,
-            'stats': stats
+            'stats': stats,
+            'leaderboard': ActivityService.get_leaderboard(activity_id, user_id=user_id)
         }
 
+    @staticmethod
+    def get_leaderboard(activity_id: int, limit: int = LEADERBOARD_SIZE, offset: int = 0,
+                        user_id: Optional[int] = None) -> ActivityLeaderboard:
+        """
+        Ranking de jugadores de la actividad por rating Elo (user_ratings), que
+        se actualiza al completar cada partida. Si se indica user_id, incluye
+        además la posición de ese usuario aunque no esté en la página.
+        """
+        limit = max(1, min(limit, MAX_LEADERBOARD_PAGE))
+        offset = max(0, offset)
+        entries = [
+            LeaderboardEntry(
+                rank=offset + i + 1, user_id=row.user_id, name=row.name,
+                rating=round(row.rating), matches_rated=row.matches_rated
+            ) for i, row in enumerate(ActivityRepository.get_top_rated(activity_id, limit, offset))
+        ]
+        leaderboard = ActivityLeaderboard(
+            entries=entries,
+            total_players=ActivityRepository.count_rated_players(activity_id),
+            offset=offset,
+            limit=limit
+        )
+
+        if user_id is not None:
+            leaderboard.current_user = next((e for e in entries if e.user_id == user_id), None)
+            player = None if leaderboard.current_user else ActivityRepository.get_player_rating(activity_id, user_id)
+            if player:
+                leaderboard.current_user = LeaderboardEntry(
+                    rank=ActivityRepository.get_player_rank(activity_id, user_id, player.rating),
+                    user_id=player.user_id, name=player.name,
+                    rating=round(player.rating), matches_rated=player.matches_rated
+                )
+
+        return leaderboard
+
     @staticmethod
     def get_all_activities() -> List[ActivityDTO]:
         activities = ActivityRepository.get_all_with_details()
@@ -147,8 +147,10 @@ class TestActivityService:
         test_activity.category = mock_category()
         test_activity.tournaments = mock_tournament()
         
-        # Mockear todas las llamadas al repositorio
-        with patch('flaskapp.modules.activities.service.ActivityRepository') as mock_repo:
+        # Mockear todas las llamadas al repositorio (y el registro de estados)
+        with patch('flaskapp.modules.activities.service.ActivityRepository') as mock_repo, \
+                patch('flaskapp.modules.activities.service.lookups') as mock_lookups:
+            mock_lookups.code_of.return_value = 'IN_PROGRESS'
             # Configurar retornos de los métodos del repositorio
             mock_repo.get_by_id_with_details.return_value = test_activity
             mock_repo.count_tournaments_by_activity.return_value = 2
@@ -169,4 +171,5 @@ class TestActivityService:
             assert result['stats'].total_participants == 32
             assert len(result['stats'].recent_tournaments) == 2
             assert result['stats'].recent_tournaments[0].organization_name == "Organización de Prueba"
+            assert result['stats'].recent_tournaments[0].status == 'IN_PROGRESS'
             assert len(result['stats'].popular_organizations) == 1
\ No newline at end of file
@@ -0,0 +1,69 @@
+from flaskapp.database.models import Tournament, UserRating, UserRatingBucket, db
+from flaskapp.modules.activities.repository import ActivityRepository
+from flaskapp.modules.activities.service import ActivityService
+from flaskapp.modules.matches import ratings
+from flaskapp.modules.matches.service import MatchService
+from tests.factory import QueryCounter, create_started_tournament, match_by_number
+
+"""
+Ranking de jugadores por actividad (ActivityService.get_leaderboard)
+    test_rank_matches_order: la posición por tramos coincide con el orden completo del ranking.
+    test_buckets_follow_results: los tramos incrementales coinciden con un recálculo.
+    test_current_user_outside_page: la posición del usuario se informa aunque no esté en la página.
+"""
+
+
+def play_first_round(ids, team_count):
+    """Completa la primera ronda (team_a gana las partidas impares)."""
+    t = ids['tournament_id']
+    first = range(team_count // 2, team_count)
+    MatchService.submit_results(t, ids['referee_id'], [
+        {'match_id': match_by_number(t, n).id, 'score_team_a': n % 2, 'score_team_b': 1 - n % 2}
+        for n in first
+    ])
+    return db.session.get(Tournament, t).activity_id
+
+
+def bucket_counts(activity_id):
+    return {
+        b.bucket: b.players
+        for b in UserRatingBucket.query.filter_by(activity_id=activity_id) if b.players
+    }
+
+
+class TestLeaderboard:
+    def test_rank_matches_order(self, app):
+        activity_id = play_first_round(create_started_tournament(8), 8)
+        board = ActivityService.get_leaderboard(activity_id, limit=100)
+
+        assert board.total_players == 16
+        assert [e.rank for e in board.entries] == list(range(1, 17))
+        rated = {r.user_id: r.rating for r in UserRating.query.filter_by(activity_id=activity_id)}
+        for entry in board.entries:
+            with QueryCounter() as counter:
+                rank = ActivityRepository.get_player_rank(activity_id, entry.user_id, rated[entry.user_id])
+            assert rank == entry.rank
+            assert counter.count == 1
+
+    def test_buckets_follow_results(self, app):
+        ids = create_started_tournament(8)
+        activity_id = play_first_round(ids, 8)
+        t = ids['tournament_id']
+        MatchService.submit_results(t, ids['referee_id'], [
+            {'match_id': match_by_number(t, n).id, 'score_team_a': 1, 'score_team_b': 0} for n in (2, 3)
+        ])
+        incremental = bucket_counts(activity_id)
+
+        ratings.recompute(activity_id)
+        db.session.flush()
+        assert bucket_counts(activity_id) == incremental
+        assert sum(incremental.values()) == 16
+
+    def test_current_user_outside_page(self, app):
+        activity_id = play_first_round(create_started_tournament(8), 8)
+        last = ActivityService.get_leaderboard(activity_id, limit=1, offset=15).entries[0]
+
+        board = ActivityService.get_leaderboard(activity_id, limit=3, user_id=last.user_id)
+        assert len(board.entries) == 3
+        assert board.current_user == last
+        assert board.current_user.rank == 16
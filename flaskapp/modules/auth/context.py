@@ -0,0 +1,191 @@
+"""
+Contexto de autorización por request.
+
+Reúne los roles del usuario actual que consultan los decoradores de
+decorators.py y los servicios: membresía y rol de organizador en la
+organización, y para un torneo además si es árbitro y a qué equipo pertenece
+(y si lo lidera). Los roles de un torneo se leen con una sola consulta y se
+memorizan en `g` durante el request, así que decoradores, vistas y servicios
+no repiten las mismas verificaciones.
+
+    access = authorization_for(current_user.id)
+    access.tournament(tournament_id).is_referee
+
+Fuera de un request (scripts, tests) o para otro usuario se obtiene un
+contexto nuevo, sin memorizar entre llamadas. Cualquier commit descarta el
+contexto del request: un cambio de roles se ve en la siguiente consulta.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from flask import g, has_request_context
+from flask_login import current_user
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from flaskapp.database.models import OrganizationMember, Team, TeamMember, Tournament, TournamentReferee, User, db
+
+
+@dataclass
+class OrganizationAccess:
+    organization_id: int
+    is_member: bool
+    is_organizer: bool
+
+
+@dataclass
+class TournamentAccess:
+    tournament_id: int
+    organization_id: int
+    status_id: Optional[int]
+    is_admin: bool
+    is_member: bool
+    is_organizer: bool
+    is_referee: bool
+    team_id: Optional[int]  # Equipo del usuario en el torneo (a lo más uno)
+    is_leader: bool
+
+    @property
+    def has_team(self) -> bool:
+        return self.team_id is not None
+
+
+class AuthorizationContext:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self._organizations: Dict[int, OrganizationAccess] = {}
+        self._tournaments: Dict[int, Optional[TournamentAccess]] = {}
+        self._team_tournaments: Dict[int, Optional[int]] = {}
+        self._is_admin: Optional[bool] = None
+
+    @property
+    def is_admin(self) -> bool:
+        """
+        Flag de administrador leído de la BD (el de current_user viene del
+        principal en caché, que en otros procesos puede estar vencido hasta
+        USER_CACHE_TTL). Reutiliza el de un torneo ya cargado.
+        """
+        if self._is_admin is None:
+            loaded = next((a for a in self._tournaments.values() if a is not None), None)
+            if loaded is not None:
+                self._is_admin = loaded.is_admin
+            else:
+                self._is_admin = bool(db.session.execute(
+                    select(User.is_admin).where(User.id == self.user_id)
+                ).scalar())
+        return self._is_admin
+
+    def organization(self, organization_id: int) -> OrganizationAccess:
+        """Membresía en la organización (reutiliza la de un torneo ya cargado)."""
+        if organization_id not in self._organizations:
+            member = db.session.execute(
+                select(OrganizationMember.is_organizer).where(
+                    OrganizationMember.organization_id == organization_id,
+                    OrganizationMember.user_id == self.user_id
+                )
+            ).first()
+            self._organizations[organization_id] = OrganizationAccess(
+                organization_id=organization_id,
+                is_member=member is not None,
+                is_organizer=bool(member and member.is_organizer)
+            )
+        return self._organizations[organization_id]
+
+    def tournament(self, tournament_id: int) -> Optional[TournamentAccess]:
+        """Roles del usuario en el torneo en una consulta; None si el torneo no existe."""
+        if tournament_id not in self._tournaments:
+            self._load_tournament(Tournament.id == tournament_id, tournament_id)
+        return self._tournaments[tournament_id]
+
+    def team(self, team_id: int) -> Optional[TournamentAccess]:
+        """Roles en el torneo del equipo (misma consulta, buscando el torneo por el equipo)."""
+        if team_id not in self._team_tournaments:
+            for access in self._tournaments.values():
+                if access is not None and access.team_id == team_id:
+                    return access
+            tournament_of_team = select(Team.tournament_id).where(Team.id == team_id).scalar_subquery()
+            access = self._load_tournament(Tournament.id == tournament_of_team)
+            self._team_tournaments[team_id] = access.tournament_id if access else None
+        tournament_id = self._team_tournaments[team_id]
+        return self._tournaments.get(tournament_id) if tournament_id is not None else None
+
+    def is_team_leader(self, team_id: int) -> bool:
+        access = self.team(team_id)
+        return bool(access and access.team_id == team_id and access.is_leader)
+
+    def is_team_member(self, team_id: int) -> bool:
+        access = self.team(team_id)
+        return bool(access and access.team_id == team_id)
+
+    def _load_tournament(self, condition, tournament_id: Optional[int] = None) -> Optional[TournamentAccess]:
+        # Equipo del usuario en el torneo: subconsultas escalares correlacionadas
+        user_team = select(TeamMember.team_id).join(Team, Team.id == TeamMember.team_id).where(
+            Team.tournament_id == Tournament.id,
+            TeamMember.user_id == self.user_id
+        ).limit(1)
+
+        query = select(
+            Tournament.id,
+            Tournament.organization_id,
+            Tournament.status_id,
+            select(User.is_admin).where(User.id == self.user_id).scalar_subquery().label('is_admin'),
+            OrganizationMember.id.label('member_id'),
+            OrganizationMember.is_organizer,
+            TournamentReferee.id.label('referee_id'),
+            user_team.scalar_subquery().label('team_id'),
+            user_team.with_only_columns(TeamMember.is_leader).scalar_subquery().label('is_leader')
+        ).outerjoin(
+            OrganizationMember,
+            (OrganizationMember.organization_id == Tournament.organization_id) &
+            (OrganizationMember.user_id == self.user_id)
+        ).outerjoin(
+            TournamentReferee,
+            (TournamentReferee.tournament_id == Tournament.id) & (TournamentReferee.user_id == self.user_id)
+        ).where(condition)
+
+        row = db.session.execute(query).first()
+        if row is None:
+            if tournament_id is not None:
+                self._tournaments[tournament_id] = None
+            return None
+
+        access = TournamentAccess(
+            tournament_id=row.id,
+            organization_id=row.organization_id,
+            status_id=row.status_id,
+            is_admin=bool(row.is_admin),
+            is_member=row.member_id is not None,
+            is_organizer=bool(row.is_organizer),
+            is_referee=row.referee_id is not None,
+            team_id=row.team_id,
+            is_leader=bool(row.is_leader)
+        )
+        self._tournaments[access.tournament_id] = access
+        self._organizations.setdefault(access.organization_id, OrganizationAccess(
+            organization_id=access.organization_id,
+            is_member=access.is_member,
+            is_organizer=access.is_organizer
+        ))
+        return access
+
+
+def authorization_for(user_id: Optional[int] = None) -> AuthorizationContext:
+    """
+    Contexto del usuario actual, memorizado durante el request. Para otro
+    usuario, o fuera de un request, retorna un contexto nuevo.
+    """
+    if has_request_context() and current_user.is_authenticated:
+        if user_id is None or user_id == current_user.id:
+            if '_authorization' not in g:
+                g._authorization = AuthorizationContext(current_user.id)
+            return g._authorization
+    if user_id is None:
+        user_id = current_user.id
+    return AuthorizationContext(user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _forget_after_commit(session):
+    if has_request_context():
+        g.pop('_authorization', None)
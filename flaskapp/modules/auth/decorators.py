@@ -5,7 +5,22 @@ Decoradores para controlar el acceso basado en roles contextuales.
 from functools import wraps
 from flask import abort, request, redirect, url_for, flash
 from flask_login import login_required, current_user
-from sqlalchemy import and_
+
+from flaskapp.modules.auth.context import authorization_for
+
+
+def _route_access():
+    """
+    Contexto de autorización del request. En rutas de un torneo carga primero
+    sus roles: esa consulta trae también la membresía en su organización y el
+    equipo del usuario, que usan los demás decoradores.
+    """
+    access = authorization_for()
+    tournament_id = request.view_args.get('tournament_id')
+    if tournament_id:
+        access.tournament(tournament_id)
+    return access
+
 
 def admin_required(f):
     """
@@ -23,7 +38,7 @@ def admin_required(f):
         print(f"Checking admin access for user: {current_user.id}", flush=True)
         print(f"User is authenticated: {current_user.is_authenticated}", flush=True)
         print(f"User is admin: {current_user.is_admin}", flush=True)
-        if not current_user.is_authenticated or not current_user.is_admin:
+        if not current_user.is_authenticated or not authorization_for().is_admin:
             abort(403)
         return f(*args, **kwargs)
     return decorated_function
@@ -46,8 +61,6 @@ def organization_member_required(organization_param='organization_id'):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            from flaskapp.database.models import OrganizationMember
-            
             # Obtener organization_id de los argumentos de la ruta
             organization_id = kwargs.get(organization_param)
             if not organization_id:
@@ -58,12 +71,8 @@ def organization_member_required(organization_param='organization_id'):
                 abort(400)  # Bad Request si no se encuentra el parámetro
             
             # Verificar membresía
-            membership = OrganizationMember.query.filter_by(
-                organization_id=organization_id,
-                user_id=current_user.id
-            ).first()
-            
-            if not membership and not current_user.is_admin:
+            access = _route_access()
+            if not access.organization(organization_id).is_member and not access.is_admin:
                 flash('No tienes acceso a esta organización.', 'danger')
                 return redirect(url_for('organizations_blueprint.index'))
             
@@ -86,20 +95,12 @@ def organization_organizer_required(organization_param='organization_id'):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            from flaskapp.database.models import OrganizationMember
-            
             organization_id = kwargs.get(organization_param) or request.view_args.get(organization_param)
             if not organization_id:
                 abort(400)
             
             # Verificar que sea organizador
-            membership = OrganizationMember.query.filter_by(
-                organization_id=organization_id,
-                user_id=current_user.id,
-                is_organizer=True
-            ).first()
-            
-            if not membership:
+            if not _route_access().organization(organization_id).is_organizer:
                 flash('No tienes permisos de organizador en esta organización.', 'danger')
                 return redirect(url_for('organizations_blueprint.detail', organization_id=organization_id))
             
@@ -122,19 +123,14 @@ def tournament_referee_required(tournament_param='tournament_id'):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            from flaskapp.database.models import TournamentReferee
-            
             tournament_id = kwargs.get(tournament_param) or request.view_args.get(tournament_param)
             if not tournament_id:
                 abort(400)
             
             # Verificar que sea árbitro del torneo
-            referee = TournamentReferee.query.filter_by(
-                tournament_id=tournament_id,
-                user_id=current_user.id
-            ).first()
+            access = authorization_for().tournament(tournament_id)
             
-            if not referee:
+            if not access or not access.is_referee:
                 flash('No tienes permisos de árbitro en este torneo.', 'danger')
                 return redirect(url_for('matches_blueprint.detail', organization_id=kwargs.get('organization_id'), tournament_id=tournament_id, match_id=kwargs.get('match_id')))
             
@@ -157,20 +153,12 @@ def team_leader_required(team_param='team_id'):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            from flaskapp.database.models import TeamMember
-            
             team_id = kwargs.get(team_param) or request.view_args.get(team_param)
             if not team_id:
                 abort(400)
             
             # Verificar que sea líder del equipo
-            membership = TeamMember.query.filter_by(
-                team_id=team_id,
-                user_id=current_user.id,
-                is_leader=True
-            ).first()
-            
-            if not membership:
+            if not _route_access().is_team_leader(team_id):
                 flash('No tienes permisos de líder en este equipo.', 'danger')
                 return redirect(url_for('teams_blueprint.detail', organization_id=kwargs.get('organization_id'), tournament_id=kwargs.get('tournament_id'), team_id=team_id))
             
@@ -193,19 +181,12 @@ def team_member_required(team_param='team_id'):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            from flaskapp.database.models import TeamMember
-            
             team_id = kwargs.get(team_param) or request.view_args.get(team_param)
             if not team_id:
                 abort(400)
             
             # Verificar que sea miembro del equipo
-            membership = TeamMember.query.filter_by(
-                team_id=team_id,
-                user_id=current_user.id
-            ).first()
-            
-            if not membership:
+            if not _route_access().is_team_member(team_id):
                 flash('No eres miembro de este equipo.', 'danger')
                 return redirect(url_for('team_blueprint.index'))
             
@@ -230,32 +211,21 @@ def tournament_participant_allowed(tournament_param='tournament_id'):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            from flaskapp.database.models import TournamentReferee, TeamMember, Team
-            from sqlalchemy import and_
-            
             tournament_id = kwargs.get(tournament_param) or request.view_args.get(tournament_param)
             if not tournament_id:
                 abort(400)
             
-            # Verificar que no sea árbitro del torneo
-            is_referee = TournamentReferee.query.filter_by(
-                tournament_id=tournament_id,
-                user_id=current_user.id
-            ).first()
+            access = authorization_for().tournament(tournament_id)
+            if access is None:
+                abort(404)
             
-            if is_referee:
+            # Verificar que no sea árbitro del torneo
+            if access.is_referee:
                 flash('No puedes participar como jugador siendo árbitro del torneo.', 'danger')
                 return redirect(url_for('tournament_blueprint.detail', tournament_id=tournament_id))
             
             # Verificar que no esté ya en otro equipo del torneo
-            existing_team = TeamMember.query.join(Team).filter(
-                and_(
-                    Team.tournament_id == tournament_id,
-                    TeamMember.user_id == current_user.id
-                )
-            ).first()
-            
-            if existing_team:
+            if access.has_team:
                 flash('Ya estás participando en este torneo con otro equipo.', 'danger')
                 return redirect(url_for('tournament_blueprint.detail', tournament_id=tournament_id))
             
@@ -284,7 +254,7 @@ def resource_owner_or_admin_required(resource_param='user_id'):
                 abort(400)
             
             # Permitir si es el propio usuario o es admin
-            if current_user.id != user_id and not current_user.is_admin:
+            if current_user.id != user_id and not authorization_for().is_admin:
                 abort(403)
             
             return f(*args, **kwargs)
@@ -311,39 +281,28 @@ def tournament_access_required(require_organizer=False, require_referee=False):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            from flaskapp.database.models import Tournament, OrganizationMember, TournamentReferee
-            
             tournament_id = kwargs.get('tournament_id') or request.view_args.get('tournament_id')
             if not tournament_id:
                 abort(400)
             
-            # Obtener el torneo para conocer la organización
-            tournament = Tournament.query.get_or_404(tournament_id)
+            # Roles en el torneo y su organización (una consulta)
+            access = authorization_for().tournament(tournament_id)
+            if access is None:
+                abort(404)
             
             # Verificar membresía básica en la organización
-            membership = OrganizationMember.query.filter_by(
-                organization_id=tournament.organization_id,
-                user_id=current_user.id
-            ).first()
-            
-            if not membership:
+            if not access.is_member:
                 flash('No tienes acceso a esta organización.', 'danger')
                 return redirect(url_for('organizations_blueprint.index'))
             
             # Verificar permisos específicos
-            if require_organizer and not membership.is_organizer:
+            if require_organizer and not access.is_organizer:
                 flash('Necesitas permisos de organizador.', 'danger')
                 return redirect(url_for('tournament_blueprint.detail', tournament_id=tournament_id))
             
-            if require_referee:
-                referee = TournamentReferee.query.filter_by(
-                    tournament_id=tournament_id,
-                    user_id=current_user.id
-                ).first()
-                
-                if not referee:
-                    flash('Necesitas ser árbitro de este torneo.', 'error')
-                    return redirect(url_for('tournament_blueprint.detail', tournament_id=tournament_id))
+            if require_referee and not access.is_referee:
+                flash('Necesitas ser árbitro de este torneo.', 'error')
+                return redirect(url_for('tournament_blueprint.detail', tournament_id=tournament_id))
             
             return f(*args, **kwargs)
         return decorated_function
@@ -0,0 +1,97 @@
+import pytest
+from flask import request
+from flask_login import LoginManager, login_user
+
+from flaskapp.database.models import Organization, OrganizationMember, Team, TeamMember, TournamentReferee, User, db
+from flaskapp.modules.auth.context import authorization_for
+from flaskapp.modules.auth.decorators import organization_member_required, team_leader_required
+from flaskapp.modules.matches.service import MatchService
+from flaskapp.modules.teams.service import TeamService
+from flaskapp.modules.tournaments.service import TournamentService
+from tests.factory import QueryCounter, create_started_tournament
+
+"""
+Contexto de autorización por request (flaskapp.modules.auth.context)
+    test_roles_match_tables: los roles de un torneo coinciden con las filas de cada tabla.
+    test_request_checks_share_one_query: decoradores y servicios de una página usan una sola consulta.
+    test_commit_forgets_context: tras un commit el request vuelve a leer los roles.
+"""
+
+
+@pytest.fixture
+def app(app):
+    app.config['SECRET_KEY'] = 'test'
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+    return app
+
+
+def setup_roles():
+    ids = create_started_tournament(2)
+    organization = Organization.query.one()
+    team = Team.query.filter_by(tournament_id=ids['tournament_id']).first()
+    leader = TeamMember.query.filter_by(team_id=team.id, is_leader=True).one().user
+    organizer = User(name='Organizador', email='organizador@test.com')
+    db.session.add(organizer)
+    db.session.flush()
+    for user_id, is_organizer in ((organizer.id, True), (leader.id, False), (ids['referee_id'], False)):
+        db.session.add(OrganizationMember(organization_id=organization.id, user_id=user_id, is_organizer=is_organizer))
+    db.session.commit()
+    return ids['tournament_id'], organization.id, team.id, {
+        'organizer': organizer.id, 'leader': leader.id, 'referee': ids['referee_id']
+    }
+
+
+class TestAuthorizationContext:
+    def test_roles_match_tables(self, app):
+        tournament_id, organization_id, team_id, users = setup_roles()
+        for user_id in list(users.values()) + [99]:
+            access = authorization_for(user_id).tournament(tournament_id)
+            member = OrganizationMember.query.filter_by(organization_id=organization_id, user_id=user_id).first()
+            team_member = TeamMember.query.join(Team).filter(
+                Team.tournament_id == tournament_id, TeamMember.user_id == user_id
+            ).first()
+            assert access.organization_id == organization_id
+            assert access.is_member == (member is not None)
+            assert access.is_organizer == bool(member and member.is_organizer)
+            assert access.is_referee == (
+                TournamentReferee.query.filter_by(tournament_id=tournament_id, user_id=user_id).first() is not None
+            )
+            assert access.team_id == (team_member.team_id if team_member else None)
+            assert access.is_leader == bool(team_member and team_member.is_leader)
+        assert authorization_for(users['leader']).is_team_leader(team_id)
+        assert not authorization_for(users['referee']).is_team_member(team_id)
+        assert authorization_for(users['leader']).tournament(12345) is None
+
+    def test_request_checks_share_one_query(self, app):
+        tournament_id, organization_id, team_id, users = setup_roles()
+
+        @organization_member_required()
+        @team_leader_required()
+        def view(organization_id, tournament_id, team_id):
+            return (
+                TournamentService.can_create_team(tournament_id, users['leader']),
+                MatchService.is_user_tournament_referee(users['leader'], tournament_id),
+                TeamService.is_team_leader(team_id, users['leader'])
+            )
+
+        path = f'/organizations/{organization_id}/tournaments/{tournament_id}/teams/{team_id}'
+        with app.test_request_context(path):
+            login_user(db.session.get(User, users['leader']))
+            # Sin blueprints: los argumentos de la ruta se fijan a mano
+            request.view_args = {'organization_id': organization_id, 'tournament_id': tournament_id, 'team_id': team_id}
+            with QueryCounter() as counter:
+                result = view(organization_id=organization_id, tournament_id=tournament_id, team_id=team_id)
+        assert result == (False, False, True)
+        assert counter.count == 1
+
+    def test_commit_forgets_context(self, app):
+        tournament_id, organization_id, team_id, users = setup_roles()
+        with app.test_request_context('/'):
+            login_user(db.session.get(User, users['organizer']))
+            assert not MatchService.is_user_tournament_referee(users['organizer'], tournament_id)
+            db.session.add(TournamentReferee(
+                tournament_id=tournament_id, user_id=users['organizer'], assigned_by=users['organizer']
+            ))
+            db.session.commit()
+            assert MatchService.is_user_tournament_referee(users['organizer'], tournament_id)
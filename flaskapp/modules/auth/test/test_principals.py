@@ -0,0 +1,121 @@
+import pytest
+from flask import g, session
+from sqlalchemy import update
+from werkzeug.exceptions import Forbidden
+from flask_login import LoginManager, current_user
+
+from flaskapp.database.models import NotificationType, RelatedEntityType, User, db
+from flaskapp.database.principals import DEFAULT_MAX_SIZE, DEFAULT_TTL, UserPrincipal, principals
+from flaskapp.modules.auth.decorators import admin_required
+from flaskapp.modules.notifications.service import NotificationService
+from flaskapp.modules.profile.service import ProfileService
+from tests.factory import QueryCounter, add_notifications
+
+"""
+Principales de usuario en caché (flaskapp.database.principals)
+    test_requests_skip_users_table: con el principal en caché, cargar current_user no consulta la BD.
+    test_user_writes_evict_principal: editar el perfil o el flag de admin se ve en el siguiente request.
+    test_live_columns_skip_cache: el contador de no leídas y los permisos de admin se leen de la BD.
+    test_cache_is_bounded: el caché descarta el menos usado al llenarse y las entradas vencidas.
+"""
+
+
+@pytest.fixture
+def app(app):
+    app.config['SECRET_KEY'] = 'test'
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: principals.get(int(user_id)))
+    db.session.add_all([NotificationType(code='TEAM_INVITE'), RelatedEntityType(name='TOURNAMENT')])
+    db.session.commit()
+    yield app
+    principals.configure(DEFAULT_MAX_SIZE, DEFAULT_TTL)
+
+
+def create_users(count=1):
+    users = [User(name=f'Usuario {i}', email=f'usuario{i}@test.com') for i in range(count)]
+    db.session.add_all(users)
+    db.session.commit()
+    return [user.id for user in users]
+
+
+def load_current_user(app, user_id):
+    """current_user de un request con sesión iniciada por `user_id`."""
+    with app.test_request_context():
+        g.pop('_login_user', None)  # El app context de la fixture se comparte entre requests
+        session['_user_id'] = str(user_id)
+        with QueryCounter() as counter:
+            user = current_user._get_current_object()
+        return user, counter.count
+
+
+class TestPrincipals:
+    def test_requests_skip_users_table(self, app):
+        user_id, = create_users()
+
+        first, queries = load_current_user(app, user_id)
+        assert queries == 1
+        assert isinstance(first, UserPrincipal) and first.is_authenticated
+        assert (first.id, first.name, first.is_admin) == (user_id, 'Usuario 0', False)
+
+        second, queries = load_current_user(app, user_id)
+        assert queries == 0
+        assert second is first
+
+        assert load_current_user(app, 9999)[0].is_anonymous
+
+    def test_user_writes_evict_principal(self, app):
+        user_id, = create_users()
+        load_current_user(app, user_id)
+
+        ProfileService.update_profile(user_id, {'name': 'Nombre nuevo'})
+        user, queries = load_current_user(app, user_id)
+        assert (user.name, queries) == ('Nombre nuevo', 1)
+
+        db.session.get(User, user_id).is_admin = True
+        db.session.flush()
+        load_current_user(app, user_id)  # Otro request lee la fila antes del commit
+        db.session.commit()
+        assert load_current_user(app, user_id)[0].is_admin
+
+    def test_live_columns_skip_cache(self, app):
+        user_id, = create_users()
+        db.session.get(User, user_id).is_admin = True
+        db.session.commit()
+        assert load_current_user(app, user_id)[0].is_admin
+
+        # Cambios que no pasan por este proceso (triggers, otro worker): el principal sigue en caché
+        add_notifications(user_id, 2)
+        db.session.execute(update(User).where(User.id == user_id).values(is_admin=False))
+        db.session.commit()
+        admin_view = admin_required(lambda: 'ok')
+        with app.test_request_context():
+            g.pop('_login_user', None)
+            session['_user_id'] = str(user_id)
+            assert current_user.is_admin  # Valor en caché
+            assert NotificationService.get_unread_count(user_id, user=current_user) == 2
+            with pytest.raises(Forbidden):
+                admin_view()
+
+    def test_cache_is_bounded(self, app, monkeypatch):
+        ids = create_users(3)
+        principals.configure(max_size=2, ttl=30)
+        clock = [1000.0]
+        monkeypatch.setattr('flaskapp.database.principals.time.monotonic', lambda: clock[0])
+
+        for user_id in ids[:2]:
+            principals.get(user_id)
+        principals.get(ids[0])  # ids[1] pasa a ser el menos usado
+        principals.get(ids[2])
+        assert len(principals) == 2
+        with QueryCounter() as counter:
+            principals.get(ids[0])
+            principals.get(ids[2])
+        assert counter.count == 0
+        with QueryCounter() as counter:
+            principals.get(ids[1])
+        assert counter.count == 1
+
+        clock[0] += 31
+        with QueryCounter() as counter:
+            principals.get(ids[1])
+        assert counter.count == 1
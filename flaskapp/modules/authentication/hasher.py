@@ -0,0 +1,144 @@
+"""
+Hash de contraseñas en un pool acotado de hilos.
+
+PBKDF2-SHA512 cuesta decenas de milisegundos de CPU por contraseña; en una
+ráfaga de logins (check-in de un torneo) los hilos del servidor compiten por
+la CPU y se atrasan también los requests que no autentican. PasswordHasher
+ejecuta cada hash en un pool de `workers` hilos (hashlib libera el GIL
+mientras calcula PBKDF2) con a lo más `max_pending` requests más en cola; el
+resto espera cupo hasta `timeout` segundos y si no lo obtiene recibe
+PasswordHasherBusy.
+
+Formato almacenado (bytes ASCII):
+
+    pbkdf2_sha512$<iteraciones>$<sal hex>$<hash hex>
+
+Las contraseñas del formato anterior (sal de 64 caracteres seguida del hash,
+100.000 iteraciones) se siguen verificando. verify_and_update() indica cuándo
+rehacer el hash con el costo configurado, así el cambio de parámetros se
+aplica en el siguiente login de cada usuario. La comparación usa
+hmac.compare_digest (tiempo constante).
+"""
+
+import binascii
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+ALGORITHM = 'pbkdf2_sha512'
+DEFAULT_ITERATIONS = 100_000
+DEFAULT_MAX_PENDING = 64
+DEFAULT_TIMEOUT = 10.0
+SALT_BYTES = 16
+
+LEGACY_ITERATIONS = 100_000
+LEGACY_SALT_LENGTH = 64
+
+
+class PasswordHasherBusy(RuntimeError):
+    """No hubo cupo en el pool de hash dentro del tiempo de espera."""
+
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac('sha512', password.encode('utf-8'), salt, iterations)
+
+
+def _parse(stored: bytes) -> Tuple[bytes, int, bytes]:
+    """(sal, iteraciones, hash esperado) de un valor almacenado en cualquiera de los dos formatos."""
+    text = stored.decode('ascii')
+    if text.startswith(ALGORITHM + '$'):
+        _, iterations, salt, digest = text.split('$')
+        return binascii.unhexlify(salt), int(iterations), binascii.unhexlify(digest)
+    # Formato anterior: la sal hex se usaba tal cual (como texto) en PBKDF2
+    return (
+        text[:LEGACY_SALT_LENGTH].encode('ascii'), LEGACY_ITERATIONS,
+        binascii.unhexlify(text[LEGACY_SALT_LENGTH:])
+    )
+
+
+class PasswordHasher:
+    def __init__(self, iterations: int = DEFAULT_ITERATIONS, workers: Optional[int] = None,
+                 max_pending: int = DEFAULT_MAX_PENDING, timeout: float = DEFAULT_TIMEOUT):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self.configure(iterations, workers, max_pending, timeout)
+
+    def configure(self, iterations: int, workers: Optional[int] = None,
+                  max_pending: int = DEFAULT_MAX_PENDING, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Costo y tamaño del pool; `workers` None o 0 usa un hilo por CPU."""
+        with self._lock:
+            self.iterations = iterations
+            self.workers = workers or os.cpu_count() or 1
+            self.max_pending = max_pending
+            self.timeout = timeout
+            self._slots = threading.BoundedSemaphore(self.workers + max_pending)
+            self._shutdown_executor()
+            # Hash de referencia para usuarios inexistentes (se calcula al primer uso)
+            self._dummy = None
+
+    def hash(self, password: str) -> bytes:
+        """Hash nuevo con el costo configurado."""
+        return self._run(self._encode, os.urandom(SALT_BYTES), self.iterations, password)
+
+    def verify(self, password: str, stored: Optional[bytes]) -> bool:
+        return self.verify_and_update(password, stored)[0]
+
+    def needs_rehash(self, stored: bytes) -> bool:
+        return not stored.startswith(ALGORITHM.encode('ascii') + b'$') or _parse(stored)[1] != self.iterations
+
+    def verify_and_update(self, password: str, stored: Optional[bytes]) -> Tuple[bool, Optional[bytes]]:
+        """
+        (válida, hash nuevo). El hash nuevo solo se entrega si la contraseña es
+        válida y el valor almacenado usa otro formato o costo; quien llama lo guarda.
+        """
+        if not stored:
+            # Sin usuario se verifica igual, así el tiempo de respuesta no lo delata
+            if self._dummy is None:
+                self._dummy = self.hash('dummy')
+            self._run(self._check, password, self._dummy)
+            return False, None
+        if not self._run(self._check, password, stored):
+            return False, None
+        if self.needs_rehash(stored):
+            return True, self.hash(password)
+        return True, None
+
+    @staticmethod
+    def _encode(salt: bytes, iterations: int, password: str) -> bytes:
+        digest = _pbkdf2(password, salt, iterations)
+        return f'{ALGORITHM}${iterations}${salt.hex()}${digest.hex()}'.encode('ascii')
+
+    @staticmethod
+    def _check(password: str, stored: bytes) -> bool:
+        salt, iterations, expected = _parse(stored)
+        return hmac.compare_digest(_pbkdf2(password, salt, iterations), expected)
+
+    def _run(self, fn, *args):
+        """Ejecuta `fn` en el pool, esperando cupo a lo más `timeout` segundos."""
+        slots = self._slots
+        if not slots.acquire(timeout=self.timeout):
+            raise PasswordHasherBusy('Demasiados hashes de contraseña en curso')
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            slots.release()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Un proceso hijo (fork del servidor) no hereda los hilos del pool
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+                self._pid = os.getpid()
+            return self._executor
+
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        self._executor = None
+
+
+password_hasher = PasswordHasher()
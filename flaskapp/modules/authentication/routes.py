@@ -8,7 +8,8 @@ from flaskapp.database.models import db
 from flaskapp import login_manager
 from flaskapp.modules.authentication.forms import LoginForm, CreateAccountForm
 from flaskapp.database.models import User
-from flaskapp.modules.authentication.util import verify_pass
+from flaskapp.modules.authentication.hasher import PasswordHasherBusy
+from flaskapp.modules.authentication.service import AuthenticationService
 
 auth_blueprint = Blueprint(
     'authentication_blueprint',
@@ -32,11 +33,15 @@ def login():
         email = request.form['email']
         password = request.form['password']
 
-        # Locate user
-        user = User.query.filter_by(email=email).first()
+        # Locate user and check the password (rehashed if the cost changed)
+        try:
+            user = AuthenticationService.authenticate(email, password)
+        except PasswordHasherBusy:
+            return render_template('authentication/login.html',
+                                   msg='Server busy, please try again in a few seconds',
+                                   form=login_form), 503
 
-        # Check the password
-        if user and verify_pass(password, user.password):
+        if user:
 
             login_user(user)
             return redirect(url_for('authentication_blueprint.route_default'))
@@ -80,12 +85,18 @@ def register():
                                 form=create_account_form)
         
         # Create new user with default profile picture
-        user = User(
-            name=name,
-            email=email,
-            password=password,  # Asegúrate de hashear la contraseña antes de guardarla
-            profile_picture="https://randomuser.me/api/portraits/men/1.jpg"  # Imagen por defecto
-        )
+        try:
+            user = User(
+                name=name,
+                email=email,
+                password=password,  # User.__init__ la hashea (hash_pass)
+                profile_picture="https://randomuser.me/api/portraits/men/1.jpg"  # Imagen por defecto
+            )
+        except PasswordHasherBusy:
+            return render_template('authentication/register.html',
+                                msg='Server busy, please try again in a few seconds',
+                                success=False,
+                                form=create_account_form), 503
         
         # Get a database session
         db.session.add(user)
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from flaskapp.database.models import User, db
+from flaskapp.modules.authentication.hasher import password_hasher
+
+
+class AuthenticationService:
+    @staticmethod
+    def authenticate(email: str, password: str) -> Optional[User]:
+        """
+        Usuario con ese email y contraseña, o None. Si el hash almacenado usa
+        otro formato o costo que el configurado, se reemplaza por uno nuevo.
+        Puede lanzar PasswordHasherBusy si el pool de hash está saturado.
+        """
+        user = User.query.filter_by(email=email).first()
+        valid, new_hash = password_hasher.verify_and_update(password, user.password if user else None)
+        if not valid:
+            return None
+        if new_hash is not None:
+            user.password = new_hash
+            db.session.commit()
+        return user
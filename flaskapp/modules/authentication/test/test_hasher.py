@@ -0,0 +1,90 @@
+import binascii
+import hashlib
+import os
+import threading
+
+import pytest
+
+from flaskapp.database.models import User, db
+from flaskapp.modules.authentication.hasher import (
+    DEFAULT_ITERATIONS, PasswordHasher, PasswordHasherBusy, password_hasher
+)
+from flaskapp.modules.authentication.service import AuthenticationService
+
+"""
+Hash de contraseñas (flaskapp.modules.authentication.hasher)
+    test_verifies_both_formats: valida hashes nuevos y del formato anterior, y rechaza contraseñas erróneas.
+    test_login_rehashes_on_cost_change: el login reemplaza el hash cuando cambia el formato o el costo.
+    test_pool_is_bounded: sin cupo en el pool, el hash falla con PasswordHasherBusy tras el tiempo de espera.
+"""
+
+ITERATIONS = 1000
+
+
+@pytest.fixture
+def app(app):
+    password_hasher.configure(ITERATIONS, workers=2)
+    yield app
+    password_hasher.configure(DEFAULT_ITERATIONS)
+
+
+def legacy_hash(password):
+    """Formato anterior de util.hash_pass: sal hex de 64 caracteres + hash hex, 100.000 iteraciones."""
+    salt = hashlib.sha256(os.urandom(60)).hexdigest().encode('ascii')
+    return salt + binascii.hexlify(hashlib.pbkdf2_hmac('sha512', password.encode('utf-8'), salt, 100000))
+
+
+class TestPasswordHasher:
+    def test_verifies_both_formats(self):
+        hasher = PasswordHasher(ITERATIONS, workers=1)
+        stored = hasher.hash('secreta')
+        assert stored.startswith(b'pbkdf2_sha512$1000$')
+        assert hasher.verify('secreta', stored)
+        assert not hasher.verify('Secreta', stored)
+        assert hasher.hash('secreta') != stored  # sal distinta
+
+        old = legacy_hash('secreta')
+        assert hasher.verify('secreta', old)
+        assert not hasher.verify('otra', old)
+        assert not hasher.verify('secreta', None)
+
+    def test_login_rehashes_on_cost_change(self, app):
+        db.session.add(User(name='Nuevo', email='nuevo@test.com', password='clave'))
+        legacy = User(name='Antiguo', email='antiguo@test.com')
+        legacy.password = legacy_hash('clave')
+        db.session.add(legacy)
+        db.session.commit()
+
+        assert AuthenticationService.authenticate('antiguo@test.com', 'mala') is None
+        assert not legacy.password.startswith(b'pbkdf2_sha512')
+        assert AuthenticationService.authenticate('antiguo@test.com', 'clave') == legacy
+        assert legacy.password.startswith(b'pbkdf2_sha512$1000$')
+        assert AuthenticationService.authenticate('nadie@test.com', 'clave') is None
+
+        password_hasher.configure(2 * ITERATIONS, workers=2)
+        user = User.query.filter_by(email='nuevo@test.com').one()
+        unchanged = user.password
+        assert AuthenticationService.authenticate('nuevo@test.com', 'clave') == user
+        assert user.password != unchanged and user.password.startswith(b'pbkdf2_sha512$2000$')
+        rehashed = user.password
+        assert AuthenticationService.authenticate('nuevo@test.com', 'clave') == user
+        assert user.password == rehashed
+
+    def test_pool_is_bounded(self):
+        hasher = PasswordHasher(ITERATIONS, workers=1, max_pending=0, timeout=0.05)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        busy = threading.Thread(target=hasher._run, args=(block,))
+        busy.start()
+        started.wait(5)
+        try:
+            with pytest.raises(PasswordHasherBusy):
+                hasher.hash('secreta')
+        finally:
+            release.set()
+            busy.join()
+        assert hasher.verify('secreta', hasher.hash('secreta'))
@@ -3,32 +3,19 @@
 Copyright (c) 2019 - present AppSeed.us
 """
 
-import os
-import hashlib
-import binascii
+from flaskapp.modules.authentication.hasher import password_hasher
 
 # Inspiration -> https://www.vitoshacademy.com/hashing-passwords-in-python/
+# Hashing runs in password_hasher's bounded pool (see hasher.py)
 
 
 def hash_pass(password):
     """Hash a password for storing."""
 
-    salt = hashlib.sha256(os.urandom(60)).hexdigest().encode('ascii')
-    pwdhash = hashlib.pbkdf2_hmac('sha512', password.encode('utf-8'),
-                                  salt, 100000)
-    pwdhash = binascii.hexlify(pwdhash)
-    return (salt + pwdhash)  # return bytes
+    return password_hasher.hash(password)  # return bytes
 
 
 def verify_pass(provided_password, stored_password):
     """Verify a stored password against one provided by user"""
 
-    stored_password = stored_password.decode('ascii')
-    salt = stored_password[:64]
-    stored_password = stored_password[64:]
-    pwdhash = hashlib.pbkdf2_hmac('sha512',
-                                  provided_password.encode('utf-8'),
-                                  salt.encode('ascii'),
-                                  100000)
-    pwdhash = binascii.hexlify(pwdhash).decode('ascii')
-    return pwdhash == stored_password
+    return password_hasher.verify(provided_password, stored_password)
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List
-from flaskapp.database.models import Event # Solo para type hinting
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import Event, EventStatus, TournamentStatus
 from flaskapp.modules.events.dto import EventDTO, EventDetailDTO
 
 # Se importan los nuevos repositorios
@@ -17,7 +18,7 @@ class EventService:
                 id=e.id, name=e.name, description=e.description,
                 start_date=e.start_date.strftime('%Y-%m-%d'),
                 end_date=e.end_date.strftime('%Y-%m-%d'),
-                status=e.status.code, organization_id=e.organization_id,
+                status=lookups.code_of(EventStatus, e.status_id), organization_id=e.organization_id,
                 organization_name=e.organization.name, can_edit=is_organizer
             ) for e in events
         ]
@@ -34,7 +35,7 @@ class EventService:
             id=event.id, name=event.name, description=event.description,
             start_date=event.start_date.strftime('%Y-%m-%d'),
             end_date=event.end_date.strftime('%Y-%m-%d'),
-            status=event.status.code, organization_id=event.organization_id,
+            status=lookups.code_of(EventStatus, event.status_id), organization_id=event.organization_id,
             organization_name=event.organization.name, can_edit=is_organizer,
             creator_name=event.creator.name, created_at=event.created_at.strftime('%Y-%m-%d'),
             updated_at=event.updated_at.strftime('%Y-%m-%d') if event.updated_at else '',
@@ -45,7 +46,7 @@ class EventService:
                 'activity_name': t.activity.name if t.activity else 'N/A',
                 'start_date': t.start_date.strftime('%Y-%m-%d') if t.start_date else 'N/A',
                 'end_date': t.end_date.strftime('%Y-%m-%d') if t.end_date else 'N/A',
-                'status': t.status.code
+                'status': lookups.code_of(TournamentStatus, t.status_id)
             } for t in sorted_tournaments]
         )
 
@@ -37,6 +37,7 @@ def mock_event():
     event.start_date = datetime.now()
     event.end_date = datetime.now() + timedelta(days=3)
     event.status = mock_event_status()
+    event.status_id = event.status.id
     event.organization = mock_organization()
     event.creator = mock_user()
     event.tournaments = [mock_tournament()]
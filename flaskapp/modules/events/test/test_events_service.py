@@ -58,6 +58,7 @@ class TestEventService:
             EventRepository=MagicMock(
                 get_by_organization=MagicMock(return_value=[test_event])
             ),
+            lookups=MagicMock(code_of=MagicMock(return_value='active')),
             OrganizationMemberRepository=MagicMock(
                 is_user_organizer=MagicMock(return_value=True)
             )
@@ -66,6 +67,7 @@ class TestEventService:
             
             assert len(results) == 1
             assert results[0].name == "Evento de Prueba"
+            assert results[0].status == 'active'
             assert results[0].can_edit is True
 
     def test_get_event_detail(self):
@@ -78,6 +80,7 @@ class TestEventService:
                 get_by_id_with_details=MagicMock(return_value=test_event),
                 get_status_options=MagicMock(return_value=[test_status])
             ),
+            lookups=MagicMock(code_of=MagicMock(return_value='active')),
             OrganizationMemberRepository=MagicMock(
                 is_user_organizer=MagicMock(return_value=True)
             )
@@ -138,6 +141,7 @@ class TestEventService:
                 get_by_id_with_details=MagicMock(return_value=test_event),
                 get_status_options=MagicMock(return_value=[mock_event_status()])
             ),
+            lookups=MagicMock(code_of=MagicMock(return_value='active')),
             OrganizationMemberRepository=MagicMock(
                 is_user_organizer=MagicMock(return_value=False)
             )
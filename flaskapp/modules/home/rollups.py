@@ -0,0 +1,170 @@
+"""
+Conteos diarios para las gráficas de crecimiento (tabla daily_rollups).
+
+Cada métrica cuenta eventos por día y organización: usuarios, organizaciones,
+torneos y equipos creados, y partidas completadas (sin byes). run() procesa
+solo las filas posteriores a la marca de agua de cada métrica (rollup_watermarks)
+y hasta `now - LAG`, con una consulta agrupada por métrica sobre el índice de
+la columna de tiempo y un upsert que suma los conteos. Las lecturas (dashboard,
+gráficas por organización) recorren unas cientos de filas diarias en vez de las
+tablas base.
+
+Los conteos registran altas: borrar un registro no los descuenta. rebuild()
+recalcula todo desde cero.
+
+run() escribe (marcas con FOR UPDATE y commit), así que lo ejecuta un solo
+proceso programado, no cada worker web:
+
+    python -m flaskapp.modules.home.rollups                # una vez (cron)
+    python -m flaskapp.modules.home.rollups --interval 60  # proceso dedicado, cada 60 s
+    python -m flaskapp.modules.home.rollups --rebuild      # recontar todo el historial
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, literal, select
+
+from flaskapp.database.bulk import bulk_upsert
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import (
+    DailyRollup, Match, MatchStatus, Organization, RollupWatermark, Team, Tournament, User, db
+)
+from flaskapp.database.timebuckets import date_trunc
+
+METRICS = ('users', 'organizations', 'tournaments', 'teams', 'matches_completed')
+
+# Margen para transacciones que aún no confirman filas con marcas de tiempo anteriores
+LAG = timedelta(minutes=1)
+
+
+def _source(metric: str):
+    """(columna de tiempo, organización o None, consulta base) de cada métrica."""
+    if metric == 'users':
+        return User.created_at, None, select().select_from(User)
+    if metric == 'organizations':
+        return Organization.created_at, Organization.id, select().select_from(Organization)
+    if metric == 'tournaments':
+        return Tournament.created_at, Tournament.organization_id, select().select_from(Tournament)
+    if metric == 'teams':
+        return Team.created_at, Tournament.organization_id, select().select_from(Team).join(
+            Tournament, Tournament.id == Team.tournament_id
+        )
+    if metric == 'matches_completed':
+        return Match.completed_at, Tournament.organization_id, select().select_from(Match).join(
+            Tournament, Tournament.id == Match.tournament_id
+        ).where(
+            Match.status_id == lookups.id_of(MatchStatus, 'COMPLETED'),
+            Match.is_bye.is_(False)
+        )
+    raise ValueError(f"Métrica desconocida: {metric}")
+
+
+def _count_window(metric: str, since: Optional[datetime], until: datetime, session) -> List[dict]:
+    timestamp, organization, query = _source(metric)
+    day = date_trunc('day', timestamp)
+    group_by = [day] if organization is None else [day, organization]
+    query = query.add_columns(
+        day.label('day'),
+        (literal(0) if organization is None else organization).label('organization_id'),
+        func.count().label('count')
+    ).where(timestamp <= until).group_by(*group_by)
+    if since is not None:
+        query = query.where(timestamp > since)
+
+    return [
+        {'metric': metric, 'day': row.day.date(), 'organization_id': row.organization_id, 'count': row.count}
+        for row in session.execute(query) if row.day is not None
+    ]
+
+
+def run(until: Optional[datetime] = None, session=None) -> Dict[str, int]:
+    """
+    Suma a daily_rollups los eventos entre la marca de agua de cada métrica y
+    `until` (por defecto, ahora - LAG) y avanza las marcas. Las marcas se leen
+    con FOR UPDATE: dos procesos que ejecuten el job a la vez se serializan y el
+    segundo solo ve lo que quede pendiente. Hace commit. Retorna las filas
+    diarias actualizadas por métrica.
+    """
+    session = session or db.session
+    until = until or datetime.utcnow() - LAG
+
+    watermarks = {
+        w.metric: w for w in session.query(RollupWatermark).filter(
+            RollupWatermark.metric.in_(METRICS)
+        ).with_for_update()
+    }
+
+    updated = {}
+    for metric in METRICS:
+        watermark = watermarks.get(metric)
+        since = watermark.processed_until if watermark else None
+        if since is not None and since >= until:
+            updated[metric] = 0
+            continue
+
+        rows = _count_window(metric, since, until, session)
+        updated[metric] = bulk_upsert(
+            DailyRollup, rows, ['metric', 'day', 'organization_id'], increment=('count',), session=session
+        )
+        if watermark is None:
+            session.add(RollupWatermark(metric=metric, processed_until=until))
+        else:
+            watermark.processed_until = until
+
+    session.commit()
+    return updated
+
+
+def rebuild(until: Optional[datetime] = None, session=None) -> Dict[str, int]:
+    """Borra los conteos y las marcas de agua y vuelve a contar todo el historial."""
+    session = session or db.session
+    session.execute(delete(DailyRollup))
+    session.execute(delete(RollupWatermark))
+    return run(until, session)
+
+
+def daily_series(metric: str, since: date, organization_id: Optional[int] = None,
+                 session=None) -> List[Tuple[date, int]]:
+    """Conteos por día desde `since` (todas las organizaciones o una), sin días vacíos."""
+    session = session or db.session
+    query = select(DailyRollup.day, func.sum(DailyRollup.count)).where(
+        DailyRollup.metric == metric,
+        DailyRollup.day >= since
+    )
+    if organization_id is not None:
+        query = query.where(DailyRollup.organization_id == organization_id)
+    return [tuple(row) for row in session.execute(query.group_by(DailyRollup.day).order_by(DailyRollup.day))]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Actualiza los conteos diarios de daily_rollups.')
+    parser.add_argument('--interval', type=float, default=0,
+                        help='repetir cada INTERVAL segundos (por defecto se ejecuta una vez)')
+    parser.add_argument('--rebuild', action='store_true', help='borrar los conteos y recontar todo el historial')
+    args = parser.parse_args(argv)
+
+    from flaskapp import create_app
+    app = create_app(bootstrap_only=True)
+    rebuild_first = args.rebuild
+    while True:
+        with app.app_context():
+            try:
+                updated = rebuild() if rebuild_first else run()
+                print(f"daily_rollups: {sum(updated.values())} filas diarias actualizadas", flush=True)
+            except Exception as e:
+                if not args.interval:
+                    raise
+                app.logger.warning(f"No se pudieron actualizar los conteos diarios: {e}")
+            finally:
+                db.session.remove()
+        rebuild_first = False
+        if not args.interval:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
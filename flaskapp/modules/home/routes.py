@@ -3,10 +3,12 @@
 Copyright (c) 2019 - present AppSeed.us
 """
 
-from flask import render_template, request, Blueprint
+from flask import abort, jsonify, render_template, request, Blueprint
 from flask_login import current_user, login_required
 from jinja2 import TemplateNotFound
 
+from flaskapp.database.profiling import sql_profiler
+from flaskapp.modules.auth.decorators import admin_required
 from flaskapp.modules.home.service import DashboardService
 
 from flaskapp.database.models import db
@@ -24,6 +26,16 @@ def index():
     return render_template('home/index.html', segment='index', stats=stats)
 
 
+@home_blueprint.route('/admin/sql-profile')
+@login_required
+@admin_required
+def sql_profile():
+    """Reporte del perfilador SQL (solo con SQL_PROFILING activo)."""
+    if not sql_profiler.enabled:
+        abort(404)
+    return jsonify(sql_profiler.report(recent=request.args.get('recent', 50, type=int)))
+
+
 @home_blueprint.route('/<template>')
 @login_required
 def route_template(template):
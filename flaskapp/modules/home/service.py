@@ -1,75 +1,184 @@
+import threading
+import time
 from datetime import datetime, timedelta
-from sqlalchemy import and_
-from flaskapp.database.models import db, User, Organization, Tournament, Team
+from typing import Optional
+
+from dateutil.relativedelta import relativedelta
+from flask import current_app
+from sqlalchemy import func, select
+from flaskapp.database.models import db, DailyRollup, User, Organization, Tournament, Team
+from flaskapp.database.timebuckets import date_trunc
 from flaskapp.modules.home.dto import DashboardStatsDTO
 from flaskapp.modules.home.utils import TimeLabelGenerator
 
+# Antigüedad máxima del snapshot servido (segundos) y cada cuánto lo renueva el hilo de fondo
+DEFAULT_TTL = 300
+DEFAULT_REFRESH_INTERVAL = 60
+
+COUNTED_MODELS = (User, Organization, Tournament, Team)
+
+
+def _counts(one_month_ago: datetime):
+    """
+    Totales actuales y filas creadas hasta hace un mes, en una sola sentencia
+    (COUNT sobre los índices de created_at; los equipos actuales salen de
+    tournaments.team_count). Son exactos: incluyen las bajas.
+    """
+    def count(model, *criteria):
+        return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+    columns = []
+    for model in COUNTED_MODELS:
+        if model is Team:
+            columns.append(select(func.coalesce(func.sum(Tournament.team_count), 0)).scalar_subquery())
+        else:
+            columns.append(count(model))
+        columns.append(count(model, model.created_at <= one_month_ago))
+    row = db.session.execute(select(*columns)).one()
+    return {
+        model.__tablename__: (row[2 * i], row[2 * i + 1]) for i, model in enumerate(COUNTED_MODELS)
+    }
+
+
+def calculate_change_percentage(current_count, previous_count):
+    if previous_count == 0:
+        if current_count == 0:
+            return 0.0
+        return 100.0  # Si no había registros previos, consideramos crecimiento del 100%
+    return ((current_count - previous_count) / previous_count) * 100
+
+
+class DashboardSnapshot:
+    """
+    Último DashboardStatsDTO calculado y su antigüedad. Las lecturas solo
+    toman el snapshot; se recalcula si venció el TTL (un solo hilo a la vez)
+    o cuando lo renueva el hilo de refresco. El recálculo solo lee: los
+    conteos diarios los avanza el job de rollups (python -m flaskapp.modules.home.rollups).
+
+    Con refresh_interval > 0, la primera lectura de un proceso arranca el hilo
+    de refresco, que termina solo cuando nadie lee el snapshot durante un TTL:
+    los procesos que no sirven el dashboard (otros workers, el reloader de
+    Werkzeug) no consultan nada.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, refresh_interval: float = 0):
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._stats: Optional[DashboardStatsDTO] = None
+        self._computed_at = 0.0
+        self._read_at = 0.0
+        self._refresher: Optional[threading.Thread] = None
+
+    def is_fresh(self) -> bool:
+        return self._stats is not None and time.monotonic() - self._computed_at < self.ttl
+
+    def get(self) -> DashboardStatsDTO:
+        self._read_at = time.monotonic()
+        if self.refresh_interval > 0 and (self._refresher is None or not self._refresher.is_alive()):
+            self.start_refresher(current_app._get_current_object(), self.refresh_interval)
+        if self.is_fresh():
+            return self._stats
+        with self._lock:
+            if not self.is_fresh():  # Otro hilo pudo recalcularlo mientras esperábamos
+                self._store(self._compute())
+            return self._stats
+
+    def refresh(self) -> DashboardStatsDTO:
+        stats = self._compute()
+        with self._lock:
+            self._store(stats)
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats, self._computed_at = None, 0.0
+
+    @staticmethod
+    def _compute() -> DashboardStatsDTO:
+        return DashboardService.compute_dashboard_stats()
+
+    def _store(self, stats: DashboardStatsDTO) -> None:
+        self._stats, self._computed_at = stats, time.monotonic()
+
+    def start_refresher(self, app, interval: float = DEFAULT_REFRESH_INTERVAL) -> None:
+        """
+        Hilo daemon que recalcula el snapshot cada `interval` segundos (uno por
+        proceso) mientras se siga leyendo: sale tras un TTL sin lecturas.
+        """
+        def run():
+            while True:
+                time.sleep(interval)
+                if time.monotonic() - self._read_at >= self.ttl:
+                    return  # Nadie lee el dashboard: la próxima lectura lo vuelve a arrancar
+                with app.app_context():
+                    try:
+                        self.refresh()
+                    except Exception as e:
+                        app.logger.warning(f"No se pudo actualizar el snapshot del dashboard: {e}")
+                    finally:
+                        db.session.remove()
+
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(target=run, name='dashboard-snapshot', daemon=True)
+            self._refresher.start()
+
+
+dashboard_snapshot = DashboardSnapshot()
+
+
 class DashboardService:
     @staticmethod
     def get_dashboard_stats():
-        # Totales actuales
-        total_users = User.query.count()
-        total_organizations = Organization.query.count()
-        total_tournaments = Tournament.query.count()
-        total_teams = Team.query.count()
+        """Estadísticas del dashboard desde el snapshot (sin consultas mientras esté vigente)."""
+        return dashboard_snapshot.get()
 
-        # Fechas para cálculos de variación
+    @staticmethod
+    def compute_dashboard_stats():
+        """
+        Calcula el DTO con dos consultas: totales y valores de hace un mes
+        exactos (_counts) y los usuarios por mes del gráfico desde daily_rollups
+        (hasta su marca de agua), agrupados por mes calendario (date_trunc).
+        Los conteos diarios no descuentan bajas, por eso no se usan para totales.
+        """
         now = datetime.utcnow()
-        one_month_ago = now - timedelta(days=30)
-        
-        # Cálculo de variaciones porcentuales
-        def calculate_change_percentage(current_count, previous_count):
-            if previous_count == 0:
-                if current_count == 0:
-                    return 0.0
-                return 100.0  # Si no había registros previos, consideramos crecimiento del 100%
-            return ((current_count - previous_count) / previous_count) * 100
-
-        # Usuarios
-        users_month_ago = User.query.filter(User.created_at <= one_month_ago).count()
-        users_change = calculate_change_percentage(total_users, users_month_ago)
-
-        # Organizaciones
-        orgs_month_ago = Organization.query.filter(Organization.created_at <= one_month_ago).count()
-        orgs_change = calculate_change_percentage(total_organizations, orgs_month_ago)
-
-        # Torneos
-        tournaments_month_ago = Tournament.query.filter(Tournament.created_at <= one_month_ago).count()
-        tournaments_change = calculate_change_percentage(total_tournaments, tournaments_month_ago)
-
-        # Equipos
-        teams_month_ago = Team.query.filter(Team.created_at <= one_month_ago).count()
-        teams_change = calculate_change_percentage(total_teams, teams_month_ago)
-
-        # Usuarios últimos 6 meses
-        users_last_6_months = []
-        for i in range(5, -1, -1):  # Desde hace 5 meses hasta el mes actual
-            month_start = now.replace(day=1) - timedelta(days=30*i)
-            next_month_start = month_start + timedelta(days=32)
-            next_month_start = next_month_start.replace(day=1)
-            
-            users_in_month = User.query.filter(
-                and_(
-                    User.created_at >= month_start,
-                    User.created_at < next_month_start
-                )
-            ).count()
-            users_last_6_months.append(users_in_month)
+        counts = _counts(now - timedelta(days=30))
+
+        # Usuarios últimos 6 meses (meses calendario, desde hace 5 meses hasta el actual)
+        current_month = now.replace(day=1)
+        chart_months = [current_month - relativedelta(months=i) for i in range(5, -1, -1)]
+        month = date_trunc('month', DailyRollup.day)
+        per_month = select(month, func.sum(DailyRollup.count)).where(
+            DailyRollup.metric == User.__tablename__,
+            DailyRollup.day >= chart_months[0].date()
+        ).group_by(month)
+        users_by_month = {
+            (bucket.year, bucket.month): created
+            for bucket, created in db.session.execute(per_month) if bucket is not None
+        }
+        users_last_6_months = [users_by_month.get((m.year, m.month), 0) for m in chart_months]
 
         # Últimos 6 meses como etiquetas
         label_generator = TimeLabelGenerator()
-        last_6_months = label_generator.get_last_month_labels()    
+        last_6_months = label_generator.get_last_month_labels()
+
+        def change(model):
+            return calculate_change_percentage(*counts[model.__tablename__])
+
+        def total(model):
+            return counts[model.__tablename__][0]
 
         return DashboardStatsDTO(
-            total_users=total_users,
-            users_change_percentage=users_change,
-            total_organizations=total_organizations,
-            organizations_change_percentage=orgs_change,
-            total_tournaments=total_tournaments,
-            tournaments_change_percentage=tournaments_change,
-            total_teams=total_teams,
-            teams_change_percentage=teams_change,
+            total_users=total(User),
+            users_change_percentage=change(User),
+            total_organizations=total(Organization),
+            organizations_change_percentage=change(Organization),
+            total_tournaments=total(Tournament),
+            tournaments_change_percentage=change(Tournament),
+            total_teams=total(Team),
+            teams_change_percentage=change(Team),
             users_last_6_months=users_last_6_months,
             last_6_months=last_6_months
         )
-    
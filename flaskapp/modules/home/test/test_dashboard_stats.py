@@ -0,0 +1,128 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import Activity, Organization, Team, Tournament, TournamentStatus, User, db
+from flaskapp.modules.home import rollups
+from flaskapp.modules.home.service import DashboardService, DashboardSnapshot
+from flaskapp.modules.teams.service import TeamService
+from tests.factory import QueryCounter, seed_statuses
+
+"""
+Estadísticas del dashboard (DashboardService)
+    test_two_statements: totales y variaciones exactos en una consulta; usuarios por mes en otra a daily_rollups.
+    test_deletes_not_counted: borrar equipos y usuarios descuenta los totales aunque daily_rollups no los reste.
+    test_calendar_months: los usuarios se agrupan por mes calendario, no por bloques de 30 días.
+    test_snapshot_ttl: el snapshot se sirve sin consultas mientras está vigente y su recálculo solo lee.
+    test_refresher_follows_reads: el hilo de refresco arranca con la primera lectura y sale sin lecturas.
+"""
+
+
+@pytest.fixture
+def app(app):
+    seed_statuses()
+    return app
+
+
+def add_users(*created_at):
+    for i, when in enumerate(created_at):
+        db.session.add(User(name=f'u{i}', email=f'u{i}-{when.timestamp()}@test.com', created_at=when))
+    db.session.commit()
+
+
+def roll_up():
+    rollups.run(until=datetime.utcnow() + timedelta(seconds=1))
+
+
+class TestDashboardStats:
+    def test_two_statements(self, app):
+        now = datetime.utcnow()
+        add_users(now, now - timedelta(days=1), now - timedelta(days=40), now - timedelta(days=400))
+        owner = User.query.first()
+        db.session.add(Organization(name='Org', created_by=owner.id, created_at=now - timedelta(days=60)))
+        db.session.commit()
+        roll_up()
+
+        with QueryCounter() as counter:
+            stats = DashboardService.compute_dashboard_stats()
+        assert counter.count == 2
+        assert stats.total_users == 4
+        assert stats.users_change_percentage == 100.0  # 2 hace un mes -> 4
+        assert stats.total_organizations == 1
+        assert stats.organizations_change_percentage == 0.0
+        assert (stats.total_tournaments, stats.tournaments_change_percentage) == (0, 0.0)
+        assert len(stats.users_last_6_months) == len(stats.last_6_months) == 6
+
+    def test_deletes_not_counted(self, app):
+        now = datetime.utcnow()
+        add_users(now - timedelta(days=60), now - timedelta(days=50), now)
+        owner = User.query.first()
+        organization = Organization(name='Org', created_by=owner.id, created_at=now - timedelta(days=60))
+        activity = Activity(name='Actividad', min_players_per_team=1, created_by=owner.id)
+        db.session.add_all([organization, activity])
+        db.session.flush()
+        tournament = Tournament(organization_id=organization.id, activity_id=activity.id, name='Torneo', max_teams=8,
+                                created_by=owner.id, created_at=now - timedelta(days=60),
+                                status_id=lookups.id_of(TournamentStatus, 'REGISTRATION_OPEN'))
+        db.session.add(tournament)
+        db.session.flush()
+        teams = [Team(tournament_id=tournament.id, name=f'Equipo {i}', created_at=now - timedelta(days=45))
+                 for i in range(4)]
+        db.session.add_all(teams)
+        db.session.commit()
+        roll_up()
+
+        TeamService.delete_team(teams[0].id)
+        db.session.delete(User.query.filter_by(name='u2').one())
+        db.session.commit()
+        roll_up()
+
+        stats = DashboardService.compute_dashboard_stats()
+        assert (stats.total_teams, stats.teams_change_percentage) == (3, 0.0)
+        assert (stats.total_users, stats.users_change_percentage) == (2, 0.0)
+        assert stats.total_tournaments == 1
+
+    def test_calendar_months(self, app):
+        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        add_users(
+            month_start,
+            month_start - timedelta(seconds=1),              # Último instante del mes anterior
+            month_start - relativedelta(months=5),           # Primer mes del gráfico
+            month_start - relativedelta(months=6),           # Fuera del gráfico
+        )
+        roll_up()
+        stats = DashboardService.compute_dashboard_stats()
+        assert stats.users_last_6_months == [1, 0, 0, 0, 1, 1]
+        assert stats.total_users == 4
+
+    def test_snapshot_ttl(self, app):
+        snapshot = DashboardSnapshot(ttl=60)
+        add_users(datetime.utcnow())
+        first = snapshot.get()
+
+        add_users(datetime.utcnow())
+        with QueryCounter() as counter:
+            assert snapshot.get() is first
+        assert counter.count == 0
+
+        snapshot.ttl = 0
+        with QueryCounter() as counter:
+            assert snapshot.get().total_users == 2
+        assert not any(s.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')) for s in counter.statements)
+
+    def test_refresher_follows_reads(self, app):
+        snapshot = DashboardSnapshot(ttl=0.2, refresh_interval=0.01)
+        stats, refreshed = object(), []
+        snapshot._compute = lambda: refreshed.append(1) or stats
+        assert snapshot._refresher is None  # Crear la app no arranca nada
+
+        snapshot.get()
+        assert snapshot._refresher.is_alive()
+        time.sleep(0.1)
+        assert len(refreshed) > 1
+
+        snapshot._refresher.join(timeout=2)  # Sin lecturas durante un TTL, el hilo termina
+        assert not snapshot._refresher.is_alive()
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+
+from flaskapp.database.models import DailyRollup, RollupWatermark, Tournament, User, db
+from flaskapp.modules.home import rollups
+from flaskapp.modules.matches.service import MatchService
+from tests.factory import QueryCounter, create_started_tournament, match_by_number, seed_statuses
+
+"""
+Conteos diarios incrementales (flaskapp.modules.home.rollups)
+    test_incremental_matches_rebuild: varias ejecuciones incrementales equivalen a recontar todo.
+    test_watermark_window: solo se cuentan filas hasta la marca; repetir la ejecución no suma nada.
+    test_matches_by_organization: partidas completadas por organización, sin recontar correcciones.
+"""
+
+
+def add_users(*created_at):
+    for when in created_at:
+        db.session.add(User(name='u', email=f'u-{when.timestamp()}@test.com', created_at=when))
+    db.session.commit()
+
+
+def snapshot():
+    return {(r.metric, r.day, r.organization_id): r.count for r in DailyRollup.query if r.count}
+
+
+class TestRollups:
+    def test_incremental_matches_rebuild(self, app):
+        create_started_tournament(4)
+        now = datetime.utcnow()
+        add_users(now - timedelta(days=4), now - timedelta(days=3), now - timedelta(days=1))
+        rollups.run(until=now - timedelta(days=2))
+
+        add_users(now - timedelta(hours=1), now - timedelta(days=1, hours=1))
+        rollups.run(until=now + timedelta(minutes=5))
+        incremental = snapshot()
+
+        rollups.rebuild(until=now + timedelta(minutes=5))
+        assert snapshot() == incremental
+        users = dict(rollups.daily_series('users', (now - timedelta(days=7)).date()))
+        assert users[(now - timedelta(days=3)).date()] == 1
+        assert sum(users.values()) == 5 + 9  # 5 usuarios + árbitro y 8 jugadores del torneo
+
+    def test_watermark_window(self, app):
+        seed_statuses()
+        now = datetime.utcnow()
+        add_users(now - timedelta(hours=2), now - timedelta(minutes=30))
+        rollups.run(until=now - timedelta(hours=1))
+        assert sum(count for _, count in rollups.daily_series('users', (now - timedelta(days=1)).date())) == 1
+        assert db.session.get(RollupWatermark, 'users').processed_until == now - timedelta(hours=1)
+
+        with QueryCounter() as counter:
+            updated = rollups.run(until=now - timedelta(hours=1))
+        assert set(updated.values()) == {0}
+        assert counter.count == 1  # Solo las marcas de agua (FOR UPDATE)
+
+    def test_matches_by_organization(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        semi = match_by_number(t, 2)
+        assert MatchService.update_match(semi.id, {'user_id': ids['referee_id'], 'score_team_a': 2, 'score_team_b': 0})
+        rollups.run(until=datetime.utcnow() + timedelta(seconds=1))
+
+        # Corrección del mismo partido: conserva completed_at, no se vuelve a contar
+        assert MatchService.update_match(semi.id, {'user_id': ids['referee_id'], 'score_team_a': 0, 'score_team_b': 2})
+        rollups.run(until=datetime.utcnow() + timedelta(seconds=2))
+
+        organization_id = db.session.get(Tournament, t).organization_id
+        today = datetime.utcnow().date()
+        assert rollups.daily_series('matches_completed', today, organization_id) == [(today, 1)]
+        assert rollups.daily_series('teams', today, organization_id) == [(today, 4)]
+        assert rollups.daily_series('matches_completed', today, organization_id + 1) == []
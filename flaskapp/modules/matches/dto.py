@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 @dataclass
 class MatchDTO:
@@ -35,4 +35,10 @@ class MatchUpdateDTO:
     score_team_b: Optional[int]
     best_player_id: Optional[int]
     status: str
-    recorded_by_referee_id: int
\ No newline at end of file
+    recorded_by_referee_id: int
+
+@dataclass
+class BatchResultDTO:
+    updated: List[int] = field(default_factory=list)  # ids de partidos guardados
+    errors: List[Dict] = field(default_factory=list)  # {'match_id': ..., 'error': ...}
+    authorized: bool = True
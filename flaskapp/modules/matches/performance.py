@@ -0,0 +1,146 @@
+"""
+Rendimiento histórico por usuario (tabla user_performance).
+
+Cada partida completada (sin contar byes) suma una partida jugada a cada miembro
+de ambos equipos. Los miembros del ganador suman además una victoria y, si la
+partida definió al campeón, una final ganada.
+
+El agregado se mantiene de forma incremental:
+- record_results: al completar o corregir partidas (update_match, submit_results).
+- rebuild: recalcula todo con un solo INSERT ... SELECT (seeder, bases existentes).
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select, union_all
+
+from flaskapp.database.bulk import bulk_upsert
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import Match, MatchStatus, TeamMember, UserPerformance, db
+
+STAT_COLUMNS = ('matches_played', 'wins', 'finals_won')
+
+
+def is_title_match(bracket: str, level: int, winner_id: Optional[int], team_a_id: Optional[int]) -> bool:
+    """
+    La partida que define al campeón: la final del bracket principal o la gran
+    final (la revancha o, si team_a gana la primera, esa misma).
+    """
+    if bracket == 'MAIN':
+        return level == 0
+    if bracket == 'GRAND_FINAL':
+        return level == 0 or winner_id == team_a_id
+    return False
+
+
+def _title_condition():
+    """is_title_match como expresión SQL (para rebuild)."""
+    return or_(
+        and_(Match.bracket == 'MAIN', Match.level == 0),
+        and_(Match.bracket == 'GRAND_FINAL', or_(Match.level == 0, Match.winner_id == Match.team_a_id)),
+    )
+
+
+def _team_deltas(changes: Iterable[Tuple[Match, Optional[int]]]) -> Dict[int, List[int]]:
+    deltas: Dict[int, List[int]] = defaultdict(lambda: [0, 0, 0])
+
+    def add_win(match: Match, winner_id: int, sign: int) -> None:
+        deltas[winner_id][1] += sign
+        if is_title_match(match.bracket, match.level, winner_id, match.team_a_id):
+            deltas[winner_id][2] += sign
+
+    for match, previous_winner_id in changes:
+        if match.is_bye or not match.winner_id or previous_winner_id == match.winner_id:
+            continue
+        if previous_winner_id is None:
+            deltas[match.team_a_id][0] += 1
+            deltas[match.team_b_id][0] += 1
+        else:
+            add_win(match, previous_winner_id, -1)  # Corrección: se revierte el ganador anterior
+        add_win(match, match.winner_id, 1)
+
+    return {team_id: delta for team_id, delta in deltas.items() if any(delta)}
+
+
+def record_results(changes: Iterable[Tuple[Match, Optional[int]]], session=None) -> int:
+    """
+    Aplica al agregado partidas recién completadas o corregidas.
+
+    `changes` son pares (partida ya completada, ganador anterior); el ganador
+    anterior es None si la partida recién se completa. Usa una consulta para los
+    miembros de los equipos involucrados y un upsert (bulk_upsert). No hace commit.
+    Retorna la cantidad de usuarios actualizados.
+    """
+    session = session or db.session
+    team_deltas = _team_deltas(changes)
+    if not team_deltas:
+        return 0
+
+    user_deltas: Dict[int, List[int]] = defaultdict(lambda: [0, 0, 0])
+    members = session.query(TeamMember.team_id, TeamMember.user_id).filter(
+        TeamMember.team_id.in_(list(team_deltas))
+    )
+    for team_id, user_id in members:
+        for i, value in enumerate(team_deltas[team_id]):
+            user_deltas[user_id][i] += value
+
+    # Orden estable por usuario: evita interbloqueos entre transacciones concurrentes
+    now = datetime.utcnow()
+    rows = [
+        {'user_id': user_id, **dict(zip(STAT_COLUMNS, user_deltas[user_id])), 'updated_at': now}
+        for user_id in sorted(user_deltas)
+    ]
+    return bulk_upsert(UserPerformance, rows, ['user_id'], increment=STAT_COLUMNS, session=session)
+
+
+def rebuild(session=None) -> int:
+    """
+    Recalcula el agregado completo desde el historial de partidas con un solo
+    INSERT ... SELECT (cada partida aporta una fila por lado). No hace commit.
+    """
+    session = session or db.session
+    completed_status_id = lookups.id_of(MatchStatus, 'COMPLETED')
+
+    sides = union_all(*(
+        select(
+            side.label('team_id'),
+            case((Match.winner_id == side, 1), else_=0).label('won'),
+            case((and_(Match.winner_id == side, _title_condition()), 1), else_=0).label('final_won'),
+        ).where(
+            Match.status_id == completed_status_id,
+            Match.is_bye.is_(False),
+            Match.winner_id.isnot(None)
+        )
+        for side in (Match.team_a_id, Match.team_b_id)
+    )).subquery()
+
+    per_user = select(
+        TeamMember.user_id,
+        func.count(),
+        func.sum(sides.c.won),
+        func.sum(sides.c.final_won),
+        func.now()
+    ).join(sides, sides.c.team_id == TeamMember.team_id).group_by(TeamMember.user_id)
+
+    session.execute(delete(UserPerformance))
+    result = session.execute(insert(UserPerformance).from_select(
+        ['user_id', *STAT_COLUMNS, 'updated_at'], per_user
+    ))
+    return result.rowcount
+
+
+def ensure_built(session=None) -> bool:
+    """Reconstruye el agregado si está vacío y ya hay partidas completadas (bases existentes)."""
+    session = session or db.session
+    if session.query(UserPerformance.user_id).first() is not None:
+        return False
+    completed = session.query(Match.id).filter(
+        Match.status_id == lookups.id_of(MatchStatus, 'COMPLETED')
+    ).first()
+    if completed is None:
+        return False
+    rebuild(session)
+    session.commit()
+    return True
@@ -0,0 +1,407 @@
+"""
+Ratings Elo por usuario y actividad (tabla user_ratings).
+
+Un equipo juega con el promedio de los ratings de sus miembros (quien no tiene
+rating parte en DEFAULT_RATING). Tras cada partida, cada miembro del ganador
+suma K·(1 - E) y cada miembro del perdedor resta lo mismo, con
+E = 1 / (1 + 10^((R_rival - R_propio) / 400)).
+
+- record_results: actualización incremental al completar partidas. Elo depende
+  del orden, así que una corrección de resultado no se resuelve en la petición:
+  encola la actividad (rating_recomputes) y el job de ratings la recalcula.
+- recompute: recalcula todo el historial en orden cronológico con NumPy.
+  Las partidas se agrupan en capas donde ningún jugador se repite: dentro de
+  una capa todas las partidas son independientes y se procesan en bloque con
+  operaciones vectorizadas, con el mismo resultado que el recorrido secuencial.
+  La asignación de capas también es vectorizada (orden topológico por niveles).
+
+Ambas rutas mantienen también user_rating_buckets (usuarios por tramo de
+BUCKET_WIDTH puntos en cada actividad), que usa el ranking de actividades para
+calcular la posición de un usuario sin recorrer a todos los que tiene delante.
+
+El job de correcciones lo ejecuta un solo proceso programado:
+
+    python -m flaskapp.modules.matches.ratings                # una vez (cron)
+    python -m flaskapp.modules.matches.ratings --interval 10  # proceso dedicado, cada 10 s
+"""
+
+import argparse
+import math
+import time
+from collections import Counter, defaultdict, namedtuple
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, func
+
+from flaskapp.database.bulk import bulk_insert, bulk_upsert
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import (
+    Match, MatchStatus, RatingRecompute, Team, TeamMember, Tournament, UserRating, UserRatingBucket, db
+)
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 32.0
+SCALE = 400.0
+BUCKET_WIDTH = 5.0
+
+SeededTeam = namedtuple('SeededTeam', 'id seed_score')
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / SCALE))
+
+
+def elo_delta(team_a_rating: float, team_b_rating: float, a_won: bool, k: float = K_FACTOR) -> float:
+    """Cambio para cada miembro de team_a (team_b recibe el opuesto)."""
+    return k * ((1.0 if a_won else 0.0) - expected_score(team_a_rating, team_b_rating))
+
+
+def bucket_of(rating: float) -> int:
+    return math.floor(rating / BUCKET_WIDTH)
+
+
+def _bucket_rows(counts: Dict[Tuple[int, int], int]) -> List[dict]:
+    return [
+        {'activity_id': activity_id, 'bucket': bucket, 'players': players}
+        for (activity_id, bucket), players in sorted(counts.items()) if players
+    ]
+
+
+def _team_rating(members: Sequence[int], ratings: Dict[int, float]) -> float:
+    if not members:
+        return DEFAULT_RATING
+    return sum(ratings.get(user_id, DEFAULT_RATING) for user_id in members) / len(members)
+
+
+def apply_match(
+    ratings: Dict[int, float],
+    games: Dict[int, int],
+    team_a: Sequence[int],
+    team_b: Sequence[int],
+    a_won: bool,
+    k: float = K_FACTOR
+) -> float:
+    """Aplica una partida sobre los diccionarios {user_id: rating/partidas}. Retorna el delta de team_a."""
+    delta = elo_delta(_team_rating(team_a, ratings), _team_rating(team_b, ratings), a_won, k)
+    for members, change in ((team_a, delta), (team_b, -delta)):
+        for user_id in members:
+            ratings[user_id] = ratings.get(user_id, DEFAULT_RATING) + change
+            games[user_id] = games.get(user_id, 0) + 1
+    return delta
+
+
+def _layers(offsets: np.ndarray, players: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Recorre las capas en orden: (partidas de la capa, en orden ascendente;
+    cuántas filas de `players` tiene cada una). La capa de una partida es
+    1 + la capa de la última partida de cualquiera de sus jugadores, así que
+    las partidas de una capa no comparten jugadores.
+
+    Todo con NumPy: cada fila apunta a la siguiente partida del mismo jugador
+    (un solo sort por jugador y orden cronológico) y cada partida espera a
+    tantas predecesoras como jugadores con partidas anteriores; una capa es la
+    lista de partidas sin predecesoras pendientes (orden topológico por niveles).
+    """
+    match_count = len(offsets) - 1
+    match_of = np.repeat(np.arange(match_count), np.diff(offsets))
+    row_count = len(players)
+    # Filas por jugador y, dentro de cada jugador, cronológicas (clave única: un sort de valores)
+    key = players * row_count + np.arange(row_count)
+    key.sort()
+    order = key % row_count
+    chained = players[order[1:]] == players[order[:-1]]
+    following = np.full(row_count, -1, dtype=np.int64)
+    following[order[:-1][chained]] = order[1:][chained]
+    pending = np.bincount(match_of[order[1:][chained]], minlength=match_count)
+
+    frontier = np.flatnonzero(pending == 0)
+    while frontier.size:
+        starts, lengths = offsets[frontier], offsets[frontier + 1] - offsets[frontier]
+        yield frontier, lengths
+        rows = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        successors = following[rows]
+        ready, hits = np.unique(match_of[successors[successors >= 0]], return_counts=True)
+        pending[ready] -= hits
+        frontier = ready[pending[ready] == 0]
+
+
+def match_layers(offsets: np.ndarray, players: np.ndarray) -> np.ndarray:
+    """Capa de cada partida (ver _layers)."""
+    offsets, players = np.asarray(offsets, dtype=np.int64), np.asarray(players, dtype=np.int64)
+    layers = np.zeros(len(offsets) - 1, dtype=np.int64)
+    if len(players):
+        for layer, (matches, _) in enumerate(_layers(offsets, players)):
+            layers[matches] = layer
+    return layers
+
+
+def compute_ratings(
+    offsets: np.ndarray,
+    players: np.ndarray,
+    sides: np.ndarray,
+    a_won: np.ndarray,
+    player_count: int,
+    initial: Optional[np.ndarray] = None,
+    k: float = K_FACTOR
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ratings tras procesar `len(a_won)` partidas en orden cronológico.
+
+    Formato CSR: los participantes de la partida i son
+    players[offsets[i]:offsets[i + 1]] (índices 0..player_count-1) y
+    sides[j] es 0 para team_a y 1 para team_b. Retorna (ratings, partidas).
+    """
+    ratings = np.full(player_count, DEFAULT_RATING) if initial is None else np.asarray(initial, dtype=float).copy()
+    games = np.zeros(player_count, dtype=np.int64)
+    offsets, players = np.asarray(offsets, dtype=np.int64), np.asarray(players, dtype=np.int64)
+    sides, outcome = np.asarray(sides, dtype=np.int64), np.asarray(a_won, dtype=float)
+    if len(outcome) == 0 or len(players) == 0:
+        return ratings, games
+
+    for matches, lengths in _layers(offsets, players):
+        # Filas de la capa, agrupadas por partida (partida local = posición en `matches`)
+        starts = offsets[matches]
+        rows = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        local_index = np.repeat(np.arange(len(matches)), lengths)
+        layer_players, layer_sides = players[rows], sides[rows]
+
+        # Promedio de cada lado: clave = partida local * 2 + lado
+        key = local_index * 2 + layer_sides
+        size = 2 * len(matches)
+        totals = np.bincount(key, weights=ratings[layer_players], minlength=size)
+        counts = np.bincount(key, minlength=size)
+        means = np.where(counts > 0, totals / np.maximum(counts, 1), DEFAULT_RATING)
+
+        expected_a = 1.0 / (1.0 + 10.0 ** ((means[1::2] - means[0::2]) / SCALE))
+        delta_a = k * (outcome[matches] - expected_a)
+        ratings[layer_players] += np.where(layer_sides == 0, delta_a[local_index], -delta_a[local_index])
+        games[layer_players] += 1
+
+    return ratings, games
+
+
+def _completed_matches_query(session, activity_id: Optional[int]):
+    query = session.query(
+        Tournament.activity_id, Match.team_a_id, Match.team_b_id, Match.winner_id
+    ).join(Tournament, Tournament.id == Match.tournament_id).filter(
+        Match.status_id == lookups.id_of(MatchStatus, 'COMPLETED'),
+        Match.is_bye.is_(False),
+        Match.winner_id.isnot(None),
+        Match.team_b_id.isnot(None)
+    )
+    if activity_id is not None:
+        query = query.filter(Tournament.activity_id == activity_id)
+    return query.order_by(Match.completed_at, Match.id)
+
+
+def recompute(activity_id: Optional[int] = None, session=None, method: Optional[str] = None) -> int:
+    """
+    Recalcula los ratings de una actividad (o de todas) desde el historial
+    completo: dos consultas (partidas y miembros), el cálculo vectorizado y una
+    inserción masiva (ratings y tramos). No hace commit. Retorna la cantidad de
+    ratings escritos.
+    """
+    session = session or db.session
+
+    members_query = session.query(TeamMember.team_id, TeamMember.user_id)
+    if activity_id is not None:
+        members_query = members_query.join(Team, Team.id == TeamMember.team_id).join(
+            Tournament, Tournament.id == Team.tournament_id
+        ).filter(Tournament.activity_id == activity_id)
+    members: Dict[int, List[int]] = defaultdict(list)
+    for team_id, user_id in members_query:
+        members[team_id].append(user_id)
+
+    by_activity: Dict[int, List[Tuple[int, int, int]]] = defaultdict(list)
+    for match_activity_id, team_a_id, team_b_id, winner_id in _completed_matches_query(session, activity_id):
+        by_activity[match_activity_id].append((team_a_id, team_b_id, winner_id))
+
+    now = datetime.utcnow()
+    rows = []
+    for current_activity_id, matches in by_activity.items():
+        user_index: Dict[int, int] = {}
+        offsets, players, sides, a_won = [0], [], [], []
+        for team_a_id, team_b_id, winner_id in matches:
+            for side, team_id in enumerate((team_a_id, team_b_id)):
+                for user_id in members.get(team_id, ()):
+                    players.append(user_index.setdefault(user_id, len(user_index)))
+                    sides.append(side)
+            offsets.append(len(players))
+            a_won.append(winner_id == team_a_id)
+
+        ratings, games = compute_ratings(
+            np.asarray(offsets, dtype=np.int64), np.asarray(players, dtype=np.int64),
+            np.asarray(sides, dtype=np.int64), np.asarray(a_won, dtype=bool), len(user_index)
+        )
+        rows.extend(
+            {'user_id': user_id, 'activity_id': current_activity_id, 'rating': float(ratings[i]),
+             'matches_rated': int(games[i]), 'updated_at': now}
+            for user_id, i in user_index.items()
+        )
+
+    for model in (UserRating, UserRatingBucket):
+        stale = delete(model)
+        if activity_id is not None:
+            stale = stale.where(model.activity_id == activity_id)
+        session.execute(stale)
+    buckets = Counter((row['activity_id'], bucket_of(row['rating'])) for row in rows)
+    bulk_insert(UserRatingBucket, _bucket_rows(buckets), method=method, session=session)
+    return bulk_insert(UserRating, rows, method=method, session=session)
+
+
+def ensure_built(session=None) -> bool:
+    """
+    Recalcula todos los ratings si aún no hay tramos y ya hay partidas
+    completadas (bases existentes, incluidas las que tienen ratings sin tramos).
+    """
+    session = session or db.session
+    if session.query(UserRatingBucket.activity_id).first() is not None:
+        return False
+    if _completed_matches_query(session, None).first() is None:
+        return False
+    recompute(session=session)
+    session.commit()
+    return True
+
+
+def record_results(activity_id: int, changes: Iterable[Tuple[Match, Optional[int]]], session=None) -> int:
+    """
+    Actualiza los ratings con partidas recién completadas, en el orden dado.
+    `changes` son pares (partida completada, ganador anterior) como en
+    performance.record_results; si alguna es una corrección, se encola la
+    actividad para el job (request_recompute) y no se toca ningún rating. Una
+    consulta (miembros + ratings actuales) y dos upserts (ratings y tramos).
+    No hace commit.
+    """
+    session = session or db.session
+    changes = [(m, previous) for m, previous in changes if not m.is_bye and m.winner_id and m.team_b_id]
+    if any(previous is not None and previous != m.winner_id for m, previous in changes):
+        request_recompute(activity_id, session)
+        return 0
+
+    new_matches = [m for m, previous in changes if previous is None]
+    if not new_matches:
+        return 0
+
+    team_ids = {team_id for m in new_matches for team_id in (m.team_a_id, m.team_b_id)}
+    rows = session.query(
+        TeamMember.team_id, TeamMember.user_id, UserRating.rating, UserRating.matches_rated
+    ).outerjoin(UserRating, and_(
+        UserRating.user_id == TeamMember.user_id, UserRating.activity_id == activity_id
+    )).filter(TeamMember.team_id.in_(team_ids))
+
+    members: Dict[int, List[int]] = defaultdict(list)
+    ratings: Dict[int, float] = {}
+    games: Dict[int, int] = {}
+    previous: Dict[int, Optional[float]] = {}
+    for team_id, user_id, rating, matches_rated in rows:
+        members[team_id].append(user_id)
+        previous[user_id] = rating
+        ratings[user_id] = DEFAULT_RATING if rating is None else rating
+        games[user_id] = matches_rated or 0
+
+    for match in new_matches:
+        apply_match(ratings, games, members[match.team_a_id], members[match.team_b_id],
+                    match.winner_id == match.team_a_id)
+
+    # Mover a cada usuario de tramo (los nuevos solo entran)
+    bucket_deltas: Dict[Tuple[int, int], int] = defaultdict(int)
+    for user_id, rating in previous.items():
+        if rating is not None:
+            bucket_deltas[(activity_id, bucket_of(rating))] -= 1
+        bucket_deltas[(activity_id, bucket_of(ratings[user_id]))] += 1
+    bulk_upsert(UserRatingBucket, _bucket_rows(bucket_deltas), ['activity_id', 'bucket'],
+                increment=('players',), session=session)
+
+    now = datetime.utcnow()
+    return bulk_upsert(UserRating, [
+        {'user_id': user_id, 'activity_id': activity_id, 'rating': ratings[user_id],
+         'matches_rated': games[user_id], 'updated_at': now}
+        for user_id in sorted(ratings)
+    ], ['user_id', 'activity_id'], session=session)
+
+
+def request_recompute(activity_id: int, session=None) -> None:
+    """Encola la actividad para el job (un upsert; renueva requested_at si ya estaba). No hace commit."""
+    session = session or db.session
+    bulk_upsert(RatingRecompute, [{'activity_id': activity_id, 'requested_at': datetime.utcnow()}],
+                ['activity_id'], session=session)
+
+
+def run_pending(session=None) -> List[int]:
+    """
+    Recalcula las actividades encoladas, una transacción por actividad. Cada
+    pedido se borra solo si nadie lo renovó mientras tanto (mismo requested_at):
+    una corrección que llega durante el recálculo queda para la siguiente
+    pasada. Hace commit. Retorna las actividades recalculadas.
+    """
+    session = session or db.session
+    pending = session.query(RatingRecompute.activity_id, RatingRecompute.requested_at).order_by(
+        RatingRecompute.requested_at
+    ).all()
+
+    for activity_id, requested_at in pending:
+        recompute(activity_id, session)
+        session.execute(delete(RatingRecompute).where(
+            RatingRecompute.activity_id == activity_id,
+            RatingRecompute.requested_at == requested_at
+        ))
+        session.commit()
+    return [activity_id for activity_id, _ in pending]
+
+
+def team_seed_scores(tournament_id: Optional[int] = None, team_id: Optional[int] = None, session=None) -> List[SeededTeam]:
+    """
+    Seed de los equipos de un torneo (o de un equipo): el promedio redondeado
+    de los ratings de sus miembros en la actividad del torneo, con una sola
+    consulta agrupada. Ante empate se conserva el orden del seed guardado.
+    """
+    session = session or db.session
+    query = session.query(
+        Team.id, func.avg(func.coalesce(UserRating.rating, DEFAULT_RATING)), func.count(TeamMember.id)
+    ).join(Tournament, Tournament.id == Team.tournament_id).outerjoin(
+        TeamMember, TeamMember.team_id == Team.id
+    ).outerjoin(UserRating, and_(
+        UserRating.user_id == TeamMember.user_id, UserRating.activity_id == Tournament.activity_id
+    ))
+    if tournament_id is not None:
+        query = query.filter(Team.tournament_id == tournament_id)
+    if team_id is not None:
+        query = query.filter(Team.id == team_id)
+    rows = query.group_by(Team.id, Team.seed_score).order_by(Team.seed_score.desc(), Team.id).all()
+
+    return [
+        SeededTeam(row_team_id, max(0, round(average if member_count else DEFAULT_RATING)))
+        for row_team_id, average, member_count in rows
+    ]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Recalcula los ratings de las actividades con correcciones pendientes.')
+    parser.add_argument('--interval', type=float, default=0,
+                        help='repetir cada INTERVAL segundos (por defecto se ejecuta una vez)')
+    args = parser.parse_args(argv)
+
+    from flaskapp import create_app
+    app = create_app(bootstrap_only=True)
+    while True:
+        with app.app_context():
+            try:
+                done = run_pending()
+                if done or not args.interval:
+                    print(f"ratings: {len(done)} actividades recalculadas", flush=True)
+            except Exception as e:
+                if not args.interval:
+                    raise
+                app.logger.warning(f"No se pudieron recalcular los ratings: {e}")
+            finally:
+                db.session.remove()
+        if not args.interval:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
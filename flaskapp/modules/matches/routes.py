@@ -1,4 +1,5 @@
-from flask import Blueprint, render_template, abort, request
+from dataclasses import asdict
+from flask import Blueprint, jsonify, render_template, abort, request
 from flask_login import login_required, current_user
 from flaskapp.database.models import Match, Organization, Tournament
 from flaskapp.modules.auth.decorators import organization_member_required
@@ -32,6 +33,25 @@ def detail(organization_id, tournament_id, match_id):
         tournament_id=tournament_id
     )
 
+@matches_bp.route('/batch', methods=['POST'])
+@login_required
+@organization_member_required()
+def submit_batch(organization_id, tournament_id):
+    """
+    Registro masivo de resultados (JSON):
+    {"results": [{"match_id": 1, "score_team_a": 2, "score_team_b": 0, "best_player_id": 7}, ...]}
+    Responde {"updated": [...], "errors": [...]}; si hay errores no se guarda nada.
+    """
+    payload = request.get_json(silent=True) or {}
+    results = payload.get('results')
+    if not isinstance(results, list) or not results:
+        return jsonify({'updated': [], 'errors': [{'match_id': None, 'error': 'Se requiere una lista de resultados'}]}), 400
+
+    batch = MatchService.submit_results(tournament_id, current_user.id, results)
+    if not batch.authorized:
+        return jsonify(asdict(batch)), 403
+    return jsonify(asdict(batch)), 400 if batch.errors else 200
+
 @matches_bp.route('/manage/<int:match_id>', methods=['GET', 'POST'])
 @login_required
 @organization_member_required()
@@ -93,8 +113,8 @@ def manage(organization_id, tournament_id, match_id):
                              tournament_id=tournament_id,
                              match_id=match_id))
 
-    elif request.method == 'GET':
-        match_details = MatchService.get_match_details(match_id)
+    match_details = MatchService.get_match_details(match_id)
+    if request.method == 'GET':
         form.score_team_a.data = match_details.team_a_score
         form.score_team_b.data = match_details.team_b_score
         form.best_player_id.data = match_details.best_player_id or 0
@@ -103,7 +123,7 @@ def manage(organization_id, tournament_id, match_id):
         'matches/manage.html',
         segment='matches',
         form=form,
-        match=MatchService.get_match_details(match_id),
+        match=match_details,
         organization=Organization.query.get(organization_id),
         tournament=tournament,
         organization_id=organization_id,
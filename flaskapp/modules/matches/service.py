@@ -1,67 +1,66 @@
 from datetime import datetime
 import math
-from typing import Optional
-from flaskapp.database.models import MatchStatus, Tournament, db
-from flaskapp.database.models import Match, Team, TournamentReferee, User
-from flaskapp.modules.matches.dto import MatchDTO
-from sqlalchemy.orm import joinedload
+from typing import Dict, List, Optional
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import MatchStatus, Tournament, TournamentStatus, db
+from flaskapp.database.models import Match, Team, TeamMember, TournamentReferee, User
+from flaskapp.modules.auth.context import authorization_for
+from flaskapp.modules.matches import performance, ratings
+from flaskapp.modules.matches.dto import BatchResultDTO, MatchDTO
+from sqlalchemy.orm import contains_eager, joinedload
 
 class MatchService:
     @staticmethod
     @staticmethod
     def is_user_tournament_referee(user_id: int, tournament_id: int) -> bool:
-        """Verifica si un usuario es árbitro en un torneo específico"""
-        return db.session.query(
-            TournamentReferee.query.filter_by(
-                tournament_id=tournament_id,
-                user_id=user_id
-            ).exists()
-        ).scalar()
+        """Verifica si un usuario es árbitro en un torneo específico (contexto de autorización)"""
+        access = authorization_for(user_id).tournament(tournament_id)
+        return bool(access and access.is_referee)
 
     @staticmethod
     def get_match_details(match_id: int) -> Optional[MatchDTO]:
+        """
+        Detalle completo del partido en dos consultas:
+        1. El partido con equipos, mejor jugador y árbitro (JOINs); el estado sale del registro de lookups.
+        2. Los miembros de ambos equipos con su usuario.
+        """
         match = Match.query.options(
             joinedload(Match.team_a),
             joinedload(Match.team_b),
             joinedload(Match.best_player),
-            joinedload(Match.recorded_by_referee) # Asumiendo que tienes una relación definida en el modelo
-        ).get(match_id)
+            joinedload(Match.recorded_by_referee)
+        ).filter(Match.id == match_id).one_or_none()
         if not match:
             return None
 
-        # Obtener información de equipos
-        team_a = Team.query.get(match.team_a_id) if match.team_a_id else None
-        team_b = Team.query.get(match.team_b_id) if match.team_b_id else None
-        
+        # Miembros de ambos equipos en una sola consulta
+        members_by_team = {match.team_a_id: [], match.team_b_id: []}
+        team_ids = [team_id for team_id in (match.team_a_id, match.team_b_id) if team_id]
+        if team_ids:
+            members = TeamMember.query.join(TeamMember.user).options(
+                contains_eager(TeamMember.user)
+            ).filter(
+                TeamMember.team_id.in_(team_ids)
+            ).order_by(TeamMember.id).all()
+            for member in members:
+                members_by_team[member.team_id].append(member)
+
+        team_a_members = members_by_team[match.team_a_id] if match.team_a_id else []
+        team_b_members = members_by_team[match.team_b_id] if match.team_b_id else []
+
         # Obtener líderes de equipo
-        def get_team_leader_info(team):
-            if team:
-                leader = next((m.user for m in team.members if m.is_leader), None)
-                if leader:
-                    return {
-                        'name': f"{leader.name}",
-                        'id': leader.id,
-                        'pic': leader.profile_picture
-                    }
+        def get_team_leader_info(members):
+            leader = next((m.user for m in members if m.is_leader), None)
+            if leader:
+                return {
+                    'name': f"{leader.name}",
+                    'id': leader.id,
+                    'pic': leader.profile_picture
+                }
             return {'name': None, 'id': None, 'pic': None}
 
-        team_a_info = get_team_leader_info(team_a)
-        team_b_info = get_team_leader_info(team_b)
-        
-        # Obtener mejor jugador
-        best_player = User.query.get(match.best_player_id) if match.best_player_id else None
-        best_player_info = {
-            'name': f"{best_player.name}" if best_player else None,
-            'id': match.best_player_id,
-            'pic': best_player.profile_picture if best_player else None
-        }
-        
-        # Obtener árbitro
-        referee = User.query.get(match.recorded_by_referee_id) if match.recorded_by_referee_id else None
-        referee_info = {
-            'name': f"{referee.name}" if referee else None,
-            'id': match.recorded_by_referee_id
-        }
+        best_player = match.best_player
+        referee = match.recorded_by_referee
 
         return MatchDTO(
             id=match.id,
@@ -70,24 +69,24 @@ class MatchService:
             match_number=match.match_number,
             team_a_id=match.team_a_id,
             team_b_id=match.team_b_id,
-            team_a_members=team_a.members if team_a else [],
-            team_b_members=team_b.members if team_b else [],
-            team_a_name=team_a.name if team_a else None,
-            team_b_name=team_b.name if team_b else None,
+            team_a_members=team_a_members,
+            team_b_members=team_b_members,
+            team_a_name=match.team_a.name if match.team_a else None,
+            team_b_name=match.team_b.name if match.team_b else None,
             team_a_score=match.score_team_a,
             team_b_score=match.score_team_b,
             winner_id=match.winner_id,
             best_player_id=match.best_player_id,
-            best_player_name=best_player_info['name'],
-            best_player_pic=best_player_info['pic'],
+            best_player_name=f"{best_player.name}" if best_player else None,
+            best_player_pic=best_player.profile_picture if best_player else None,
             is_bye=match.is_bye,
-            status=match.status.code,
-            status_description=match.status.description,
+            status=lookups.code_of(MatchStatus, match.status_id),
+            status_description=lookups.description_of(MatchStatus, match.status_id),
             completed_at=match.completed_at,
-            recorded_by_referee_id=referee_info['id'],
-            recorded_by_referee_name=referee_info['name'],
-            team_a_leader=team_a_info,
-            team_b_leader=team_b_info
+            recorded_by_referee_id=match.recorded_by_referee_id,
+            recorded_by_referee_name=f"{referee.name}" if referee else None,
+            team_a_leader=get_team_leader_info(team_a_members),
+            team_b_leader=get_team_leader_info(team_b_members)
         )
 
     @staticmethod
@@ -128,27 +127,100 @@ class MatchService:
             return False
 
         # 2. Verificar estado del torneo
-        tournament = Tournament.query.get(match.tournament_id)
-        if tournament.status.code != 'IN_PROGRESS':
+        tournament_status_id = db.session.query(Tournament.status_id).filter(
+            Tournament.id == match.tournament_id
+        ).scalar()
+        if tournament_status_id != lookups.id_of(TournamentStatus, 'IN_PROGRESS'):
             return False
         
         # 3. Verificar estado del partido (no es CANCELLED)
-        if match.status.code == 'CANCELLED':
+        if match.status_id == lookups.id_of(MatchStatus, 'CANCELLED'):
             return False
 
-        # 4. Verificar siguiente partido en el bracket
-        next_match_number = match.match_number // 2
+        completed_status_id = lookups.id_of(MatchStatus, 'COMPLETED')
+
+        # 4. Verificar siguiente(s) partido(s) en el bracket
+        if MatchService._has_routes(match):
+            # Rutas precalculadas (doble eliminación): ganador y perdedor en una consulta
+            targets = [n for n in (match.next_match_number, match.loser_match_number) if n is not None]
+            completed = db.session.query(Match.id).filter(
+                Match.tournament_id == match.tournament_id,
+                Match.match_number.in_(targets),
+                Match.status_id == completed_status_id
+            ).first()
+            return completed is None
+
+        next_match_number = match.match_number // 2 if match.bracket == 'MAIN' else 0
         if next_match_number > 0:
-            next_match = Match.query.filter_by(
+            next_status_id = db.session.query(Match.status_id).filter_by(
                 tournament_id=match.tournament_id,
                 match_number=next_match_number
-            ).first()
+            ).scalar()
             
-            if next_match and next_match.status.code == 'COMPLETED':
+            if next_status_id == completed_status_id:
                 return False
 
         return True
 
+    @staticmethod
+    def _has_routes(match: Match) -> bool:
+        """Las partidas con rutas guardadas no usan la numeración de heap (match_number // 2)."""
+        return match.next_match_number is not None or match.loser_match_number is not None
+
+    @staticmethod
+    def _assign_slot(target: Match, slot: str, team_id: int) -> None:
+        if slot == 'A':
+            target.team_a_id = team_id
+        else:
+            target.team_b_id = team_id
+
+    @staticmethod
+    def _propagate_routes(
+        match: Match,
+        targets: Optional[Dict[int, Match]] = None,
+        status_ids: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Propaga ganador y perdedor según las rutas precalculadas del bracket.
+        En la gran final, si gana el campeón del bracket de ganadores (team_a)
+        la revancha se cancela; si no, ambos equipos juegan la revancha.
+        `targets` ({match_number: Match}) permite propagar sobre un snapshot ya
+        cargado; `status_ids` ({code: id}) por defecto sale del registro en memoria.
+        """
+        loser_id = match.team_b_id if match.winner_id == match.team_a_id else match.team_a_id
+        if targets is None:
+            targets = {
+                m.match_number: m
+                for m in Match.query.filter(
+                    Match.tournament_id == match.tournament_id,
+                    Match.match_number.in_([
+                        n for n in (match.next_match_number, match.loser_match_number) if n is not None
+                    ])
+                )
+            }
+
+        def status_id(code: str) -> int:
+            if status_ids is not None:
+                return status_ids[code]
+            return lookups.id_of(MatchStatus, code)
+
+        if match.bracket == 'GRAND_FINAL' and match.level == 1:
+            reset = targets.get(match.next_match_number)
+            if reset is None:
+                return
+            if match.winner_id == match.team_a_id:
+                reset.team_a_id = reset.team_b_id = None
+                reset.status_id = status_id('CANCELLED')
+                return
+            reset.status_id = status_id('PENDING')
+
+        next_match = targets.get(match.next_match_number)
+        if next_match:
+            MatchService._assign_slot(next_match, match.next_match_slot, match.winner_id)
+        loser_match = targets.get(match.loser_match_number)
+        if loser_match:
+            MatchService._assign_slot(loser_match, match.loser_match_slot, loser_id)
+
     @staticmethod
     def update_match(match_id: int, update_data: dict) -> bool:
         """Actualiza un partido, determina ganador y propaga al siguiente si corresponde"""
@@ -160,21 +232,22 @@ class MatchService:
             return False
 
         try:
+            # Obtener ID de estado 'COMPLETED' (registro en memoria, sin consulta)
+            completed_status_id = lookups.id_of(MatchStatus, 'COMPLETED')
+            # Ganador anterior si el partido ya estaba completado (corrección de resultado)
+            previous_winner_id = match.winner_id if match.status_id == completed_status_id else None
+
             match.score_team_a = update_data.get('score_team_a')
             match.score_team_b = update_data.get('score_team_b')
             match.best_player_id = update_data.get('best_player_id')
             match.recorded_by_referee_id = update_data.get('recorded_by_referee_id')
 
-            # Obtener ID de estado 'COMPLETED'
-            completed_status = MatchStatus.query.filter_by(code='COMPLETED').first()
-            if not completed_status:
-                raise ValueError("Estado 'COMPLETED' no encontrado")
-
             # Si ambos scores están presentes, marcar como completado
             if match.score_team_a is not None and match.score_team_b is not None:
                 print(f"Marcando match {match.id} como completado", flush=True)
-                match.status_id = completed_status.id
-                match.completed_at = datetime.utcnow()
+                if match.status_id != completed_status_id or match.completed_at is None:
+                    match.completed_at = datetime.utcnow()  # Una corrección conserva la fecha original
+                match.status_id = completed_status_id
 
                 # Determinar ganador
                 if match.score_team_a > match.score_team_b:
@@ -185,8 +258,17 @@ class MatchService:
                     # Empates no permitidos
                     raise ValueError("No se permiten empates")
 
+                # Rendimiento histórico y rating de los jugadores
+                performance.record_results([(match, previous_winner_id)])
+                activity_id = db.session.query(Tournament.activity_id).filter(
+                    Tournament.id == match.tournament_id
+                ).scalar()
+                ratings.record_results(activity_id, [(match, previous_winner_id)])
+
                 # Propagación al siguiente match (si no es final)
-                if match.level > 0 and match.winner_id:
+                if MatchService._has_routes(match):
+                    MatchService._propagate_routes(match)
+                elif match.bracket == 'MAIN' and match.level > 0 and match.winner_id:
                     print(f"Actualizando siguiente partido para el match {match.id} (Nivel {match.level}, Match {match.match_number})", flush=True)
                     next_match_number = match.match_number // 2
                     next_level = match.level - 1
@@ -219,3 +301,149 @@ class MatchService:
             db.session.rollback()
             print(f"Error actualizando match: {e}")
             return False
+
+    # Orden de propagación: ganadores/principal antes que perdedores y gran final
+    _SECTION_ORDER = {'LOSERS': 1, 'GRAND_FINAL': 2}
+
+    @staticmethod
+    def submit_results(tournament_id: int, user_id: int, results: List[dict]) -> BatchResultDTO:
+        """
+        Registra varios resultados de un torneo en una sola transacción.
+
+        Se cargan una vez el árbitro, el estado del torneo y todas las partidas
+        del torneo (snapshot); los estados de partida salen del registro en memoria.
+        El rendimiento y los ratings de los jugadores se actualizan con un upsert
+        por lote. Los resultados se validan y
+        aplican en orden de ronda sobre ese snapshot, propagando ganadores en
+        memoria, de modo que una partida puede recibir a sus equipos de otra del
+        mismo lote. El mejor jugador, si viene, debe ser miembro de uno de los dos
+        equipos. Si algún resultado es inválido no se guarda ninguno.
+        """
+        batch = BatchResultDTO()
+
+        if not MatchService.is_user_tournament_referee(user_id, tournament_id):
+            batch.authorized = False
+            batch.errors.append({'match_id': None, 'error': 'No eres árbitro de este torneo'})
+            return batch
+
+        tournament_status_id, activity_id = db.session.query(
+            Tournament.status_id, Tournament.activity_id
+        ).filter(Tournament.id == tournament_id).one_or_none() or (None, None)
+        if lookups.code_of(TournamentStatus, tournament_status_id) != 'IN_PROGRESS':
+            batch.errors.append({'match_id': None, 'error': 'El torneo no está en curso'})
+            return batch
+
+        status_ids = lookups.ids(MatchStatus)
+        status_codes = lookups.codes(MatchStatus)
+
+        snapshot = Match.query.filter_by(tournament_id=tournament_id).all()
+        by_id = {m.id: m for m in snapshot}
+        by_number = {m.match_number: m for m in snapshot}
+
+        # 1. Validaciones que no dependen del orden
+        pending = []
+        seen = set()
+        for item in results:
+            match_id = item.get('match_id') if isinstance(item, dict) else None
+            match = by_id.get(match_id)
+            if match is None:
+                batch.errors.append({'match_id': match_id, 'error': 'Partido no encontrado en este torneo'})
+                continue
+            if match_id in seen:
+                batch.errors.append({'match_id': match_id, 'error': 'Partido repetido en el lote'})
+                continue
+            seen.add(match_id)
+
+            score_a, score_b = item.get('score_team_a'), item.get('score_team_b')
+            if not all(isinstance(v, int) and not isinstance(v, bool) and v >= 0 for v in (score_a, score_b)):
+                batch.errors.append({'match_id': match_id, 'error': 'Las puntuaciones deben ser enteros no negativos'})
+                continue
+            if score_a == score_b:
+                batch.errors.append({'match_id': match_id, 'error': 'No se permiten empates'})
+                continue
+            best_player_id = item.get('best_player_id')
+            if best_player_id is not None and (not isinstance(best_player_id, int) or isinstance(best_player_id, bool)):
+                batch.errors.append({'match_id': match_id, 'error': 'El mejor jugador debe ser un id de usuario'})
+                continue
+            pending.append((match, item))
+
+        # Miembros de los equipos del torneo (una consulta, solo si el lote trae mejores jugadores)
+        members: Dict[int, set] = {}
+        if any(item.get('best_player_id') is not None for _, item in pending):
+            for team_id, member_id in db.session.query(TeamMember.team_id, TeamMember.user_id).join(
+                Team, Team.id == TeamMember.team_id
+            ).filter(Team.tournament_id == tournament_id):
+                members.setdefault(team_id, set()).add(member_id)
+
+        # 2. Aplicar en orden de ronda (primeras rondas primero) sobre el snapshot
+        pending.sort(key=lambda entry: (
+            MatchService._SECTION_ORDER.get(entry[0].bracket, 0), -entry[0].level, entry[0].match_number
+        ))
+        now = datetime.utcnow()
+        changes = []
+        for match, item in pending:
+            error = MatchService._snapshot_edit_error(match, by_number, status_codes)
+            # Los equipos pueden venir de otra partida del lote: se comprueba tras propagar
+            best_player_id = item.get('best_player_id')
+            if not error and best_player_id is not None and best_player_id not in (
+                members.get(match.team_a_id, set()) | members.get(match.team_b_id, set())
+            ):
+                error = 'El mejor jugador no pertenece a ninguno de los dos equipos'
+            if error:
+                batch.errors.append({'match_id': match.id, 'error': error})
+                continue
+            previous_winner_id = match.winner_id if match.status_id == status_ids['COMPLETED'] else None
+
+            match.score_team_a = item['score_team_a']
+            match.score_team_b = item['score_team_b']
+            match.best_player_id = best_player_id
+            match.recorded_by_referee_id = user_id
+            if match.status_id != status_ids['COMPLETED'] or match.completed_at is None:
+                match.completed_at = now  # Una corrección conserva la fecha original
+            match.status_id = status_ids['COMPLETED']
+            match.winner_id = match.team_a_id if match.score_team_a > match.score_team_b else match.team_b_id
+
+            if MatchService._has_routes(match):
+                MatchService._propagate_routes(match, targets=by_number, status_ids=status_ids)
+            elif match.bracket == 'MAIN' and match.level > 0:
+                next_match = by_number.get(match.match_number // 2)
+                if next_match:
+                    MatchService._assign_slot(next_match, 'A' if match.match_number % 2 == 0 else 'B', match.winner_id)
+            changes.append((match, previous_winner_id))
+            batch.updated.append(match.id)
+
+        if batch.errors:
+            db.session.rollback()
+            batch.updated = []
+            return batch
+
+        try:
+            performance.record_results(changes)
+            ratings.record_results(activity_id, changes)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            batch.updated = []
+            batch.errors.append({'match_id': None, 'error': f'Error guardando resultados: {e}'})
+        return batch
+
+    @staticmethod
+    def _snapshot_edit_error(match: Match, by_number: Dict[int, Match], status_codes: Dict[int, str]) -> Optional[str]:
+        """Mismas reglas que can_edit_match, evaluadas sobre el snapshot en memoria."""
+        if not match.team_a_id or not match.team_b_id or match.is_bye:
+            return 'El partido no tiene dos equipos asignados'
+        if status_codes.get(match.status_id) == 'CANCELLED':
+            return 'El partido está cancelado'
+
+        if MatchService._has_routes(match):
+            next_numbers = (match.next_match_number, match.loser_match_number)
+        elif match.bracket == 'MAIN':
+            next_numbers = (match.match_number // 2,)
+        else:
+            next_numbers = ()
+
+        for number in next_numbers:
+            next_match = by_number.get(number)
+            if next_match is not None and status_codes.get(next_match.status_id) == 'COMPLETED':
+                return 'El siguiente partido ya fue jugado'
+        return None
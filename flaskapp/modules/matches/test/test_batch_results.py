@@ -0,0 +1,139 @@
+from flaskapp.database.models import MatchStatus, User, db
+from flaskapp.modules.matches.service import MatchService
+from tests.factory import QueryCounter, create_started_tournament, match_by_number
+
+"""
+Registro masivo de resultados (MatchService.submit_results)
+    test_batch_propagates_in_round_order: semifinales y final en un mismo lote, en cualquier orden.
+    test_invalid_result_saves_nothing: un empate invalida todo el lote.
+    test_best_player_must_play: el mejor jugador debe ser de uno de los equipos de la partida.
+    test_requires_referee: solo los árbitros del torneo pueden enviar resultados.
+    test_rejects_when_next_match_played: no se edita un partido cuyo siguiente ya se jugó.
+    test_double_elimination_routes_loser: el perdedor baja al bracket de perdedores.
+    test_constant_query_count: las lecturas no crecen con el tamaño del lote.
+"""
+
+
+def result(match, score_a, score_b):
+    return {'match_id': match.id, 'score_team_a': score_a, 'score_team_b': score_b}
+
+
+class TestBatchResults:
+    def test_batch_propagates_in_round_order(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        final, semi_a, semi_b = (match_by_number(t, n) for n in (1, 2, 3))
+        final_id = final.id
+
+        batch = MatchService.submit_results(t, ids['referee_id'], [
+            {'match_id': final_id, 'score_team_a': 3, 'score_team_b': 1},
+            result(semi_a, 2, 0),
+            result(semi_b, 0, 1),
+        ])
+
+        assert batch.errors == []
+        assert sorted(batch.updated) == sorted([final_id, semi_a.id, semi_b.id])
+        db.session.expire_all()
+        final = match_by_number(t, 1)
+        assert final.team_a_id == semi_a.team_a_id
+        assert final.team_b_id == semi_b.team_b_id
+        assert final.winner_id == final.team_a_id
+        assert final.status.code == 'COMPLETED'
+
+    def test_invalid_result_saves_nothing(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        semi_a, semi_b = match_by_number(t, 2), match_by_number(t, 3)
+
+        batch = MatchService.submit_results(t, ids['referee_id'], [result(semi_a, 2, 0), result(semi_b, 1, 1)])
+
+        assert batch.updated == []
+        assert batch.errors == [{'match_id': semi_b.id, 'error': 'No se permiten empates'}]
+        db.session.expire_all()
+        assert match_by_number(t, 2).status.code == 'PENDING'
+        assert match_by_number(t, 1).team_a_id is None
+
+    def test_best_player_must_play(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        final, semi_a, semi_b = (match_by_number(t, n) for n in (1, 2, 3))
+        final_id = final.id
+        player_a = next(m.user_id for m in semi_a.team_a.members)
+        player_b = next(m.user_id for m in semi_b.team_b.members)
+
+        batch = MatchService.submit_results(t, ids['referee_id'], [
+            {**result(semi_a, 2, 0), 'best_player_id': player_b},
+            {**result(semi_b, 2, 1), 'best_player_id': 'x'},
+        ])
+        assert batch.updated == []
+        assert batch.errors == [
+            {'match_id': semi_b.id, 'error': 'El mejor jugador debe ser un id de usuario'},
+            {'match_id': semi_a.id, 'error': 'El mejor jugador no pertenece a ninguno de los dos equipos'},
+        ]
+        db.session.expire_all()
+        assert match_by_number(t, 2).best_player_id is None
+
+        # En la final, los equipos llegan desde las semifinales del mismo lote
+        batch = MatchService.submit_results(t, ids['referee_id'], [
+            {'match_id': final_id, 'score_team_a': 1, 'score_team_b': 3, 'best_player_id': player_b},
+            {**result(semi_a, 2, 0), 'best_player_id': player_a},
+            result(semi_b, 0, 1),
+        ])
+        assert batch.errors == []
+        db.session.expire_all()
+        assert match_by_number(t, 1).best_player_id == player_b
+        assert match_by_number(t, 2).best_player_id == player_a
+
+    def test_requires_referee(self, app):
+        ids = create_started_tournament(4)
+        outsider = User(name='Otro', email='other@test.com')
+        db.session.add(outsider)
+        db.session.commit()
+
+        batch = MatchService.submit_results(
+            ids['tournament_id'], outsider.id, [result(match_by_number(ids['tournament_id'], 2), 1, 0)]
+        )
+        assert not batch.authorized
+        assert batch.updated == []
+
+    def test_rejects_when_next_match_played(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        semis = [match_by_number(t, 2), match_by_number(t, 3)]
+        MatchService.submit_results(t, ids['referee_id'], [result(semis[0], 1, 0), result(semis[1], 1, 0)])
+        MatchService.submit_results(t, ids['referee_id'], [result(match_by_number(t, 1), 1, 0)])
+
+        batch = MatchService.submit_results(t, ids['referee_id'], [result(match_by_number(t, 2), 0, 1)])
+        assert batch.errors[0]['error'] == 'El siguiente partido ya fue jugado'
+
+    def test_double_elimination_routes_loser(self, app):
+        ids = create_started_tournament(4, format_code='DOUBLE_ELIMINATION')
+        t = ids['tournament_id']
+        first_round = [match_by_number(t, 2), match_by_number(t, 3)]
+        losers = [m.team_b_id for m in first_round]
+
+        batch = MatchService.submit_results(t, ids['referee_id'], [result(m, 1, 0) for m in first_round])
+
+        assert batch.errors == []
+        db.session.expire_all()
+        losers_round_1 = match_by_number(t, first_round[0].loser_match_number)
+        assert {losers_round_1.team_a_id, losers_round_1.team_b_id} == set(losers)
+
+    def test_constant_query_count(self, app):
+        counts = []
+        for team_count in (4, 16):
+            db.drop_all()
+            db.create_all()
+            ids = create_started_tournament(team_count)
+            t = ids['tournament_id']
+            first_round = [match_by_number(t, n) for n in range(team_count // 2, team_count)]
+            payload = [result(m, 1, 0) for m in first_round]
+            db.session.expire_all()
+
+            with QueryCounter(only_selects=True) as counter:
+                batch = MatchService.submit_results(t, ids['referee_id'], payload)
+            assert batch.errors == []
+            counts.append(counter.count)
+
+        # Árbitro, torneo, snapshot, miembros (rendimiento) y miembros con ratings
+        assert counts[0] == counts[1] <= 5
@@ -0,0 +1,55 @@
+from flaskapp.database.models import User, db
+from flaskapp.modules.matches.service import MatchService
+from tests.factory import QueryCounter, create_started_tournament, match_by_number
+
+"""
+Detalle de partido (MatchService.get_match_details)
+    test_details_in_two_queries: partido, equipos, miembros, líderes, MVP y árbitro en dos consultas.
+    test_query_count_does_not_grow_with_members: la cantidad de consultas no depende del tamaño de los equipos.
+    test_match_without_teams: una partida sin equipos asignados se resuelve con una sola consulta.
+    test_missing_match: un id inexistente retorna None.
+"""
+
+
+def load_details(match_id):
+    db.session.expire_all()
+    with QueryCounter() as counter:
+        details = MatchService.get_match_details(match_id)
+    return details, counter.count
+
+
+class TestMatchDetails:
+    def test_details_in_two_queries(self, app):
+        ids = create_started_tournament(4, members_per_team=3)
+        t = ids['tournament_id']
+        semi = match_by_number(t, 2)
+        MatchService.submit_results(t, ids['referee_id'], [{
+            'match_id': semi.id, 'score_team_a': 2, 'score_team_b': 1,
+            'best_player_id': User.query.filter_by(email='player1-2@test.com').one().id
+        }])
+
+        details, queries = load_details(semi.id)
+
+        assert queries == 2
+        assert details.status == 'COMPLETED'
+        assert details.team_a_name == 'Equipo 1'
+        assert len(details.team_a_members) == len(details.team_b_members) == 3
+        assert details.team_a_members[0].user.name == 'Jugador 1-1'
+        assert details.team_a_leader['name'] == 'Jugador 1-1'
+        assert details.best_player_name == 'Jugador 1-2'
+        assert details.recorded_by_referee_name == 'Árbitro'
+
+    def test_query_count_does_not_grow_with_members(self, app):
+        ids = create_started_tournament(4, members_per_team=12)
+        details, queries = load_details(match_by_number(ids['tournament_id'], 3).id)
+        assert queries == 2
+        assert len(details.team_b_members) == 12
+
+    def test_match_without_teams(self, app):
+        ids = create_started_tournament(4)
+        details, queries = load_details(match_by_number(ids['tournament_id'], 1).id)
+        assert queries == 1
+        assert details.team_a_members == [] and details.team_a_leader['name'] is None
+
+    def test_missing_match(self, app):
+        assert MatchService.get_match_details(999) is None
@@ -0,0 +1,72 @@
+from flaskapp.database.models import User, UserPerformance, db
+from flaskapp.modules.matches import performance
+from flaskapp.modules.matches.service import MatchService
+from tests.factory import create_started_tournament, match_by_number
+
+"""
+Rendimiento materializado por usuario (user_performance)
+    test_title_match: final principal, gran final y revancha.
+    test_results_update_aggregate: jugadas, victorias y finales de cada miembro.
+    test_correction_moves_the_win: corregir un resultado mueve la victoria sin sumar partidas.
+    test_rebuild_matches_incremental: el recálculo completo coincide con el incremental.
+"""
+
+
+def stats_by_email():
+    db.session.expire_all()
+    rows = db.session.query(User.email, UserPerformance).join(UserPerformance, UserPerformance.user_id == User.id)
+    return {email: (p.matches_played, p.wins, p.finals_won) for email, p in rows}
+
+
+def play_bracket(ids):
+    """Semifinales y final de un torneo de 4: ambas semis para team_a, la final para team_b."""
+    t = ids['tournament_id']
+    semi_a, semi_b = match_by_number(t, 2), match_by_number(t, 3)
+    MatchService.submit_results(t, ids['referee_id'], [
+        {'match_id': semi_a.id, 'score_team_a': 2, 'score_team_b': 0},
+        {'match_id': semi_b.id, 'score_team_a': 2, 'score_team_b': 1},
+    ])
+    final = match_by_number(t, 1)
+    assert MatchService.update_match(final.id, {'user_id': ids['referee_id'], 'score_team_a': 0, 'score_team_b': 1})
+    return t
+
+
+class TestPerformance:
+    def test_title_match(self):
+        assert performance.is_title_match('MAIN', 0, 5, 5)
+        assert not performance.is_title_match('MAIN', 1, 5, 5)
+        assert performance.is_title_match('GRAND_FINAL', 1, 5, 5)
+        assert not performance.is_title_match('GRAND_FINAL', 1, 6, 5)
+        assert performance.is_title_match('GRAND_FINAL', 0, 6, 5)
+        assert not performance.is_title_match('SWISS', 0, 5, 5)
+
+    def test_results_update_aggregate(self, app):
+        play_bracket(create_started_tournament(4))
+        stats = stats_by_email()
+
+        # Equipo 1 gana la semifinal y pierde la final; el equipo 2 (seed 2) gana la otra semi y la final
+        assert stats['player1-1@test.com'] == stats['player1-2@test.com'] == (2, 1, 0)
+        champion = {email for email, (_, _, finals) in stats.items() if finals}
+        assert len(champion) == 2 and all(stats[email] == (2, 2, 1) for email in champion)
+        assert sum(played for played, _, _ in stats.values()) == 3 * 2 * 2
+
+    def test_correction_moves_the_win(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        semi = match_by_number(t, 2)
+        for score_a, score_b in ((2, 0), (0, 2)):
+            assert MatchService.update_match(semi.id, {
+                'user_id': ids['referee_id'], 'score_team_a': score_a, 'score_team_b': score_b
+            })
+
+        stats = stats_by_email()
+        assert stats['player1-1@test.com'] == (1, 0, 0)
+        assert sorted(stats.values()) == [(1, 0, 0)] * 2 + [(1, 1, 0)] * 2
+
+    def test_rebuild_matches_incremental(self, app):
+        play_bracket(create_started_tournament(4))
+        incremental = stats_by_email()
+
+        assert performance.rebuild() == len(incremental)
+        db.session.commit()
+        assert stats_by_email() == incremental
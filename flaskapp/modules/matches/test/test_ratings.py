@@ -0,0 +1,138 @@
+import random
+
+import numpy as np
+import pytest
+
+from flaskapp.database.models import RatingRecompute, Team, User, UserRating, db
+from flaskapp.modules.matches import ratings
+from flaskapp.modules.matches.service import MatchService
+from flaskapp.modules.teams.service import TeamService
+from flaskapp.modules.tournaments.service import TournamentGenerator
+from tests.factory import QueryCounter, create_started_tournament, match_by_number
+
+"""
+Ratings Elo por actividad (flaskapp.modules.matches.ratings)
+    test_elo_delta: el favorito gana poco, la sorpresa suma mucho y el total se conserva.
+    test_layers_do_not_share_players: partidas de una misma capa no comparten jugadores.
+    test_vectorized_matches_sequential: el recálculo con NumPy coincide con el incremental.
+    test_results_update_ratings: completar partidas actualiza el rating de cada miembro.
+    test_correction_recomputes: una corrección se encola y el job equivale a recalcular desde cero.
+    test_team_seed_from_ratings: el seed del equipo es el promedio de sus miembros (una consulta).
+    test_seeding_uses_ratings: el mejor rating queda como cabeza de serie.
+"""
+
+
+def random_history(rng, player_count, match_count, team_size):
+    offsets, players, sides, outcomes, teams = [0], [], [], [], []
+    for _ in range(match_count):
+        chosen = rng.sample(range(player_count), 2 * team_size)
+        team_a, team_b = chosen[:team_size], chosen[team_size:]
+        players.extend(chosen)
+        sides.extend([0] * team_size + [1] * team_size)
+        offsets.append(len(players))
+        outcomes.append(rng.random() < 0.5)
+        teams.append((team_a, team_b))
+    arrays = (np.array(offsets), np.array(players), np.array(sides), np.array(outcomes))
+    return arrays, teams, outcomes
+
+
+def stored_ratings():
+    db.session.expire_all()
+    return {(r.user_id, r.activity_id): (round(r.rating, 6), r.matches_rated) for r in UserRating.query}
+
+
+class TestRatings:
+    def test_elo_delta(self):
+        assert ratings.elo_delta(1500, 1500, True) == pytest.approx(16)
+        assert ratings.elo_delta(1800, 1400, True) < 4
+        assert ratings.elo_delta(1400, 1800, True) > 28
+        game_ratings, games = {}, {}
+        ratings.apply_match(game_ratings, games, [1, 2], [3, 4], a_won=False)
+        assert sum(game_ratings.values()) == pytest.approx(4 * ratings.DEFAULT_RATING)
+        assert games == {1: 1, 2: 1, 3: 1, 4: 1}
+
+    def test_layers_do_not_share_players(self):
+        (offsets, players, _, _), _, _ = random_history(random.Random(1), 30, 200, 2)
+        layers = ratings.match_layers(offsets, players)
+        for layer in set(layers.tolist()):
+            members = [p for i in np.flatnonzero(layers == layer) for p in players[offsets[i]:offsets[i + 1]]]
+            assert len(members) == len(set(members))
+
+    @pytest.mark.parametrize('team_size', [1, 3])
+    def test_vectorized_matches_sequential(self, team_size):
+        arrays, teams, outcomes = random_history(random.Random(team_size), 40, 500, team_size)
+        batch, batch_games = ratings.compute_ratings(*arrays, player_count=40)
+
+        sequential, games = {}, {}
+        for (team_a, team_b), a_won in zip(teams, outcomes):
+            ratings.apply_match(sequential, games, team_a, team_b, a_won)
+
+        for player in range(40):
+            assert batch[player] == pytest.approx(sequential.get(player, ratings.DEFAULT_RATING))
+            assert batch_games[player] == games.get(player, 0)
+
+    def test_results_update_ratings(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        semi = match_by_number(t, 2)
+        assert MatchService.update_match(semi.id, {'user_id': ids['referee_id'], 'score_team_a': 2, 'score_team_b': 0})
+
+        stored = stored_ratings()
+        assert len(stored) == 4
+        winner = User.query.filter_by(email='player1-1@test.com').one()
+        assert stored[(winner.id, semi.tournament.activity_id)] == (ratings.DEFAULT_RATING + 16, 1)
+
+    def test_correction_recomputes(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        semi_a, semi_b = match_by_number(t, 2), match_by_number(t, 3)
+        MatchService.submit_results(t, ids['referee_id'], [
+            {'match_id': semi_a.id, 'score_team_a': 2, 'score_team_b': 0},
+            {'match_id': semi_b.id, 'score_team_a': 2, 'score_team_b': 1},
+        ])
+        before = stored_ratings()
+        with QueryCounter() as counter:
+            assert MatchService.update_match(semi_a.id, {'user_id': ids['referee_id'], 'score_team_a': 0, 'score_team_b': 2})
+        # La petición del árbitro solo encola la actividad
+        assert not any('user_ratings' in statement for statement in counter.statements)
+        assert stored_ratings() == before
+        assert [r.activity_id for r in RatingRecompute.query] == [semi_a.tournament.activity_id]
+
+        assert ratings.run_pending() == [semi_a.tournament.activity_id]
+        assert RatingRecompute.query.count() == 0
+        corrected = stored_ratings()
+
+        ratings.recompute()
+        db.session.commit()
+        assert stored_ratings() == corrected
+        loser = User.query.filter_by(email='player1-1@test.com').one()
+        assert corrected[(loser.id, semi_a.tournament.activity_id)][0] == ratings.DEFAULT_RATING - 16
+
+    def test_team_seed_from_ratings(self, app):
+        ids = create_started_tournament(4)
+        team = Team.query.filter_by(tournament_id=ids['tournament_id'], name='Equipo 1').one()
+        activity_id = team.tournament.activity_id
+        leader = next(m.user_id for m in team.members if m.is_leader)
+        team_id = team.id
+        db.session.add(UserRating(user_id=leader, activity_id=activity_id, rating=1700, matches_rated=5))
+        db.session.commit()
+
+        with QueryCounter() as counter:
+            seed = TeamService.calculate_team_seed(team_id)
+        assert counter.count == 1
+        assert seed == (1700 + 1500) // 2
+
+    def test_seeding_uses_ratings(self, app):
+        ids = create_started_tournament(4)
+        t = ids['tournament_id']
+        # El equipo 4 (peor seed guardado) tiene al mejor jugador de la actividad
+        team_4 = Team.query.filter_by(tournament_id=t, name='Equipo 4').one()
+        db.session.add(UserRating(user_id=team_4.members[0].user_id,
+                                  activity_id=team_4.tournament.activity_id, rating=2500))
+        db.session.commit()
+
+        seeded = TournamentGenerator._seed_teams(ratings.team_seed_scores(t))
+        assert seeded[0] == (team_4.id, 2000)
+        # Empates: se conserva el orden del seed guardado
+        assert [s.id for s in seeded[1:]] == [s.id for s in ratings.team_seed_scores(t) if s.id != team_4.id]
+        assert [s.seed_score for s in seeded[1:]] == [1500] * 3
@@ -44,8 +44,7 @@ def mark_as_read(notification_id):
         flash('No tienes permisos', 'danger')
         return redirect(url_for('notifications_blueprint.index'))
     
-    notification.is_read = True
-    db.session.commit()
+    NotificationService.mark_as_read(notification.id, current_user.id)
     flash('Notificación marcada como leída.', 'success')
 
     next_url = request.args.get('next')
@@ -60,11 +59,7 @@ def mark_all_as_read():
     """ Mark all notifications as read
     URL: /notifications/mark_all_as_read
     """
-    notifications = NotificationService.get_notifications(current_user.id)
-    for notification in notifications:
-        if not notification.is_read:
-            notification.is_read = True
-    db.session.commit()
+    NotificationService.mark_all_as_read(current_user.id)
     flash('Todas las notificaciones han sido marcadas como leídas.', 'success')
     return redirect(url_for('notifications_blueprint.index'))
 
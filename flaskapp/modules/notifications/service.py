@@ -1,11 +1,82 @@
 from datetime import datetime
-from typing import List
-from flaskapp.database.models import Event, EventStatus, OrganizationMember, Tournament
+from typing import List, Optional
+from flask import g
+from sqlalchemy import case, update
+from flaskapp.database.models import Event, EventStatus, Notification, OrganizationMember, Tournament, User
 from flaskapp.modules.notifications.dto import NotificationDTO
 
 from flaskapp.database.models import db
 
 class NotificationService:
+    @staticmethod
+    def get_unread_count(user_id: int, user: Optional[User] = None) -> int:
+        """
+        Notificaciones sin leer del usuario, desde el contador desnormalizado
+        users.unread_notification_count. Se calcula a lo más una vez por request
+        (memo en flask.g) con una consulta por clave primaria; si se pasa el User
+        ya cargado en este request no hay consulta. El UserPrincipal en caché no
+        sirve: los triggers de la BD suben el contador sin descartarlo.
+        """
+        memo = g.setdefault('unread_notification_counts', {})
+        if user_id not in memo:
+            if isinstance(user, User) and user.id == user_id:
+                memo[user_id] = user.unread_notification_count or 0
+            else:
+                memo[user_id] = db.session.query(User.unread_notification_count).filter(
+                    User.id == user_id
+                ).scalar() or 0
+        return memo[user_id]
+
+    @staticmethod
+    def _forget_unread_count(user_id: int) -> None:
+        g.get('unread_notification_counts', {}).pop(user_id, None)
+
+    @staticmethod
+    def _add_to_unread_count(user_id: int, delta: int) -> None:
+        """
+        Ajusta el contador en la BD (sin bajar de 0) y descarta el memo del request.
+        """
+        if delta:
+            counter = User.unread_notification_count + delta
+            db.session.execute(
+                update(User)
+                .where(User.id == user_id)
+                # updated_at se conserva: el contador no es un cambio de perfil
+                .values(unread_notification_count=case((counter > 0, counter), else_=0), updated_at=User.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            NotificationService._forget_unread_count(user_id)
+
+    @staticmethod
+    def mark_as_read(notification_id: int, user_id: int) -> bool:
+        """
+        Marca una notificación como leída. El UPDATE es condicional (solo si no
+        estaba leída), así dos requests simultáneos no descuentan dos veces.
+        """
+        result = db.session.execute(
+            update(Notification)
+            .where(Notification.id == notification_id, Notification.user_id == user_id, Notification.is_read.is_(False))
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        NotificationService._add_to_unread_count(user_id, -result.rowcount)
+        db.session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    def mark_all_as_read(user_id: int) -> int:
+        """Marca todas como leídas con un solo UPDATE; retorna cuántas cambiaron."""
+        result = db.session.execute(
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        # Se descuenta lo marcado (no se fija en 0) por si llegó otra notificación entretanto
+        NotificationService._add_to_unread_count(user_id, -result.rowcount)
+        db.session.commit()
+        return result.rowcount
+
     @staticmethod
     def get_notifications(c_id: int) -> List[dict]:
         from flaskapp.database.models import Notification
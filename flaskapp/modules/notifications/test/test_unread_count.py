@@ -0,0 +1,73 @@
+import pytest
+
+from flaskapp.database.models import NotificationType, RelatedEntityType, User, db
+from flaskapp.modules.notifications.service import NotificationService
+from tests.factory import QueryCounter, add_notifications
+
+"""
+Contador de notificaciones sin leer (users.unread_notification_count)
+    test_count_memoized_per_request: a lo más una consulta por request, ninguna con el usuario cargado.
+    test_mark_as_read_decrements_once: marcar dos veces la misma notificación descuenta una sola vez.
+    test_mark_all_as_read: un solo UPDATE deja el contador en 0.
+"""
+
+
+@pytest.fixture
+def app(app):
+    db.session.add_all([NotificationType(code='TEAM_INVITE'), RelatedEntityType(name='TOURNAMENT')])
+    db.session.commit()
+    return app
+
+
+def create_user(unread=0):
+    user = User(name='Usuario', email='user@test.com')
+    db.session.add(user)
+    db.session.flush()
+    notifications = add_notifications(user.id, unread)
+    db.session.commit()
+    return user, notifications
+
+
+def stored_count(user_id):
+    db.session.expire_all()
+    return db.session.get(User, user_id).unread_notification_count
+
+
+class TestUnreadCount:
+    def test_count_memoized_per_request(self, app):
+        user, _ = create_user(unread=2)
+        user_id = user.id
+
+        with app.test_request_context():
+            with QueryCounter() as counter:
+                assert NotificationService.get_unread_count(user_id) == 2
+                assert NotificationService.get_unread_count(user_id) == 2
+            assert counter.count == 1
+
+        loaded = db.session.get(User, user_id)
+        with app.test_request_context():
+            with QueryCounter() as counter:
+                assert NotificationService.get_unread_count(user_id, user=loaded) == 2
+            assert counter.count == 0
+
+    def test_mark_as_read_decrements_once(self, app):
+        user, notifications = create_user(unread=2)
+        user_id, notification_id = user.id, notifications[0].id
+
+        with app.test_request_context():
+            assert NotificationService.get_unread_count(user_id) == 2
+            assert NotificationService.mark_as_read(notification_id, user_id)
+            assert not NotificationService.mark_as_read(notification_id, user_id)
+            # El memo del request se descarta tras escribir
+            assert NotificationService.get_unread_count(user_id) == 1
+        assert stored_count(user_id) == 1
+
+    def test_mark_all_as_read(self, app):
+        user, _ = create_user(unread=4)
+        user_id = user.id
+
+        with QueryCounter() as counter:
+            assert NotificationService.mark_all_as_read(user_id) == 4
+        assert sum(s.lstrip().upper().startswith('UPDATE') for s in counter.statements) == 2
+        assert stored_count(user_id) == 0
+        assert NotificationService.mark_all_as_read(user_id) == 0
@@ -72,4 +72,21 @@ class MemberDTO:
     name: str
     email: str
     is_organizer: bool
-    is_admin: bool
\ No newline at end of file
+    is_admin: bool
+
+""" search_members() """
+""" Búsqueda incremental (typeahead) de miembros """
+@dataclass
+class MemberSearchResultDTO:
+    user_id: int
+    name: str
+    email: str
+    profile_picture: Optional[str]
+
+@dataclass
+class MemberSearchPageDTO:
+    items: List[MemberSearchResultDTO]
+    query: str
+    page: int
+    per_page: int
+    has_more: bool
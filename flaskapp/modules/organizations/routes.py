@@ -1,4 +1,6 @@
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+from dataclasses import asdict
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import login_required, current_user
 from flaskapp.database.models import Organization
 from flaskapp.modules.auth.decorators import (
@@ -104,6 +106,19 @@ def detail(organization_id):
     )
 
 
+@org_bp.route('/<int:organization_id>/members/search')
+@login_required
+@organization_member_required()
+def search_members(organization_id):
+    """Autocompletar miembros en JSON: ?q=texto&page=1&per_page=10 (máximo 50 por página)."""
+    results = OrganizationService.search_members(
+        organization_id,
+        request.args.get('q', ''),
+        page=request.args.get('page', 1, type=int),
+        per_page=request.args.get('per_page', 10, type=int)
+    )
+    return jsonify(asdict(results))
+
 @org_bp.route('/join/<int:organization_id>', methods=['POST'])
 @login_required
 def join(organization_id):
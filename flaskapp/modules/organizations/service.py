@@ -4,20 +4,26 @@ from flask_login import current_user
 from typing import List
 
 from sqlalchemy import case
-from flaskapp.database.models import Activity, Event, Tournament, TournamentStatus, User, db, Organization, OrganizationMember
-from .dto import EventDTO, MemberDTO, OrganizationDTO, OrganizationDetailDTO, OrganizationGroupsDTO, OrganizationListDTO, PaginatedOrganizationsDTO, TournamentDTO
+from flaskapp.database import usersearch
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import Activity, Event, EventStatus, Tournament, TournamentStatus, User, db, Organization, OrganizationMember
+from .dto import EventDTO, MemberDTO, MemberSearchPageDTO, MemberSearchResultDTO, OrganizationDTO, OrganizationDetailDTO, OrganizationGroupsDTO, OrganizationListDTO, PaginatedOrganizationsDTO, TournamentDTO
 
 def convert_to_dto(org: Organization, is_member: bool = False, is_organizer: bool = False) -> OrganizationDTO:
     return OrganizationDTO(
         id=org.id,
         name=org.name,
         description=org.description[:100] + '...' if org.description and len(org.description) > 100 else org.description or '',
-        member_count=len(org.members),  # Asume relación backref 'members'
+        member_count=org.member_count,
         is_organizer=is_organizer,
         is_member=is_member,
         created_at=org.created_at.strftime('%Y-%m-%d')
     )
 
+# Búsqueda incremental: largo mínimo (un trigrama) y tamaño máximo de página
+MIN_SEARCH_LENGTH = 3
+MAX_SEARCH_PAGE = 50
+
 class OrganizationService:
     @staticmethod
     def get_organization_groups() -> tuple[PaginatedOrganizationsDTO, PaginatedOrganizationsDTO]:
@@ -37,10 +43,8 @@ class OrganizationService:
         member_org_ids = {org_id for org_id, _ in user_memberships}
         organizer_org_ids = {org_id for org_id, is_org in user_memberships if is_org}
 
-        # Consulta base optimizada
-        base_query = Organization.query.options(
-            db.joinedload(Organization.members)
-        )
+        # Consulta base: member_count es una columna, no se cargan los miembros
+        base_query = Organization.query
 
         # Mis organizaciones (paginación independiente)
         my_orgs_paginated = base_query.filter(
@@ -73,7 +77,7 @@ class OrganizationService:
                 id=org.id,
                 name=org.name,
                 description=org.description[:100] + '...' if org.description and len(org.description) > 100 else org.description or '',
-                member_count=len(org.members),
+                member_count=org.member_count,
                 is_organizer=org.id in organizer_org_ids,
                 is_member=org.id in member_org_ids,
                 created_at=org.created_at.strftime('%Y-%m-%d')
@@ -98,8 +102,7 @@ class OrganizationService:
     def get_organization_details(organization_id: int, user_id: int) -> OrganizationDetailDTO:
         # Obtener organización básica
         org = Organization.query.options(
-            db.joinedload(Organization.creator),
-            db.joinedload(Organization.members)
+            db.joinedload(Organization.creator)
         ).get_or_404(organization_id)
 
         # Obtener eventos activos (que incluyen hoy en su rango de fechas)
@@ -140,7 +143,7 @@ class OrganizationService:
                 description=event.description[:100] + '...' if event.description and len(event.description) > 100 else event.description or '',
                 start_date=event.start_date.strftime('%Y-%m-%d'),
                 end_date=event.end_date.strftime('%Y-%m-%d'),
-                status=event.status.code
+                status=lookups.code_of(EventStatus, event.status_id)
             )
 
         def to_tournament_dto(tournament: Tournament) -> TournamentDTO:
@@ -150,8 +153,8 @@ class OrganizationService:
                 activity_name=tournament.activity.name,
                 start_date=tournament.start_date.strftime('%Y-%m-%d %H:%M') if tournament.start_date else 'N/A',
                 end_date=tournament.end_date.strftime('%Y-%m-%d %H:%M') if tournament.end_date else 'N/A',
-                status=tournament.status.code,
-                team_count=len(tournament.teams)
+                status=lookups.code_of(TournamentStatus, tournament.status_id),
+                team_count=tournament.team_count
             )
 
         # Verificar si el usuario es organizador
@@ -167,7 +170,7 @@ class OrganizationService:
             description=org.description,
             created_at=org.created_at.strftime('%Y-%m-%d'),
             creator_name=org.creator.name,
-            member_count=len(org.members),
+            member_count=org.member_count,
             active_events=[to_event_dto(e) for e in active_events],
             active_tournaments=[to_tournament_dto(t) for t in active_tournaments],
             past_tournaments=[to_tournament_dto(t) for t in past_tournaments],
@@ -253,12 +256,7 @@ class OrganizationService:
         )
         
         if search:
-            query = query.filter(
-                db.or_(
-                    User.name.ilike(f'%{search}%'),
-                    User.email.ilike(f'%{search}%')
-                )
-            )
+            query = query.filter(usersearch.matching(search))
         
         return [
             MemberDTO(
@@ -272,6 +270,38 @@ class OrganizationService:
             for member, user in query.all()
         ]
 
+    @staticmethod
+    def search_members(organization_id: int, search: str, page: int = 1, per_page: int = 10) -> MemberSearchPageDTO:
+        """
+        Página de miembros cuyo nombre o email contiene `search`, ordenados por
+        nombre. Pensada para autocompletar: no cuenta el total, solo indica si
+        hay otra página. Con menos de MIN_SEARCH_LENGTH caracteres no busca.
+        """
+        query = (search or '').strip()
+        page = max(page, 1)
+        per_page = min(max(per_page, 1), MAX_SEARCH_PAGE)
+        if len(query) < MIN_SEARCH_LENGTH:
+            return MemberSearchPageDTO(items=[], query=query, page=page, per_page=per_page, has_more=False)
+
+        users, has_more = usersearch.page(
+            query, offset=(page - 1) * per_page, limit=per_page, organization_id=organization_id
+        )
+        return MemberSearchPageDTO(
+            items=[
+                MemberSearchResultDTO(
+                    user_id=user.id,
+                    name=user.name,
+                    email=user.email,
+                    profile_picture=user.profile_picture
+                )
+                for user in users
+            ],
+            query=query,
+            page=page,
+            per_page=per_page,
+            has_more=has_more
+        )
+
     @staticmethod
     def toggle_organizer(member_id: int, organization_id: int):
         member = OrganizationMember.query.filter_by(
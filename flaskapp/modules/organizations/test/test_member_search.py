@@ -0,0 +1,73 @@
+from sqlalchemy import true
+from sqlalchemy.dialects import postgresql
+
+from flaskapp.database import usersearch
+from flaskapp.database.models import Organization, OrganizationMember, User, db
+from flaskapp.modules.organizations.service import OrganizationService
+from flaskapp.modules.tournaments.service import TournamentService
+from tests.factory import create_started_tournament
+
+"""
+Búsqueda de usuarios por subcadena (flaskapp.database.usersearch)
+    test_postgres_uses_escaped_ilike: en PostgreSQL el filtro es ILIKE escapado (índices pg_trgm).
+    test_pickers_follow_user_changes: los selectores ven altas y cambios de nombre al instante.
+    test_search_members_pages: las páginas recorren los miembros en orden y sin repetir.
+"""
+
+
+class TestMemberSearch:
+    def test_postgres_uses_escaped_ilike(self):
+        compiled = usersearch.matching('  100%_Ana ').compile(dialect=postgresql.dialect())
+        assert str(compiled).count('ILIKE') == 2 and str(compiled).count("ESCAPE '\\'") == 2
+        assert set(compiled.params.values()) == {'%100\\%\\_ana%'}  # % y _ del usuario quedan literales
+        assert str(usersearch.matching('  ')) == str(true())
+
+    def test_pickers_follow_user_changes(self, app):
+        ids = create_started_tournament(2)
+        organization = Organization.query.one()
+        ana = User(name='Ana Torres', email='ana.torres@test.com')
+        other = User(name='Pedro 100%', email='pedro@test.com')
+        db.session.add_all([ana, other])
+        db.session.flush()
+        for user in (ana, other):
+            db.session.add(OrganizationMember(organization_id=organization.id, user_id=user.id))
+        db.session.commit()
+
+        def referees(search):
+            return [r.name for r in TournamentService.get_eligible_referees(ids['tournament_id'], search).items]
+
+        assert referees('torres') == ['Ana Torres']
+        assert referees('ANA.TOR') == ['Ana Torres']
+        assert referees('0%') == ['Pedro 100%']  # % es literal, no comodín
+        assert referees('zzz') == []
+
+        ana.name = 'Ana Beltrán'
+        db.session.commit()
+        assert referees('torres') == ['Ana Beltrán']  # por el email
+        assert referees('beltr') == ['Ana Beltrán']
+        members = OrganizationService.get_organization_members(organization.id, 'beltr')
+        assert [m.user_id for m in members] == [ana.id]
+
+    def test_search_members_pages(self, app):
+        create_started_tournament(4, members_per_team=3)
+        organization = Organization.query.one()
+        outsider = User(name='Jugador externo', email='fuera@test.com')
+        db.session.add(outsider)
+        db.session.commit()
+        for member in User.query.filter(User.name.like('Jugador 1-%')):
+            db.session.add(OrganizationMember(organization_id=organization.id, user_id=member.id))
+        for member in User.query.filter(User.name.like('Jugador 2-%')):
+            db.session.add(OrganizationMember(organization_id=organization.id, user_id=member.id))
+        db.session.commit()
+
+        assert OrganizationService.search_members(organization.id, 'ju').items == []  # muy corto
+
+        seen, page = [], 1
+        while True:
+            result = OrganizationService.search_members(organization.id, 'jugador', page=page, per_page=2)
+            seen.extend(item.name for item in result.items)
+            if not result.has_more:
+                break
+            page += 1
+        assert seen == ['Jugador 1-1', 'Jugador 1-2', 'Jugador 1-3', 'Jugador 2-1', 'Jugador 2-2', 'Jugador 2-3']
+        assert page == 3
@@ -1,6 +1,6 @@
 from flask import abort
-from sqlalchemy import func, or_
-from flaskapp.database.models import Activity, Match, MatchStatus, Organization, Team, TeamMember, Tournament, TournamentReferee, TournamentStatus, User
+from sqlalchemy import distinct, func, select, true
+from flaskapp.database.models import Activity, Organization, Team, TeamMember, Tournament, TournamentReferee, TournamentStatus, User, UserPerformance
 from flaskapp.modules.profile.dto import TournamentStats, UserProfileDTO, UserStats
 
 from flaskapp.database.models import OrganizationMember, db
@@ -52,93 +52,90 @@ class ProfileService:
         db.session.commit()
         return user
 
-    def get_user_stats(user_id):        
-        stats = UserStats()
-        
-        # Torneos jugados (como miembro de equipo)
-        stats.tournaments_played = db.session.query(Tournament).join(
-            Team, Team.tournament_id == Tournament.id
-        ).join(
-            TeamMember, TeamMember.team_id == Team.id
-        ).filter(
-            TeamMember.user_id == user_id
-        ).count()
-        
-        # Partidos ganados y perdidos
-        matches_won = db.session.query(Match).join(
-            Team, Team.id == Match.winner_id
-        ).join(
-            TeamMember, TeamMember.team_id == Team.id
-        ).filter(
-            TeamMember.user_id == user_id,
-            Match.winner_id.isnot(None)
-        ).count()
-        
-        matches_participated = db.session.query(Match).join(
-            Team, or_(Team.id == Match.team_a_id, Team.id == Match.team_b_id)
-        ).join(
-            TeamMember, TeamMember.team_id == Team.id
-        ).filter(
-            TeamMember.user_id == user_id,
-            Match.status_id == MatchStatus.query.filter_by(code='COMPLETED').first().id
-        ).count()
-        
-        stats.matches_won = matches_won
-        stats.matches_lost = matches_participated - matches_won
-        stats.win_rate = round((matches_won / matches_participated * 100) if matches_participated > 0 else 0, 1)
-        
-        # Actividad favorita
-        favorite_activity = db.session.query(
-            Activity.name,
-            func.count(Tournament.id).label('count')
+    @staticmethod
+    def get_user_stats(user_id: int) -> UserStats:
+        """
+        Estadísticas del perfil en una sola consulta: un CTE con los equipos del
+        usuario, partidas y victorias desde user_performance (sin byes, cada
+        partida una vez) y los últimos torneos unidos a la fila del usuario.
+        """
+        user_teams = select(
+            TeamMember.is_leader, Team.tournament_id
+        ).join(Team, Team.id == TeamMember.team_id).where(TeamMember.user_id == user_id).cte('user_teams')
+        user_tournament_ids = select(user_teams.c.tournament_id)
+
+        favorite = select(
+            Activity.name.label('name'),
+            func.count(distinct(Tournament.id)).label('tournament_count')
         ).join(
             Tournament, Tournament.activity_id == Activity.id
-        ).join(
-            Team, Team.tournament_id == Tournament.id
-        ).join(
-            TeamMember, TeamMember.team_id == Team.id
-        ).filter(
-            TeamMember.user_id == user_id
+        ).where(
+            Tournament.id.in_(user_tournament_ids)
         ).group_by(
-            Activity.name
+            Activity.id, Activity.name
         ).order_by(
-            func.count(Tournament.id).desc()
-        ).first()
-        
-        if favorite_activity:
-            stats.favorite_activity = favorite_activity[0]
-            stats.favorite_activity_count = favorite_activity[1]
-        
-        # Veces como árbitro
-        stats.referee_count = TournamentReferee.query.filter_by(user_id=user_id).count()
-        
-        # Equipos liderados
-        stats.leader_count = TeamMember.query.filter_by(
-            user_id=user_id, is_leader=True
-        ).count()
-        
-        # Últimos torneos participados
-        recent_tournaments = db.session.query(
-            Tournament.id,
-            Tournament.name,
+            func.count(distinct(Tournament.id)).desc(), Activity.name
+        ).limit(1).subquery('favorite')
+
+        recent = select(
+            Tournament.id.label('id'),
+            Tournament.name.label('name'),
+            Tournament.start_date.label('start_date'),
             Organization.name.label('organization_name'),
             Organization.id.label('organization_id'),
             TournamentStatus.code.label('status'),
             TournamentStatus.description.label('status_display')
         ).join(
             Organization, Organization.id == Tournament.organization_id
-        ).join(
-            Team, Team.tournament_id == Tournament.id
-        ).join(
-            TeamMember, TeamMember.team_id == Team.id
         ).join(
             TournamentStatus, TournamentStatus.id == Tournament.status_id
-        ).filter(
-            TeamMember.user_id == user_id
+        ).where(
+            Tournament.id.in_(user_tournament_ids)
         ).order_by(
-            Tournament.start_date.desc()
-        ).limit(5).all()
-        
+            Tournament.start_date.desc(), Tournament.id.desc()
+        ).limit(5).subquery('recent')
+
+        # Una fila por torneo reciente (o una sola fila si no hay ninguno)
+        rows = db.session.execute(select(
+            select(func.count(distinct(user_teams.c.tournament_id))).scalar_subquery().label('tournaments_played'),
+            select(func.count()).select_from(user_teams).where(
+                user_teams.c.is_leader.is_(True)
+            ).scalar_subquery().label('leader_count'),
+            select(func.count()).select_from(TournamentReferee).where(
+                TournamentReferee.user_id == user_id
+            ).scalar_subquery().label('referee_count'),
+            func.coalesce(UserPerformance.matches_played, 0).label('matches_played'),
+            func.coalesce(UserPerformance.wins, 0).label('wins'),
+            favorite.c.name.label('favorite_activity'),
+            favorite.c.tournament_count.label('favorite_activity_count'),
+            recent
+        ).select_from(User).outerjoin(
+            UserPerformance, UserPerformance.user_id == User.id
+        ).outerjoin(
+            favorite, true()
+        ).outerjoin(
+            recent, true()
+        ).where(
+            User.id == user_id
+        ).order_by(
+            recent.c.start_date.desc(), recent.c.id.desc()
+        )).all()
+
+        stats = UserStats(recent_tournaments=[])
+        if not rows:
+            return stats
+
+        first = rows[0]
+        stats.tournaments_played = first.tournaments_played
+        stats.matches_won = first.wins
+        stats.matches_lost = first.matches_played - first.wins
+        stats.win_rate = round((first.wins / first.matches_played * 100) if first.matches_played > 0 else 0, 1)
+        if first.favorite_activity:
+            stats.favorite_activity = first.favorite_activity
+            stats.favorite_activity_count = first.favorite_activity_count
+        stats.referee_count = first.referee_count
+        stats.leader_count = first.leader_count
+
         stats.recent_tournaments = [
             TournamentStats(
                 id=t.id,
@@ -147,7 +144,7 @@ class ProfileService:
                 organization_id=t.organization_id,
                 status=t.status,
                 status_display=t.status_display
-            ) for t in recent_tournaments
+            ) for t in rows if t.id is not None
         ]
         
-        return stats
\ No newline at end of file
+        return stats
@@ -0,0 +1,67 @@
+from flaskapp.database.models import TeamMember, User, db
+from flaskapp.modules.matches.service import MatchService
+from flaskapp.modules.profile.service import ProfileService
+from tests.factory import QueryCounter, create_started_tournament, match_by_number
+
+"""
+Estadísticas del perfil (ProfileService.get_user_stats)
+    test_single_query: todas las estadísticas salen de una sola consulta.
+    test_counts_each_match_once: partidas ganadas/perdidas sin doble conteo ni byes.
+    test_user_without_history: un usuario sin torneos obtiene estadísticas vacías.
+"""
+
+
+def player(email):
+    return User.query.filter_by(email=email).one()
+
+
+def play_bracket(ids):
+    """Torneo de 4: ambas semis para team_a, la final para team_b."""
+    t = ids['tournament_id']
+    MatchService.submit_results(t, ids['referee_id'], [
+        {'match_id': match_by_number(t, 2).id, 'score_team_a': 2, 'score_team_b': 0},
+        {'match_id': match_by_number(t, 3).id, 'score_team_a': 2, 'score_team_b': 1},
+    ])
+    final = match_by_number(t, 1)
+    assert MatchService.update_match(final.id, {'user_id': ids['referee_id'], 'score_team_a': 0, 'score_team_b': 1})
+
+
+class TestUserStats:
+    def test_single_query(self, app):
+        ids = create_started_tournament(4)
+        play_bracket(ids)
+        user_id = player('player1-1@test.com').id
+        db.session.expire_all()
+
+        with QueryCounter() as counter:
+            stats = ProfileService.get_user_stats(user_id)
+        assert counter.count == 1
+        assert stats.tournaments_played == 1
+        assert stats.favorite_activity == 'Actividad de prueba'
+        assert stats.favorite_activity_count == 1
+        assert stats.leader_count == 1
+        assert [t.id for t in stats.recent_tournaments] == [ids['tournament_id']]
+        assert stats.recent_tournaments[0].status == 'IN_PROGRESS'
+
+    def test_counts_each_match_once(self, app):
+        ids = create_started_tournament(4)
+        play_bracket(ids)
+
+        # Campeón: ganó su semi y la final (como team_b); el finalista ganó solo su semi
+        final = match_by_number(ids['tournament_id'], 1)
+        champion_id = TeamMember.query.filter_by(team_id=final.winner_id).first().user_id
+        champion = ProfileService.get_user_stats(champion_id)
+        assert (champion.matches_won, champion.matches_lost, champion.win_rate) == (2, 0, 100.0)
+
+        finalist_id = TeamMember.query.filter_by(team_id=final.team_a_id).first().user_id
+        finalist = ProfileService.get_user_stats(finalist_id)
+        assert (finalist.matches_won, finalist.matches_lost, finalist.win_rate) == (1, 1, 50.0)
+
+    def test_user_without_history(self, app):
+        ids = create_started_tournament(4)
+        stats = ProfileService.get_user_stats(ids['referee_id'])
+        assert stats.tournaments_played == 0
+        assert (stats.matches_won, stats.matches_lost, stats.win_rate) == (0, 0, 0)
+        assert stats.favorite_activity is None
+        assert stats.referee_count == 1
+        assert stats.recent_tournaments == []
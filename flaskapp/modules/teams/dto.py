@@ -48,4 +48,13 @@ class EligibleMemberDTO:
     name: str
     email: str
     profile_picture: Optional[str]
-    is_invited: bool
\ No newline at end of file
+    is_invited: bool
+
+@dataclass
+class EligibleMembersPageDTO:
+    items: List[EligibleMemberDTO]
+    page: int
+    per_page: int
+    total: int
+    pages: int
+    invited_total: int
@@ -19,7 +19,9 @@ def create(organization_id, tournament_id):
     search_query = request.args.get('search', '')
     
     # Se pasa team_id=None porque aún no existe
-    eligible_members = TeamService.get_eligible_members(tournament_id, None, search_query)
+    eligible_members = TeamService.get_eligible_members(
+        tournament_id, None, search_query, page=request.args.get('page', 1, type=int)
+    )
 
     if form.validate_on_submit():
         try:
@@ -58,7 +60,9 @@ def manage(organization_id, tournament_id, team_id):
     form = TeamForm(obj=team)
     search_query = request.args.get('search', '')
 
-    eligible_members = TeamService.get_eligible_members(tournament_id, team_id, search_query)
+    eligible_members = TeamService.get_eligible_members(
+        tournament_id, team_id, search_query, page=request.args.get('page', 1, type=int)
+    )
 
     if form.validate_on_submit():
         try:
@@ -126,7 +130,8 @@ def toggle_invite(organization_id, tournament_id, team_id, user_id):
                           organization_id=organization_id, 
                           tournament_id=tournament_id, 
                           team_id=team_id,
-                          search=request.args.get('search', '')))
+                          search=request.args.get('search', ''),
+                          page=request.args.get('page', 1, type=int)))
 
 @teams_bp.route('/delete/<int:team_id>')
 @login_required
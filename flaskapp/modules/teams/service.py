@@ -1,3 +1,4 @@
+import math
 from datetime import datetime
 from typing import List, Optional
 from flask import abort
@@ -5,8 +6,12 @@ from flask_login import current_user
 from psycopg2 import IntegrityError
 from sqlalchemy import and_, or_, not_
 
-from flaskapp.database.models import Match, TeamInvitationStatus, TournamentReferee, db, Team, TeamMember, TeamInvitation, Tournament, OrganizationMember, User
-from .dto import TeamMatchDTO, TeamMemberDTO, TeamInvitationDTO, EligibleMemberDTO
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import Match, MatchStatus, TeamInvitationStatus, TournamentReferee, TournamentStatus, db, Team, TeamMember, TeamInvitation, Tournament, OrganizationMember, User
+from flaskapp.modules.auth.context import authorization_for
+from flaskapp.modules.matches import ratings
+from flaskapp.modules.tournaments import eligibility
+from .dto import TeamMatchDTO, TeamMemberDTO, TeamInvitationDTO, EligibleMemberDTO, EligibleMembersPageDTO
 from sqlalchemy.orm import aliased
 
 
@@ -18,6 +23,10 @@ class TeamService:
     def calculate_team_seed(team_id):
         """
         Calculate the seed score for a team based on ALL its members' performance.
+
+        The seed is the average Elo rating of the members in the tournament's
+        activity (see flaskapp.modules.matches.ratings), read with a single
+        grouped query.
         
         Args:
             team_id (int): ID of the team to calculate seed for
@@ -25,38 +34,10 @@ class TeamService:
         Returns:
             int: The calculated seed score
         """
-        
-        team = Team.query.get_or_404(team_id)
-        total_seed = 0
-        
-        # Calcular para todos los miembros del equipo
-        for member in team.members:
-            # Get all matches this member has participated in (as part of any team)
-            user_matches = Match.query.join(
-                TeamMember, TeamMember.team_id == Match.team_a_id
-            ).filter(
-                TeamMember.user_id == member.user_id
-            ).union(
-                Match.query.join(
-                    TeamMember, TeamMember.team_id == Match.team_b_id
-                ).filter(
-                    TeamMember.user_id == member.user_id
-                )
-            ).all()
-            
-            # Calculate points from match wins
-            for match in user_matches:
-                if match.winner_id:
-                    # Check if the user was on the winning team
-                    user_teams_in_match = [tm.team_id for tm in member.user.team_memberships]
-                    if match.winner_id in user_teams_in_match:
-                        total_seed += 10  # 10 point for each match win
-                        
-                        # Check if this was a tournament final
-                        if match.level == 0:  # Assuming level 1 is the final
-                            total_seed += 15  # Bonus 15 points for tournament win
-        
-        return total_seed
+        seeded = ratings.team_seed_scores(team_id=team_id)
+        if not seeded:
+            abort(404)
+        return seeded[0].seed_score
 
     @staticmethod
     def get_team_details(team_id: int) -> Team:
@@ -64,10 +45,7 @@ class TeamService:
     
     @staticmethod
     def is_team_leader(team_id: int, user_id: int) -> bool:
-        team_member = TeamMember.query.filter_by(team_id=team_id, user_id=user_id).first()
-        if not team_member:
-            return False
-        return team_member.is_leader
+        return authorization_for(user_id).is_team_leader(team_id)
     
     @staticmethod
     def create_team(organization_id, tournament_id, name, leader_id):
@@ -79,34 +57,23 @@ class TeamService:
         if current_teams_count >= tournament.max_teams:
             raise ValueError(f"No se pueden crear más equipos. El torneo ya alcanzó el máximo de {tournament.max_teams} equipos.")
 
+        # Roles del líder en el torneo (una consulta)
+        access = authorization_for(leader_id).tournament(tournament_id)
+
         # Validación 1: no debe ser admin
-        user = User.query.get_or_404(leader_id)
-        if user.is_admin:
+        if access.is_admin:
             raise ValueError("Un administrador no puede crear equipos.")
 
         # Validación 2: no debe ser organizador de esta organización
-        is_organizer = db.session.query(OrganizationMember).filter_by(
-            organization_id=organization_id,
-            user_id=leader_id,
-            is_organizer=True
-        ).first()
-        if is_organizer:
+        if access.is_organizer:
             raise ValueError("Un organizador no puede crear equipos.")
 
         # Validación 3: no debe ser árbitro del torneo
-        is_referee = db.session.query(TournamentReferee).filter_by(
-            tournament_id=tournament_id,
-            user_id=leader_id
-        ).first()
-        if is_referee:
+        if access.is_referee:
             raise ValueError("Un árbitro no puede crear equipos.")
 
         # Validación 4: no debe estar en otro equipo del torneo
-        is_in_team = db.session.query(TeamMember).join(Team).filter(
-            Team.tournament_id == tournament_id,
-            TeamMember.user_id == leader_id
-        ).first()
-        if is_in_team:
+        if access.has_team:
             raise ValueError("Ya perteneces a un equipo en este torneo.")
 
         # Crear el equipo
@@ -180,80 +147,34 @@ class TeamService:
                 invited_user_name=user.name,
                 invited_user_email=user.email,
                 invited_user_profile_picture=user.profile_picture,
-                status=invitation.status.code,
+                status=lookups.code_of(TeamInvitationStatus, invitation.status_id),
                 created_at=invitation.created_at
             ) for invitation, user in invitations
         ]
 
     @staticmethod
-    def get_eligible_members(tournament_id: int, team_id: int, search: str = None) -> List[EligibleMemberDTO]:
+    def get_eligible_members(tournament_id: int, team_id: int, search: str = None, page: int = 1,
+                             per_page: int = eligibility.DEFAULT_PAGE_SIZE) -> EligibleMembersPageDTO:
         tournament = Tournament.query.get_or_404(tournament_id)
-
-        # Subqueries para exclusión
-        existing_members = db.session.query(TeamMember.user_id).filter_by(team_id=team_id).subquery()
-        existing_referees = db.session.query(TournamentReferee.user_id).filter_by(tournament_id=tournament_id).subquery()
-        other_team_members = db.session.query(TeamMember.user_id).join(Team).filter(
-            Team.tournament_id == tournament_id,
-            Team.id != team_id
-        ).subquery()
-
-        # Invitaciones
-        pending_status_id = TeamInvitationStatus.query.filter_by(code='PENDING').first().id
-        pending_invitation_ids = db.session.query(TeamInvitation.invited_user_id).filter(
-            TeamInvitation.team_id == team_id,
-            TeamInvitation.status_id == pending_status_id
-        ).subquery()
-
-        non_pending_invited_ids = db.session.query(TeamInvitation.invited_user_id).filter(
-            TeamInvitation.team_id == team_id,
-            TeamInvitation.status_id != pending_status_id
-        ).subquery()
-
-        # Organizadores de la organización
-        organization_organizers = db.session.query(OrganizationMember.user_id).filter(
-            OrganizationMember.organization_id == tournament.organization_id,
-            OrganizationMember.is_organizer == True
-        ).subquery()
-
-        # Consulta principal
-        query = db.session.query(
-            OrganizationMember,
-            User
-        ).join(
-            User,
-            OrganizationMember.user_id == User.id
-        ).filter(
-            OrganizationMember.organization_id == tournament.organization_id,
-            OrganizationMember.user_id.notin_(existing_members),
-            OrganizationMember.user_id.notin_(existing_referees),
-            OrganizationMember.user_id.notin_(other_team_members),
-            OrganizationMember.user_id.notin_(non_pending_invited_ids),
-            OrganizationMember.user_id.notin_(organization_organizers),  # ✅ Aquí filtramos organizadores
-            User.is_admin == False
+        candidates = eligibility.page(tournament, eligibility.PLAYER, team_id, search, page, per_page)
+
+        return EligibleMembersPageDTO(
+            items=[
+                EligibleMemberDTO(
+                    user_id=candidate.user_id,
+                    name=candidate.name,
+                    email=candidate.email,
+                    profile_picture=candidate.profile_picture,
+                    is_invited=candidate.selected
+                ) for candidate in candidates.items
+            ],
+            page=candidates.page,
+            per_page=candidates.per_page,
+            total=candidates.total,
+            pages=math.ceil(candidates.total / candidates.per_page),
+            invited_total=candidates.selected_total
         )
 
-        if search:
-            query = query.filter(
-                db.or_(
-                    User.name.ilike(f'%{search}%'),
-                    User.email.ilike(f'%{search}%')
-                )
-            )
-
-        results = query.all()
-
-        pending_ids = [inv_id for (inv_id,) in db.session.query(pending_invitation_ids).all()]
-
-        return [
-            EligibleMemberDTO(
-                user_id=user.id,
-                name=user.name,
-                email=user.email,
-                profile_picture=user.profile_picture,
-                is_invited=user.id in pending_ids
-            ) for _, user in results
-        ]
-
 
     @staticmethod
     def toggle_invitation(tournament_id: int, team_id: int, user_id: int):
@@ -261,11 +182,11 @@ class TeamService:
         team = Team.query.get_or_404(team_id)
         
         # Verificar si el torneo está en estado de registro abierto
-        if tournament.status.code != 'REGISTRATION_OPEN':
+        if lookups.code_of(TournamentStatus, tournament.status_id) != 'REGISTRATION_OPEN':
             raise ValueError("El torneo no está en fase de registro")
         
         # Verificar si ya existe una invitación pendiente
-        pending_status_id = TeamInvitationStatus.query.filter_by(code='PENDING').first().id
+        pending_status_id = lookups.id_of(TeamInvitationStatus, 'PENDING')
         existing_invitation = TeamInvitation.query.filter_by(
             team_id=team_id,
             invited_user_id=user_id,
@@ -277,26 +198,8 @@ class TeamService:
             db.session.commit()
             return 'removed'
 
-        # Verificar si ya pertenece a un equipo del torneo
-        is_in_team = db.session.query(TeamMember.id).join(Team).filter(
-            Team.tournament_id == tournament_id,
-            TeamMember.user_id == user_id
-        ).first()
-
-        # Verificar si es árbitro del torneo
-        is_referee = db.session.query(TournamentReferee.id).filter_by(
-            tournament_id=tournament_id,
-            user_id=user_id
-        ).first()
-
-        # Verificar si es miembro válido de la organización
-        is_member = db.session.query(OrganizationMember).join(User).filter(
-            OrganizationMember.organization_id == tournament.organization_id,
-            OrganizationMember.user_id == user_id,
-            User.is_admin == False
-        ).first()
-
-        if not is_member or is_in_team or is_referee:
+        # Mismas reglas que la lista de elegibles
+        if not eligibility.is_eligible(tournament, eligibility.PLAYER, user_id, team_id):
             raise ValueError("El usuario no cumple los requisitos para ser invitado")
 
         # Crear la nueva invitación
@@ -316,7 +219,7 @@ class TeamService:
         team = Team.query.get_or_404(team_id)
 
         # Validar que el torneo aún esté en estado 'REGISTRATION_OPEN'
-        if team.tournament.status.code != 'REGISTRATION_OPEN':
+        if lookups.code_of(TournamentStatus, team.tournament.status_id) != 'REGISTRATION_OPEN':
             raise ValueError("El equipo no puede ser modificado porque el torneo ya ha comenzado")
 
         team.name = name
@@ -402,7 +305,7 @@ class TeamService:
                 team_b_leader=match.team_b_leader,
                 team_b_leader_pic=match.team_b_leader_pic or '/static/assets/img/theme/team-2.jpg',
                 winner_id=match.Match.winner_id,
-                status=match.Match.status.code,
+                status=lookups.code_of(MatchStatus, match.Match.status_id),
                 completed_at=match.Match.completed_at,
                 best_player_name=match.best_player_name,
                 best_player_pic=match.best_player_pic or '/static/assets/img/theme/player.jpg'
@@ -0,0 +1,227 @@
+"""
+Representación compacta de brackets de eliminación simple.
+
+El bracket se guarda como un heap indexado por match_number (1 = final,
+2**level + i = partida i del nivel `level`), igual que la numeración que
+usan Match.match_number y MatchService.update_match. Cada columna es un
+array de enteros, por lo que padre/hijos son operaciones aritméticas O(1)
+y la construcción de la primera ronda se hace con asignaciones por slices.
+
+No depende de la BD: solo trabaja con ids de equipos (0 = sin equipo).
+"""
+
+from array import array
+from operator import itemgetter, not_
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+EMPTY = 0  # Los ids de la BD empiezan en 1, así que 0 representa "sin equipo"
+
+# Tabla de colocación por tamaño de bracket, compartida por todo el proceso.
+# size -> (getter de seeds para team_a, getter de seeds para team_b,
+#          match_number donde juega cada seed de team_b)
+_SEEDING_TABLES: Dict[int, Tuple[Callable, Callable, List[int]]] = {}
+
+
+def seeding_order(size: int) -> List[int]:
+    """
+    Orden estándar de seeds (base 0) en la primera ronda, de a pares por partida.
+    Para 8 cupos: 1-8, 4-5, 2-7, 3-6, es decir [0, 7, 3, 4, 1, 6, 2, 5].
+    Así el seed 1 y el 2 solo pueden cruzarse en la final.
+    """
+    order = [0]
+    while len(order) < size:
+        mirror = 2 * len(order) - 1
+        order = [seed for top in order for seed in (top, mirror - top)]
+    return order
+
+
+def seeding_table(size: int) -> Tuple[Callable, Callable, List[int]]:
+    """
+    Devuelve (y memoiza) los getters que ubican los seeds en la primera ronda.
+    Cada getter recibe la lista de ids ordenados por seed y retorna una tupla
+    con el id de cada partida, en orden de match_number. El tercer elemento
+    da, para cada seed de la mitad inferior (los de team_b), su match_number.
+    """
+    table = _SEEDING_TABLES.get(size)
+    if table is None:
+        order = seeding_order(size)
+        match_of_seed = [0] * size
+        for match_number, seed in enumerate(order[1::2], start=size >> 1):
+            match_of_seed[seed] = match_number
+        table = (itemgetter(*order[0::2]), itemgetter(*order[1::2]), match_of_seed)
+        _SEEDING_TABLES[size] = table
+    return table
+
+
+class Bracket:
+    """Bracket de eliminación simple guardado como columnas indexadas por match_number."""
+
+    __slots__ = ('size', 'depth', 'team_a', 'team_b', 'winner', 'is_bye')
+
+    def __init__(self, size: int):
+        if size < 2 or size & (size - 1):
+            raise ValueError("El tamaño del bracket debe ser una potencia de 2 mayor o igual a 2.")
+
+        self.size = size  # Cantidad de cupos de la primera ronda
+        self.depth = size.bit_length() - 1  # Cantidad de rondas
+
+        # Índice 0 sin uso; las partidas van de 1 a size - 1
+        self.team_a = array('q', bytes(8 * size))
+        self.team_b = array('q', bytes(8 * size))
+        self.winner = array('q', bytes(8 * size))
+        self.is_bye = bytearray(size)
+
+    # ------------------------------------------------------------------
+    # Navegación O(1)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def parent(match_number: int) -> int:
+        """Partida a la que avanza el ganador (0 si es la final)."""
+        return match_number >> 1
+
+    @staticmethod
+    def children(match_number: int) -> Tuple[int, int]:
+        """Partidas cuyos ganadores alimentan team_a y team_b respectivamente."""
+        return match_number << 1, (match_number << 1) | 1
+
+    @staticmethod
+    def level_of(match_number: int) -> int:
+        """Nivel de la partida (0 = final)."""
+        return match_number.bit_length() - 1
+
+    @staticmethod
+    def slot_in_parent(match_number: int) -> str:
+        """Campo de la partida padre que recibe al ganador: par -> team_a, impar -> team_b."""
+        return 'team_a_id' if match_number % 2 == 0 else 'team_b_id'
+
+    @property
+    def first_round_level(self) -> int:
+        return self.depth - 1
+
+    @property
+    def first_round(self) -> range:
+        """match_numbers de la primera ronda."""
+        return range(self.size >> 1, self.size)
+
+    @property
+    def match_count(self) -> int:
+        return self.size - 1
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_seeded_ids(cls, team_ids: Sequence[int]) -> 'Bracket':
+        """
+        Construye el bracket a partir de ids ya ordenados por seed (mejor primero)
+        usando la colocación estándar (1 vs N, 4 vs N-3, ...). Los cupos sobrantes
+        son byes, por lo que caen naturalmente en los rivales de los mejores seeds.
+        """
+        team_count = len(team_ids)
+        if team_count < 2:
+            raise ValueError("Se requieren al menos dos equipos para un torneo.")
+
+        size = 1 << (team_count - 1).bit_length()
+        byes_count = size - team_count
+        bracket = cls(size)
+
+        # Los seeds que no existen (byes) quedan como EMPTY
+        padded = list(team_ids)
+        padded.extend([EMPTY] * byes_count)
+        seeds_a, seeds_b, match_of_seed = seeding_table(size)
+
+        first = size >> 1
+        if first == 1:
+            bracket.team_a[1], bracket.team_b[1] = padded
+        else:
+            bracket.team_a[first:size] = array('q', seeds_a(padded))
+            bracket.team_b[first:size] = array('q', seeds_b(padded))
+
+        # Bye = partida sin rival (los byes son los últimos seeds, todos en team_b);
+        # el equipo de team_a gana directamente. Solo se recorren los byes.
+        for seed in range(team_count, size):
+            match_number = match_of_seed[seed]
+            bracket.is_bye[match_number] = 1
+            bracket.winner[match_number] = bracket.team_a[match_number]
+
+        bracket._propagate_byes()
+        return bracket
+
+    def _propagate_byes(self) -> None:
+        """Adelanta los ganadores de los byes a la segunda ronda."""
+        if self.size == 2:
+            return
+        # Hijo par -> team_a del padre, impar -> team_b; las partidas sin bye aportan EMPTY
+        first = self.size >> 1
+        self.team_a[first >> 1:first] = self.winner[first:self.size:2]
+        self.team_b[first >> 1:first] = self.winner[first + 1:self.size:2]
+
+    # ------------------------------------------------------------------
+    # Validación
+    # ------------------------------------------------------------------
+
+    def validate(self) -> None:
+        """
+        Verifica las invariantes del bracket recién generado.
+        Lanza ValueError con el primer problema encontrado.
+        """
+        first = self.size >> 1
+        round_a = self.team_a[first:self.size]
+        round_b = self.team_b[first:self.size]
+
+        if EMPTY in round_a:
+            raise ValueError("Hay partidas de primera ronda sin equipo asignado.")
+
+        seen = set(round_a)
+        seen.update(round_b)
+        seen.discard(EMPTY)
+        if len(seen) != len(round_a) + len(round_b) - round_b.count(EMPTY):
+            raise ValueError("Un equipo aparece en más de una partida de primera ronda.")
+
+        # Una partida es bye si y solo si no tiene rival (comparación byte a byte)
+        if bytes(map(not_, round_b)) != self.is_bye[first:self.size]:
+            raise ValueError("Hay partidas de primera ronda inconsistentes con su bye.")
+
+    # ------------------------------------------------------------------
+    # Exportación
+    # ------------------------------------------------------------------
+
+    def team_count(self) -> int:
+        first = self.size >> 1
+        return 2 * first - self.is_bye[first:self.size].count(1)
+
+    def iter_rows(
+        self,
+        pending_status_id: int,
+        completed_status_id: int,
+        tournament_id: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Genera una fila por partida, desde la primera ronda hasta la final,
+        con las columnas de Match listas para insertar.
+        """
+        for level in range(self.depth - 1, -1, -1):
+            for match_number in range(1 << level, 2 << level):
+                bye = bool(self.is_bye[match_number])
+                row = {
+                    "level": level,
+                    "match_number": match_number,
+                    "team_a_id": self.team_a[match_number] or None,
+                    "team_b_id": self.team_b[match_number] or None,
+                    "is_bye": bye,
+                    "status_id": completed_status_id if bye else pending_status_id,
+                    "winner_id": self.winner[match_number] or None,
+                }
+                if tournament_id is not None:
+                    row["tournament_id"] = tournament_id
+                yield row
+
+    def to_levels(self, pending_status_id: int, completed_status_id: int) -> Dict[int, List[Dict[str, Any]]]:
+        """Formato histórico de TournamentGenerator.generate_full_bracket: {nivel: [partidas]}."""
+        matches_by_level: Dict[int, List[Dict[str, Any]]] = {}
+        for row in self.iter_rows(pending_status_id, completed_status_id):
+            matches_by_level.setdefault(row["level"], []).append(row)
+        return matches_by_level
+
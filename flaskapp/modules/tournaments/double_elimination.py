@@ -0,0 +1,264 @@
+"""
+Brackets de doble eliminación.
+
+Numeración (N = tamaño del bracket de ganadores, potencia de 2):
+- Ganadores (WINNERS): heap 1..N-1, igual que el bracket de eliminación simple.
+- Perdedores (LOSERS): N..2N-3, ronda por ronda. Nivel 0 = final de perdedores.
+- Gran final (GRAND_FINAL): 2N-2 (nivel 1) y la revancha 2N-1 (nivel 0), que solo
+  se juega si gana el campeón del bracket de perdedores.
+
+Para cada partida se precalcula a dónde va el ganador y a dónde va el perdedor
+(match_number + casilla), de modo que registrar un resultado no necesita buscar
+la siguiente partida. Las partidas de perdedores que, por culpa de los byes,
+recibirían un solo equipo (o ninguno) no se crean: las rutas las saltan.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flaskapp.modules.tournaments.bracket import EMPTY, Bracket
+
+WINNERS = 'WINNERS'
+LOSERS = 'LOSERS'
+GRAND_FINAL = 'GRAND_FINAL'
+
+SLOT_A = 'A'
+SLOT_B = 'B'
+
+# Tabla de rutas por tamaño, compartida por todo el proceso
+_ROUTING_TABLES: Dict[int, 'RoutingTable'] = {}
+
+
+class RoutingTable:
+    """
+    Rutas estructurales de un bracket de doble eliminación de tamaño N,
+    indexadas por match_number. Un destino 0 significa "sin destino".
+    Las casillas se guardan como 0 (team_a) / 1 (team_b).
+    """
+
+    __slots__ = ('size', 'losers_rounds', 'losers_round_start', 'grand_final', 'reset',
+                 'win_to', 'win_slot', 'lose_to', 'lose_slot', 'level', 'section')
+
+    def __init__(self, size: int):
+        if size < 2 or size & (size - 1):
+            raise ValueError("El tamaño del bracket debe ser una potencia de 2 mayor o igual a 2.")
+
+        depth = size.bit_length() - 1
+        self.size = size
+        self.losers_rounds = 2 * (depth - 1)
+        self.grand_final = 2 * size - 2
+        self.reset = 2 * size - 1
+
+        total = 2 * size
+        self.win_to = array('q', bytes(8 * total))
+        self.lose_to = array('q', bytes(8 * total))
+        self.win_slot = bytearray(total)
+        self.lose_slot = bytearray(total)
+        self.level = array('q', bytes(8 * total))
+        self.section: List[str] = [''] * total
+
+        # Inicio de cada ronda de perdedores (ronda r en losers_round_start[r])
+        self.losers_round_start = [0] * (self.losers_rounds + 2)
+        next_number = size
+        for r in range(1, self.losers_rounds + 1):
+            self.losers_round_start[r] = next_number
+            next_number += self.losers_round_count(r)
+        self.losers_round_start[self.losers_rounds + 1] = next_number
+
+        self._build_winners(depth)
+        self._build_losers()
+        self._build_grand_final()
+
+    def losers_round_count(self, r: int) -> int:
+        """Partidas en la ronda r (1..losers_rounds) del bracket de perdedores."""
+        return self.size >> ((r + 1) // 2 + 1)
+
+    def losers_match(self, r: int, index: int) -> int:
+        return self.losers_round_start[r] + index
+
+    def _link(self, match_number: int, winner: Tuple[int, int], loser: Tuple[int, int] = (0, 0)) -> None:
+        self.win_to[match_number], self.win_slot[match_number] = winner
+        self.lose_to[match_number], self.lose_slot[match_number] = loser
+
+    def _build_winners(self, depth: int) -> None:
+        for match_number in range(1, self.size):
+            level = match_number.bit_length() - 1
+            self.level[match_number] = level
+            self.section[match_number] = WINNERS
+
+            winner = (match_number >> 1, match_number & 1) if match_number > 1 else (self.grand_final, 0)
+
+            wb_round = depth - level  # 1 = primera ronda
+            index = match_number - (1 << level)
+            if self.losers_rounds == 0:
+                # Bracket de 2: el perdedor de la final de ganadores va directo a la gran final
+                loser = (self.grand_final, 1)
+            elif wb_round == 1:
+                loser = (self.losers_match(1, index >> 1), index & 1)
+            else:
+                target_round = 2 * (wb_round - 1)
+                count = self.losers_round_count(target_round)
+                # Se invierte el orden cada dos rondas para evitar revanchas tempranas
+                target_index = count - 1 - index if wb_round % 2 == 0 else index
+                loser = (self.losers_match(target_round, target_index), 0)
+
+            self._link(match_number, winner, loser)
+
+    def _build_losers(self) -> None:
+        for r in range(1, self.losers_rounds + 1):
+            for index in range(self.losers_round_count(r)):
+                match_number = self.losers_match(r, index)
+                self.level[match_number] = self.losers_rounds - r
+                self.section[match_number] = LOSERS
+
+                if r == self.losers_rounds:
+                    winner = (self.grand_final, 1)
+                elif r % 2 == 1:
+                    # Ronda impar: el ganador enfrenta a un perdedor que baja del bracket de ganadores
+                    winner = (self.losers_match(r + 1, index), 1)
+                else:
+                    # Ronda par: los ganadores se cruzan entre sí
+                    winner = (self.losers_match(r + 1, index >> 1), index & 1)
+
+                self._link(match_number, winner)
+
+    def _build_grand_final(self) -> None:
+        self.section[self.grand_final] = GRAND_FINAL
+        self.section[self.reset] = GRAND_FINAL
+        self.level[self.grand_final] = 1
+        self.level[self.reset] = 0
+        # La revancha solo se juega si gana team_b (ver MatchService)
+        self._link(self.grand_final, (self.reset, 0), (self.reset, 1))
+
+
+def routing_table(size: int) -> RoutingTable:
+    """Devuelve (y memoiza) la tabla de rutas para un bracket de tamaño `size`."""
+    table = _ROUTING_TABLES.get(size)
+    if table is None:
+        table = RoutingTable(size)
+        _ROUTING_TABLES[size] = table
+    return table
+
+
+class DoubleEliminationBracket:
+    """
+    Bracket de doble eliminación de un torneo concreto: el bracket de ganadores
+    (con seeds y byes) más las rutas efectivas de ganador/perdedor de cada partida.
+    """
+
+    __slots__ = ('winners', 'routing', 'live', 'win_to', 'win_slot', 'lose_to', 'lose_slot')
+
+    def __init__(self, winners: Bracket):
+        self.winners = winners
+        self.routing = routing_table(winners.size)
+
+        total = 2 * winners.size
+        # Cantidad de casillas que efectivamente recibirán un equipo
+        self.live = bytearray(total)
+        self.win_to = array('q', self.routing.win_to)
+        self.win_slot = bytearray(self.routing.win_slot)
+        self.lose_to = array('q', self.routing.lose_to)
+        self.lose_slot = bytearray(self.routing.lose_slot)
+
+        self._compute_live_slots()
+        self._bypass_single_team_matches()
+
+    @classmethod
+    def from_seeded_ids(cls, team_ids: Sequence[int]) -> 'DoubleEliminationBracket':
+        return cls(Bracket.from_seeded_ids(team_ids))
+
+    def _topological_order(self) -> Iterator[int]:
+        """Ganadores (de la primera ronda a la final), perdedores ronda a ronda y gran final."""
+        for level in range(self.winners.depth - 1, -1, -1):
+            yield from range(1 << level, 2 << level)
+        yield from range(self.routing.size, self.routing.grand_final + 2)
+
+    def _compute_live_slots(self) -> None:
+        """Propaga cuántos equipos llegarán a cada partida a partir de la primera ronda."""
+        for match_number in self.winners.first_round:
+            self.live[match_number] = 1 + (self.winners.team_b[match_number] != EMPTY)
+
+        routing = self.routing
+        for match_number in self._topological_order():
+            if match_number == routing.grand_final:
+                break
+            live = self.live[match_number]
+            # Con un solo equipo hay ganador (avanza directo) pero no perdedor
+            if live >= 1 and routing.win_to[match_number]:
+                self.live[routing.win_to[match_number]] += 1
+            if live == 2 and routing.lose_to[match_number]:
+                self.live[routing.lose_to[match_number]] += 1
+
+    def _is_skipped(self, match_number: int) -> bool:
+        """Partidas de perdedores que recibirían menos de dos equipos no se crean."""
+        return self.routing.section[match_number] == LOSERS and self.live[match_number] < 2
+
+    def _resolve(self, target: int, slot: int) -> Tuple[int, int]:
+        """Sigue la ruta del ganador mientras el destino sea una partida omitida."""
+        while target and self._is_skipped(target):
+            target, slot = self.routing.win_to[target], self.routing.win_slot[target]
+        return target, slot
+
+    def _bypass_single_team_matches(self) -> None:
+        for match_number in range(1, self.routing.reset + 1):
+            if self.win_to[match_number]:
+                self.win_to[match_number], self.win_slot[match_number] = self._resolve(
+                    self.win_to[match_number], self.win_slot[match_number])
+            if self.lose_to[match_number]:
+                self.lose_to[match_number], self.lose_slot[match_number] = self._resolve(
+                    self.lose_to[match_number], self.lose_slot[match_number])
+
+    # ------------------------------------------------------------------
+    # Consultas O(1)
+    # ------------------------------------------------------------------
+
+    def winner_destination(self, match_number: int) -> Optional[Tuple[int, str]]:
+        """(match_number, casilla) que recibe al ganador, o None si no avanza."""
+        target = self.win_to[match_number]
+        return (target, SLOT_B if self.win_slot[match_number] else SLOT_A) if target else None
+
+    def loser_destination(self, match_number: int) -> Optional[Tuple[int, str]]:
+        """(match_number, casilla) que recibe al perdedor, o None si queda eliminado."""
+        if self.live[match_number] < 2:
+            return None
+        target = self.lose_to[match_number]
+        return (target, SLOT_B if self.lose_slot[match_number] else SLOT_A) if target else None
+
+    def match_numbers(self) -> List[int]:
+        """Partidas que efectivamente se crean, en orden topológico."""
+        return [m for m in self._topological_order() if not self._is_skipped(m)]
+
+    # ------------------------------------------------------------------
+    # Exportación
+    # ------------------------------------------------------------------
+
+    def iter_rows(
+        self,
+        pending_status_id: int,
+        completed_status_id: int,
+        tournament_id: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Una fila por partida con las columnas de Match, incluidas las rutas precalculadas."""
+        winners = self.winners
+        for match_number in self.match_numbers():
+            in_winners = match_number < winners.size
+            bye = in_winners and bool(winners.is_bye[match_number])
+            next_match = self.winner_destination(match_number)
+            loser_match = self.loser_destination(match_number)
+            row = {
+                "level": self.routing.level[match_number],
+                "match_number": match_number,
+                "bracket": self.routing.section[match_number],
+                "team_a_id": (winners.team_a[match_number] or None) if in_winners else None,
+                "team_b_id": (winners.team_b[match_number] or None) if in_winners else None,
+                "is_bye": bye,
+                "status_id": completed_status_id if bye else pending_status_id,
+                "winner_id": (winners.winner[match_number] or None) if in_winners else None,
+                "next_match_number": next_match[0] if next_match else None,
+                "next_match_slot": next_match[1] if next_match else None,
+                "loser_match_number": loser_match[0] if loser_match else None,
+                "loser_match_slot": loser_match[1] if loser_match else None,
+            }
+            if tournament_id is not None:
+                row["tournament_id"] = tournament_id
+            yield row
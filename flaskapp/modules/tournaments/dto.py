@@ -53,6 +53,7 @@ class TournamentDetailDTO(TournamentDTO):
     event_id: Optional[int]  # Útil para formularios
     teams: List[TeamDTO]
     user_has_team: bool
+    format_code: str = 'SINGLE_ELIMINATION'
 
 @dataclass
 class EligibleRefereeDTO:
@@ -63,6 +64,15 @@ class EligibleRefereeDTO:
     is_referee: bool
     profile_picture: Optional[str]  # Útil para la UI
 
+@dataclass
+class EligibleRefereesPageDTO:
+    items: List[EligibleRefereeDTO]
+    page: int
+    per_page: int
+    total: int
+    pages: int
+    referee_total: int
+
 @dataclass
 class TournamentFormDTO:
     """DTO específico para el formulario de torneo"""
@@ -95,4 +105,5 @@ class MatchDTO:
     winner_id: Optional[int]
     status: str  # 'PENDING' o 'COMPLETED'
     is_bye: bool
-    completed_at: Optional[str] 
\ No newline at end of file
+    completed_at: Optional[str]
+    bracket: str = 'MAIN'  # MAIN, WINNERS, LOSERS o GRAND_FINAL 
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Elegibilidad de miembros de la organización para un torneo: invitados a un
+equipo (PLAYER) o árbitros (REFEREE).
+
+Las reglas se expresan una sola vez, como condiciones NOT EXISTS correlacionadas
+sobre organization_members (el planificador las resuelve como anti-joins):
+
+    - miembro de la organización del torneo, no administrador ni organizador
+    - sin equipo en el torneo
+    - PLAYER: además, no es árbitro del torneo ni tiene una invitación ya
+      respondida para el equipo
+
+page() lista los candidatos en una consulta paginada (los seleccionados
+primero: invitación pendiente al equipo o árbitro asignado) y obtiene los
+totales con funciones de ventana sobre la misma consulta. is_eligible()
+valida un usuario con las mismas condiciones antes de invitarlo o asignarlo.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import and_, case, exists, false, func, select
+
+from flaskapp.database import usersearch
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import (
+    OrganizationMember, Team, TeamInvitation, TeamInvitationStatus, TeamMember, Tournament,
+    TournamentReferee, User, db
+)
+
+PLAYER = 'PLAYER'
+REFEREE = 'REFEREE'
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+@dataclass
+class Candidate:
+    member_id: int
+    user_id: int
+    name: str
+    email: str
+    profile_picture: Optional[str]
+    selected: bool
+
+
+@dataclass
+class CandidatePage:
+    items: List[Candidate]
+    page: int
+    per_page: int
+    total: int
+    selected_total: int
+
+
+def _in_tournament_team(tournament_id: int):
+    return exists().where(
+        TeamMember.user_id == OrganizationMember.user_id,
+        Team.id == TeamMember.team_id,
+        Team.tournament_id == tournament_id
+    )
+
+
+def _is_referee(tournament_id: int):
+    return exists().where(
+        TournamentReferee.user_id == OrganizationMember.user_id,
+        TournamentReferee.tournament_id == tournament_id
+    )
+
+
+def _invitation(team_id: int, pending: bool):
+    pending_id = lookups.id_of(TeamInvitationStatus, 'PENDING')
+    return exists().where(
+        TeamInvitation.invited_user_id == OrganizationMember.user_id,
+        TeamInvitation.team_id == team_id,
+        TeamInvitation.status_id == pending_id if pending else TeamInvitation.status_id != pending_id
+    )
+
+
+def _conditions(tournament: Tournament, role: str, team_id: Optional[int]) -> list:
+    if role not in (PLAYER, REFEREE):
+        raise ValueError(f"Rol desconocido: {role}")
+    conditions = [
+        OrganizationMember.organization_id == tournament.organization_id,
+        OrganizationMember.is_organizer.is_(False),
+        User.is_admin.is_(False),
+        ~_in_tournament_team(tournament.id)
+    ]
+    if role == PLAYER:
+        conditions.append(~_is_referee(tournament.id))
+        if team_id is not None:
+            conditions.append(~_invitation(team_id, pending=False))
+    return conditions
+
+
+def _selected(tournament: Tournament, role: str, team_id: Optional[int]):
+    if role == REFEREE:
+        return _is_referee(tournament.id)
+    return _invitation(team_id, pending=True) if team_id is not None else false()
+
+
+def page(tournament: Tournament, role: str, team_id: Optional[int] = None, search: Optional[str] = None,
+         page: int = 1, per_page: int = DEFAULT_PAGE_SIZE) -> CandidatePage:
+    """
+    Candidatos de una página, en una sola consulta: los seleccionados primero
+    y luego por nombre. `total` y `selected_total` cuentan todos los
+    candidatos (no solo la página) y salen de funciones de ventana.
+    """
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), MAX_PAGE_SIZE)
+    selected = _selected(tournament, role, team_id)
+    selected_flag = case((selected, 1), else_=0)
+
+    query = select(
+        OrganizationMember.id, User.id, User.name, User.email, User.profile_picture,
+        selected_flag.label('selected'),
+        func.count().over().label('total'),
+        func.sum(selected_flag).over().label('selected_total')
+    ).join(
+        User, User.id == OrganizationMember.user_id
+    ).where(*_conditions(tournament, role, team_id))
+    if search:
+        query = query.where(usersearch.matching(search))
+    query = query.order_by(selected_flag.desc(), User.name, User.id).offset((page - 1) * per_page).limit(per_page)
+
+    rows = db.session.execute(query).all()
+    return CandidatePage(
+        items=[
+            Candidate(
+                member_id=row[0], user_id=row[1], name=row[2], email=row[3],
+                profile_picture=row[4], selected=bool(row.selected)
+            ) for row in rows
+        ],
+        page=page,
+        per_page=per_page,
+        total=rows[0].total if rows else 0,
+        selected_total=int(rows[0].selected_total or 0) if rows else 0
+    )
+
+
+def is_eligible(tournament: Tournament, role: str, user_id: int, team_id: Optional[int] = None) -> bool:
+    """Si `user_id` puede ser invitado al equipo (PLAYER) o asignado como árbitro (REFEREE)."""
+    query = select(
+        exists().where(
+            and_(User.id == OrganizationMember.user_id, OrganizationMember.user_id == user_id),
+            *_conditions(tournament, role, team_id)
+        )
+    )
+    return bool(db.session.scalar(query))
@@ -2,7 +2,7 @@ from flask_wtf import FlaskForm
 from wtforms import DateField, StringField, TextAreaField, DateTimeField, IntegerField, SelectField, BooleanField
 from wtforms.validators import DataRequired, Optional, NumberRange, ValidationError
 from datetime import date, datetime
-from flaskapp.database.models import Activity, TournamentStatus, Event, OrganizationMember
+from flaskapp.database.models import Activity, TournamentStatus, TournamentFormat, Event, OrganizationMember
 from flask_login import current_user
 
 class TournamentForm(FlaskForm):
@@ -27,6 +27,7 @@ class TournamentForm(FlaskForm):
     )
     prizes = TextAreaField('Premios')
     status_id = SelectField('Estado', coerce=int, validators=[DataRequired()])
+    format_id = SelectField('Formato', coerce=int, validators=[DataRequired()])
     event_id = SelectField('Evento (opcional)', coerce=int, validators=[Optional()])
 
     def __init__(self, organization_id=None, *args, **kwargs):
@@ -34,6 +35,7 @@ class TournamentForm(FlaskForm):
         self.organization_id = organization_id
         self._set_activity_choices()
         self._set_status_choices()
+        self._set_format_choices()
         self._set_event_choices()
 
     def _set_activity_choices(self):
@@ -48,6 +50,11 @@ class TournamentForm(FlaskForm):
         statuses = TournamentStatus.query.order_by(TournamentStatus.id).all()
         self.status_id.choices = [(s.id, s.code) for s in statuses]
 
+    def _set_format_choices(self):
+        """Cargar formatos de torneo disponibles"""
+        formats = TournamentFormat.query.order_by(TournamentFormat.id).all()
+        self.format_id.choices = [(f.id, f.description or f.code) for f in formats]
+
     def _set_event_choices(self):
         """Cargar eventos disponibles para la organización"""
         if not self.organization_id:
@@ -0,0 +1,177 @@
+"""
+Ligas (todos contra todos) y fases de grupos.
+
+El calendario se genera con el método del círculo: un equipo queda fijo y el
+resto rota una posición por jornada, de modo que en N-1 jornadas (N par) cada
+equipo enfrenta a todos los demás una vez: N·(N-1)/2 partidas. Con N impar se
+agrega un cupo vacío y quien lo enfrenta descansa esa jornada.
+
+Todo se produce con generadores: el calendario nunca se materializa completo,
+así que se puede insertar por bloques (ver bulk_insert_chunked).
+
+Numeración: las partidas de grupos empiezan en `first_match_number` para dejar
+libres los números 1..size-1 al bracket de eliminación que se juega después.
+"""
+
+from itertools import count
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from flaskapp.modules.tournaments.bracket import EMPTY
+
+LEAGUE = 'LEAGUE'
+GROUP_PREFIX = 'GROUP_'
+
+GROUP_SIZE = 4  # Tamaño objetivo de cada grupo
+ADVANCING_PER_GROUP = 2  # Equipos que pasan de cada grupo a la eliminación
+
+
+def round_count(team_count: int) -> int:
+    """Jornadas de una liga de `team_count` equipos."""
+    return team_count - 1 if team_count % 2 == 0 else team_count
+
+
+def match_count(team_count: int) -> int:
+    return team_count * (team_count - 1) // 2
+
+
+def iter_circle_schedule(team_ids: Sequence[int]) -> Iterator[Tuple[int, int, int]]:
+    """
+    Genera (jornada, team_a_id, team_b_id) con el método del círculo, jornada por
+    jornada (0 = primera). No arma listas por jornada: cada posición se calcula
+    con aritmética modular sobre la lista original.
+    """
+    slots = len(team_ids) + (len(team_ids) % 2)
+    if len(team_ids) < 2:
+        raise ValueError("Se requieren al menos dos equipos para una liga.")
+
+    rotating = slots - 1
+
+    def team_at(position: int, round_index: int) -> int:
+        if position == 0:
+            return team_ids[0]
+        index = 1 + (position - 1 + round_index) % rotating
+        return team_ids[index] if index < len(team_ids) else EMPTY
+
+    for round_index in range(rotating):
+        for i in range(slots // 2):
+            team_a = team_at(i, round_index)
+            team_b = team_at(slots - 1 - i, round_index)
+            if team_a == EMPTY or team_b == EMPTY:
+                continue  # Descanso
+            if i == 0 and round_index % 2:
+                # El equipo fijo alterna de lado para no ser siempre team_a
+                team_a, team_b = team_b, team_a
+            yield round_index, team_a, team_b
+
+
+def group_count_for(team_count: int) -> int:
+    """
+    Cantidad de grupos: la mayor potencia de 2 que deja grupos de al menos
+    GROUP_SIZE equipos, para que la eliminación posterior no tenga byes.
+    """
+    groups = max(1, team_count // GROUP_SIZE)
+    return 1 << (groups.bit_length() - 1)
+
+
+def group_code(index: int) -> str:
+    """0 -> GROUP_A, 1 -> GROUP_B, ..."""
+    return f"{GROUP_PREFIX}{chr(ord('A') + index)}" if index < 26 else f"{GROUP_PREFIX}{index + 1}"
+
+
+def group_index(code: str) -> int:
+    """
+    Inverso de group_code. Los códigos no ordenan alfabéticamente (GROUP_27 <
+    GROUP_A), así que los grupos se ordenan por este índice.
+    """
+    suffix = code[len(GROUP_PREFIX):]
+    return int(suffix) - 1 if suffix.isdigit() else ord(suffix) - ord('A')
+
+
+def split_into_groups(seeded_ids: Sequence[int], group_count: int) -> List[List[int]]:
+    """
+    Reparte los equipos (ordenados por seed) en serpentina: A B C D D C B A ...
+    así cada grupo recibe un cabeza de serie y la fuerza queda balanceada.
+    """
+    if group_count < 1:
+        raise ValueError("Se requiere al menos un grupo.")
+    groups: List[List[int]] = [[] for _ in range(group_count)]
+    for position, team_id in enumerate(seeded_ids):
+        lap, offset = divmod(position, group_count)
+        groups[offset if lap % 2 == 0 else group_count - 1 - offset].append(team_id)
+    return groups
+
+
+def knockout_size(group_count: int, advancing: int = ADVANCING_PER_GROUP) -> int:
+    """Tamaño del bracket de eliminación que reciben los clasificados."""
+    return 1 << (group_count * advancing - 1).bit_length()
+
+
+def iter_round_robin_rows(
+    groups: Sequence[Sequence[int]],
+    pending_status_id: int,
+    first_match_number: int = 1,
+    tournament_id: Optional[int] = None,
+    bracket_codes: Optional[Sequence[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Filas de Match para todos los grupos, una jornada de cada grupo a la vez.
+    El nivel sigue la convención del bracket: 0 = última jornada.
+    """
+    bracket_codes = bracket_codes or [group_code(i) for i in range(len(groups))]
+    numbers = count(first_match_number)
+    for group, bracket in zip(groups, bracket_codes):
+        last_round = round_count(len(group)) - 1
+        for round_index, team_a_id, team_b_id in iter_circle_schedule(group):
+            row = {
+                "level": last_round - round_index,
+                "match_number": next(numbers),
+                "bracket": bracket,
+                "team_a_id": team_a_id,
+                "team_b_id": team_b_id,
+                "is_bye": False,
+                "status_id": pending_status_id,
+                "winner_id": None,
+            }
+            if tournament_id is not None:
+                row["tournament_id"] = tournament_id
+            yield row
+
+
+def group_standings(
+    results: Iterable[Tuple[str, int, int, Optional[int], Optional[int], Optional[int]]],
+    seed_scores: Dict[int, float]
+) -> Dict[str, List[int]]:
+    """
+    Tabla de cada grupo a partir de filas (bracket, team_a_id, team_b_id,
+    winner_id, score_team_a, score_team_b). Orden: victorias, diferencia de
+    puntos y, ante empate, seed.
+    """
+    wins: Dict[int, int] = {}
+    difference: Dict[int, int] = {}
+    members: Dict[str, set] = {}
+    for bracket, team_a_id, team_b_id, winner_id, score_a, score_b in results:
+        members.setdefault(bracket, set()).update((team_a_id, team_b_id))
+        if winner_id:
+            wins[winner_id] = wins.get(winner_id, 0) + 1
+        if score_a is not None and score_b is not None:
+            difference[team_a_id] = difference.get(team_a_id, 0) + score_a - score_b
+            difference[team_b_id] = difference.get(team_b_id, 0) + score_b - score_a
+
+    return {
+        bracket: sorted(
+            teams,
+            key=lambda t: (wins.get(t, 0), difference.get(t, 0), seed_scores.get(t) or 0, -t),
+            reverse=True
+        )
+        for bracket, teams in sorted(members.items(), key=lambda item: group_index(item[0]))
+    }
+
+
+def knockout_seeding(standings: Dict[str, List[int]], advancing: int = ADVANCING_PER_GROUP) -> List[int]:
+    """
+    Clasificados ordenados como seeds: primero todos los ganadores de grupo,
+    luego los segundos, etc. Con la colocación estándar, el 1.º de un grupo
+    enfrenta al 2.º de otro en la primera ronda.
+    """
+    tables = [standings[bracket] for bracket in sorted(standings, key=group_index)]
+    return [table[place] for place in range(advancing) for table in tables if place < len(table)]
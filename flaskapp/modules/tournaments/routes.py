@@ -1,4 +1,3 @@
-from collections import defaultdict
 from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
@@ -67,6 +66,36 @@ def start_tournament(organization_id, tournament_id):
     
     return redirect(url_for('tournaments_blueprint.detail', organization_id=organization_id, tournament_id=tournament_id))
 
+@tournaments_bp.route('/<int:tournament_id>/next-round', methods=['GET'])
+@login_required
+@organization_organizer_required()
+def next_swiss_round(organization_id, tournament_id):
+    try:
+        created = TournamentService.generate_next_swiss_round(tournament_id)
+        flash(f'Nueva ronda generada ({created} partidas)', 'success')
+    except ValueError as e:
+        flash(str(e), 'danger')
+    except Exception as e:
+        current_app.logger.error(f"Error generating swiss round: {str(e)}")
+        flash('Ocurrió un error al generar la ronda', 'danger')
+
+    return redirect(url_for('tournaments_blueprint.detail', organization_id=organization_id, tournament_id=tournament_id))
+
+@tournaments_bp.route('/<int:tournament_id>/knockout', methods=['GET'])
+@login_required
+@organization_organizer_required()
+def start_knockout_stage(organization_id, tournament_id):
+    try:
+        created = TournamentService.start_knockout_stage(tournament_id)
+        flash(f'Fase de eliminación generada ({created} partidas)', 'success')
+    except ValueError as e:
+        flash(str(e), 'danger')
+    except Exception as e:
+        current_app.logger.error(f"Error starting knockout stage: {str(e)}")
+        flash('Ocurrió un error al generar la fase de eliminación', 'danger')
+
+    return redirect(url_for('tournaments_blueprint.detail', organization_id=organization_id, tournament_id=tournament_id))
+
 @tournaments_bp.route('/<int:tournament_id>')
 @login_required
 @organization_member_required()
@@ -76,10 +105,8 @@ def detail(organization_id, tournament_id):
     pending_invitations = TournamentService.get_user_pending_invitations(tournament_id, current_user.id)
     
     matches = TournamentService.get_tournament_matches(tournament_id)
-    bracket_by_level = defaultdict(list)
-    for match in matches:
-        bracket_by_level[match.level].append(match)
-    bracket_by_level = dict(sorted(bracket_by_level.items(), reverse=True))
+    bracket_sections = TournamentService.group_matches_by_bracket(matches)
+    final_match = TournamentService.get_final_match(matches)
 
     return render_template(
         'tournaments/detail.html',
@@ -88,7 +115,8 @@ def detail(organization_id, tournament_id):
         can_create_team=can_create_team,
         tournament_id=tournament_id,
         pending_invitations=pending_invitations,
-        bracket_by_level=bracket_by_level,
+        bracket_sections=bracket_sections,
+        final_match=final_match,
         segment='Torneos'
     )
 
@@ -108,7 +136,8 @@ def manage(organization_id, tournament_id=None):
         tournament = Tournament.query.get_or_404(tournament_id)
         form = TournamentForm(organization_id=organization_id, obj=tournament)
         search_query = request.args.get('search', '')
-        referees = TournamentService.get_eligible_referees(tournament_id, search_query)
+        page = request.args.get('page', 1, type=int)
+        referees = TournamentService.get_eligible_referees(tournament_id, search_query, page=page)
         
         if 'toggle_referee' in request.args:
             try:
@@ -120,7 +149,8 @@ def manage(organization_id, tournament_id=None):
                 return redirect(url_for('tournaments_blueprint.manage', 
                                     organization_id=organization_id,
                                     tournament_id=tournament_id,
-                                    search=search_query))
+                                    search=search_query,
+                                    page=page))
             except ValueError as e:
                 flash(str(e), 'danger')
                 db.session.rollback()
@@ -1,17 +1,26 @@
 import math
-from sqlalchemy import and_
+from operator import attrgetter
+from sqlalchemy import and_, update
 from typing import Any, Tuple
-from sqlalchemy.orm import aliased
+from flask import abort
 from flask_login import current_user
+from flaskapp.database.bulk import bulk_insert, bulk_insert_chunked
+from flaskapp.database.lookups import lookups
 from flaskapp.database.models import Match, MatchStatus, TeamInvitationStatus, TournamentStatus, db, OrganizationMember, Team, TeamMember, Tournament, TournamentReferee, User, TeamInvitation, Team
+from flaskapp.modules.auth.context import authorization_for
+from flaskapp.modules.matches import ratings
 from flaskapp.modules.teams.service import TeamService
-from flaskapp.modules.tournaments.dto import EligibleRefereeDTO, MatchDTO, MatchTeamDTO, TeamDTO, TeamMemberDTO, TournamentDTO, TournamentDetailDTO
-from typing import Dict, List
+from flaskapp.modules.tournaments.bracket import Bracket
+from flaskapp.modules.tournaments.double_elimination import DoubleEliminationBracket
+from flaskapp.modules.tournaments import eligibility, round_robin
+from flaskapp.modules.tournaments.swiss import SwissHistory, iter_round_rows, pair_round, swiss_round_count
+from flaskapp.modules.tournaments.dto import EligibleRefereeDTO, EligibleRefereesPageDTO, MatchDTO, MatchTeamDTO, TeamDTO, TeamMemberDTO, TournamentDTO, TournamentDetailDTO
+from typing import Dict, Iterator, List
 
 class TournamentGenerator:
     """
     Genera brackets de torneo de eliminación simple con cabezas de serie y byes.
-    TODA la lógica opera con diccionarios de Python para mantenerse desacoplada de la BD.
+    TODA la lógica opera sobre ids de equipos (ver Bracket) para mantenerse desacoplada de la BD.
     """
     
     @staticmethod
@@ -27,70 +36,85 @@ class TournamentGenerator:
     @staticmethod
     def _seed_teams(teams: List['Team']) -> List['Team']:
         """Ordena los equipos por seed_score (los mejores primero)."""
-        return sorted(teams, key=lambda x: x.seed_score, reverse=True)
+        return sorted(teams, key=attrgetter('seed_score'), reverse=True)
 
     @staticmethod
-    def _create_initial_matches(
-        sorted_teams: List['Team'],
-        level: int,
-        byes_count: int,
+    def build_bracket(teams: List['Team']) -> Bracket:
+        """
+        Genera el bracket completo como un Bracket indexado por match_number.
+        Es la representación que usa start_tournament; el resto de los métodos
+        la exponen en el formato de diccionarios histórico.
+        """
+        if len(teams) < 2:
+            raise ValueError("Se necesitan al menos 2 equipos para generar un bracket.")
+
+        sorted_teams = TournamentGenerator._seed_teams(teams)
+        bracket = Bracket.from_seeded_ids(list(map(attrgetter('id'), sorted_teams)))
+        bracket.validate()
+        return bracket
+
+    @staticmethod
+    def build_double_elimination_bracket(teams: List['Team']) -> DoubleEliminationBracket:
+        """
+        Genera el bracket de doble eliminación: el bracket de ganadores se arma
+        igual que en eliminación simple y las rutas del de perdedores se precalculan.
+        """
+        return DoubleEliminationBracket(TournamentGenerator.build_bracket(teams))
+
+    @staticmethod
+    def generate_swiss_round(
+        teams: List['Team'],
+        history: SwissHistory,
+        first_match_number: int,
         pending_status_id: int,
-        completed_status_id: int
+        completed_status_id: int,
+        tournament_id: int = None
     ) -> List[Dict[str, Any]]:
         """
-        Crea los diccionarios que representan las partidas iniciales de la primera ronda.
-        Maneja tanto partidas regulares como byes.
+        Empareja la siguiente ronda suiza a partir del historial y devuelve sus
+        partidas (incluido el bye si la cantidad de equipos es impar).
         """
-        matches = []
-        
-        # Crear partidas de bye (victorias automáticas para los mejores seeds)
-        for i in range(byes_count):
-            bye_team = sorted_teams[i]
-            matches.append({
-                "level": level,
-                "match_number": 0,  # Temporal, se asignará correctamente después
-                "team_a_id": bye_team.id,
-                "team_b_id": None,
-                "is_bye": True,
-                "status_id": 2,
-                "winner_id": bye_team.id
-            })
-        
-        # Crear partidas regulares para los equipos restantes
-        remaining_teams = sorted_teams[byes_count:]
-        for i in range(0, len(remaining_teams), 2):
-            team_a = remaining_teams[i]
-            team_b = remaining_teams[i + 1] if i + 1 < len(remaining_teams) else None
-            
-            matches.append({
-                "level": level,
-                "match_number": 0,  # Temporal
-                "team_a_id": team_a.id,
-                "team_b_id": team_b.id if team_b else None,
-                "is_bye": False,
-                "status_id": pending_status_id
-            })
-            
-        return matches
+        if len(teams) < 2:
+            raise ValueError("Se necesitan al menos dos equipos para generar partidas.")
+
+        swiss_round = pair_round({team.id: team.seed_score for team in teams}, history)
+        return list(iter_round_rows(
+            swiss_round,
+            round_number=history.rounds_played + 1,
+            total_rounds=swiss_round_count(len(teams)),
+            first_match_number=first_match_number,
+            pending_status_id=pending_status_id,
+            completed_status_id=completed_status_id,
+            tournament_id=tournament_id
+        ))
 
     @staticmethod
-    def _assign_match_numbers(matches: List[Dict[str, Any]], level: int) -> List[Dict[str, Any]]:
+    def generate_round_robin(
+        teams: List['Team'],
+        pending_status_id: int,
+        group_count: int = 1,
+        tournament_id: int = None
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Asigna los números de partida correctos siguiendo los patrones de seeding del torneo.
+        Calendario de todos contra todos como generador de filas de Match.
+        Con group_count == 1 es una liga; con más grupos, cada grupo juega su
+        propia liga y los números de partida dejan libre el bracket de eliminación.
         """
-        if not matches:
-            return []
-            
-        num_matches_in_level = len(matches)
-        base_match_number = 2**level
-        
-        # Standard Seeding Order (e.g., for 8 slots: 1 vs 8, 4 vs 5, 2 vs 7, 3 vs 6)
-        # This simplified assignment ensures unique numbers per level.
-        # A more complex algorithm could be used for precise bracket placement.
-        for i, match in enumerate(matches):
-            match['match_number'] = base_match_number + i
+        if len(teams) < 2:
+            raise ValueError("Se necesitan al menos dos equipos para generar partidas.")
 
-        return sorted(matches, key=lambda m: m['match_number'])
+        seeded_ids = list(map(attrgetter('id'), TournamentGenerator._seed_teams(teams)))
+        if group_count == 1:
+            return round_robin.iter_round_robin_rows(
+                [seeded_ids], pending_status_id,
+                tournament_id=tournament_id, bracket_codes=[round_robin.LEAGUE]
+            )
+
+        return round_robin.iter_round_robin_rows(
+            round_robin.split_into_groups(seeded_ids, group_count), pending_status_id,
+            first_match_number=round_robin.knockout_size(group_count),
+            tournament_id=tournament_id
+        )
 
     @staticmethod
     def generate_initial_matches(
@@ -103,21 +127,9 @@ class TournamentGenerator:
         """
         if len(teams) < 2:
             raise ValueError("Se necesitan al menos dos equipos para generar partidas.")
-            
-        sorted_teams = TournamentGenerator._seed_teams(teams)
-        bracket_size, byes_count = TournamentGenerator._calculate_bracket_size(len(teams))
-        
-        # El nivel inicial es el más alto (ej: para 8 equipos, size=8, log2(8)=3, nivel=2)
-        level = int(math.log2(bracket_size)) - 1 if bracket_size > 1 else 0
 
-        matches = TournamentGenerator._create_initial_matches(
-            sorted_teams, level, byes_count, pending_status_id, completed_status_id
-        )
-        
-        # La asignación de números de partida es crucial para el orden del bracket
-        ordered_matches = TournamentGenerator._assign_match_numbers(matches, level)
-        
-        return ordered_matches
+        bracket = TournamentGenerator.build_bracket(teams)
+        return bracket.to_levels(pending_status_id, completed_status_id)[bracket.first_round_level]
 
     @staticmethod
     def generate_full_bracket(
@@ -132,127 +144,80 @@ class TournamentGenerator:
         if len(teams) < 2:
             raise ValueError("Se necesitan al menos 2 equipos para generar un bracket.")
 
-        initial_matches = TournamentGenerator.generate_initial_matches(
-            teams, pending_status_id, completed_status_id
-        )
-        
-        bracket_size, _ = TournamentGenerator._calculate_bracket_size(len(teams))
-        max_level = int(math.log2(bracket_size)) - 1 if bracket_size > 1 else 0
-
-        matches_by_level = {max_level: initial_matches}
-
-        # Generar niveles superiores (semifinales, final, etc.) vacíos
-        for level in range(max_level - 1, -1, -1):
-            num_matches_in_level = 2 ** level
-            matches_in_level = []
-
-            for i in range(num_matches_in_level):
-                # El número de partida en un árbol binario es base + índice
-                match_number = (2 ** level) + i
-                matches_in_level.append({
-                    "level": level,
-                    "match_number": match_number,
-                    "is_bye": False,
-                    "status_id": pending_status_id,
-                    "team_a_id": None, # Se llenarán a medida que avance el torneo
-                    "team_b_id": None,
-                })
-            
-            matches_by_level[level] = matches_in_level
-
-        return matches_by_level
+        bracket = TournamentGenerator.build_bracket(teams)
+        return bracket.to_levels(pending_status_id, completed_status_id)
 
 
 class TournamentService:
 
     @staticmethod
-    def start_tournament(tournament_id: int) -> bool:
+    def start_tournament(tournament_id: int, bulk_method: str = None) -> bool:
         """
-        Inicia un torneo: genera todas las partidas a partir de diccionarios
+        Inicia un torneo: genera todas las partidas a partir del bracket indexado
         y las guarda en la base de datos, actualizando el estado del torneo.
-        """
-        tournament = Tournament.query.get_or_404(tournament_id)
 
-        # Prueba ejecutar esto justo antes de tu operación fallida
-        """
-        print(f"Realizando prueba de inserción de partida para el torneo {tournament_id}", flush=True)
-        test_match = Match(
-            tournament_id=7,
-            level=2,
-            match_number=99,  # Usa un número que no exista
-            team_a_id=18,
-            team_b_id=None,
-            is_bye=True,
-            status_id=2,
-            winner_id=18
-        )
-        db.session.add(test_match)
-        db.session.commit()
-        print(f"Partida de prueba insertada correctamente para el torneo {tournament_id}", flush=True)
+        Las partidas se escriben con una sola inserción masiva (COPY en PostgreSQL,
+        executemany en el resto) dentro de la misma transacción que el cambio de estado.
+        `bulk_method` permite forzar el método (ver flaskapp.database.bulk).
         """
+        tournament = Tournament.query.get_or_404(tournament_id)
 
         # 1. Validar el estado actual del torneo
-        if tournament.status.code != 'REGISTRATION_OPEN':
+        if lookups.code_of(TournamentStatus, tournament.status_id) != 'REGISTRATION_OPEN':
             raise ValueError("El torneo debe estar en 'REGISTRATION_OPEN' para poder iniciarse.")
 
-        teams = Team.query.filter_by(tournament_id=tournament_id).all()
+        # Seeds actualizados desde los ratings de la actividad (una consulta agrupada);
+        # solo se necesitan id y seed_score, no se cargan objetos Team completos
+        teams = ratings.team_seed_scores(tournament_id)
         if len(teams) < 2:
             raise ValueError("Se necesitan al menos dos equipos para iniciar el torneo.")
 
-        # 2. Obtener los IDs de estado necesarios ANTES de la generación
+        # 2. Obtener los IDs de estado necesarios ANTES de la generación (registro en memoria)
         try:
-            in_progress_status = db.session.query(TournamentStatus).filter_by(code='IN_PROGRESS').one()
-            pending_match_status = db.session.query(MatchStatus).filter_by(code='PENDING').one()
-            completed_match_status = db.session.query(MatchStatus).filter_by(code='COMPLETED').one()
-        except Exception as e:
+            in_progress_status_id = lookups.id_of(TournamentStatus, 'IN_PROGRESS')
+            pending_status_id = lookups.id_of(MatchStatus, 'PENDING')
+            completed_status_id = lookups.id_of(MatchStatus, 'COMPLETED')
+        except LookupError as e:
             raise RuntimeError(f"No se pudieron encontrar los estados necesarios en la BD: {e}")
 
-        # 3. Generar el bracket como una estructura de datos (diccionarios)
-        match_data_by_level = TournamentGenerator.generate_full_bracket(
-            teams, pending_match_status.id, completed_match_status.id
-        )
+        # 3. Generar el bracket como estructura indexada (sin tocar la BD)
+        if tournament.format_code == 'ROUND_ROBIN':
+            match_rows = TournamentGenerator.generate_round_robin(
+                teams, pending_status_id, tournament_id=tournament_id
+            )
+        elif tournament.format_code == 'GROUP_STAGE':
+            match_rows = TournamentGenerator.generate_round_robin(
+                teams, pending_status_id,
+                group_count=round_robin.group_count_for(len(teams)),
+                tournament_id=tournament_id
+            )
+        elif tournament.format_code == 'SWISS':
+            # En sistema suizo solo se genera la primera ronda
+            match_rows = TournamentGenerator.generate_swiss_round(
+                teams, SwissHistory(), 1,
+                pending_status_id, completed_status_id, tournament_id
+            )
+        else:
+            if tournament.format_code == 'DOUBLE_ELIMINATION':
+                bracket = TournamentGenerator.build_double_elimination_bracket(teams)
+            else:
+                bracket = TournamentGenerator.build_bracket(teams)
+            match_rows = bracket.iter_rows(
+                pending_status_id, completed_status_id, tournament_id
+            )
 
-        if not match_data_by_level:
-            raise ValueError("No se pudieron generar las partidas para el torneo.")
-            
-        team_map = {team.id: team for team in teams}
-
-        # 4. Convertir los diccionarios a objetos Match y añadirlos a la sesión
-        #    *** ESTA ES LA SECCIÓN CORREGIDA ***
-        total_matches_created = 0
-        for level, match_dicts in match_data_by_level.items():
-            for match_data in match_dicts:
-                
-                # Asignar el ID del torneo que falta en el diccionario
-                match_data['tournament_id'] = tournament_id
-                
-                # --- INICIO DE LA CORRECCIÓN CLAVE ---
-                # En lugar de Match(**match_data), creamos una instancia vacía
-                # y asignamos los atributos manualmente. Esto evita problemas
-                # con un posible constructor __init__ personalizado en el modelo Match.
-                new_match = Match()
-                for key, value in match_data.items():
-                    setattr(new_match, key, value)
-                # --- FIN DE LA CORRECCIÓN CLAVE ---
-                
-                # Logging para depuración (opcional pero útil)
-                team_a_name = team_map.get(new_match.team_a_id).name if new_match.team_a_id else "TBD"
-                team_b_name = "BYE" if new_match.is_bye else (team_map.get(new_match.team_b_id).name if new_match.team_b_id else "TBD")
-                print(f"  Añadiendo a la sesión: Match {new_match.match_number} ({team_a_name} vs {team_b_name}) con StatusID: {new_match.status_id}", flush=True)
-
-                db.session.add(new_match)
-                total_matches_created += 1
-
-        print(f"Total de partidas para añadir a la sesión: {total_matches_created}", flush=True)
-
-        # 5. Actualizar el estado del torneo a 'IN_PROGRESS'
-        print(f"Actualizando estado del torneo '{tournament.name}' a IN_PROGRESS (ID: {in_progress_status.id})", flush=True)
-        tournament.status_id = in_progress_status.id
-        
         try:
+            # 4. Insertar las partidas por bloques a medida que se generan
+            #    (orden: primera ronda -> final; ligas jornada por jornada)
+            total_matches_created = bulk_insert_chunked(Match, match_rows, method=bulk_method)
+            db.session.execute(update(Team), [team._asdict() for team in teams])
+
+            # 5. Actualizar el estado del torneo a 'IN_PROGRESS'
+            tournament.status_id = in_progress_status_id
+
             # Confirmar todos los cambios en la base de datos en una sola transacción
             db.session.commit()
-            print(f"Torneo '{tournament.name}' iniciado exitosamente.", flush=True)
+            print(f"Torneo '{tournament.name}' iniciado exitosamente ({total_matches_created} partidas).", flush=True)
         except Exception as e:
             db.session.rollback()
             print(f"ERROR: No se pudo iniciar el torneo '{tournament.name}'. Rollback ejecutado. Causa: {e}", flush=True)
@@ -261,11 +226,102 @@ class TournamentService:
 
         return True
 
+    @staticmethod
+    def generate_next_swiss_round(tournament_id: int, bulk_method: str = None) -> int:
+        """
+        Genera la siguiente ronda de un torneo suizo. El historial completo se lee
+        con una sola consulta y la ronda se inserta con una inserción masiva.
+        Retorna la cantidad de partidas creadas.
+        """
+        tournament = Tournament.query.get_or_404(tournament_id)
+        if tournament.format_code != 'SWISS':
+            raise ValueError("Solo los torneos de sistema suizo se juegan por rondas.")
+        if lookups.code_of(TournamentStatus, tournament.status_id) != 'IN_PROGRESS':
+            raise ValueError("El torneo debe estar en curso para generar una nueva ronda.")
+
+        teams = db.session.query(Team.id, Team.seed_score).filter(
+            Team.tournament_id == tournament_id
+        ).all()
+
+        # Historial de partidas en una sola consulta
+        completed_status_id = lookups.id_of(MatchStatus, 'COMPLETED')
+        played = db.session.query(
+            Match.level, Match.team_a_id, Match.team_b_id, Match.winner_id, Match.is_bye,
+            Match.match_number, Match.status_id
+        ).filter(
+            Match.tournament_id == tournament_id
+        ).all()
+
+        if any(row.status_id != completed_status_id for row in played):
+            raise ValueError("Todas las partidas de la ronda actual deben estar finalizadas.")
+
+        history = SwissHistory.from_matches(row[:5] for row in played)
+        if history.rounds_played >= swiss_round_count(len(teams)):
+            raise ValueError("El torneo ya jugó todas sus rondas.")
+
+        match_rows = TournamentGenerator.generate_swiss_round(
+            teams, history, max((row.match_number for row in played), default=0) + 1,
+            lookups.id_of(MatchStatus, 'PENDING'), completed_status_id, tournament_id
+        )
+
+        try:
+            created = bulk_insert(Match, match_rows, method=bulk_method)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return created
+
+    @staticmethod
+    def start_knockout_stage(tournament_id: int, bulk_method: str = None) -> int:
+        """
+        Cierra la fase de grupos: arma la tabla de cada grupo con una sola consulta,
+        siembra a los clasificados (ganadores de grupo primero) y crea el bracket
+        de eliminación. Retorna la cantidad de partidas creadas.
+        """
+        tournament = Tournament.query.get_or_404(tournament_id)
+        if tournament.format_code != 'GROUP_STAGE':
+            raise ValueError("Solo los torneos con fase de grupos tienen fase de eliminación.")
+        if lookups.code_of(TournamentStatus, tournament.status_id) != 'IN_PROGRESS':
+            raise ValueError("El torneo debe estar en curso para iniciar la fase de eliminación.")
+
+        completed_status_id = lookups.id_of(MatchStatus, 'COMPLETED')
+        results = db.session.query(
+            Match.bracket, Match.team_a_id, Match.team_b_id, Match.winner_id,
+            Match.score_team_a, Match.score_team_b, Match.status_id
+        ).filter(
+            Match.tournament_id == tournament_id
+        ).all()
+
+        if any(not row.bracket.startswith(round_robin.GROUP_PREFIX) for row in results):
+            raise ValueError("La fase de eliminación ya fue generada.")
+        if any(row.status_id != completed_status_id for row in results):
+            raise ValueError("Todas las partidas de grupos deben estar finalizadas.")
+
+        seed_scores = dict(db.session.query(Team.id, Team.seed_score).filter(
+            Team.tournament_id == tournament_id
+        ).all())
+        standings = round_robin.group_standings((row[:6] for row in results), seed_scores)
+
+        bracket = Bracket.from_seeded_ids(round_robin.knockout_seeding(standings))
+        bracket.validate()
+
+        try:
+            created = bulk_insert(Match, list(bracket.iter_rows(
+                lookups.id_of(MatchStatus, 'PENDING'), completed_status_id, tournament_id
+            )), method=bulk_method)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return created
+
     @classmethod
     def cancel_tournament(cls, tournament_id):
         # Obtener el estado "CANCELLED" de la base de datos
-        cancelled_status = db.session.query(TournamentStatus).filter_by(code='CANCELLED').one()
-        print(f"Estado de torneo cancelado: {cancelled_status.code}", flush=True)
+        cancelled_status_id = lookups.id_of(TournamentStatus, 'CANCELLED')
         
         # Obtener el torneo
         tournament = db.session.query(Tournament).get(tournament_id)
@@ -273,31 +329,32 @@ class TournamentService:
             raise ValueError("Torneo no encontrado")
         
         # Verificar que el torneo no esté ya completado o cancelado
-        if tournament.status.code in ['COMPLETED', 'CANCELLED']:
+        if lookups.code_of(TournamentStatus, tournament.status_id) in ['COMPLETED', 'CANCELLED']:
             raise ValueError("No se puede cancelar un torneo que ya está completado o cancelado")
         
         # Actualizar el estado
-        tournament.status_id = cancelled_status.id
+        tournament.status_id = cancelled_status_id
         
         # Opcional: cancelar también todos los partidos pendientes
         matches = db.session.query(Match).filter_by(tournament_id=tournament_id).all()
-        cancelled_match_status = db.session.query(MatchStatus).filter_by(code='CANCELLED').one()
+        pending_match_status_id = lookups.id_of(MatchStatus, 'PENDING')
+        cancelled_match_status_id = lookups.id_of(MatchStatus, 'CANCELLED')
         
         for match in matches:
-            if match.status.code == 'PENDING':
-                match.status_id = cancelled_match_status.id
+            if match.status_id == pending_match_status_id:
+                match.status_id = cancelled_match_status_id
         
         db.session.commit()
 
     @staticmethod
     def get_team_initation_status_id(code: str) -> int:
-        return db.session.query(TeamInvitationStatus.id).filter_by(code=code).scalar()
+        return lookups.id_of(TeamInvitationStatus, code)
 
     @staticmethod
     def get_user_pending_invitations(tournament_id, user_id):
         """Obtiene todas las invitaciones pendientes de un usuario para un torneo específico"""
 
-        pending_status_id = db.session.query(TeamInvitationStatus.id).filter_by(code='PENDING').scalar()
+        pending_status_id = lookups.id_of(TeamInvitationStatus, 'PENDING')
 
         return TeamInvitation.query.join(
             Team, Team.id == TeamInvitation.team_id
@@ -395,60 +452,24 @@ class TournamentService:
     def can_create_team(tournament_id: int, user_id: int = None) -> bool:
         """
         Determina si un usuario puede crear un equipo en el torneo.
+        Los roles salen del contexto de autorización (una consulta por request).
         """
         if user_id is None:
             if not current_user.is_authenticated:
                 return False
             user_id = current_user.id
         
-        tournament = Tournament.query.get_or_404(tournament_id)
-        
-        # 1. No puede si es admin de plataforma
-        user = User.query.get(user_id)
-        if user.is_admin:
-            return False
-            
-        # 2. No puede si es organizador de la organización
-        is_organizer = OrganizationMember.query.filter(
-            and_(
-                OrganizationMember.organization_id == tournament.organization_id,
-                OrganizationMember.user_id == user_id,
-                OrganizationMember.is_organizer == True
-            )
-        ).first() is not None
-        
-        if is_organizer:
-            return False
-            
-        # 3. No puede si ya tiene equipo en el torneo
-        has_team = TeamMember.query.join(
-            Team
-        ).filter(
-            and_(
-                Team.tournament_id == tournament_id,
-                TeamMember.user_id == user_id
-            )
-        ).first() is not None
+        access = authorization_for(user_id).tournament(tournament_id)
+        if access is None:
+            abort(404)
         
-        if has_team:
+        # No puede si es admin de plataforma, organizador de la organización,
+        # si ya tiene equipo en el torneo o si es árbitro del torneo
+        if access.is_admin or access.is_organizer or access.has_team or access.is_referee:
             return False
             
-        # 4. No puede si es árbitro del torneo
-        is_referee = TournamentReferee.query.filter(
-            and_(
-                TournamentReferee.tournament_id == tournament_id,
-                TournamentReferee.user_id == user_id
-            )
-        ).first() is not None
-        
-        if is_referee:
-            return False
-            
-        # 6. Verificar que el torneo esté en fase de registro
-        if tournament.status.code != 'REGISTRATION_OPEN':
-            return False
-            
-        return True
+        # Verificar que el torneo esté en fase de registro
+        return lookups.code_of(TournamentStatus, access.status_id) == 'REGISTRATION_OPEN'
 
     @staticmethod
     def create_or_update_tournament(form, organization_id, tournament_id=None):
@@ -461,13 +482,7 @@ class TournamentService:
             tournament = Tournament(organization_id=organization_id)
 
         # Verificar permisos del organizador
-        is_organizer = OrganizationMember.query.filter_by(
-            organization_id=organization_id,
-            user_id=current_user.id,
-            is_organizer=True
-        ).first() is not None
-
-        if not is_organizer:
+        if not authorization_for(current_user.id).organization(organization_id).is_organizer:
             raise ValueError("Solo los organizadores pueden crear o editar torneos")
 
         # Actualizar campos del torneo
@@ -479,6 +494,7 @@ class TournamentService:
         tournament.end_date = form.end_date.data
         tournament.prizes = form.prizes.data
         tournament.status_id = form.status_id.data
+        tournament.format_id = form.format_id.data
         tournament.event_id = form.event_id.data if form.event_id.data != -1 else None
         tournament.created_by = current_user.id
 
@@ -493,16 +509,10 @@ class TournamentService:
         tournaments = Tournament.query.filter_by(
             organization_id=organization_id
         ).options(
-            db.joinedload(Tournament.activity),
-            db.joinedload(Tournament.status),
-            db.joinedload(Tournament.teams)
+            db.joinedload(Tournament.activity)
         ).all()
 
-        is_organizer = OrganizationMember.query.filter_by(
-            organization_id=organization_id,
-            user_id=user_id,
-            is_organizer=True
-        ).first() is not None
+        is_organizer = authorization_for(user_id).organization(organization_id).is_organizer
 
         return [
             TournamentDTO(
@@ -511,11 +521,11 @@ class TournamentService:
                 activity_name=t.activity.name,
                 start_date=t.start_date.strftime('%Y-%m-%d %H:%M') if t.start_date else 'N/A',
                 end_date=t.end_date.strftime('%Y-%m-%d %H:%M') if t.end_date else 'N/A',
-                status=t.status.code,
+                status=lookups.code_of(TournamentStatus, t.status_id),
                 max_teams=t.max_teams,
-                team_count=len(t.teams),
+                team_count=t.team_count,
                 can_edit=is_organizer,
-                is_team_creation_open=t.status.code == 'REGISTRATION_OPEN'  # Calculado basado en estado
+                is_team_creation_open=t.status_id == lookups.id_of(TournamentStatus, 'REGISTRATION_OPEN')  # Calculado basado en estado
             ) for t in tournaments
         ]
 
@@ -524,7 +534,6 @@ class TournamentService:
         # Consulta principal con todas las relaciones necesarias
         tournament = Tournament.query.options(
             db.joinedload(Tournament.activity),
-            db.joinedload(Tournament.status),
             db.joinedload(Tournament.creator),
             db.joinedload(Tournament.organization),
             db.joinedload(Tournament.event),
@@ -532,14 +541,8 @@ class TournamentService:
             db.joinedload(Tournament.teams).subqueryload(Team.members).joinedload(TeamMember.user)
         ).get_or_404(tournament_id)
 
-        # Verificar si el usuario es organizador
-        is_organizer = db.session.query(
-            OrganizationMember.query.filter_by(
-                organization_id=tournament.organization_id,
-                user_id=user_id,
-                is_organizer=True
-            ).exists()
-        ).scalar()
+        # Roles del usuario (organizador, equipo) desde el contexto de autorización
+        access = authorization_for(user_id).tournament(tournament_id)
 
         # Obtener equipos con sus miembros de manera optimizada
         teams_data = []
@@ -561,12 +564,6 @@ class TournamentService:
                 members=members
             ))
 
-        # Verificar si el usuario tiene un equipo en este torneo
-        user_has_team = db.session.query(TeamMember).select_from(TeamMember).join(Team).filter(
-            TeamMember.user_id == user_id,
-            Team.tournament_id == tournament_id
-        ).first() is not None
-
         return TournamentDetailDTO(
             id=tournament.id,
             name=tournament.name,
@@ -574,12 +571,12 @@ class TournamentService:
             activity_id=tournament.activity_id,
             start_date=tournament.start_date.strftime('%Y-%m-%d %H:%M') if tournament.start_date else 'N/A',
             end_date=tournament.end_date.strftime('%Y-%m-%d %H:%M') if tournament.end_date else 'N/A',
-            status=tournament.status.code,
+            status=lookups.code_of(TournamentStatus, tournament.status_id),
             status_id=tournament.status_id,
             max_teams=tournament.max_teams,
             team_count=len(tournament.teams),
-            can_edit=is_organizer,
-            is_team_creation_open=tournament.status.code == 'REGISTRATION_OPEN',
+            can_edit=access.is_organizer,
+            is_team_creation_open=tournament.status_id == lookups.id_of(TournamentStatus, 'REGISTRATION_OPEN'),
             description=tournament.description,
             prizes=tournament.prizes,
             created_by=tournament.creator.name if tournament.creator else 'Sistema',
@@ -596,59 +593,33 @@ class TournamentService:
             event_name=tournament.event.name if tournament.event else None,
             event_id=tournament.event_id if tournament.event else None,
             teams=teams_data,
-            user_has_team=user_has_team
+            user_has_team=access.has_team,
+            format_code=tournament.format_code
         )
 
     @staticmethod
-    def get_eligible_referees(tournament_id: int, search: str = None) -> List[EligibleRefereeDTO]:
+    def get_eligible_referees(tournament_id: int, search: str = None, page: int = 1,
+                              per_page: int = eligibility.DEFAULT_PAGE_SIZE) -> EligibleRefereesPageDTO:
         tournament = Tournament.query.get_or_404(tournament_id)
-        
-        # Subquery para miembros que ya son árbitros
-        existing_referees = db.session.query(TournamentReferee.user_id).filter_by(
-            tournament_id=tournament_id
+        candidates = eligibility.page(tournament, eligibility.REFEREE, None, search, page, per_page)
+
+        return EligibleRefereesPageDTO(
+            items=[
+                EligibleRefereeDTO(
+                    id=candidate.member_id,
+                    user_id=candidate.user_id,
+                    name=candidate.name,
+                    email=candidate.email,
+                    is_referee=candidate.selected,
+                    profile_picture=candidate.profile_picture
+                ) for candidate in candidates.items
+            ],
+            page=candidates.page,
+            per_page=candidates.per_page,
+            total=candidates.total,
+            pages=math.ceil(candidates.total / candidates.per_page),
+            referee_total=candidates.selected_total
         )
-        existing_referee_ids = [ref_id for (ref_id,) in existing_referees]        
-
-        # Subquery para miembros que están en equipos
-        team_members = db.session.query(TeamMember.user_id).join(
-            Team
-        ).filter(
-            Team.tournament_id == tournament_id
-        )
-        
-        query = db.session.query(
-            OrganizationMember,
-            User
-        ).join(
-            User,
-            OrganizationMember.user_id == User.id
-        ).filter(
-            OrganizationMember.organization_id == tournament.organization_id,
-            User.is_admin == False,
-            OrganizationMember.is_organizer == False,
-            OrganizationMember.user_id.notin_(team_members)
-        )
-        
-        if search:
-            query = query.filter(
-                db.or_(
-                    User.name.ilike(f'%{search}%'),
-                    User.email.ilike(f'%{search}%')
-                )
-            )
-
-        results = query.all()
-
-        return [
-            EligibleRefereeDTO(
-                id=member.id,
-                user_id=user.id,
-                name=user.name,
-                email=user.email,
-                is_referee=user.id in existing_referee_ids,
-                profile_picture=user.profile_picture
-            ) for member, user in results
-        ]
 
     @staticmethod
     def toggle_referee(tournament_id: int, user_id: int):
@@ -665,29 +636,8 @@ class TournamentService:
             db.session.commit()
             return 'removed'
 
-        # Subconsulta: si el usuario está en un equipo de este torneo
-        team_alias = aliased(Team)
-
-
-        user_in_tournament_team = db.session.query(TeamMember.id).join(
-            team_alias, TeamMember.team_id == team_alias.id
-        ).filter(
-            TeamMember.user_id == user_id,
-            team_alias.tournament_id == tournament_id
-        ).exists()
-
-        # Verificar elegibilidad si NO está en un equipo del torneo
-        eligible = db.session.query(
-            OrganizationMember
-        ).join(User).filter(
-            OrganizationMember.organization_id == tournament.organization_id,
-            OrganizationMember.user_id == user_id,
-            User.is_admin == False,
-            OrganizationMember.is_organizer == False,
-            ~user_in_tournament_team
-        ).first()
-
-        if not eligible:
+        # Mismas reglas que la lista de elegibles
+        if not eligibility.is_eligible(tournament, eligibility.REFEREE, user_id):
             raise ValueError("El usuario no cumple los requisitos para ser árbitro")
 
         new_referee = TournamentReferee(
@@ -699,14 +649,54 @@ class TournamentService:
         db.session.commit()
         return 'added'
     
+    # Orden en que se muestran las secciones del bracket
+    BRACKET_SECTIONS = ('MAIN', 'WINNERS', 'LOSERS', 'GRAND_FINAL', 'SWISS')
+
+    @staticmethod
+    def group_matches_by_bracket(matches: List[MatchDTO]) -> List[Tuple[str, Dict[int, List[MatchDTO]]]]:
+        """
+        Agrupa las partidas por sección del bracket y luego por nivel (de la
+        primera ronda a la final): [(bracket, {nivel: [partidas]}), ...].
+        """
+        sections: Dict[str, Dict[int, List[MatchDTO]]] = {}
+        for match in matches:
+            sections.setdefault(match.bracket, {}).setdefault(match.level, []).append(match)
+
+        order = TournamentService.BRACKET_SECTIONS
+
+        def section_key(bracket: str) -> Tuple[int, int, str]:
+            # Liga y grupos primero (en orden de creación), luego las eliminatorias
+            if bracket == round_robin.LEAGUE:
+                return 0, 0, bracket
+            if bracket.startswith(round_robin.GROUP_PREFIX):
+                return 0, round_robin.group_index(bracket), bracket
+            return 1 + (order.index(bracket) if bracket in order else len(order)), 0, bracket
+
+        return [
+            (bracket, dict(sorted(sections[bracket].items(), reverse=True)))
+            for bracket in sorted(sections, key=section_key)
+        ]
+
+    @staticmethod
+    def get_final_match(matches: List[MatchDTO]) -> MatchDTO:
+        """
+        Partida que define al campeón: la final en eliminación simple; en doble
+        eliminación, la revancha si se jugó o, si se canceló, la gran final.
+        """
+        decisive = [
+            m for m in matches
+            if m.status == 'COMPLETED'
+            and (m.bracket == 'GRAND_FINAL' or (m.bracket == 'MAIN' and m.level == 0))
+        ]
+        return min(decisive, key=attrgetter('level'), default=None)
+
     @staticmethod
     def get_tournament_matches(tournament_id: int) -> List[MatchDTO]:
         """Obtiene todos los matches de un torneo con su información relevante"""
         matches = Match.query.filter_by(tournament_id=tournament_id)\
             .options(
                 db.joinedload(Match.team_a),
-                db.joinedload(Match.team_b),
-                db.joinedload(Match.status)
+                db.joinedload(Match.team_b)
             )\
             .order_by(Match.level.desc(), Match.match_number.asc())\
             .all()
@@ -729,12 +719,13 @@ class TournamentService:
                 id=match.id,
                 level=match.level,
                 match_number=match.match_number,
+                bracket=match.bracket,
                 team_a=team_a_dto,
                 team_b=team_b_dto,
                 score_team_a=match.score_team_a,
                 score_team_b=match.score_team_b,
                 winner_id=match.winner_id,
-                status=match.status.code,
+                status=lookups.code_of(MatchStatus, match.status_id),
                 is_bye=match.is_bye,
                 completed_at=match.completed_at.isoformat() if match.completed_at else None
             ))
@@ -0,0 +1,310 @@
+"""
+Emparejamiento de rondas en sistema suizo.
+
+Cada ronda enfrenta equipos con el mismo puntaje evitando revanchas:
+- Los equipos se ordenan por puntaje (y luego por seed) y se agrupan por puntaje.
+- Cada grupo se empareja al estilo holandés (mitad superior vs mitad inferior);
+  si eso no alcanza para evitar revanchas, se calcula un emparejamiento máximo
+  (algoritmo de Edmonds) sobre el grafo de rivales permitidos del grupo.
+- Los equipos que quedan sin rival bajan al grupo siguiente. Si al final sobran
+  equipos, se deshacen las últimas parejas y se vuelve a emparejar un bloque
+  cada vez más grande; solo como último recurso se permite una revancha.
+
+No depende de la BD: trabaja con ids de equipos y con el historial ya leído.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+Pair = Tuple[int, int]
+
+SWISS = 'SWISS'
+
+
+def swiss_round_count(team_count: int) -> int:
+    """Rondas necesarias para que quede un único invicto: ceil(log2(equipos))."""
+    if team_count < 2:
+        raise ValueError("Se requieren al menos dos equipos para un torneo.")
+    return math.ceil(math.log2(team_count))
+
+
+@dataclass
+class SwissHistory:
+    """Resultados previos de un torneo suizo, leídos de una sola vez."""
+    scores: Dict[int, int] = field(default_factory=dict)
+    opponents: Dict[int, Set[int]] = field(default_factory=dict)
+    had_bye: Set[int] = field(default_factory=set)
+    rounds_played: int = 0
+
+    @classmethod
+    def from_matches(cls, rows: Iterable[Tuple]) -> 'SwissHistory':
+        """
+        Construye el historial desde filas (level, team_a_id, team_b_id, winner_id, is_bye).
+        Cada victoria (incluido el bye) suma un punto.
+        """
+        history = cls()
+        levels = set()
+        for level, team_a_id, team_b_id, winner_id, is_bye in rows:
+            levels.add(level)
+            if is_bye:
+                history.had_bye.add(team_a_id)
+            elif team_a_id and team_b_id:
+                history.opponents.setdefault(team_a_id, set()).add(team_b_id)
+                history.opponents.setdefault(team_b_id, set()).add(team_a_id)
+            if winner_id:
+                history.scores[winner_id] = history.scores.get(winner_id, 0) + 1
+        history.rounds_played = len(levels)
+        return history
+
+    def have_played(self, team_a_id: int, team_b_id: int) -> bool:
+        return team_b_id in self.opponents.get(team_a_id, ())
+
+
+@dataclass
+class SwissRound:
+    """Resultado del emparejamiento de una ronda."""
+    pairs: List[Pair]
+    bye_team_id: Optional[int] = None
+    rematches: int = 0  # Revanchas que no se pudieron evitar
+
+
+def rank_teams(seed_scores: Dict[int, float], history: SwissHistory) -> List[int]:
+    """Ordena los equipos por puntaje y, ante empate, por seed (mejor primero)."""
+    return sorted(
+        seed_scores,
+        key=lambda team_id: (history.scores.get(team_id, 0), seed_scores[team_id] or 0, -team_id),
+        reverse=True
+    )
+
+
+def pair_round(seed_scores: Dict[int, float], history: SwissHistory) -> SwissRound:
+    """Empareja la siguiente ronda. `seed_scores` es {team_id: seed_score}."""
+    ranking = rank_teams(seed_scores, history)
+    if len(ranking) < 2:
+        raise ValueError("Se requieren al menos dos equipos para emparejar una ronda.")
+
+    bye_team_id = None
+    if len(ranking) % 2:
+        # El bye va al peor clasificado que todavía no lo haya recibido
+        bye_team_id = next(
+            (team_id for team_id in reversed(ranking) if team_id not in history.had_bye),
+            ranking[-1]
+        )
+        ranking.remove(bye_team_id)
+
+    score_of = history.scores.get
+    pairs: List[Pair] = []
+    carry: List[int] = []
+    for _, group in groupby(ranking, key=lambda team_id: score_of(team_id, 0)):
+        matched, carry = _pair_pool(carry + list(group), history)
+        pairs.extend(matched)
+
+    rematches = 0
+    if carry:
+        pairs, rematches = _repair_bottom(pairs, carry, ranking, history)
+
+    return SwissRound(pairs=pairs, bye_team_id=bye_team_id, rematches=rematches)
+
+
+def _pair_pool(pool: List[int], history: SwissHistory) -> Tuple[List[Pair], List[int]]:
+    """
+    Empareja un grupo (en orden de ranking). Devuelve (parejas, sin_rival);
+    los equipos sin rival quedan en orden de ranking para bajar al grupo siguiente.
+    """
+    pairs = _dutch_pairing(pool, history)
+    if pairs is not None:
+        leftover = set(pool).difference(*pairs) if pairs else set(pool)
+        return pairs, [team_id for team_id in pool if team_id in leftover]
+
+    mate = _maximum_matching(pool, history)
+    pairs = [(pool[i], pool[j]) for i, j in enumerate(mate) if j > i]
+    return pairs, [pool[i] for i, j in enumerate(mate) if j < 0]
+
+
+def _dutch_pairing(pool: List[int], history: SwissHistory) -> Optional[List[Pair]]:
+    """
+    Mitad superior contra mitad inferior (1 vs k/2+1, 2 vs k/2+2, ...). Si hay
+    revancha se prueba con el siguiente de la mitad inferior. Devuelve None si
+    algún equipo de la mitad superior queda sin rival.
+    """
+    half = len(pool) // 2
+    bottom = pool[half:]
+    used = bytearray(len(bottom))
+    pairs: List[Pair] = []
+    for i, top_id in enumerate(pool[:half]):
+        for j in range(len(bottom)):
+            k = (i + j) % len(bottom)
+            if not used[k] and not history.have_played(top_id, bottom[k]):
+                used[k] = 1
+                pairs.append((top_id, bottom[k]))
+                break
+        else:
+            return None
+    return pairs
+
+
+def _repair_bottom(
+    pairs: List[Pair],
+    carry: List[int],
+    ranking: List[int],
+    history: SwissHistory
+) -> Tuple[List[Pair], int]:
+    """
+    Reempareja desde abajo: deshace las últimas parejas (duplicando el bloque
+    cada vez) hasta lograr un emparejamiento perfecto sin revanchas.
+    """
+    position = {team_id: i for i, team_id in enumerate(ranking)}
+    undo = 1
+    while True:
+        undo = min(undo, len(pairs))
+        kept, released = pairs[:len(pairs) - undo], pairs[len(pairs) - undo:]
+        pool = sorted(carry + [team_id for pair in released for team_id in pair], key=position.get)
+        mate = _maximum_matching(pool, history)
+        if all(j >= 0 for j in mate):
+            return kept + [(pool[i], pool[j]) for i, j in enumerate(mate) if j > i], 0
+        if undo == len(pairs):
+            break
+        undo *= 2
+
+    # Sin emparejamiento perfecto posible: los sobrantes se enfrentan en orden
+    new_pairs = [(pool[i], pool[j]) for i, j in enumerate(mate) if j > i]
+    leftover = [pool[i] for i, j in enumerate(mate) if j < 0]
+    forced = list(zip(leftover[0::2], leftover[1::2]))
+    return new_pairs + forced, len(forced)
+
+
+def _maximum_matching(pool: Sequence[int], history: SwissHistory) -> List[int]:
+    """
+    Emparejamiento de cardinalidad máxima (Edmonds, O(V^3)) en el grafo de rivales
+    permitidos del grupo. Devuelve mate[i] = índice del rival de pool[i] o -1.
+    Parte de un emparejamiento goloso en orden de ranking y lo aumenta.
+    """
+    n = len(pool)
+    adjacency = []
+    for i, team_id in enumerate(pool):
+        opponents = history.opponents.get(team_id, ())
+        adjacency.append([j for j, other in enumerate(pool) if j != i and other not in opponents])
+
+    mate = [-1] * n
+    for i in range(n):
+        if mate[i] < 0:
+            for j in adjacency[i]:
+                if j > i and mate[j] < 0:
+                    mate[i], mate[j] = j, i
+                    break
+
+    for root in range(n):
+        if mate[root] < 0:
+            _augment_from(root, adjacency, mate)
+    return mate
+
+
+def _augment_from(root: int, adjacency: List[List[int]], mate: List[int]) -> bool:
+    """Busca un camino aumentante desde `root` contrayendo blossoms; lo aplica si existe."""
+    n = len(adjacency)
+    parent = [-1] * n
+    base = list(range(n))
+    used = [False] * n
+    used[root] = True
+    queue = deque([root])
+
+    def lowest_common_ancestor(a: int, b: int) -> int:
+        seen = [False] * n
+        while True:
+            a = base[a]
+            seen[a] = True
+            if mate[a] < 0:
+                break
+            a = parent[mate[a]]
+        while True:
+            b = base[b]
+            if seen[b]:
+                return b
+            b = parent[mate[b]]
+
+    def mark_path(v: int, b: int, child: int, in_blossom: List[bool]) -> None:
+        while base[v] != b:
+            in_blossom[base[v]] = in_blossom[base[mate[v]]] = True
+            parent[v] = child
+            child = mate[v]
+            v = parent[mate[v]]
+
+    while queue:
+        v = queue.popleft()
+        for u in adjacency[v]:
+            if base[v] == base[u] or mate[v] == u:
+                continue
+            if u == root or (mate[u] >= 0 and parent[mate[u]] >= 0):
+                # Ciclo impar: contraer el blossom
+                current_base = lowest_common_ancestor(v, u)
+                in_blossom = [False] * n
+                mark_path(v, current_base, u, in_blossom)
+                mark_path(u, current_base, v, in_blossom)
+                for i in range(n):
+                    if in_blossom[base[i]]:
+                        base[i] = current_base
+                        if not used[i]:
+                            used[i] = True
+                            queue.append(i)
+            elif parent[u] < 0:
+                parent[u] = v
+                if mate[u] < 0:
+                    # Camino aumentante encontrado: invertirlo
+                    while u >= 0:
+                        previous = mate[parent[u]]
+                        mate[u], mate[parent[u]] = parent[u], u
+                        u = previous
+                    return True
+                used[mate[u]] = True
+                queue.append(mate[u])
+    return False
+
+
+def iter_round_rows(
+    swiss_round: SwissRound,
+    round_number: int,
+    total_rounds: int,
+    first_match_number: int,
+    pending_status_id: int,
+    completed_status_id: int,
+    tournament_id: Optional[int] = None
+):
+    """
+    Filas de Match para una ronda. El nivel sigue la convención del bracket
+    (0 = última ronda), por lo que la ronda r queda en total_rounds - r.
+    """
+    level = max(total_rounds - round_number, 0)
+    match_number = first_match_number
+    for team_a_id, team_b_id in swiss_round.pairs:
+        row = {
+            "level": level,
+            "match_number": match_number,
+            "bracket": SWISS,
+            "team_a_id": team_a_id,
+            "team_b_id": team_b_id,
+            "is_bye": False,
+            "status_id": pending_status_id,
+            "winner_id": None,
+        }
+        if tournament_id is not None:
+            row["tournament_id"] = tournament_id
+        yield row
+        match_number += 1
+
+    if swiss_round.bye_team_id is not None:
+        row = {
+            "level": level,
+            "match_number": match_number,
+            "bracket": SWISS,
+            "team_a_id": swiss_round.bye_team_id,
+            "team_b_id": None,
+            "is_bye": True,
+            "status_id": completed_status_id,
+            "winner_id": swiss_round.bye_team_id,
+        }
+        if tournament_id is not None:
+            row["tournament_id"] = tournament_id
+        yield row
@@ -0,0 +1,12 @@
+from unittest.mock import MagicMock
+
+def mock_team(team_id, seed_score=0):
+    team = MagicMock()
+    team.id = team_id
+    team.name = f"Equipo {team_id}"
+    team.seed_score = seed_score
+    return team
+
+def mock_teams(count):
+    # El equipo 1 es el mejor seed, el equipo `count` el peor
+    return [mock_team(i, seed_score=(count - i) * 10) for i in range(1, count + 1)]
@@ -0,0 +1,95 @@
+import pytest
+
+from flaskapp.modules.tournaments.bracket import Bracket, seeding_order, seeding_table
+from flaskapp.modules.tournaments.service import TournamentGenerator
+from flaskapp.modules.tournaments.test.factory import mock_teams
+
+"""
+Bracket (representación indexada por match_number)
+    test_navigation: padre/hijos/nivel siguen la numeración 2**level + i.
+    test_full_bracket_shape: cantidad de partidas por nivel y numeración.
+    test_byes_go_to_top_seeds: los mejores seeds reciben los byes y avanzan a la segunda ronda.
+    test_standard_seeding_order: colocación estándar 1 vs N, 4 vs N-3, ...
+    test_top_seeds_meet_in_final: los seeds 1 y 2 quedan en mitades opuestas.
+    test_seeding_table_is_memoized: la tabla se calcula una vez por tamaño.
+    test_validate_detects_duplicates: validate() detecta un equipo repetido.
+    test_generate_full_bracket_format: el formato {nivel: [partidas]} se mantiene.
+"""
+
+PENDING, COMPLETED = 1, 2
+
+class TestBracket:
+    def test_navigation(self):
+        assert Bracket.parent(1) == 0
+        assert Bracket.parent(6) == 3
+        assert Bracket.parent(7) == 3
+        assert Bracket.children(3) == (6, 7)
+        assert Bracket.level_of(1) == 0
+        assert Bracket.level_of(7) == 2
+        assert Bracket.slot_in_parent(6) == 'team_a_id'
+        assert Bracket.slot_in_parent(7) == 'team_b_id'
+
+    @pytest.mark.parametrize('team_count', [2, 3, 5, 8, 13, 64, 1000])
+    def test_full_bracket_shape(self, team_count):
+        bracket = TournamentGenerator.build_bracket(mock_teams(team_count))
+        rows = list(bracket.iter_rows(PENDING, COMPLETED, tournament_id=7))
+
+        assert len(rows) == bracket.size - 1
+        assert sorted(r['match_number'] for r in rows) == list(range(1, bracket.size))
+        assert all(r['level'] == Bracket.level_of(r['match_number']) for r in rows)
+        assert all(r['tournament_id'] == 7 for r in rows)
+        assert bracket.team_count() == team_count
+
+    def test_byes_go_to_top_seeds(self):
+        # 5 equipos -> bracket de 8 con 3 byes
+        bracket = TournamentGenerator.build_bracket(mock_teams(5))
+        first_round = [r for r in bracket.iter_rows(PENDING, COMPLETED) if r['level'] == 2]
+
+        byes = [r for r in first_round if r['is_bye']]
+        assert sorted(r['team_a_id'] for r in byes) == [1, 2, 3]
+        assert all(r['winner_id'] == r['team_a_id'] for r in byes)
+        assert all(r['status_id'] == COMPLETED for r in byes)
+
+        # Cada ganador de bye ya está en su partida de segunda ronda
+        for bye in byes:
+            parent = Bracket.parent(bye['match_number'])
+            slot = Bracket.slot_in_parent(bye['match_number'])
+            parent_slot = bracket.team_a if slot == 'team_a_id' else bracket.team_b
+            assert parent_slot[parent] == bye['team_a_id']
+
+    def test_standard_seeding_order(self):
+        assert seeding_order(2) == [0, 1]
+        assert seeding_order(8) == [0, 7, 3, 4, 1, 6, 2, 5]
+
+        bracket = TournamentGenerator.build_bracket(mock_teams(8))
+        first_round = [(bracket.team_a[n], bracket.team_b[n]) for n in bracket.first_round]
+        assert first_round == [(1, 8), (4, 5), (2, 7), (3, 6)]
+
+    @pytest.mark.parametrize('team_count', [16, 27, 128])
+    def test_top_seeds_meet_in_final(self, team_count):
+        bracket = TournamentGenerator.build_bracket(mock_teams(team_count))
+        half = bracket.size >> 2  # Primera partida de primera ronda en la mitad inferior
+        first = bracket.size >> 1
+        top_half = {bracket.team_a[n] for n in range(first, first + half)}
+        assert 1 in top_half
+        assert 2 not in top_half
+
+    def test_seeding_table_is_memoized(self):
+        assert seeding_table(64) is seeding_table(64)
+
+    def test_validate_detects_duplicates(self):
+        bracket = Bracket.from_seeded_ids([1, 2, 3, 4])
+        bracket.team_b[3] = 1
+        with pytest.raises(ValueError):
+            bracket.validate()
+
+    def test_generate_full_bracket_format(self):
+        levels = TournamentGenerator.generate_full_bracket(mock_teams(6), PENDING, COMPLETED)
+
+        assert sorted(levels) == [0, 1, 2]
+        assert [m['match_number'] for m in levels[2]] == [4, 5, 6, 7]
+        assert [m['match_number'] for m in levels[0]] == [1]
+
+    def test_requires_two_teams(self):
+        with pytest.raises(ValueError):
+            TournamentGenerator.build_bracket(mock_teams(1))
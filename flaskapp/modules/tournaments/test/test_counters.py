@@ -0,0 +1,49 @@
+from flaskapp.database.models import Organization, OrganizationMember, Team, Tournament, User, db
+from flaskapp.modules.teams.service import TeamService
+from flaskapp.modules.tournaments.service import TournamentService
+from tests.factory import QueryCounter, create_started_tournament
+
+"""
+Contadores desnormalizados (Organization.member_count, Tournament.team_count)
+    test_team_count_follows_teams: crear y borrar equipos ajusta team_count.
+    test_member_count_keeps_updated_at: unirse/salir ajusta member_count sin tocar updated_at.
+    test_listing_skips_teams: el listado de torneos no carga la tabla teams.
+"""
+
+
+class TestCounters:
+    def test_team_count_follows_teams(self, app):
+        tournament_id = create_started_tournament(4)['tournament_id']
+        assert db.session.get(Tournament, tournament_id).team_count == 4
+
+        db.session.add(Team(tournament_id=tournament_id, name='Nuevo'))
+        db.session.commit()
+        assert db.session.get(Tournament, tournament_id).team_count == 5
+
+        TeamService.delete_team(Team.query.filter_by(name='Nuevo').one().id)
+        assert db.session.get(Tournament, tournament_id).team_count == 4
+
+    def test_member_count_keeps_updated_at(self, app):
+        create_started_tournament(2)
+        organization = Organization.query.one()
+        players = User.query.filter(User.email.like('player%')).all()
+        before = organization.updated_at
+
+        db.session.add_all([OrganizationMember(organization_id=organization.id, user_id=p.id) for p in players])
+        db.session.commit()
+        assert organization.member_count == len(players)
+
+        db.session.delete(OrganizationMember.query.first())
+        db.session.commit()
+        assert organization.member_count == len(players) - 1
+        assert organization.updated_at == before
+
+    def test_listing_skips_teams(self, app):
+        ids = create_started_tournament(4)
+        organization_id = db.session.get(Tournament, ids['tournament_id']).organization_id
+        db.session.expire_all()
+
+        with QueryCounter() as counter:
+            tournaments = TournamentService.get_organization_tournaments(organization_id, ids['referee_id'])
+        assert [t.team_count for t in tournaments] == [4]
+        assert not any('FROM teams' in statement for statement in counter.statements)
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from flaskapp.modules.tournaments.double_elimination import (
+    GRAND_FINAL, LOSERS, WINNERS, routing_table
+)
+from flaskapp.modules.tournaments.service import TournamentGenerator, TournamentService
+from flaskapp.modules.tournaments.test.factory import mock_teams
+from unittest.mock import MagicMock
+
+"""
+Doble eliminación (rutas precalculadas de ganador y perdedor)
+    test_routing_table_shape: numeración de ganadores, perdedores y gran final.
+    test_routing_table_is_memoized: la tabla de rutas se calcula una vez por tamaño.
+    test_row_counts: sin byes se crean 2N - 1 partidas; con byes se omiten las de un solo equipo.
+    test_bye_matches_have_no_loser_route: un bye no manda a nadie al bracket de perdedores.
+    test_simulated_tournament: jugando todas las partidas con las rutas, cada equipo
+        queda eliminado con dos derrotas salvo el campeón.
+    test_group_matches_by_bracket: las secciones se ordenan ganadores -> perdedores -> gran final.
+    test_final_match_uses_reset_only_if_played: el campeón sale de la revancha solo si se jugó.
+"""
+
+PENDING, COMPLETED = 1, 2
+
+
+def _play(rows, pick_winner):
+    """Juega el bracket en memoria siguiendo las rutas y devuelve las derrotas por equipo."""
+    matches = {r['match_number']: dict(r) for r in rows}
+    losses = {}
+    for row in rows:
+        match = matches[row['match_number']]
+        if match['is_bye']:
+            winner, loser = match['team_a_id'], None
+        else:
+            assert match['team_a_id'] and match['team_b_id'], f"Partida {row['match_number']} sin dos equipos"
+            winner = pick_winner(match['team_a_id'], match['team_b_id'])
+            loser = match['team_b_id'] if winner == match['team_a_id'] else match['team_a_id']
+            losses[loser] = losses.get(loser, 0) + 1
+            losses.setdefault(winner, 0)
+
+        if match['bracket'] == GRAND_FINAL and match['level'] == 1 and winner == match['team_a_id']:
+            break  # El campeón invicto gana: no hay revancha
+
+        if match['next_match_number']:
+            slot = 'team_a_id' if match['next_match_slot'] == 'A' else 'team_b_id'
+            matches[match['next_match_number']][slot] = winner
+        if loser and match['loser_match_number']:
+            slot = 'team_a_id' if match['loser_match_slot'] == 'A' else 'team_b_id'
+            matches[match['loser_match_number']][slot] = loser
+    return losses
+
+
+class TestDoubleElimination:
+    def test_routing_table_shape(self):
+        table = routing_table(8)
+        assert table.grand_final == 14 and table.reset == 15
+        assert table.losers_rounds == 4
+        assert [table.losers_round_count(r) for r in range(1, 5)] == [2, 2, 1, 1]
+        assert table.section[1:8] == [WINNERS] * 7
+        assert table.section[8:14] == [LOSERS] * 6
+        # Ganador de la final de ganadores -> gran final (team_a)
+        assert (table.win_to[1], table.win_slot[1]) == (14, 0)
+        # Perdedores de la primera ronda se cruzan en la primera ronda de perdedores
+        assert (table.lose_to[4], table.lose_slot[4]) == (8, 0)
+        assert (table.lose_to[5], table.lose_slot[5]) == (8, 1)
+
+    def test_routing_table_is_memoized(self):
+        assert routing_table(16) is routing_table(16)
+
+    @pytest.mark.parametrize('team_count, expected', [(2, 3), (3, 6), (4, 7), (5, 12), (8, 15), (13, 28), (16, 31)])
+    def test_row_counts(self, team_count, expected):
+        bracket = TournamentGenerator.build_double_elimination_bracket(mock_teams(team_count))
+        rows = list(bracket.iter_rows(PENDING, COMPLETED, tournament_id=3))
+        assert len(rows) == expected
+        assert len({r['match_number'] for r in rows}) == expected
+        assert all(r['tournament_id'] == 3 for r in rows)
+
+    def test_bye_matches_have_no_loser_route(self):
+        bracket = TournamentGenerator.build_double_elimination_bracket(mock_teams(5))
+        rows = list(bracket.iter_rows(PENDING, COMPLETED))
+        byes = [r for r in rows if r['is_bye']]
+        assert len(byes) == 3
+        assert all(r['loser_match_number'] is None for r in byes)
+        assert all(r['status_id'] == COMPLETED for r in byes)
+
+    @pytest.mark.parametrize('team_count', [2, 3, 5, 6, 8, 11, 16, 27])
+    @pytest.mark.parametrize('seed', [0, 1, 2])
+    def test_simulated_tournament(self, team_count, seed):
+        rng = random.Random(seed)
+        bracket = TournamentGenerator.build_double_elimination_bracket(mock_teams(team_count))
+        rows = list(bracket.iter_rows(PENDING, COMPLETED))
+
+        losses = _play(rows, lambda a, b: rng.choice((a, b)))
+
+        assert len(losses) == team_count
+        assert all(count <= 2 for count in losses.values())
+        assert sum(1 for count in losses.values() if count < 2) == 1
+
+    def test_group_matches_by_bracket(self):
+        matches = [
+            MagicMock(bracket=GRAND_FINAL, level=1),
+            MagicMock(bracket=LOSERS, level=0),
+            MagicMock(bracket=WINNERS, level=0),
+            MagicMock(bracket=WINNERS, level=1),
+        ]
+        sections = TournamentService.group_matches_by_bracket(matches)
+        assert [bracket for bracket, _ in sections] == [WINNERS, LOSERS, GRAND_FINAL]
+        assert list(sections[0][1].keys()) == [1, 0]
+
+    def test_final_match_uses_reset_only_if_played(self):
+        grand_final = MagicMock(bracket=GRAND_FINAL, level=1, status='COMPLETED')
+        reset = MagicMock(bracket=GRAND_FINAL, level=0, status='CANCELLED')
+        winners_final = MagicMock(bracket=WINNERS, level=0, status='COMPLETED')
+        assert TournamentService.get_final_match([winners_final, grand_final, reset]) is grand_final
+
+        reset.status = 'COMPLETED'
+        assert TournamentService.get_final_match([winners_final, grand_final, reset]) is reset
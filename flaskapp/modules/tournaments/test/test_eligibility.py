@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+import pytest
+
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import (
+    Organization, OrganizationMember, Team, TeamInvitation, TeamInvitationStatus, TeamMember, Tournament,
+    TournamentStatus, User, db
+)
+from flaskapp.modules.teams import service as team_service
+from flaskapp.modules.teams.service import TeamService
+from flaskapp.modules.tournaments import eligibility
+from flaskapp.modules.tournaments import service as tournament_service
+from flaskapp.modules.tournaments.service import TournamentService
+from tests.factory import QueryCounter, create_started_tournament
+
+"""
+Elegibilidad de invitados y árbitros (flaskapp.modules.tournaments.eligibility)
+    test_rules_match_listing: la lista y is_eligible aplican las mismas reglas a cada miembro.
+    test_pages_cover_candidates: páginas de una consulta, seleccionados primero y totales completos.
+    test_toggles_use_rules: invitar y asignar árbitro rechazan a quien no aparece en la lista.
+"""
+
+
+def add_member(organization, name, is_organizer=False, is_admin=False):
+    user = User(name=name, email=f'{name.lower().replace(" ", ".")}@test.com', is_admin=is_admin)
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(OrganizationMember(organization_id=organization.id, user_id=user.id, is_organizer=is_organizer))
+    return user
+
+
+def setup_roster():
+    """Torneo abierto con miembros en cada situación; retorna (torneo, equipo, usuarios por nombre)."""
+    ids = create_started_tournament(2)
+    for code in ('PENDING', 'ACCEPTED', 'REJECTED'):
+        db.session.add(TeamInvitationStatus(code=code))
+    db.session.flush()
+    lookups.refresh()
+
+    tournament = db.session.get(Tournament, ids['tournament_id'])
+    tournament.status_id = lookups.id_of(TournamentStatus, 'REGISTRATION_OPEN')
+    organization = Organization.query.one()
+    team = Team.query.filter_by(tournament_id=tournament.id).first()
+    users = {name: add_member(organization, name) for name in ('Libre', 'Invitado', 'Rechazado')}
+    users['Organizador'] = add_member(organization, 'Organizador', is_organizer=True)
+    users['Admin'] = add_member(organization, 'Admin', is_admin=True)
+    users['Árbitro'] = db.session.get(User, ids['referee_id'])
+    db.session.add(OrganizationMember(organization_id=organization.id, user_id=ids['referee_id']))
+    users['Jugador'] = db.session.get(User, TeamMember.query.filter_by(team_id=team.id).first().user_id)
+    db.session.add(OrganizationMember(organization_id=organization.id, user_id=users['Jugador'].id))
+    for name, code in (('Invitado', 'PENDING'), ('Rechazado', 'REJECTED')):
+        db.session.add(TeamInvitation(
+            team_id=team.id, invited_user_id=users[name].id, invited_by_user_id=users['Jugador'].id,
+            status_id=lookups.id_of(TeamInvitationStatus, code)
+        ))
+    db.session.commit()
+    return tournament, team, users
+
+
+class TestEligibility:
+    def test_rules_match_listing(self, app):
+        tournament, team, users = setup_roster()
+
+        players = TeamService.get_eligible_members(tournament.id, team.id)
+        assert [(m.name, m.is_invited) for m in players.items] == [('Invitado', True), ('Libre', False)]
+        referees = TournamentService.get_eligible_referees(tournament.id)
+        assert [(r.name, r.is_referee) for r in referees.items] == [
+            ('Árbitro', True), ('Invitado', False), ('Libre', False), ('Rechazado', False)
+        ]
+
+        listed = {
+            eligibility.PLAYER: {m.user_id for m in players.items},
+            eligibility.REFEREE: {r.user_id for r in referees.items}
+        }
+        for role, team_id in ((eligibility.PLAYER, team.id), (eligibility.REFEREE, None)):
+            for user in users.values():
+                assert eligibility.is_eligible(tournament, role, user.id, team_id) == (user.id in listed[role]), \
+                    (role, user.name)
+
+    def test_pages_cover_candidates(self, app):
+        tournament, team, users = setup_roster()
+        organization = Organization.query.one()
+        for i in range(7):
+            add_member(organization, f'Miembro {i}')
+        tournament_id, team_id = tournament.id, team.id
+        db.session.commit()
+
+        seen = []
+        for page in (1, 2, 3):
+            db.session.expire_all()
+            with QueryCounter(only_selects=True) as counter:
+                result = TeamService.get_eligible_members(tournament_id, team_id, page=page, per_page=4)
+            assert counter.count == 2  # torneo + candidatos con totales
+            assert (result.total, result.pages, result.invited_total) == (9, 3, 1)
+            seen.extend(m.name for m in result.items)
+        assert seen[0] == 'Invitado'
+        assert sorted(seen) == sorted(['Invitado', 'Libre'] + [f'Miembro {i}' for i in range(7)])
+
+        searched = TeamService.get_eligible_members(tournament_id, team_id, 'miembro', per_page=4)
+        assert (searched.total, searched.invited_total, len(searched.items)) == (7, 0, 4)
+
+    def test_toggles_use_rules(self, app, monkeypatch):
+        tournament, team, users = setup_roster()
+        leader = SimpleNamespace(id=users['Jugador'].id)
+        monkeypatch.setattr(team_service, 'current_user', leader)
+        monkeypatch.setattr(tournament_service, 'current_user', leader)
+
+        for name in ('Organizador', 'Rechazado', 'Árbitro', 'Admin'):
+            with pytest.raises(ValueError):
+                TeamService.toggle_invitation(tournament.id, team.id, users[name].id)
+        assert TeamService.toggle_invitation(tournament.id, team.id, users['Libre'].id) == 'added'
+        assert TeamService.toggle_invitation(tournament.id, team.id, users['Invitado'].id) == 'removed'
+
+        for name in ('Organizador', 'Jugador', 'Admin'):
+            with pytest.raises(ValueError):
+                TournamentService.toggle_referee(tournament.id, users[name].id)
+        assert TournamentService.toggle_referee(tournament.id, users['Rechazado'].id) == 'added'
+        assert TournamentService.toggle_referee(tournament.id, users['Árbitro'].id) == 'removed'
@@ -0,0 +1,116 @@
+import types
+
+import pytest
+
+from flaskapp.modules.tournaments import round_robin
+from flaskapp.modules.tournaments.bracket import Bracket
+from flaskapp.modules.tournaments.service import TournamentGenerator, TournamentService
+from flaskapp.modules.tournaments.test.factory import mock_teams
+from unittest.mock import MagicMock
+
+"""
+Ligas y fases de grupos (método del círculo)
+    test_circle_schedule: cada par se enfrenta una vez y nadie juega dos veces por jornada.
+    test_schedule_is_lazy: el calendario es un generador, no una lista.
+    test_split_into_groups: reparto en serpentina por seed.
+    test_group_count_for: grupos en potencia de 2 con al menos GROUP_SIZE equipos.
+    test_generate_round_robin_league: numeración y niveles de una liga.
+    test_generate_round_robin_groups: los grupos dejan libres los números del bracket.
+    test_group_standings_and_knockout_seeding: tabla por grupo y cruces 1.º vs 2.º.
+    test_sections_put_groups_first: los grupos se muestran antes que la eliminación.
+    test_groups_keep_creation_order: con más de 26 grupos, GROUP_27 va después de GROUP_Z.
+"""
+
+PENDING = 1
+
+
+class TestRoundRobin:
+    @pytest.mark.parametrize('team_count', [2, 3, 4, 7, 10, 21])
+    def test_circle_schedule(self, team_count):
+        schedule = list(round_robin.iter_circle_schedule(list(range(1, team_count + 1))))
+        pairs = {frozenset((a, b)) for _, a, b in schedule}
+
+        assert len(schedule) == len(pairs) == round_robin.match_count(team_count)
+        rounds = {}
+        for round_index, team_a, team_b in schedule:
+            rounds.setdefault(round_index, []).extend((team_a, team_b))
+        assert len(rounds) == round_robin.round_count(team_count)
+        assert all(len(teams) == len(set(teams)) for teams in rounds.values())
+
+    def test_schedule_is_lazy(self):
+        schedule = round_robin.iter_circle_schedule(list(range(1, 201)))
+        assert isinstance(schedule, types.GeneratorType)
+        assert next(schedule)[0] == 0
+
+    def test_split_into_groups(self):
+        groups = round_robin.split_into_groups(list(range(1, 11)), 4)
+        assert groups == [[1, 8, 9], [2, 7, 10], [3, 6], [4, 5]]
+
+    def test_group_count_for(self):
+        assert round_robin.group_count_for(3) == 1
+        assert round_robin.group_count_for(10) == 2
+        assert round_robin.group_count_for(16) == 4
+        assert round_robin.group_count_for(35) == 8
+
+    def test_generate_round_robin_league(self):
+        rows = TournamentGenerator.generate_round_robin(mock_teams(6), PENDING, tournament_id=4)
+        assert isinstance(rows, types.GeneratorType)
+        rows = list(rows)
+
+        assert [r['match_number'] for r in rows] == list(range(1, 16))
+        assert {r['bracket'] for r in rows} == {round_robin.LEAGUE}
+        assert {r['level'] for r in rows} == set(range(5))
+        assert rows[0]['level'] == 4 and rows[-1]['level'] == 0
+        assert all(r['tournament_id'] == 4 and r['status_id'] == PENDING for r in rows)
+
+    def test_generate_round_robin_groups(self):
+        rows = list(TournamentGenerator.generate_round_robin(mock_teams(16), PENDING, group_count=4))
+
+        assert len(rows) == 4 * round_robin.match_count(4)
+        # El bracket de 8 clasificados usa 1..7: los grupos empiezan en 8
+        assert min(r['match_number'] for r in rows) == round_robin.knockout_size(4) == 8
+        assert {r['bracket'] for r in rows} == {'GROUP_A', 'GROUP_B', 'GROUP_C', 'GROUP_D'}
+        group_a = {t for r in rows if r['bracket'] == 'GROUP_A' for t in (r['team_a_id'], r['team_b_id'])}
+        assert group_a == {1, 8, 9, 16}
+
+    def test_group_standings_and_knockout_seeding(self):
+        results = [
+            ('GROUP_A', 1, 2, 2, 1, 3), ('GROUP_A', 1, 3, 1, 2, 0), ('GROUP_A', 2, 3, 2, 1, 0),
+            ('GROUP_B', 4, 5, 4, 1, 0), ('GROUP_B', 4, 6, 4, 5, 0), ('GROUP_B', 5, 6, 6, 0, 1),
+        ]
+        standings = round_robin.group_standings(results, {})
+        assert standings['GROUP_A'] == [2, 1, 3]
+        assert standings['GROUP_B'][0] == 4
+
+        seeded = round_robin.knockout_seeding(standings)
+        assert seeded[:2] == [2, 4]
+        bracket = Bracket.from_seeded_ids(seeded)
+        # 1.º del grupo A contra 2.º del grupo B
+        assert (bracket.team_a[2], bracket.team_b[2]) == (2, standings['GROUP_B'][1])
+
+    def test_sections_put_groups_first(self):
+        matches = [
+            MagicMock(bracket='MAIN', level=0),
+            MagicMock(bracket='GROUP_B', level=1),
+            MagicMock(bracket='GROUP_A', level=2),
+        ]
+        sections = TournamentService.group_matches_by_bracket(matches)
+        assert [bracket for bracket, _ in sections] == ['GROUP_A', 'GROUP_B', 'MAIN']
+
+    def test_groups_keep_creation_order(self):
+        codes = [round_robin.group_code(i) for i in range(32)]
+        assert codes[25:27] == ['GROUP_Z', 'GROUP_27']
+        assert [round_robin.group_index(code) for code in codes] == list(range(32))
+
+        # Un partido por grupo: gana el equipo 2*i+1 al 2*i+2
+        results = [(code, 2 * i + 1, 2 * i + 2, 2 * i + 1, 1, 0) for i, code in enumerate(reversed(codes))]
+        standings = round_robin.group_standings(results, {})
+        assert list(standings) == codes
+
+        seeded = round_robin.knockout_seeding(standings)
+        assert seeded[:32] == [standings[code][0] for code in codes]
+
+        sections = TournamentService.group_matches_by_bracket(
+            [MagicMock(bracket='MAIN', level=0)] + [MagicMock(bracket=code, level=0) for code in reversed(codes)]
+        )
+        assert [bracket for bracket, _ in sections] == codes + ['MAIN']
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from flaskapp.modules.tournaments.service import TournamentGenerator
+from flaskapp.modules.tournaments.swiss import (
+    SwissHistory, _maximum_matching, pair_round, swiss_round_count
+)
+from flaskapp.modules.tournaments.test.factory import mock_teams
+
+"""
+Sistema suizo
+    test_round_count: ceil(log2(equipos)) rondas.
+    test_first_round_is_dutch: mitad superior contra mitad inferior por seed.
+    test_history_from_matches: puntajes, rivales y byes desde las filas de partidas.
+    test_bye_goes_to_lowest_without_bye: el bye no se repite mientras haya alternativas.
+    test_pairs_within_score_groups: se enfrentan equipos con el mismo puntaje.
+    test_avoids_rematch_with_matching: si el emparejamiento holandés falla, se usa el máximo.
+    test_simulated_tournament_has_no_rematches: todas las rondas sin revanchas ni equipos repetidos.
+    test_generate_swiss_round_rows: filas de Match con nivel, numeración y bye.
+"""
+
+PENDING, COMPLETED = 1, 2
+
+
+def _history(*results):
+    """results: (ronda, team_a, team_b, ganador) o (ronda, equipo_con_bye)."""
+    rows = []
+    for result in results:
+        if len(result) == 2:
+            rows.append((result[0], result[1], None, result[1], True))
+        else:
+            rows.append((*result, False))
+    return SwissHistory.from_matches(rows)
+
+
+class TestSwiss:
+    def test_round_count(self):
+        assert swiss_round_count(2) == 1
+        assert swiss_round_count(8) == 3
+        assert swiss_round_count(9) == 4
+        with pytest.raises(ValueError):
+            swiss_round_count(1)
+
+    def test_first_round_is_dutch(self):
+        seeds = {team_id: 100 - team_id for team_id in range(1, 9)}
+        swiss_round = pair_round(seeds, SwissHistory())
+        assert swiss_round.pairs == [(1, 5), (2, 6), (3, 7), (4, 8)]
+        assert swiss_round.bye_team_id is None
+
+    def test_history_from_matches(self):
+        history = _history((1, 1, 2, 1), (1, 3, 4, 4), (1, 5))
+        assert history.scores == {1: 1, 4: 1, 5: 1}
+        assert history.have_played(2, 1) and not history.have_played(1, 3)
+        assert history.had_bye == {5}
+        assert history.rounds_played == 1
+
+    def test_bye_goes_to_lowest_without_bye(self):
+        seeds = {team_id: 100 - team_id for team_id in range(1, 6)}
+        assert pair_round(seeds, SwissHistory()).bye_team_id == 5
+
+        history = _history((1, 1, 3, 1), (1, 2, 4, 4), (1, 5))
+        swiss_round = pair_round(seeds, history)
+        assert swiss_round.bye_team_id == 3  # 0 puntos y peor seed sin bye
+
+    def test_pairs_within_score_groups(self):
+        seeds = {team_id: 100 - team_id for team_id in range(1, 9)}
+        history = _history((1, 1, 5, 1), (1, 2, 6, 2), (1, 3, 7, 3), (1, 4, 8, 4))
+        swiss_round = pair_round(seeds, history)
+        winners = {1, 2, 3, 4}
+        for team_a, team_b in swiss_round.pairs:
+            assert (team_a in winners) == (team_b in winners)
+
+    def test_avoids_rematch_with_matching(self):
+        # 1-3 y 2-4 ya jugaron: el holandés (1-3 / 2-4) falla, el emparejamiento máximo no
+        history = _history((1, 1, 3, 1), (1, 2, 4, 2))
+        mate = _maximum_matching([1, 2, 3, 4], history)
+        assert all(j >= 0 for j in mate)
+
+        seeds = {1: 4, 2: 3, 3: 2, 4: 1}
+        swiss_round = pair_round(seeds, history)
+        assert swiss_round.rematches == 0
+        assert all(not history.have_played(a, b) for a, b in swiss_round.pairs)
+
+    @pytest.mark.parametrize('team_count', [4, 7, 16, 33, 100])
+    def test_simulated_tournament_has_no_rematches(self, team_count):
+        rng = random.Random(team_count)
+        seeds = {team_id: rng.random() for team_id in range(1, team_count + 1)}
+        rows = []
+        for round_number in range(1, swiss_round_count(team_count) + 1):
+            history = SwissHistory.from_matches(rows)
+            swiss_round = pair_round(seeds, history)
+
+            assert swiss_round.rematches == 0
+            teams = [team_id for pair in swiss_round.pairs for team_id in pair]
+            if swiss_round.bye_team_id:
+                teams.append(swiss_round.bye_team_id)
+                rows.append((round_number, swiss_round.bye_team_id, None, swiss_round.bye_team_id, True))
+            assert sorted(teams) == sorted(seeds)
+
+            for team_a, team_b in swiss_round.pairs:
+                assert not history.have_played(team_a, team_b)
+                rows.append((round_number, team_a, team_b, rng.choice((team_a, team_b)), False))
+
+    def test_generate_swiss_round_rows(self):
+        rows = TournamentGenerator.generate_swiss_round(
+            mock_teams(5), SwissHistory(), 1, PENDING, COMPLETED, tournament_id=9
+        )
+        assert [r['match_number'] for r in rows] == [1, 2, 3]
+        assert all(r['level'] == swiss_round_count(5) - 1 for r in rows)
+        assert all(r['bracket'] == 'SWISS' and r['tournament_id'] == 9 for r in rows)
+
+        bye = rows[-1]
+        assert bye['is_bye'] and bye['team_b_id'] is None
+        assert bye['winner_id'] == bye['team_a_id'] == 5
+        assert bye['status_id'] == COMPLETED
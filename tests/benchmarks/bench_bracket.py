@@ -0,0 +1,88 @@
+"""
+Benchmark: generación + validación de brackets de eliminación simple.
+
+Compara la implementación histórica basada en diccionarios (copiada abajo tal
+como estaba en TournamentGenerator) contra el Bracket indexado por match_number.
+
+Uso:
+    python -m tests.benchmarks.bench_bracket
+"""
+
+import math
+import timeit
+from types import SimpleNamespace
+
+from flaskapp.modules.tournaments.service import TournamentGenerator
+
+PENDING, COMPLETED = 1, 2
+SIZES = [64, 1024, 2049, 4096]  # 2049: la mayor cantidad de byes
+
+
+def legacy_generate_full_bracket(teams, pending_status_id, completed_status_id):
+    """Implementación anterior: dict de listas de diccionarios por partida."""
+    sorted_teams = sorted(teams, key=lambda x: x.seed_score, reverse=True)
+    bracket_size = 2 ** math.ceil(math.log2(len(teams)))
+    byes_count = bracket_size - len(teams)
+    max_level = int(math.log2(bracket_size)) - 1
+
+    matches = []
+    for i in range(byes_count):
+        matches.append({
+            "level": max_level, "match_number": 0, "team_a_id": sorted_teams[i].id,
+            "team_b_id": None, "is_bye": True, "status_id": 2, "winner_id": sorted_teams[i].id
+        })
+    remaining = sorted_teams[byes_count:]
+    for i in range(0, len(remaining), 2):
+        team_b = remaining[i + 1] if i + 1 < len(remaining) else None
+        matches.append({
+            "level": max_level, "match_number": 0, "team_a_id": remaining[i].id,
+            "team_b_id": team_b.id if team_b else None, "is_bye": False, "status_id": pending_status_id
+        })
+    for i, match in enumerate(matches):
+        match['match_number'] = 2 ** max_level + i
+    matches_by_level = {max_level: sorted(matches, key=lambda m: m['match_number'])}
+
+    for level in range(max_level - 1, -1, -1):
+        matches_by_level[level] = [{
+            "level": level, "match_number": 2 ** level + i, "is_bye": False,
+            "status_id": pending_status_id, "team_a_id": None, "team_b_id": None,
+        } for i in range(2 ** level)]
+    return matches_by_level
+
+
+def legacy_validate(matches_by_level):
+    first_round = matches_by_level[max(matches_by_level)]
+    seen = set()
+    for match in first_round:
+        for key in ('team_a_id', 'team_b_id'):
+            team_id = match[key]
+            if team_id is not None:
+                assert team_id not in seen
+                seen.add(team_id)
+
+
+def make_teams(count):
+    return [SimpleNamespace(id=i, seed_score=(count - i)) for i in range(1, count + 1)]
+
+
+def bench(fn, repeat=7, number=20):
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number
+
+
+def main():
+    print(f"{'equipos':>8} {'legacy (ms)':>12} {'bracket (ms)':>13} {'+filas (ms)':>12} {'speedup':>8}")
+    for size in SIZES:
+        teams = make_teams(size)
+
+        legacy = bench(lambda: legacy_validate(
+            legacy_generate_full_bracket(teams, PENDING, COMPLETED)))
+        indexed = bench(lambda: TournamentGenerator.build_bracket(teams))
+        with_rows = bench(lambda: list(
+            TournamentGenerator.build_bracket(teams).iter_rows(PENDING, COMPLETED, 1)))
+
+        print(f"{size:>8} {legacy * 1e3:>12.3f} {indexed * 1e3:>13.3f} "
+              f"{with_rows * 1e3:>12.3f} {legacy / indexed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
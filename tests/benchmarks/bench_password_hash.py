@@ -0,0 +1,68 @@
+"""
+Benchmark: logins por segundo (flaskapp.modules.authentication.hasher).
+
+Para varios costos de PBKDF2-SHA512 simula CLIENTS requests concurrentes que
+verifican una contraseña, primero en el propio hilo del request (como antes)
+y luego a través del pool acotado de password_hasher. Reporta logins/s
+totales, logins/s por núcleo y la latencia p95; en el pool la latencia
+incluye la espera en cola.
+
+Uso:
+    python -m tests.benchmarks.bench_password_hash
+    BENCH_CLIENTS=64 BENCH_SECONDS=5 python -m tests.benchmarks.bench_password_hash
+"""
+
+import os
+import threading
+import time
+
+from flaskapp.modules.authentication.hasher import PasswordHasher
+
+CORES = os.cpu_count() or 1
+CLIENTS = int(os.getenv('BENCH_CLIENTS', 4 * CORES))
+SECONDS = float(os.getenv('BENCH_SECONDS', 3))
+COSTS = [100_000, 210_000, 600_000]
+
+
+def run_clients(verify):
+    """Cada cliente verifica en bucle durante SECONDS; retorna las latencias (ms)."""
+    latencies, lock = [], threading.Lock()
+    deadline = time.perf_counter() + SECONDS
+
+    def client():
+        local = []
+        while time.perf_counter() < deadline:
+            began = time.perf_counter()
+            verify()
+            local.append((time.perf_counter() - began) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(CLIENTS)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - began
+
+
+def report(label, latencies, elapsed):
+    latencies.sort()
+    rate = len(latencies) / elapsed
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    print(f"  {label:>14}: {rate:8.1f} logins/s, {rate / CORES:7.1f} por núcleo, p95 {p95:8.1f} ms")
+
+
+def main():
+    print(f"{CORES} núcleos, {CLIENTS} clientes concurrentes, {SECONDS:.0f} s por medición")
+    for iterations in COSTS:
+        hasher = PasswordHasher(iterations, workers=CORES, max_pending=CLIENTS, timeout=60)
+        stored = hasher.hash('password1')
+        print(f"{iterations:,} iteraciones")
+        report('hilo request', *run_clients(lambda: PasswordHasher._check('password1', stored)))
+        report('pool', *run_clients(lambda: hasher.verify('password1', stored)))
+
+
+if __name__ == '__main__':
+    main()
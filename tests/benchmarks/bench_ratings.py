@@ -0,0 +1,73 @@
+"""
+Benchmark: recálculo completo de ratings Elo (flaskapp.modules.matches.ratings).
+
+Historial sintético de partidas 2 vs 2 entre PLAYERS jugadores elegidos al
+azar en cada partida. Compara el
+recorrido secuencial en Python (apply_match, el mismo de la ruta incremental)
+con compute_ratings (capas independientes + NumPy), y verifica que ambos
+producen los mismos ratings.
+
+Uso:
+    python -m tests.benchmarks.bench_ratings
+"""
+
+import time
+
+import numpy as np
+
+from flaskapp.modules.matches.ratings import apply_match, compute_ratings, match_layers
+
+PLAYERS = 100_000
+TEAM_SIZE = 2
+MATCH_COUNTS = [100_000, 1_000_000, 2_000_000]
+SEQUENTIAL_LIMIT = 1_000_000  # El recorrido en Python puro solo se mide hasta aquí
+
+
+def synthetic_history(match_count, rng):
+    players = rng.integers(0, PLAYERS, size=(match_count, 2 * TEAM_SIZE))
+    # Jugadores al azar y distintos dentro de cada partida: se sortean de nuevo los repetidos
+    while True:
+        ordered = np.sort(players, axis=1)
+        repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        if not repeated.any():
+            break
+        players[repeated] = rng.integers(0, PLAYERS, size=(int(repeated.sum()), 2 * TEAM_SIZE))
+    offsets = np.arange(0, players.size + 1, 2 * TEAM_SIZE)
+    sides = np.tile(np.repeat([0, 1], TEAM_SIZE), match_count)
+    a_won = rng.random(match_count) < 0.5
+    return offsets, players.ravel(), sides, a_won
+
+
+def sequential(offsets, players, a_won):
+    ratings, games = {}, {}
+    rows = players.reshape(-1, 2 * TEAM_SIZE).tolist()
+    for row, won in zip(rows, a_won.tolist()):
+        apply_match(ratings, games, row[:TEAM_SIZE], row[TEAM_SIZE:], won)
+    return ratings
+
+
+def main():
+    rng = np.random.default_rng(42)
+    print(f"{PLAYERS:,} jugadores, partidas {TEAM_SIZE} vs {TEAM_SIZE}")
+    print(f"{'partidas':>10} {'capas':>7} {'numpy (s)':>10} {'python (s)':>11}")
+    for match_count in MATCH_COUNTS:
+        offsets, players, sides, a_won = synthetic_history(match_count, rng)
+
+        began = time.perf_counter()
+        ratings, _ = compute_ratings(offsets, players, sides, a_won, PLAYERS)
+        vectorized = time.perf_counter() - began
+        layers = int(match_layers(offsets, players).max()) + 1
+
+        python_time = '-'
+        if match_count <= SEQUENTIAL_LIMIT:
+            began = time.perf_counter()
+            expected = sequential(offsets, players, a_won)
+            python_time = f"{time.perf_counter() - began:.2f}"
+            worst = max(abs(ratings[p] - r) for p, r in expected.items())
+            assert worst < 1e-6, f"diferencia máxima {worst}"
+
+        print(f"{match_count:>10,} {layers:>7} {vectorized:>10.2f} {python_time:>11}")
+
+
+if __name__ == '__main__':
+    main()
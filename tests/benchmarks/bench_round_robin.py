@@ -0,0 +1,102 @@
+"""
+Benchmark: generación e inserción de ligas (todos contra todos).
+
+Compara, para una liga de 200 equipos (19.900 partidas):
+- la ruta ORM (lista completa de objetos Match + unit of work), y
+- start_tournament con el calendario como generador e inserción por bloques.
+Reporta el tiempo y el pico de memoria (tracemalloc) de cada una. Al final
+ejecuta una fase de grupos completa y genera su eliminación directa.
+
+Uso:
+    python -m tests.benchmarks.bench_round_robin
+"""
+
+import time
+import tracemalloc
+
+from sqlalchemy import update
+
+from flaskapp.database.models import Match, MatchStatus, Tournament, TournamentFormat, TournamentStatus, db
+from flaskapp.modules.tournaments import round_robin
+from flaskapp.modules.tournaments.service import TournamentService
+from tests.benchmarks.bench_start_tournament import create_bench_app, create_tournament, seed_fixture
+
+LEAGUE_TEAMS = 200
+GROUP_STAGE_TEAMS = 32
+
+
+def set_format(tournament_id, code):
+    tournament_format = TournamentFormat.query.filter_by(code=code).first()
+    if tournament_format is None:
+        tournament_format = TournamentFormat(code=code)
+        db.session.add(tournament_format)
+        db.session.flush()
+    db.session.get(Tournament, tournament_id).format_id = tournament_format.id
+    db.session.commit()
+
+
+def orm_league(tournament_id):
+    """Ruta ingenua: todas las partidas como objetos ORM en memoria."""
+    tournament = db.session.get(Tournament, tournament_id)
+    team_ids = [team.id for team in tournament.teams]
+    pending = MatchStatus.query.filter_by(code='PENDING').one()
+    in_progress = TournamentStatus.query.filter_by(code='IN_PROGRESS').one()
+    matches = [
+        Match(tournament_id=tournament_id, level=0, match_number=number, bracket=round_robin.LEAGUE,
+              team_a_id=team_a, team_b_id=team_b, is_bye=False, status_id=pending.id)
+        for number, (_, team_a, team_b) in enumerate(round_robin.iter_circle_schedule(team_ids), start=1)
+    ]
+    db.session.add_all(matches)
+    tournament.status_id = in_progress.id
+    db.session.commit()
+
+
+def measure(fn, tournament_id):
+    db.session.expunge_all()
+    tracemalloc.start()
+    began = time.perf_counter()
+    fn(tournament_id)
+    elapsed = time.perf_counter() - began
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def finish_group_matches(tournament_id):
+    completed = MatchStatus.query.filter_by(code='COMPLETED').one()
+    db.session.execute(
+        update(Match)
+        .where(Match.tournament_id == tournament_id)
+        .values(score_team_a=1, score_team_b=0, winner_id=Match.team_a_id, status_id=completed.id)
+    )
+    db.session.commit()
+
+
+def main():
+    app = create_bench_app()
+    with app.app_context():
+        db.create_all()
+        try:
+            fixture = seed_fixture()
+            rows = round_robin.match_count(LEAGUE_TEAMS)
+            print(f"BD: {db.engine.dialect.name}, liga de {LEAGUE_TEAMS} equipos ({rows} partidas)")
+            for name, fn in (('orm', orm_league), ('streaming', TournamentService.start_tournament)):
+                tournament_id = create_tournament(LEAGUE_TEAMS, *fixture)
+                set_format(tournament_id, 'ROUND_ROBIN')
+                elapsed, peak = measure(fn, tournament_id)
+                print(f"{name:>10}: {elapsed * 1000:8.1f} ms, {rows / elapsed:9,.0f} filas/s, pico {peak / 2**20:6.1f} MiB")
+
+            tournament_id = create_tournament(GROUP_STAGE_TEAMS, *fixture)
+            set_format(tournament_id, 'GROUP_STAGE')
+            TournamentService.start_tournament(tournament_id)
+            finish_group_matches(tournament_id)
+            created = TournamentService.start_knockout_stage(tournament_id)
+            groups = round_robin.group_count_for(GROUP_STAGE_TEAMS)
+            print(f"\nFase de grupos: {GROUP_STAGE_TEAMS} equipos en {groups} grupos -> {created} partidas de eliminación")
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
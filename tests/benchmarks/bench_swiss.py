@@ -0,0 +1,100 @@
+"""
+Benchmark: emparejamiento de rondas en sistema suizo.
+
+1. Solo el motor (flaskapp.modules.tournaments.swiss): tiempo por ronda con
+   resultados aleatorios, para varios tamaños de torneo.
+2. De punta a punta con la BD (SQLite en memoria o BENCH_DATABASE_URI):
+   start_tournament + generate_next_swiss_round, completando cada ronda.
+
+Uso:
+    python -m tests.benchmarks.bench_swiss
+"""
+
+import random
+import time
+
+from sqlalchemy import update
+
+from flaskapp.database.models import Match, MatchStatus, Tournament, TournamentFormat, db
+from flaskapp.modules.tournaments.service import TournamentService
+from flaskapp.modules.tournaments.swiss import SwissHistory, pair_round, swiss_round_count
+from tests.benchmarks.bench_start_tournament import create_bench_app, create_tournament, seed_fixture
+
+TEAM_COUNTS = [128, 1000, 4096]
+DB_TEAM_COUNT = 1000
+
+
+def bench_engine(team_count, rng):
+    seeds = {team_id: rng.random() for team_id in range(1, team_count + 1)}
+    rows = []
+    worst = total = 0.0
+    rounds = swiss_round_count(team_count)
+    for round_number in range(1, rounds + 1):
+        began = time.perf_counter()
+        swiss_round = pair_round(seeds, SwissHistory.from_matches(rows))
+        elapsed = time.perf_counter() - began
+        worst, total = max(worst, elapsed), total + elapsed
+
+        for team_a, team_b in swiss_round.pairs:
+            rows.append((round_number, team_a, team_b, rng.choice((team_a, team_b)), False))
+        if swiss_round.bye_team_id:
+            rows.append((round_number, swiss_round.bye_team_id, None, swiss_round.bye_team_id, True))
+    return rounds, total / rounds, worst
+
+
+def complete_pending_matches(tournament_id, rng):
+    """Simula los resultados de la ronda en curso (team_a o team_b gana al azar)."""
+    completed = MatchStatus.query.filter_by(code='COMPLETED').one()
+    pending = db.session.query(Match.id, Match.team_a_id, Match.team_b_id).join(MatchStatus).filter(
+        Match.tournament_id == tournament_id, MatchStatus.code == 'PENDING'
+    ).all()
+    for match_id, team_a_id, team_b_id in pending:
+        a_wins = rng.random() < 0.5
+        db.session.execute(update(Match).where(Match.id == match_id).values(
+            score_team_a=1 if a_wins else 0, score_team_b=0 if a_wins else 1,
+            winner_id=team_a_id if a_wins else team_b_id, status_id=completed.id
+        ))
+    db.session.commit()
+
+
+def bench_database(rng):
+    app = create_bench_app()
+    with app.app_context():
+        db.create_all()
+        try:
+            fixture = seed_fixture()
+            swiss = TournamentFormat(code='SWISS')
+            db.session.add(swiss)
+            db.session.commit()
+
+            tournament_id = create_tournament(DB_TEAM_COUNT, *fixture)
+            db.session.get(Tournament, tournament_id).format_id = swiss.id
+            db.session.commit()
+
+            began = time.perf_counter()
+            TournamentService.start_tournament(tournament_id)
+            timings = [time.perf_counter() - began]
+            for _ in range(swiss_round_count(DB_TEAM_COUNT) - 1):
+                complete_pending_matches(tournament_id, rng)
+                began = time.perf_counter()
+                TournamentService.generate_next_swiss_round(tournament_id)
+                timings.append(time.perf_counter() - began)
+
+            print(f"\nBD {db.engine.dialect.name}, {DB_TEAM_COUNT} equipos: "
+                  + ', '.join(f"ronda {i + 1} {t * 1000:.1f} ms" for i, t in enumerate(timings)))
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'equipos':>8} {'rondas':>7} {'promedio (ms)':>14} {'peor (ms)':>10}")
+    for team_count in TEAM_COUNTS:
+        rounds, average, worst = bench_engine(team_count, rng)
+        print(f"{team_count:>8} {rounds:>7} {average * 1000:>14.2f} {worst * 1000:>10.2f}")
+    bench_database(rng)
+
+
+if __name__ == '__main__':
+    main()
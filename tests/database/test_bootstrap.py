@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from flaskapp import create_app
+from flaskapp.config import DevelopmentConfig
+from flaskapp.database import bootstrap
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import SchemaVersion, db
+
+"""
+Esquema versionado (flaskapp.database.bootstrap)
+    test_bootstrap_records_version: el bootstrap crea el esquema y registra la versión una sola vez.
+    test_startup_checks_version: create_app falla sin bootstrap y luego arranca con una sola consulta.
+    test_command_skips_current_version: el comando solo consulta la versión si ya está al día, salvo con --force.
+"""
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """create_app sobre una base SQLite en archivo, sin bootstrap automático ni hilos."""
+    monkeypatch.delenv('FLASK_ENV', raising=False)
+    monkeypatch.setattr(DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'app.db'}")
+    monkeypatch.setattr(DevelopmentConfig, 'DB_AUTO_BOOTSTRAP', False)
+    monkeypatch.setattr(DevelopmentConfig, 'DASHBOARD_REFRESH_INTERVAL', 0)
+    yield DevelopmentConfig
+    lookups.clear()
+
+
+class StatementCounter:
+    """Sentencias de cualquier engine (create_app crea el suyo)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _record(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(Engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'before_cursor_execute', self._record)
+        return False
+
+
+class TestBootstrap:
+    def test_bootstrap_records_version(self, config):
+        app = create_app(bootstrap_only=True)
+        with app.app_context():
+            assert bootstrap.current_version() is None
+            with pytest.raises(bootstrap.SchemaOutOfDate):
+                bootstrap.check_schema()
+
+            assert bootstrap.ensure_bootstrapped(app, seed=False)
+            assert bootstrap.current_version() == bootstrap.SCHEMA_VERSION
+            bootstrap.check_schema()
+            with StatementCounter() as counter:
+                assert not bootstrap.ensure_bootstrapped(app, seed=False)
+            assert counter.count == 1
+
+            bootstrap.bootstrap(app, seed=False)  # Repetirlo no duplica la fila
+            assert SchemaVersion.query.count() == 1
+            db.session.remove()
+
+    def test_startup_checks_version(self, config):
+        with pytest.raises(bootstrap.SchemaOutOfDate):
+            create_app()
+
+        app = create_app(bootstrap_only=True)
+        with app.app_context():
+            bootstrap.bootstrap(app, seed=False)
+            db.session.remove()
+
+        with StatementCounter() as counter:
+            create_app()
+        assert counter.count == 1
+
+        with app.app_context():
+            db.session.get(SchemaVersion, 1).version = bootstrap.SCHEMA_VERSION - 1
+            db.session.commit()
+            db.session.remove()
+        with pytest.raises(bootstrap.SchemaOutOfDate):
+            create_app()
+
+    def test_command_skips_current_version(self, config, capsys):
+        bootstrap.main(['--no-seed'])
+        assert 'bootstrapped to' in capsys.readouterr().out
+
+        with StatementCounter() as counter:
+            bootstrap.main(['--no-seed'])
+        assert counter.count == 1
+        assert 'already at' in capsys.readouterr().out
+
+        bootstrap.main(['--no-seed', '--force'])
+        assert 'bootstrapped to' in capsys.readouterr().out
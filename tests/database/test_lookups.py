@@ -0,0 +1,86 @@
+import pytest
+
+from flaskapp.database.lookups import UnknownLookupCode, lookups
+from flaskapp.database.models import MatchStatus, TeamInvitationStatus, TournamentStatus, db
+from flaskapp.modules.matches.service import MatchService
+from tests.factory import QueryCounter, create_started_tournament, create_test_app, match_by_number, seed_statuses
+
+"""
+Registro de tablas de códigos (flaskapp.database.lookups)
+    test_load_in_one_query: todas las tablas se leen con una sola consulta.
+    test_resolves_without_queries: una vez cargado, código <-> id (y descripción) no toca la BD.
+    test_unknown_code_refreshes_once: un código nuevo se encuentra tras recargar; uno inexistente falla.
+    test_misses_refresh_at_most_once_per_interval: repetir un código inexistente no recarga cada vez.
+    test_new_engine_reloads: otra app (otro engine) no reutiliza los ids de la anterior.
+    test_write_path_skips_status_tables: editar un partido no consulta tablas de estado.
+"""
+
+
+class TestLookups:
+    def test_load_in_one_query(self, app):
+        seed_statuses()
+        with QueryCounter() as counter:
+            lookups.load()
+        assert counter.count == 1
+        assert set(lookups.ids(MatchStatus)) == {'PENDING', 'COMPLETED', 'CANCELLED'}
+
+    def test_resolves_without_queries(self, app):
+        seed_statuses()
+        with QueryCounter() as counter:
+            completed_id = lookups.id_of(MatchStatus, 'COMPLETED')
+            assert lookups.code_of(MatchStatus, completed_id) == 'COMPLETED'
+            assert lookups.code_of(MatchStatus, None) is None
+            assert lookups.description_of(MatchStatus, completed_id) == 'completed'
+        assert counter.count == 0
+
+    def test_unknown_code_refreshes_once(self, app):
+        seed_statuses()
+        db.session.add(TeamInvitationStatus(code='PENDING'))
+        db.session.flush()
+
+        with QueryCounter() as counter:
+            assert lookups.id_of(TeamInvitationStatus, 'PENDING') > 0
+        assert counter.count == 1
+
+        with pytest.raises(UnknownLookupCode):
+            lookups.id_of(TournamentStatus, 'UNKNOWN')
+
+    def test_misses_refresh_at_most_once_per_interval(self, app, monkeypatch):
+        seed_statuses()
+        with QueryCounter() as counter:
+            for _ in range(3):
+                with pytest.raises(UnknownLookupCode):
+                    lookups.id_of(MatchStatus, 'UNKNOWN')
+                with pytest.raises(UnknownLookupCode):
+                    lookups.code_of(MatchStatus, 999)
+        assert counter.count == 1
+
+        # Pasado el intervalo, un fallo vuelve a recargar y encuentra filas nuevas
+        db.session.add(MatchStatus(code='UNKNOWN'))
+        db.session.flush()
+        monkeypatch.setattr(lookups, 'miss_refresh_interval', 0)
+        assert lookups.id_of(MatchStatus, 'UNKNOWN') > 0
+
+    def test_new_engine_reloads(self, app):
+        seed_statuses()
+        first_engine_id = lookups.id_of(MatchStatus, 'CANCELLED')
+
+        other = create_test_app()
+        with other.app_context():
+            db.create_all()
+            db.session.add(MatchStatus(code='CANCELLED'))
+            db.session.commit()
+            assert lookups.id_of(MatchStatus, 'CANCELLED') == 1 != first_engine_id
+            db.session.remove()
+
+    def test_write_path_skips_status_tables(self, app):
+        ids = create_started_tournament(4)
+        semi = match_by_number(ids['tournament_id'], 2)
+        db.session.expire_all()
+
+        with QueryCounter() as counter:
+            assert MatchService.update_match(semi.id, {
+                'user_id': ids['referee_id'], 'score_team_a': 3, 'score_team_b': 1
+            })
+        assert not any('_statuses' in statement for statement in counter.statements)
+        assert match_by_number(ids['tournament_id'], 1).team_a_id == semi.winner_id
@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy.orm import selectinload
+
+from flaskapp.database.models import Team, db
+from flaskapp.database.profiling import HEADER, fingerprint, sql_profiler
+from tests.factory import create_started_tournament, create_test_app
+
+"""
+Perfilado SQL por request (flaskapp.database.profiling)
+    test_header_and_n_plus_one: el header resume consultas y tiempo; un loop de lazy loads se marca como N+1 con su origen.
+    test_report_aggregates_window: el reporte agrupa por endpoint y por sentencia repetida.
+    test_disabled_by_default: sin SQL_PROFILING no se agrega el header ni se registra nada.
+    test_fingerprint: literales, parámetros y listas IN se normalizan.
+"""
+
+
+def members_loop():
+    # N+1: una consulta por equipo al leer team.members
+    return {'members': sum(len(team.members) for team in Team.query.order_by(Team.id))}
+
+
+def members_eager():
+    teams = Team.query.options(selectinload(Team.members)).order_by(Team.id)
+    return {'members': sum(len(team.members) for team in teams)}
+
+
+def profiled(app, enabled=True):
+    app.config['SQL_PROFILING'] = enabled
+    sql_profiler.init_app(app)
+    app.add_url_rule('/loop', 'members_loop', members_loop)
+    app.add_url_rule('/eager', 'members_eager', members_eager)
+    return app
+
+
+@pytest.fixture
+def app(app):
+    profiled(app)
+    create_started_tournament(team_count=8)
+    db.session.remove()
+    yield app
+    sql_profiler.clear()
+    sql_profiler.enabled = False
+
+
+def parse_header(response):
+    return dict(part.split('=') for part in response.headers[HEADER].split('; '))
+
+
+class TestSQLProfiler:
+    def test_header_and_n_plus_one(self, app):
+        client = app.test_client()
+
+        response = client.get('/loop')
+        assert response.json == {'members': 16}
+        header = parse_header(response)
+        assert (header['queries'], header['n_plus_one']) == ('9', '1')
+        assert float(header['db_ms']) > 0
+        assert response.headers['Server-Timing'].startswith('db;dur=')
+
+        flagged, = sql_profiler.report()['recent'][0]['n_plus_one']
+        assert flagged['count'] == 8
+        assert 'team_members' in flagged['fingerprint']
+        assert flagged['location'].startswith('tests/database/test_sql_profiler.py:')
+        assert flagged['location'].endswith('in <genexpr>')
+
+        response = client.get('/eager')
+        assert response.json == {'members': 16}
+        assert parse_header(response) | {'db_ms': None} == {'queries': '2', 'n_plus_one': '0', 'db_ms': None}
+
+    def test_report_aggregates_window(self, app):
+        client = app.test_client()
+        for path in ('/loop', '/loop', '/eager'):
+            client.get(path)
+
+        report = sql_profiler.report(recent=2)
+        assert (report['enabled'], report['window'], report['n_plus_one_threshold']) == (True, 3, 5)
+        assert [r['endpoint'] for r in report['recent']] == ['members_eager', 'members_loop']
+
+        loop, eager = report['endpoints']
+        assert (loop['endpoint'], loop['requests'], loop['avg_queries'], loop['n_plus_one_requests']) == \
+            ('GET members_loop', 2, 9.0, 2)
+        assert (eager['endpoint'], eager['max_queries'], eager['n_plus_one_requests']) == ('GET members_eager', 2, 0)
+
+        repeated, = report['n_plus_one']
+        assert (repeated['requests'], repeated['executions']) == (2, 16)
+
+        sql_profiler.clear()
+        assert sql_profiler.report()['window'] == 0
+
+    def test_disabled_by_default(self):
+        app = profiled(create_test_app(), enabled=False)
+        with app.app_context():
+            db.create_all()
+            response = app.test_client().get('/loop')
+            db.session.remove()
+            db.drop_all()
+        assert HEADER not in response.headers
+        assert sql_profiler.report()['window'] == 0
+
+    def test_fingerprint(self):
+        assert fingerprint(
+            "SELECT * FROM users WHERE id = 42 AND name = 'O''Hara'\n  AND email = %(email_1)s"
+        ) == "SELECT * FROM users WHERE id = ? AND name = ? AND email = ?"
+        assert fingerprint('SELECT x FROM t WHERE t.id IN (?, ?, ?) AND y = :y') == \
+            fingerprint('SELECT x FROM t WHERE t.id IN ($1, $2) AND y = :y_1') == \
+            'SELECT x FROM t WHERE t.id IN (?...) AND y = ?'
+        assert fingerprint('SELECT CAST(x AS TEXT)::text FROM t1') == 'SELECT CAST(x AS TEXT)::text FROM t1'
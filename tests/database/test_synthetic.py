@@ -0,0 +1,89 @@
+from collections import Counter
+
+import pytest
+from sqlalchemy import select
+
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import (
+    Match, MatchStatus, Organization, OrganizationMember, Team, TeamMember, Tournament, TournamentReferee, User,
+    UserPerformance, db
+)
+from flaskapp.database.synthetic import PASSWORD, TABLE_ORDER, SyntheticConfig, generate
+from flaskapp.modules.authentication.hasher import DEFAULT_ITERATIONS, password_hasher
+from tests.factory import create_test_app, seed_statuses
+
+"""
+Generador de datos sintéticos (flaskapp.database.synthetic)
+    test_same_seed_same_rows: la misma semilla produce las mismas filas en memoria y en modo streaming.
+    test_rows_are_consistent: brackets completos, equipos disjuntos, contadores y agregados al día.
+"""
+
+CONFIG = dict(users=240, organizations=4, tournaments=12, teams_per_tournament=5)
+
+
+@pytest.fixture(autouse=True)
+def cheap_hash():
+    password_hasher.configure(1000, workers=1)
+    yield
+    password_hasher.configure(DEFAULT_ITERATIONS)
+    lookups.clear()
+
+
+def generated_rows(**options):
+    """Filas de cada tabla tras generar en una base nueva (sin la contraseña, que lleva sal aleatoria)."""
+    app = create_test_app()
+    with app.app_context():
+        db.create_all()
+        seed_statuses()
+        db.session.commit()
+        counts = generate(SyntheticConfig(**CONFIG, **options))
+        rows = {
+            model.__tablename__: [
+                tuple(value for key, value in row._mapping.items() if key != 'password')
+                for row in db.session.execute(select(model.__table__).order_by(*model.__table__.primary_key))
+            ] for model in TABLE_ORDER
+        }
+        db.session.remove()
+        db.drop_all()
+    return counts, rows
+
+
+class TestSynthetic:
+    def test_same_seed_same_rows(self):
+        counts, rows = generated_rows(derived=False)
+        streamed_counts, streamed = generated_rows(derived=False, stream=True, batch_rows=37)
+        assert counts == streamed_counts
+        assert rows == streamed
+        assert counts['users'] == 240 and counts['organizations'] == 4 and counts['tournaments'] == 12
+
+        _, other_seed = generated_rows(derived=False, seed=7)
+        assert other_seed['users'] != rows['users']
+
+    def test_rows_are_consistent(self, app):
+        seed_statuses()
+        db.session.commit()
+        generate(SyntheticConfig(**CONFIG))
+
+        passwords = {password for (password,) in db.session.query(User.password)}
+        assert len(passwords) == 1 and password_hasher.verify(PASSWORD, passwords.pop())
+
+        for organization in Organization.query:
+            assert organization.member_count == OrganizationMember.query.filter_by(
+                organization_id=organization.id).count()
+
+        completed = lookups.id_of(MatchStatus, 'COMPLETED')
+        for tournament in Tournament.query:
+            teams = Team.query.filter_by(tournament_id=tournament.id).all()
+            assert tournament.team_count == len(teams) == 5
+            players = [m.user_id for m in TeamMember.query.filter(TeamMember.team_id.in_([t.id for t in teams]))]
+            referee = TournamentReferee.query.filter_by(tournament_id=tournament.id).one()
+            assert len(set(players)) == len(players) and referee.user_id not in players
+
+            matches = Match.query.filter_by(tournament_id=tournament.id).all()
+            assert len(matches) == 7  # bracket de 8 con 3 byes
+            assert all(m.status_id == completed and m.winner_id in (m.team_a_id, m.team_b_id) for m in matches)
+            assert Counter(m.is_bye for m in matches)[True] == 3
+            final = next(m for m in matches if m.match_number == 1)
+            assert final.score_team_a != final.score_team_b and final.recorded_by_referee_id == referee.user_id
+
+        assert db.session.query(UserPerformance).count() > 0
@@ -0,0 +1,122 @@
+"""
+Datos y utilidades compartidas por las pruebas con base de datos (la fixture
+`app` está en conftest.py, en la raíz del repositorio).
+"""
+
+from flask import Flask
+from sqlalchemy import event, update
+
+from flaskapp.database.lookups import lookups
+from flaskapp.database.models import (
+    Activity, Match, MatchStatus, Notification, NotificationType, Organization, RelatedEntityType, Team,
+    TeamMember, Tournament, TournamentFormat, TournamentReferee, TournamentStatus, User, db
+)
+from flaskapp.modules.tournaments.service import TournamentService
+
+
+def create_test_app():
+    """App mínima con SQLite en memoria (sin blueprints ni seeding)."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed_statuses():
+    for code in ('REGISTRATION_OPEN', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED'):
+        db.session.add(TournamentStatus(code=code, description=code.lower()))
+    for code in ('PENDING', 'COMPLETED', 'CANCELLED'):
+        db.session.add(MatchStatus(code=code, description=code.lower()))
+    for code in ('SINGLE_ELIMINATION', 'DOUBLE_ELIMINATION'):
+        db.session.add(TournamentFormat(code=code))
+    db.session.flush()
+    lookups.refresh()
+
+
+def create_started_tournament(team_count=4, format_code=None, members_per_team=2):
+    """
+    Crea un torneo con `team_count` equipos (con miembros y líder), un árbitro
+    y lo inicia con TournamentService.start_tournament. Retorna los ids útiles.
+    """
+    seed_statuses()
+    referee = User(name='Árbitro', email='referee@test.com')
+    db.session.add(referee)
+    db.session.flush()
+
+    organization = Organization(name='Org de prueba', created_by=referee.id)
+    activity = Activity(name='Actividad de prueba', min_players_per_team=1, created_by=referee.id)
+    db.session.add_all([organization, activity])
+    db.session.flush()
+
+    tournament = Tournament(
+        organization_id=organization.id, activity_id=activity.id, name='Torneo de prueba',
+        max_teams=team_count, created_by=referee.id,
+        status_id=lookups.id_of(TournamentStatus, 'REGISTRATION_OPEN'),
+        format_id=lookups.id_of(TournamentFormat, format_code) if format_code else None
+    )
+    db.session.add(tournament)
+    db.session.flush()
+    db.session.add(TournamentReferee(tournament_id=tournament.id, user_id=referee.id, assigned_by=referee.id))
+
+    for i in range(team_count):
+        team = Team(tournament_id=tournament.id, name=f'Equipo {i + 1}', seed_score=team_count - i)
+        db.session.add(team)
+        db.session.flush()
+        for j in range(members_per_team):
+            player = User(name=f'Jugador {i + 1}-{j + 1}', email=f'player{i + 1}-{j + 1}@test.com')
+            db.session.add(player)
+            db.session.flush()
+            db.session.add(TeamMember(team_id=team.id, user_id=player.id, is_leader=(j == 0)))
+    db.session.commit()
+
+    TournamentService.start_tournament(tournament.id)
+    return {'tournament_id': tournament.id, 'referee_id': referee.id}
+
+
+def add_notifications(user_id, count):
+    """
+    Notificaciones sin leer para `user_id`, como las deja send_notification
+    (seed_base_data.sql, solo PostgreSQL): las filas más el contador del usuario.
+    """
+    type_id = db.session.query(NotificationType.id).filter_by(code='TEAM_INVITE').scalar()
+    entity_type_id = db.session.query(RelatedEntityType.id).filter_by(name='TOURNAMENT').scalar()
+    notifications = [
+        Notification(user_id=user_id, title=f'Aviso {i}', message='mensaje', is_read=False,
+                     type_id=type_id, related_entity_type_id=entity_type_id, related_entity_id=1)
+        for i in range(count)
+    ]
+    db.session.add_all(notifications)
+    db.session.execute(update(User).where(User.id == user_id).values(
+        unread_notification_count=User.unread_notification_count + count
+    ))
+    return notifications
+
+
+def match_by_number(tournament_id, match_number):
+    return Match.query.filter_by(tournament_id=tournament_id, match_number=match_number).one()
+
+
+class QueryCounter:
+    """Cuenta las sentencias SQL ejecutadas por el engine dentro del bloque `with`."""
+
+    def __init__(self, only_selects=False):
+        self.only_selects = only_selects
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not self.only_selects or statement.lstrip().upper().startswith('SELECT'):
+            self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __enter__(self):
+        event.listen(db.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, 'before_cursor_execute', self._record)
+        return False